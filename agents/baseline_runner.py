@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from typing import Dict, Optional
 
-from baseline_wrappers.bl1_wrapper import run_bl1_wrapped
-from baselines.bl2 import run_bl2_structured
-from baselines.bl3 import run_bl3_stage1_only
+from baseline_wrappers.bl1_wrapper import arun_bl1_wrapped, run_bl1_wrapped
+from baselines.bl2 import arun_bl2_structured, run_bl2_structured
+from baselines.bl3 import arun_bl3_stage1_only, run_bl3_stage1_only
 from agents.specialized_agents import ATEAgent, ATSAAgent, ValidatorAgent, Moderator
 from schemas import (
     AnalysisFlags,
@@ -76,8 +76,8 @@ class BaselineRunner:
         )
 
     # --------- Modes ---------
-    def _run_bl1(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
-        _, fos = run_bl1_wrapped(
+    def _bl1_kwargs(self, text: str, text_id: str, *, language_code: str, domain_id: str) -> Dict:
+        return dict(
             backbone=self.backbone,
             text=text,
             text_id=text_id,
@@ -88,10 +88,17 @@ class BaselineRunner:
             language_code=language_code,
             domain_id=domain_id,
         )
+
+    def _run_bl1(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
+        _, fos = run_bl1_wrapped(**self._bl1_kwargs(text, text_id, language_code=language_code, domain_id=domain_id))
         return fos
 
-    def _run_bl2(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
-        bl2_result = run_bl2_structured(
+    async def _arun_bl1(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
+        _, fos = await arun_bl1_wrapped(**self._bl1_kwargs(text, text_id, language_code=language_code, domain_id=domain_id))
+        return fos
+
+    def _bl2_kwargs(self, text: str, text_id: str, *, language_code: str, domain_id: str) -> Dict:
+        return dict(
             backbone=self.backbone,
             text=text,
             run_id=self.run_id,
@@ -102,6 +109,16 @@ class BaselineRunner:
             language_code=language_code,
             domain_id=domain_id,
         )
+
+    def _run_bl2(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
+        bl2_result = run_bl2_structured(**self._bl2_kwargs(text, text_id, language_code=language_code, domain_id=domain_id))
+        return self._wrap_bl2(text, text_id, bl2_result)
+
+    async def _arun_bl2(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
+        bl2_result = await arun_bl2_structured(**self._bl2_kwargs(text, text_id, language_code=language_code, domain_id=domain_id))
+        return self._wrap_bl2(text, text_id, bl2_result)
+
+    def _wrap_bl2(self, text: str, text_id: str, bl2_result) -> FinalOutputSchema:
         bl2_output = bl2_result.model
 
         aspects = bl2_output.aspects if bl2_output else []
@@ -130,7 +147,7 @@ class BaselineRunner:
                 agent="BL2",
                 input_text=text,
                 output=bl2_output.model_dump() if bl2_output else {"error": "parsing_failed"},
-                notes=bl2_result.meta.to_notes_str(),
+                call_metadata=bl2_result.meta.to_call_metadata(),
             )
         ]
 
@@ -148,8 +165,8 @@ class BaselineRunner:
             final_result=final_result,
         )
 
-    def _run_bl3(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
-        return run_bl3_stage1_only(
+    def _bl3_kwargs(self, text: str, text_id: str, *, language_code: str, domain_id: str) -> Dict:
+        return dict(
             text=text,
             text_id=text_id,
             run_id=self.run_id,
@@ -161,14 +178,18 @@ class BaselineRunner:
             domain_id=domain_id,
         )
 
+    def _run_bl3(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
+        return run_bl3_stage1_only(**self._bl3_kwargs(text, text_id, language_code=language_code, domain_id=domain_id))
+
+    async def _arun_bl3(self, text: str, text_id: str, *, language_code: str = "unknown", domain_id: str = "unknown") -> FinalOutputSchema:
+        return await arun_bl3_stage1_only(**self._bl3_kwargs(text, text_id, language_code=language_code, domain_id=domain_id))
+
     # --------- Public ---------
     def run(self, example: InternalExample | str) -> FinalOutputSchema:
         if isinstance(example, str):
             example = InternalExample(uid="text", text=example)
         text = example.text
         text_id = getattr(example, "uid", "text") or "text"
-        case_type = getattr(example, "case_type", None) or "unknown"
-        split = getattr(example, "split", None) or "unknown"
         language_code = getattr(example, "language_code", None) or "unknown"
         domain_id = getattr(example, "domain_id", None) or "unknown"
         if self.mode == "bl1":
@@ -177,7 +198,31 @@ class BaselineRunner:
             result = self._run_bl2(text, text_id, language_code=language_code, domain_id=domain_id)
         else:
             result = self._run_bl3(text, text_id, language_code=language_code, domain_id=domain_id)
+        return self._attach_context(result, example)
 
+    async def arun(self, example: InternalExample | str) -> FinalOutputSchema:
+        """Coroutine counterpart of run() built on the agents' arun_* methods."""
+        if isinstance(example, str):
+            example = InternalExample(uid="text", text=example)
+        text = example.text
+        text_id = getattr(example, "uid", "text") or "text"
+        language_code = getattr(example, "language_code", None) or "unknown"
+        domain_id = getattr(example, "domain_id", None) or "unknown"
+        if self.mode == "bl1":
+            result = await self._arun_bl1(text, text_id, language_code=language_code, domain_id=domain_id)
+        elif self.mode == "bl2":
+            result = await self._arun_bl2(text, text_id, language_code=language_code, domain_id=domain_id)
+        else:
+            result = await self._arun_bl3(text, text_id, language_code=language_code, domain_id=domain_id)
+        return self._attach_context(result, example)
+
+    @staticmethod
+    def _attach_context(result: FinalOutputSchema, example: InternalExample) -> FinalOutputSchema:
+        text_id = getattr(example, "uid", "text") or "text"
+        case_type = getattr(example, "case_type", None) or "unknown"
+        split = getattr(example, "split", None) or "unknown"
+        language_code = getattr(example, "language_code", None) or "unknown"
+        domain_id = getattr(example, "domain_id", None) or "unknown"
         # Attach dataset context for traceability
         result.meta = {
             **(result.meta or {}),
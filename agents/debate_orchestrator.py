@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from schemas import DebateOutput, DebatePersona, DebateRound, DebateSummary, DebateTurn, ProcessTrace
 from tools.backbone_client import BackboneClient
-from tools.llm_runner import run_structured, StructuredResult
+from tools.deadline import Deadline
+from tools.llm_runner import arun_structured, run_structured, StructuredResult
 from tools.prompt_spec import PromptSpec
 from agents.prompts import load_prompt
 
@@ -14,8 +15,9 @@ class DebateOrchestrator:
     Orchestrates a pro/con debate with planning + reflection steps and a judge summary.
     """
 
-    def __init__(self, backbone: Optional[BackboneClient] = None, config: Optional[Dict] = None):
+    def __init__(self, backbone: Optional[BackboneClient] = None, config: Optional[Dict] = None, errors_path: Optional[str] = None):
         self.backbone = backbone or BackboneClient()
+        self.errors_path = errors_path  # None: run_structured's run-scoped default
         cfg = config or {}
         self.rounds = int(cfg.get("rounds", 2))
         self.order = list(cfg.get("order") or ["analyst", "critic", "empath"])
@@ -48,6 +50,9 @@ class DebateOrchestrator:
             ),
         }
 
+    def turns_per_round(self) -> int:
+        return sum(1 for key in self.order if self.personas.get(key))
+
     def _format_history(self, turns: List[DebateTurn]) -> str:
         if not turns:
             return "없음"
@@ -63,69 +68,62 @@ class DebateOrchestrator:
             turn.stance = persona.stance
         return turn
 
-    def run(
+    def _turn_call(
         self,
         *,
+        system_base: str,
         topic: str,
         context_json: str,
+        persona: DebatePersona,
+        speaker_key: str,
+        round_idx: int,
+        turns: List[DebateTurn],
         run_id: str,
         text_id: str,
-        language_code: str = "unknown",
-        domain_id: str = "unknown",
-        trace: Optional[List[ProcessTrace]] = None,
-    ) -> DebateOutput:
-        trace = trace if trace is not None else []
-        turns: List[DebateTurn] = []
-        rounds: List[DebateRound] = []
-
-        system_base = load_prompt("debate_speaker")
-        for round_idx in range(1, self.rounds + 1):
-            round_turns: List[DebateTurn] = []
-            for speaker_key in self.order:
-                persona = self.personas.get(speaker_key)
-                if not persona:
-                    continue
-                history = self._format_history(turns)
-                system_prompt = (
-                    f"{system_base}\n\n"
-                    f"[TOPIC]\n{topic}\n\n"
-                    f"[PERSONA]\n{persona.model_dump_json()}\n\n"
-                    f"[SHARED_CONTEXT_JSON]\n{context_json}\n\n"
-                    f"[HISTORY]\n{history}\n"
-                )
-                spec = PromptSpec(
-                    system=[system_prompt],
-                    user=topic,
-                    language_code=language_code,
-                    domain_id=domain_id,
-                )
-                result: StructuredResult[DebateTurn] = run_structured(
-                    backbone=self.backbone,
-                    system_prompt=system_prompt,
-                    user_text=topic,
-                    schema=DebateTurn,
-                    max_retries=2,
-                    run_id=run_id,
-                    text_id=text_id,
-                    stage=f"debate_round{round_idx}_{speaker_key}",
-                    mode="debate",
-                    use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
-                    prompt_spec=spec,
-                )
-                turn = self._normalize_turn(result.model, persona)
-                turns.append(turn)
-                round_turns.append(turn)
-                trace.append(
-                    ProcessTrace(
-                        stage="debate",
-                        agent=turn.speaker,
-                        input_text=topic,
-                        output=turn.model_dump(),
-                        notes=result.meta.to_notes_str(),
-                    )
-                )
-            rounds.append(DebateRound(round_index=round_idx, turns=round_turns))
+        language_code: str,
+        domain_id: str,
+    ) -> Dict[str, Any]:
+        """run_structured / arun_structured kwargs for one speaker turn (history = turns so far)."""
+        history = self._format_history(turns)
+        system_prompt = (
+            f"{system_base}\n\n"
+            f"[TOPIC]\n{topic}\n\n"
+            f"[PERSONA]\n{persona.model_dump_json()}\n\n"
+            f"[SHARED_CONTEXT_JSON]\n{context_json}\n\n"
+            f"[HISTORY]\n{history}\n"
+        )
+        spec = PromptSpec(
+            system=[system_prompt],
+            user=topic,
+            language_code=language_code,
+            domain_id=domain_id,
+        )
+        return dict(
+            backbone=self.backbone,
+            system_prompt=system_prompt,
+            user_text=topic,
+            schema=DebateTurn,
+            max_retries=2,
+            run_id=run_id,
+            text_id=text_id,
+            stage=f"debate_round{round_idx}_{speaker_key}",
+            mode="debate",
+            use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
+            prompt_spec=spec,
+            errors_path=self.errors_path,
+        )
 
+    def _judge_call(
+        self,
+        *,
+        topic: str,
+        context_json: str,
+        turns: List[DebateTurn],
+        run_id: str,
+        text_id: str,
+        language_code: str,
+        domain_id: str,
+    ) -> Dict[str, Any]:
         judge_prompt = (
             load_prompt("debate_judge")
             + f"\n\n[TOPIC]\n{topic}\n\n[SHARED_CONTEXT_JSON]\n{context_json}\n\n[ALL_TURNS]\n"
@@ -137,7 +135,7 @@ class DebateOrchestrator:
             language_code=language_code,
             domain_id=domain_id,
         )
-        judge_result: StructuredResult[DebateSummary] = run_structured(
+        return dict(
             backbone=self.backbone,
             system_prompt=judge_prompt,
             user_text=topic,
@@ -149,7 +147,40 @@ class DebateOrchestrator:
             mode="debate",
             use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
             prompt_spec=judge_spec,
+            errors_path=self.errors_path,
         )
+
+    def _record_turn(
+        self,
+        result: StructuredResult[DebateTurn],
+        persona: DebatePersona,
+        *,
+        topic: str,
+        turns: List[DebateTurn],
+        round_turns: List[DebateTurn],
+        trace: List[ProcessTrace],
+    ) -> None:
+        turn = self._normalize_turn(result.model, persona)
+        turns.append(turn)
+        round_turns.append(turn)
+        trace.append(
+            ProcessTrace(
+                stage="debate",
+                agent=turn.speaker,
+                input_text=topic,
+                output=turn.model_dump(),
+                call_metadata=result.meta.to_call_metadata(),
+            )
+        )
+
+    def _finish(
+        self,
+        judge_result: StructuredResult[DebateSummary],
+        *,
+        topic: str,
+        rounds: List[DebateRound],
+        trace: List[ProcessTrace],
+    ) -> DebateOutput:
         summary = judge_result.model
         trace.append(
             ProcessTrace(
@@ -157,7 +188,7 @@ class DebateOrchestrator:
                 agent="DebateJudge",
                 input_text=topic,
                 output=summary.model_dump(),
-                notes=judge_result.meta.to_notes_str(),
+                call_metadata=judge_result.meta.to_call_metadata(),
             )
         )
 
@@ -168,3 +199,93 @@ class DebateOrchestrator:
             summary=summary,
         )
 
+    def run(
+        self,
+        *,
+        topic: str,
+        context_json: str,
+        run_id: str,
+        text_id: str,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        trace: Optional[List[ProcessTrace]] = None,
+        rounds: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> DebateOutput:
+        """
+        rounds overrides the configured round count (deadline degradation). Trace entries are appended only
+        when the debate completes, so a DeadlineExceeded mid-debate leaves the caller's trace untouched.
+        """
+        pending: List[ProcessTrace] = []
+        n_rounds = self.rounds if rounds is None else rounds
+        turns: List[DebateTurn] = []
+        debate_rounds: List[DebateRound] = []
+        ids = dict(run_id=run_id, text_id=text_id, language_code=language_code, domain_id=domain_id)
+
+        system_base = load_prompt("debate_speaker")
+
+        for round_idx in range(1, n_rounds + 1):
+            round_turns: List[DebateTurn] = []
+            for speaker_key in self.order:
+                persona = self.personas.get(speaker_key)
+                if not persona:
+                    continue
+                call = self._turn_call(
+                    system_base=system_base, topic=topic, context_json=context_json, persona=persona, speaker_key=speaker_key,
+                    round_idx=round_idx, turns=turns, **ids,
+                )
+                result: StructuredResult[DebateTurn] = run_structured(**call, deadline=deadline)
+                self._record_turn(result, persona, topic=topic, turns=turns, round_turns=round_turns, trace=pending)
+            debate_rounds.append(DebateRound(round_index=round_idx, turns=round_turns))
+
+        judge_result: StructuredResult[DebateSummary] = run_structured(
+            **self._judge_call(topic=topic, context_json=context_json, turns=turns, **ids), deadline=deadline
+        )
+        output = self._finish(judge_result, topic=topic, rounds=debate_rounds, trace=pending)
+        if trace is not None:
+            trace.extend(pending)
+        return output
+
+    async def arun(
+        self,
+        *,
+        topic: str,
+        context_json: str,
+        run_id: str,
+        text_id: str,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        trace: Optional[List[ProcessTrace]] = None,
+        rounds: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> DebateOutput:
+        """Coroutine counterpart of run(). Turns stay sequential: each speaker sees the history so far."""
+        pending: List[ProcessTrace] = []
+        n_rounds = self.rounds if rounds is None else rounds
+        turns: List[DebateTurn] = []
+        debate_rounds: List[DebateRound] = []
+        ids = dict(run_id=run_id, text_id=text_id, language_code=language_code, domain_id=domain_id)
+
+        system_base = load_prompt("debate_speaker")
+
+        for round_idx in range(1, n_rounds + 1):
+            round_turns: List[DebateTurn] = []
+            for speaker_key in self.order:
+                persona = self.personas.get(speaker_key)
+                if not persona:
+                    continue
+                call = self._turn_call(
+                    system_base=system_base, topic=topic, context_json=context_json, persona=persona, speaker_key=speaker_key,
+                    round_idx=round_idx, turns=turns, **ids,
+                )
+                result: StructuredResult[DebateTurn] = await arun_structured(**call, deadline=deadline)
+                self._record_turn(result, persona, topic=topic, turns=turns, round_turns=round_turns, trace=pending)
+            debate_rounds.append(DebateRound(round_index=round_idx, turns=round_turns))
+
+        judge_result: StructuredResult[DebateSummary] = await arun_structured(
+            **self._judge_call(topic=topic, context_json=context_json, turns=turns, **ids), deadline=deadline
+        )
+        output = self._finish(judge_result, topic=topic, rounds=debate_rounds, trace=pending)
+        if trace is not None:
+            trace.extend(pending)
+        return output
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import sys
+from typing import Any, Dict
 
 from schemas import ATEOutput, AspectExtractionStage1Schema, AspectExtractionStage2Schema
 from tools.backbone_client import BackboneClient
-from tools.llm_runner import run_structured, StructuredResult
+from tools.deadline import Deadline
+from tools.llm_runner import arun_structured, run_structured, StructuredResult
 from tools.prompt_spec import PromptSpec, DemoExample
 from agents.prompts import load_prompt
 
@@ -12,22 +14,26 @@ from agents.prompts import load_prompt
 class ATEAgent:
     """Aspect-agnostic sentiment agent (ATE)."""
 
-    def __init__(self, backbone: BackboneClient | None = None):
+    def __init__(self, backbone: BackboneClient | None = None, errors_path: str | None = None):
         self.backbone = backbone or BackboneClient()
+        self.errors_path = errors_path  # None: run_structured's run-scoped default
 
-    def run_stage1(
+    def _structured_call(
         self,
+        system_prompt: str,
         text: str,
+        schema: type,
         *,
+        stage: str,
         run_id: str,
         text_id: str,
-        mode: str = "proposed",
-        demos: list[str] | None = None,
-        language_code: str = "unknown",
-        domain_id: str = "unknown",
-    ) -> StructuredResult[AspectExtractionStage1Schema]:
-        system_prompt = load_prompt("ate_stage1")
-        print(f"[ATE DEBUG] stage1 text_id={text_id}, prompt_len={len(system_prompt)}", file=sys.stderr)
+        mode: str,
+        demos: list[str] | None,
+        language_code: str,
+        domain_id: str,
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
+        """Keyword arguments for run_structured / arun_structured (shared by the sync and async entry points)."""
         spec = PromptSpec(
             system=[system_prompt],
             user=text,
@@ -35,23 +41,42 @@ class ATEAgent:
             language_code=language_code,
             domain_id=domain_id,
         )
-        result = run_structured(
+        return dict(
             backbone=self.backbone,
             system_prompt=system_prompt,
             user_text=text,
-            schema=AspectExtractionStage1Schema,
+            schema=schema,
             max_retries=2,
             run_id=run_id,
             text_id=text_id,
-            stage="ATE",
+            stage=stage,
             mode=mode,
             use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
             prompt_spec=spec,
+            deadline=deadline,
+            errors_path=self.errors_path,
         )
-        print(f"[ATE DEBUG] stage1 raw_response={result.meta.raw_response[:200]}", file=sys.stderr)
-        return result
 
-    def run_stage2(
+    def _stage1_call(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
+        system_prompt = load_prompt("ate_stage1")
+        print(f"[ATE DEBUG] stage1 text_id={text_id}, prompt_len={len(system_prompt)}", file=sys.stderr)
+        return self._structured_call(
+            system_prompt, text, AspectExtractionStage1Schema, stage="ATE", run_id=run_id, text_id=text_id,
+            mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline,
+        )
+
+    def _stage2_call(
         self,
         text: str,
         stage1_output: AspectExtractionStage1Schema,
@@ -64,34 +89,98 @@ class ATEAgent:
         language_code: str = "unknown",
         domain_id: str = "unknown",
         extra_context: str | None = None,
-    ) -> StructuredResult[AspectExtractionStage2Schema]:
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
         system_prompt = load_prompt("ate_stage2") + f"\n\nStage1 JSON:\n{stage1_output.model_dump_json()}\nValidator JSON:\n{getattr(validator_output, 'model_dump_json', lambda: '')()}"
         if extra_context:
             system_prompt += f"\n\nDebate Review Context JSON:\n{extra_context}"
         print(f"[ATE DEBUG] stage2 text_id={text_id}, prompt_len={len(system_prompt)}", file=sys.stderr)
-        spec = PromptSpec(
-            system=[system_prompt],
-            user=text,
-            demos=[DemoExample(text=d) for d in (demos or [])],
-            language_code=language_code,
-            domain_id=domain_id,
+        return self._structured_call(
+            system_prompt, text, AspectExtractionStage2Schema, stage="ATE_reanalysis", run_id=run_id, text_id=text_id,
+            mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline,
         )
-        result = run_structured(
-            backbone=self.backbone,
-            system_prompt=system_prompt,
-            user_text=text,
-            schema=AspectExtractionStage2Schema,
-            max_retries=2,
-            run_id=run_id,
-            text_id=text_id,
-            stage="ATE_reanalysis",
-            mode=mode,
-            use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
-            prompt_spec=spec,
+
+    def run_stage1(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectExtractionStage1Schema]:
+        result = run_structured(**self._stage1_call(text, run_id=run_id, text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline))
+        print(f"[ATE DEBUG] stage1 raw_response={result.meta.raw_response[:200]}", file=sys.stderr)
+        return result
+
+    async def arun_stage1(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectExtractionStage1Schema]:
+        result = await arun_structured(**self._stage1_call(text, run_id=run_id, text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline))
+        print(f"[ATE DEBUG] stage1 raw_response={result.meta.raw_response[:200]}", file=sys.stderr)
+        return result
+
+    def run_stage2(
+        self,
+        text: str,
+        stage1_output: AspectExtractionStage1Schema,
+        validator_output: object,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        extra_context: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectExtractionStage2Schema]:
+        call = self._stage2_call(
+            text, stage1_output, validator_output, run_id=run_id, text_id=text_id, mode=mode, demos=demos,
+            language_code=language_code, domain_id=domain_id, extra_context=extra_context, deadline=deadline,
         )
+        result = run_structured(**call)
+        print(f"[ATE DEBUG] stage2 raw_response={result.meta.raw_response[:200]}", file=sys.stderr)
+        return result
+
+    async def arun_stage2(
+        self,
+        text: str,
+        stage1_output: AspectExtractionStage1Schema,
+        validator_output: object,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        extra_context: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectExtractionStage2Schema]:
+        call = self._stage2_call(
+            text, stage1_output, validator_output, run_id=run_id, text_id=text_id, mode=mode, demos=demos,
+            language_code=language_code, domain_id=domain_id, extra_context=extra_context, deadline=deadline,
+        )
+        result = await arun_structured(**call)
         print(f"[ATE DEBUG] stage2 raw_response={result.meta.raw_response[:200]}", file=sys.stderr)
         return result
 
     # Compatibility
     def run(self, text: str, *, run_id: str, text_id: str, mode: str = "proposed", language_code: str = "unknown", domain_id: str = "unknown") -> StructuredResult[AspectExtractionStage1Schema]:
         return self.run_stage1(text, run_id=run_id, text_id=text_id, mode=mode, language_code=language_code, domain_id=domain_id)
+
+    async def arun(self, text: str, *, run_id: str, text_id: str, mode: str = "proposed", language_code: str = "unknown", domain_id: str = "unknown") -> StructuredResult[AspectExtractionStage1Schema]:
+        return await self.arun_stage1(text, run_id=run_id, text_id=text_id, mode=mode, language_code=language_code, domain_id=domain_id)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from typing import Any, Dict
+
 from schemas import ATSAOutput, AspectSentimentStage1Schema, AspectSentimentStage2Schema
 from tools.backbone_client import BackboneClient
-from tools.llm_runner import run_structured, StructuredResult
+from tools.deadline import Deadline
+from tools.llm_runner import arun_structured, run_structured, StructuredResult
 from tools.prompt_spec import PromptSpec, DemoExample
 from agents.prompts import load_prompt
 
@@ -10,21 +13,26 @@ from agents.prompts import load_prompt
 class ATSAAgent:
     """Aspect/target-specific sentiment agent (ATSA)."""
 
-    def __init__(self, backbone: BackboneClient | None = None):
+    def __init__(self, backbone: BackboneClient | None = None, errors_path: str | None = None):
         self.backbone = backbone or BackboneClient()
+        self.errors_path = errors_path  # None: run_structured's run-scoped default
 
-    def run_stage1(
+    def _structured_call(
         self,
+        system_prompt: str,
         text: str,
+        schema: type,
         *,
+        stage: str,
         run_id: str,
         text_id: str,
-        mode: str = "proposed",
-        demos: list[str] | None = None,
-        language_code: str = "unknown",
-        domain_id: str = "unknown",
-    ) -> StructuredResult[AspectSentimentStage1Schema]:
-        system_prompt = load_prompt("atsa_stage1")
+        mode: str,
+        demos: list[str] | None,
+        language_code: str,
+        domain_id: str,
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
+        """Keyword arguments for run_structured / arun_structured (shared by the sync and async entry points)."""
         spec = PromptSpec(
             system=[system_prompt],
             user=text,
@@ -32,21 +40,40 @@ class ATSAAgent:
             language_code=language_code,
             domain_id=domain_id,
         )
-        return run_structured(
+        return dict(
             backbone=self.backbone,
             system_prompt=system_prompt,
             user_text=text,
-            schema=AspectSentimentStage1Schema,
+            schema=schema,
             max_retries=2,
             run_id=run_id,
             text_id=text_id,
-            stage="ATSA",
+            stage=stage,
             mode=mode,
             use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
             prompt_spec=spec,
+            deadline=deadline,
+            errors_path=self.errors_path,
         )
 
-    def run_stage2(
+    def _stage1_call(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
+        return self._structured_call(
+            load_prompt("atsa_stage1"), text, AspectSentimentStage1Schema, stage="ATSA", run_id=run_id, text_id=text_id,
+            mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline,
+        )
+
+    def _stage2_call(
         self,
         text: str,
         stage1_output: AspectSentimentStage1Schema,
@@ -59,7 +86,8 @@ class ATSAAgent:
         language_code: str = "unknown",
         domain_id: str = "unknown",
         extra_context: str | None = None,
-    ) -> StructuredResult[AspectSentimentStage2Schema]:
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
         extra_instruction = "\nInstruction: Use only ATE terms verbatim for aspect_ref."
         system_prompt = (
             load_prompt("atsa_stage2")
@@ -68,26 +96,83 @@ class ATSAAgent:
         )
         if extra_context:
             system_prompt += f"\n\nDebate Review Context JSON:\n{extra_context}"
-        spec = PromptSpec(
-            system=[system_prompt],
-            user=text,
-            demos=[DemoExample(text=d) for d in (demos or [])],
-            language_code=language_code,
-            domain_id=domain_id,
+        return self._structured_call(
+            system_prompt, text, AspectSentimentStage2Schema, stage="ATSA_reanalysis", run_id=run_id, text_id=text_id,
+            mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline,
         )
-        return run_structured(
-            backbone=self.backbone,
-            system_prompt=system_prompt,
-            user_text=text,
-            schema=AspectSentimentStage2Schema,
-            max_retries=2,
-            run_id=run_id,
-            text_id=text_id,
-            stage="ATSA_reanalysis",
-            mode=mode,
-            use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
-            prompt_spec=spec,
+
+    def run_stage1(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectSentimentStage1Schema]:
+        return run_structured(**self._stage1_call(text, run_id=run_id, text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline))
+
+    async def arun_stage1(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectSentimentStage1Schema]:
+        return await arun_structured(**self._stage1_call(text, run_id=run_id, text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline))
+
+    def run_stage2(
+        self,
+        text: str,
+        stage1_output: AspectSentimentStage1Schema,
+        validator_output: object,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        extra_context: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectSentimentStage2Schema]:
+        call = self._stage2_call(
+            text, stage1_output, validator_output, run_id=run_id, text_id=text_id, mode=mode, demos=demos,
+            language_code=language_code, domain_id=domain_id, extra_context=extra_context, deadline=deadline,
+        )
+        return run_structured(**call)
+
+    async def arun_stage2(
+        self,
+        text: str,
+        stage1_output: AspectSentimentStage1Schema,
+        validator_output: object,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        extra_context: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[AspectSentimentStage2Schema]:
+        call = self._stage2_call(
+            text, stage1_output, validator_output, run_id=run_id, text_id=text_id, mode=mode, demos=demos,
+            language_code=language_code, domain_id=domain_id, extra_context=extra_context, deadline=deadline,
         )
+        return await arun_structured(**call)
 
     def run(self, text: str, *, run_id: str, text_id: str, mode: str = "proposed", language_code: str = "unknown", domain_id: str = "unknown") -> StructuredResult[AspectSentimentStage1Schema]:
         return self.run_stage1(text, run_id=run_id, text_id=text_id, mode=mode, language_code=language_code, domain_id=domain_id)
+
+    async def arun(self, text: str, *, run_id: str, text_id: str, mode: str = "proposed", language_code: str = "unknown", domain_id: str = "unknown") -> StructuredResult[AspectSentimentStage1Schema]:
+        return await self.arun_stage1(text, run_id=run_id, text_id=text_id, mode=mode, language_code=language_code, domain_id=domain_id)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Any, Dict, Iterable
 
 from schemas import (
     ATEOutput,
@@ -10,8 +10,10 @@ from schemas import (
     ValidatorOutput,
 )
 from tools.backbone_client import BackboneClient
-from tools.llm_runner import run_structured, StructuredResult
+from tools.deadline import Deadline
+from tools.llm_runner import arun_structured, run_structured, StructuredResult
 from tools.prompt_spec import PromptSpec, DemoExample
+from tools.pattern_set import AhoCorasick, get_pattern_set
 from agents.prompts import load_prompt
 
 
@@ -32,21 +34,26 @@ class ValidatorAgent:
         "전혀 안",
     )
 
-    def __init__(self, backbone: BackboneClient | None = None):
+    def __init__(self, backbone: BackboneClient | None = None, errors_path: str | None = None):
         self.backbone = backbone or BackboneClient()
+        self.errors_path = errors_path  # None: run_structured's run-scoped default
 
     @classmethod
     def _contains_negation_trigger(cls, text: str, *, language_code: str = "unknown", triggers: Iterable[str] | None = None) -> bool:
-        from tools.pattern_loader import load_patterns
-
         haystack = text.lower()
         if triggers is None:
-            patterns, _, _ = load_patterns(language_code)
-            triggers = patterns.get("negation_triggers") or cls.NEGATION_TRIGGERS
-        for trig in triggers:
-            if trig and str(trig).lower() in haystack:
-                return True
-        return False
+            matcher = get_pattern_set(language_code).negation or cls._default_negation_matcher()
+        else:
+            matcher = AhoCorasick(str(trig).lower() for trig in triggers if trig)
+        return matcher.contains_any(haystack)
+
+    @classmethod
+    def _default_negation_matcher(cls) -> AhoCorasick:
+        matcher = cls.__dict__.get("_negation_matcher")
+        if matcher is None:
+            matcher = AhoCorasick(str(trig).lower() for trig in cls.NEGATION_TRIGGERS if trig)
+            cls._negation_matcher = matcher
+        return matcher
 
     def _apply_negation_gate(self, text: str, result: StructuredResult[StructuralValidatorStage1Schema], *, language_code: str) -> StructuredResult[StructuralValidatorStage1Schema]:
         """
@@ -72,18 +79,22 @@ class ValidatorAgent:
         result.meta.error = f"{result.meta.error};{note}" if result.meta.error else note
         return result
 
-    def run_stage1(
+    def _structured_call(
         self,
+        system_prompt: str,
         text: str,
+        schema: type,
         *,
+        stage: str,
         run_id: str,
         text_id: str,
-        mode: str = "proposed",
-        demos: list[str] | None = None,
-        language_code: str = "unknown",
-        domain_id: str = "unknown",
-    ) -> StructuredResult[StructuralValidatorStage1Schema]:
-        system_prompt = load_prompt("validator_stage1")
+        mode: str,
+        demos: list[str] | None,
+        language_code: str,
+        domain_id: str,
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
+        """Keyword arguments for run_structured / arun_structured (shared by the sync and async entry points)."""
         spec = PromptSpec(
             system=[system_prompt],
             user=text,
@@ -91,22 +102,40 @@ class ValidatorAgent:
             language_code=language_code,
             domain_id=domain_id,
         )
-        result = run_structured(
+        return dict(
             backbone=self.backbone,
             system_prompt=system_prompt,
             user_text=text,
-            schema=StructuralValidatorStage1Schema,
+            schema=schema,
             max_retries=2,
             run_id=run_id,
             text_id=text_id,
-            stage="Validator",
+            stage=stage,
             mode=mode,
             use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
             prompt_spec=spec,
+            deadline=deadline,
+            errors_path=self.errors_path,
         )
-        return self._apply_negation_gate(text, result, language_code=language_code)
 
-    def run_stage2(
+    def _stage1_call(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
+        return self._structured_call(
+            load_prompt("validator_stage1"), text, StructuralValidatorStage1Schema, stage="Validator", run_id=run_id,
+            text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline,
+        )
+
+    def _stage2_call(
         self,
         text: str,
         stage1_output: StructuralValidatorStage1Schema,
@@ -118,30 +147,85 @@ class ValidatorAgent:
         language_code: str = "unknown",
         domain_id: str = "unknown",
         extra_context: str | None = None,
-    ) -> StructuredResult[StructuralValidatorStage2Schema]:
+        deadline: Deadline | None = None,
+    ) -> Dict[str, Any]:
         prompt = load_prompt("validator_stage2") + f"\n\nStage1 JSON:\n{stage1_output.model_dump_json()}"
         if extra_context:
             prompt += f"\n\nDebate Review Context JSON:\n{extra_context}"
-        spec = PromptSpec(
-            system=[prompt],
-            user=text,
-            demos=[DemoExample(text=d) for d in (demos or [])],
-            language_code=language_code,
-            domain_id=domain_id,
+        return self._structured_call(
+            prompt, text, StructuralValidatorStage2Schema, stage="Validator_reanalysis", run_id=run_id,
+            text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline,
         )
-        return run_structured(
-            backbone=self.backbone,
-            system_prompt=prompt,
-            user_text=text,
-            schema=StructuralValidatorStage2Schema,
-            max_retries=2,
-            run_id=run_id,
-            text_id=text_id,
-            stage="Validator_reanalysis",
-            mode=mode,
-            use_mock=(getattr(self.backbone, "provider", "mock") == "mock"),
-            prompt_spec=spec,
+
+    def run_stage1(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[StructuralValidatorStage1Schema]:
+        result = run_structured(**self._stage1_call(text, run_id=run_id, text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline))
+        return self._apply_negation_gate(text, result, language_code=language_code)
+
+    async def arun_stage1(
+        self,
+        text: str,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[StructuralValidatorStage1Schema]:
+        result = await arun_structured(**self._stage1_call(text, run_id=run_id, text_id=text_id, mode=mode, demos=demos, language_code=language_code, domain_id=domain_id, deadline=deadline))
+        return self._apply_negation_gate(text, result, language_code=language_code)
+
+    def run_stage2(
+        self,
+        text: str,
+        stage1_output: StructuralValidatorStage1Schema,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        extra_context: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[StructuralValidatorStage2Schema]:
+        call = self._stage2_call(
+            text, stage1_output, run_id=run_id, text_id=text_id, mode=mode, demos=demos,
+            language_code=language_code, domain_id=domain_id, extra_context=extra_context, deadline=deadline,
+        )
+        return run_structured(**call)
+
+    async def arun_stage2(
+        self,
+        text: str,
+        stage1_output: StructuralValidatorStage1Schema,
+        *,
+        run_id: str,
+        text_id: str,
+        mode: str = "proposed",
+        demos: list[str] | None = None,
+        language_code: str = "unknown",
+        domain_id: str = "unknown",
+        extra_context: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> StructuredResult[StructuralValidatorStage2Schema]:
+        call = self._stage2_call(
+            text, stage1_output, run_id=run_id, text_id=text_id, mode=mode, demos=demos,
+            language_code=language_code, domain_id=domain_id, extra_context=extra_context, deadline=deadline,
         )
+        return await arun_structured(**call)
 
     # Compatibility with previous interface
     def run(self, text: str, ate: ATEOutput = None, atsa: ATSAOutput = None, *, run_id: str, text_id: str, run_mode: str = "stage1", mode: str = "proposed", language_code: str = "unknown", domain_id: str = "unknown"):
@@ -159,3 +243,19 @@ class ValidatorAgent:
                 domain_id=domain_id,
             )
         return self.run_stage1(text, run_id=run_id, text_id=text_id, mode=mode, language_code=language_code, domain_id=domain_id)
+
+    async def arun(self, text: str, ate: ATEOutput = None, atsa: ATSAOutput = None, *, run_id: str, text_id: str, run_mode: str = "stage1", mode: str = "proposed", language_code: str = "unknown", domain_id: str = "unknown"):
+        if run_mode == "stage2" and (ate is None or atsa is None):
+            raise ValueError("Stage2 requires stage1 outputs for context.")
+        stage1 = await self.arun_stage1(text, run_id=run_id, text_id=text_id, mode=mode, language_code=language_code, domain_id=domain_id)
+        if run_mode != "stage2":
+            return stage1
+        return await self.arun_stage2(
+            text,
+            stage1.model,
+            run_id=run_id,
+            text_id=text_id,
+            mode=mode,
+            language_code=language_code,
+            domain_id=domain_id,
+        )
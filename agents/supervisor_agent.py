@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, Optional, List
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, List
 import json
 import re
+import threading
+import time
 
 from schemas import (
     AnalysisFlags,
@@ -22,6 +25,8 @@ from schemas import (
     StructuralRiskItem,
     ATEOutput,
     ATSAOutput,
+    DebateSummary,
+    ModeratorOutput,
     ValidatorOutput,
 )
 from tools.backbone_client import BackboneClient
@@ -29,9 +34,129 @@ from tools.data_tools import InternalExample
 from tools.llm_runner import StructuredResult, _log_error, default_errors_path
 from agents.specialized_agents import ATEAgent, ATSAAgent, ValidatorAgent, Moderator
 from agents.debate_orchestrator import DebateOrchestrator
-from tools.pattern_loader import load_patterns
+from tools.pattern_set import AhoCorasick, PatternSet, compile_terms, get_pattern_set
+from tools.async_utils import gather_all
+from tools.deadline import Deadline, DeadlineExceeded
 from pathlib import Path
 
+_WS_RE = re.compile(r"\s+")
+_NON_TERM_RE = re.compile(r"[^\w가-힣]")
+_FALLBACK_TOKEN_RE = re.compile(r"[A-Za-z]{3,}")
+
+# Language-independent synonym groups applied after the pattern-file synonyms: (triggers, expansions).
+_BUILTIN_SYNONYM_GROUPS = (
+    (["가격", "비용", "가성비"], ["가격", "비용", "가성비", "금액"]),
+    (["배송", "배달"], ["배송", "배달", "출고"]),
+    (["서비스", "응대", "CS"], ["서비스", "응대", "cs", "고객응대"]),
+    (["품질", "퀄리티", "quality"], ["품질", "퀄리티", "quality", "마감"]),
+    (["맛", "풍미"], ["맛", "풍미", "향"]),
+    (["디자인", "외관", "look"], ["디자인", "외관", "look", "스타일"]),
+    (["성능", "속도", "퍼포먼스"], ["성능", "속도", "퍼포먼스", "performance"]),
+)
+_BUILTIN_SYNONYM_TRIGGERS = AhoCorasick(t for triggers, _ in _BUILTIN_SYNONYM_GROUPS for t in triggers)
+_BUILTIN_SYNONYM_GROUP_OF = [gid for gid, (triggers, _) in enumerate(_BUILTIN_SYNONYM_GROUPS) for _ in triggers]
+
+
+def _normalize_term(text: str) -> str:
+    return _NON_TERM_RE.sub("", _WS_RE.sub("", text.lower()))
+
+
+def _new_override_stats() -> Dict[str, int]:
+    return {"applied": 0, "skipped_low_signal": 0, "skipped_conflict": 0}
+
+
+class OverrideStats:
+    """Run-level debate override counters; examples merge their per-request counts under a lock."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = _new_override_stats()
+
+    def add(self, counts: Dict[str, int]) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self._counts[key] = self._counts.get(key, 0) + int(value)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+@dataclass
+class SupervisorRequestContext:
+    """
+    Per-call state for SupervisorAgent.run. One context per example; the agent instance itself only holds
+    configuration and shared, read-only resources, so concurrent run() calls never see each other's state.
+    """
+
+    text: str
+    text_id: str
+    case_type: str = "unknown"
+    split: str = "unknown"
+    language_code: str = "unknown"
+    domain_id: str = "unknown"
+    demos: List[str] = field(default_factory=list)
+    trace: List[ProcessTrace] = field(default_factory=list)
+    stage1_outputs: Optional[Dict[str, Any]] = None
+    debate_review_context: Optional[dict] = None
+    patched_stage2_ate: Optional[AspectExtractionStage1Schema] = None
+    patched_stage2_atsa: Optional[AspectSentimentStage1Schema] = None
+    override_stats: Dict[str, int] = field(default_factory=_new_override_stats)
+    deadline: Optional[Deadline] = None
+    call_estimate_s: float = 0.0
+    degraded: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_example(cls, example: InternalExample) -> "SupervisorRequestContext":
+        demos: List[str] = []
+        if getattr(example, "metadata", None):
+            demos = list(getattr(example, "metadata").get("demo_texts") or [])
+        return cls(
+            text=example.text,
+            text_id=getattr(example, "uid", "text") or "text",
+            case_type=getattr(example, "case_type", None) or "unknown",
+            split=getattr(example, "split", None) or "unknown",
+            language_code=getattr(example, "language_code", None) or "unknown",
+            domain_id=getattr(example, "domain_id", None) or "unknown",
+            demos=demos,
+        )
+
+
+@dataclass
+class SupervisorStreamEvent:
+    """
+    One progressive result from SupervisorAgent.stream()/astream(), in emission order:
+      provisional (stage1): Stage1 aspects/sentiments shaped like FinalResult, usually equal to the final answer
+      debate (debate): debate summary and round count (only when debate is enabled)
+      final (moderator): the complete FinalOutputSchema
+    elapsed_ms is measured from the start of the example.
+    """
+
+    event: str
+    stage: str
+    elapsed_ms: float
+    text_id: str
+    payload: Any
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = self.payload.model_dump() if hasattr(self.payload, "model_dump") else self.payload
+        return {"event": self.event, "stage": self.stage, "elapsed_ms": self.elapsed_ms, "text_id": self.text_id, "payload": payload}
+
+
+@dataclass
+class SupervisorDecision:
+    """Outcome of SupervisorAgent.decide(): patched Stage2 outputs, aggregated labels and the Moderator decision."""
+
+    patched_ate: AspectExtractionStage1Schema
+    patched_atsa: AspectSentimentStage1Schema
+    stage1_anchor_issues: List[str]
+    stage2_anchor_issues: List[str]
+    correction_applied_log: List[Dict[str, Any]]
+    agg_stage1: ATEOutput
+    agg_stage2: ATEOutput
+    final_aspect_sentiments: List[AspectSentimentItem]
+    moderator: ModeratorOutput
+
 
 class SupervisorAgent:
     """
@@ -60,40 +185,69 @@ class SupervisorAgent:
         self.enable_debate_override = self.config.get("enable_debate_override", True)
         self.debate_override_cfg = self._load_debate_override_cfg(self.config.get("debate_override"))
         self.run_id = run_id or "run"
-        self.ate_agent = ate_agent or ATEAgent(self.backbone)
-        self.atsa_agent = atsa_agent or ATSAAgent(self.backbone)
-        self.validator = validator or ValidatorAgent(self.backbone)
+        # Same pipeline.errors_path override as BaselineRunner; None keeps the run-scoped defaults
+        self.errors_path = self.config.get("errors_path")
+        self.ate_agent = ate_agent or ATEAgent(self.backbone, errors_path=self.errors_path)
+        self.atsa_agent = atsa_agent or ATSAAgent(self.backbone, errors_path=self.errors_path)
+        self.validator = validator or ValidatorAgent(self.backbone, errors_path=self.errors_path)
         self.moderator = moderator or Moderator()
-        self.debate = DebateOrchestrator(self.backbone, config=self.config.get("debate"))
-        self._pattern_cache: dict[str, dict] = {}
-        self._override_stats: dict[str, int] = {"applied": 0, "skipped_low_signal": 0, "skipped_conflict": 0}
-
-    def _patterns(self, language_code: str) -> dict:
-        lang = (language_code or "unknown").lower()
-        if lang not in self._pattern_cache:
-            patterns, _, _ = load_patterns(lang)
-            self._pattern_cache[lang] = patterns or {}
-        return self._pattern_cache.get(lang, {})
-
-    def _run_stage1(
-        self,
-        text: str,
-        trace: list[ProcessTrace],
-        text_id: str,
-        demos: list[str] | None = None,
-        *,
-        language_code: str = "unknown",
-        domain_id: str = "unknown",
-    ) -> Dict[str, object]:
-        ate_result = self.ate_agent.run_stage1(
-            text,
+        self.debate = DebateOrchestrator(self.backbone, config=self.config.get("debate"), errors_path=self.errors_path)
+        self.override_stats = OverrideStats()
+        deadline_cfg = self.config.get("deadline") or {}
+        self.deadline_s = deadline_cfg.get("budget_s")
+        self.call_estimate_s = float(deadline_cfg.get("call_estimate_s", 2.0))
+        self.deadline_reserve_s = float(deadline_cfg.get("reserve_s", 0.05))
+
+    @staticmethod
+    def _patterns(language_code: str) -> PatternSet:
+        """Compiled pattern set for the language (built once per process, shared by all instances)."""
+        return get_pattern_set((language_code or "unknown").lower())
+
+    def _agent_kwargs(self, ctx: SupervisorRequestContext) -> Dict[str, Any]:
+        return dict(
             run_id=self.run_id,
-            text_id=text_id,
+            text_id=ctx.text_id,
             mode="proposed",
-            demos=demos,
-            language_code=language_code,
-            domain_id=domain_id,
+            demos=ctx.demos,
+            language_code=ctx.language_code,
+            domain_id=ctx.domain_id,
+            deadline=ctx.deadline,
         )
+
+    def _run_stage1(self, ctx: SupervisorRequestContext) -> Dict[str, object]:
+        kwargs = self._agent_kwargs(ctx)
+        run_validator = self._plan_validator(ctx, concurrent=False)
+        started = time.monotonic()
+        ate_result = self.ate_agent.run_stage1(ctx.text, **kwargs)
+        atsa_result = self.atsa_agent.run_stage1(ctx.text, **kwargs)
+        validator_result = None
+        if run_validator:
+            validator_result = self._degradable(ctx, "validator", lambda: self.validator.run_stage1(ctx.text, **kwargs))
+        self._observe_stage1(ctx, time.monotonic() - started, concurrent=False)
+        return self._finish_stage1(ctx, ate_result, atsa_result, validator_result)
+
+    async def _arun_stage1(self, ctx: SupervisorRequestContext) -> Dict[str, object]:
+        # ATE / ATSA / Validator stage1 calls are independent; only the post-processing below depends on ATE.
+        kwargs = self._agent_kwargs(ctx)
+        run_validator = self._plan_validator(ctx, concurrent=True)
+        started = time.monotonic()
+        calls = [self.ate_agent.arun_stage1(ctx.text, **kwargs), self.atsa_agent.arun_stage1(ctx.text, **kwargs)]
+        if run_validator:
+            # a validator deadline miss must not cancel the ATE/ATSA siblings
+            calls.append(self._adegradable(ctx, "validator", self.validator.arun_stage1(ctx.text, **kwargs)))
+        results = await gather_all(*calls)
+        validator_result = results[2] if run_validator else None
+        self._observe_stage1(ctx, time.monotonic() - started, concurrent=True)
+        return self._finish_stage1(ctx, results[0], results[1], validator_result)
+
+    def _finish_stage1(
+        self,
+        ctx: SupervisorRequestContext,
+        ate_result: StructuredResult,
+        atsa_result: StructuredResult,
+        validator_result: StructuredResult | None,
+    ) -> Dict[str, object]:
+        text, trace, language_code = ctx.text, ctx.trace, ctx.language_code
         # Post-process ATE aspects: strip topic particles, enforce contrast rule
         ate_aspects = getattr(ate_result.model, "aspects", [])
         ate_aspects = self._clean_aspects(text, ate_aspects, language_code=language_code, )
@@ -103,18 +257,9 @@ class SupervisorAgent:
         trace.append(ProcessTrace(
             stage="stage1", agent="ATE", input_text=text,
             output=ate_result.model.model_dump(),
-            notes=ate_result.meta.to_notes_str()
+            call_metadata=ate_result.meta.to_call_metadata()
         ))
 
-        atsa_result = self.atsa_agent.run_stage1(
-            text,
-            run_id=self.run_id,
-            text_id=text_id,
-            mode="proposed",
-            demos=demos,
-            language_code=language_code,
-            domain_id=domain_id,
-        )
         # Ensure sentiments align to aspects; backfill missing aspect sentiments neutrally
         atsa_sents = getattr(atsa_result.model, "aspect_sentiments", [])
         atsa_sents = self._backfill_sentiments(text, ate_aspects, atsa_sents)
@@ -123,19 +268,10 @@ class SupervisorAgent:
         trace.append(ProcessTrace(
             stage="stage1", agent="ATSA", input_text=text,
             output=atsa_result.model.model_dump(),
-            notes=atsa_result.meta.to_notes_str()
+            call_metadata=atsa_result.meta.to_call_metadata()
         ))
 
-        if self.enable_validator:
-            validator_result = self.validator.run_stage1(
-                text,
-                run_id=self.run_id,
-                text_id=text_id,
-                mode="proposed",
-                demos=demos,
-                language_code=language_code,
-                domain_id=domain_id,
-            )
+        if validator_result is not None:
             # Inject missing-second-aspect risk when contrast detected
             if self._has_contrast(text, language_code=language_code) and len(ate_aspects) < 2:
                 validator_result.model.structural_risks.append(
@@ -149,7 +285,7 @@ class SupervisorAgent:
             trace.append(ProcessTrace(
                 stage="stage1", agent="Validator", input_text=text,
                 output=validator_result.model.model_dump(),
-                notes=validator_result.meta.to_notes_str()
+                call_metadata=validator_result.meta.to_call_metadata()
             ))
             validator_model = validator_result.model
         else:
@@ -157,43 +293,63 @@ class SupervisorAgent:
             trace.append(ProcessTrace(
                 stage="stage1", agent="Validator", input_text=text,
                 output=validator_model.model_dump(),
-                notes="validator_disabled"
+                notes="validator_disabled" if not self.enable_validator else "validator_degraded"
             ))
         return {"ate": ate_result.model, "atsa": atsa_result.model, "validator": validator_model}
 
-    def _run_stage2(
-        self,
-        text: str,
-        trace: list[ProcessTrace],
-        text_id: str,
-        demos: list[str] | None = None,
-        *,
-        language_code: str = "unknown",
-        domain_id: str = "unknown",
-        debate_context: str | None = None,
-    ) -> Dict[str, object]:
-        if not self.enable_stage2:
-            return {"ate": self.stage1_outputs["ate"], "atsa": self.stage1_outputs["atsa"], "validator": self.stage1_outputs["validator"]}
+    @staticmethod
+    def _stage1_passthrough(ctx: SupervisorRequestContext) -> Dict[str, object]:
+        stage1_outputs = ctx.stage1_outputs or {}
+        return {"ate": stage1_outputs["ate"], "atsa": stage1_outputs["atsa"], "validator": stage1_outputs["validator"]}
+
+    def _run_stage2(self, ctx: SupervisorRequestContext, *, debate_context: str | None = None) -> Dict[str, object]:
+        stage1_outputs = ctx.stage1_outputs or {}
+        if not self.enable_stage2 or not self._plan_stage2(ctx, concurrent=False):
+            return self._stage1_passthrough(ctx)
         # Stage2 uses Stage1 context + validator feedback
         # Note: structural validator stage1 result is reused for reanalysis
-        errors_path = default_errors_path(self.run_id, "proposed", "stage2")
-        ate2_result = self.ate_agent.run_stage2(
-            text,
-            self.stage1_outputs["ate"],
-            self.stage1_outputs["validator"],
-            run_id=self.run_id,
-            text_id=text_id,
-            mode="proposed",
-            demos=demos,
-            language_code=language_code,
-            domain_id=domain_id,
-            extra_context=debate_context,
-        )
-        if self.debate_review_context:
+        kwargs = dict(self._agent_kwargs(ctx), extra_context=debate_context)
+
+        def calls():
+            return (
+                self.ate_agent.run_stage2(ctx.text, stage1_outputs["ate"], stage1_outputs["validator"], **kwargs),
+                self.atsa_agent.run_stage2(ctx.text, stage1_outputs["atsa"], stage1_outputs["validator"], **kwargs),
+                self.validator.run_stage2(ctx.text, stage1_outputs["validator"], **kwargs),
+            )
+
+        results = self._degradable(ctx, "stage2", calls)
+        if results is None:
+            return self._stage1_passthrough(ctx)
+        return self._finish_stage2(ctx, *results)
+
+    async def _arun_stage2(self, ctx: SupervisorRequestContext, *, debate_context: str | None = None) -> Dict[str, object]:
+        stage1_outputs = ctx.stage1_outputs or {}
+        if not self.enable_stage2 or not self._plan_stage2(ctx, concurrent=True):
+            return self._stage1_passthrough(ctx)
+        kwargs = dict(self._agent_kwargs(ctx), extra_context=debate_context)
+        results = await self._adegradable(ctx, "stage2", gather_all(
+            self.ate_agent.arun_stage2(ctx.text, stage1_outputs["ate"], stage1_outputs["validator"], **kwargs),
+            self.atsa_agent.arun_stage2(ctx.text, stage1_outputs["atsa"], stage1_outputs["validator"], **kwargs),
+            self.validator.arun_stage2(ctx.text, stage1_outputs["validator"], **kwargs),
+        ))
+        if results is None:
+            return self._stage1_passthrough(ctx)
+        return self._finish_stage2(ctx, *results)
+
+    def _finish_stage2(
+        self,
+        ctx: SupervisorRequestContext,
+        ate2_result: StructuredResult,
+        atsa2_result: StructuredResult,
+        validator2_result: StructuredResult,
+    ) -> Dict[str, object]:
+        text, trace, text_id = ctx.text, ctx.trace, ctx.text_id
+        errors_path = self.errors_path or default_errors_path(self.run_id, "proposed", "stage2")
+        if ctx.debate_review_context:
             self._inject_review_provenance(
                 reviews=getattr(ate2_result.model, "aspect_review", []),
                 key_field="term",
-                debate_review_context=self.debate_review_context,
+                debate_review_context=ctx.debate_review_context,
             )
         self._enforce_stage2_review_only(
             agent="ATE",
@@ -205,26 +361,14 @@ class SupervisorAgent:
         trace.append(ProcessTrace(
             stage="stage2", agent="ATE", input_text=text,
             output=ate2_result.model.model_dump(),
-            notes=ate2_result.meta.to_notes_str()
+            call_metadata=ate2_result.meta.to_call_metadata()
         ))
 
-        atsa2_result = self.atsa_agent.run_stage2(
-            text,
-            self.stage1_outputs["atsa"],
-            self.stage1_outputs["validator"],
-            run_id=self.run_id,
-            text_id=text_id,
-            mode="proposed",
-            demos=demos,
-            language_code=language_code,
-            domain_id=domain_id,
-            extra_context=debate_context,
-        )
-        if self.debate_review_context:
+        if ctx.debate_review_context:
             self._inject_review_provenance(
                 reviews=getattr(atsa2_result.model, "sentiment_review", []),
                 key_field="aspect_ref",
-                debate_review_context=self.debate_review_context,
+                debate_review_context=ctx.debate_review_context,
             )
         self._enforce_stage2_review_only(
             agent="ATSA",
@@ -236,130 +380,305 @@ class SupervisorAgent:
         trace.append(ProcessTrace(
             stage="stage2", agent="ATSA", input_text=text,
             output=atsa2_result.model.model_dump(),
-            notes=atsa2_result.meta.to_notes_str()
+            call_metadata=atsa2_result.meta.to_call_metadata()
         ))
 
-        validator2_result = self.validator.run_stage2(
-            text,
-            self.stage1_outputs["validator"],
-            run_id=self.run_id,
-            text_id=text_id,
-            mode="proposed",
-            demos=demos,
-            language_code=language_code,
-            domain_id=domain_id,
-            extra_context=debate_context,
-        )
         trace.append(ProcessTrace(
             stage="stage2", agent="Validator", input_text=text,
             output=validator2_result.model.model_dump(),
-            notes=validator2_result.meta.to_notes_str()
+            call_metadata=validator2_result.meta.to_call_metadata()
         ))
         return {"ate": ate2_result.model, "atsa": atsa2_result.model, "validator": validator2_result.model}
 
-    def run(self, example: InternalExample | str) -> FinalOutputSchema:
-        if isinstance(example, str):
-            example = InternalExample(uid="text", text=example)
-        text = example.text
-        text_id = getattr(example, "uid", "text") or "text"
-        case_type = getattr(example, "case_type", None) or "unknown"
-        split = getattr(example, "split", None) or "unknown"
-        language_code = getattr(example, "language_code", None) or "unknown"
-        domain_id = getattr(example, "domain_id", None) or "unknown"
-        demos = []
-        if getattr(example, "metadata", None):
-            demos = list(getattr(example, "metadata").get("demo_texts") or [])
-        trace: list[ProcessTrace] = []
+    def run(self, example: InternalExample | str, *, deadline: Deadline | float | None = None) -> FinalOutputSchema:
+        """
+        deadline: per-request budget (Deadline or seconds; default config deadline.budget_s). As it runs low,
+        stages are dropped in order debate rounds -> Stage2 -> Validator, and meta["deadline"] records what was
+        degraded. Stage1 ATE/ATSA are never dropped; if they miss the deadline DeadlineExceeded is raised.
+        """
+        for event in self.stream(example, deadline=deadline):
+            pass
+        return event.payload
 
-        stage1 = self._run_stage1(
-            text,
-            trace,
-            text_id,
-            demos=demos,
-            language_code=language_code,
-            domain_id=domain_id,
-        )
-        self.stage1_outputs = stage1
+    async def arun(self, example: InternalExample | str, *, deadline: Deadline | float | None = None) -> FinalOutputSchema:
+        """
+        Coroutine counterpart of run(): Stage1 and Stage2 agent calls are gathered concurrently (the debate
+        stays sequential), and the result is identical to run() for the same backbone responses. Cancelling
+        the task cancels every in-flight agent call of this example.
+        """
+        async for event in self.astream(example, deadline=deadline):
+            pass
+        return event.payload
+
+    def stream(self, example: InternalExample | str, *, deadline: Deadline | float | None = None) -> Iterator[SupervisorStreamEvent]:
+        """Generator form of run(): yields provisional (after Stage1), debate, then final events."""
+        started = time.perf_counter()
+        ctx = self._new_context(example, deadline)
+        stage1 = self._run_stage1(ctx)
+        ctx.stage1_outputs = stage1
+        yield self._event("provisional", "stage1", started, ctx, self._provisional_result(stage1))
 
         debate_output = None
         debate_context_json = None
-        self.debate_review_context = None
-        if self.enable_debate:
-            debate_context = self._build_debate_context(
-                text=text,
-                stage1_ate=stage1["ate"],
-                stage1_atsa=stage1["atsa"],
-                stage1_validator=stage1["validator"],
-            )
-            debate_output = self.debate.run(
-                topic=text,
-                context_json=debate_context,
-                run_id=self.run_id,
-                text_id=text_id,
-                language_code=language_code,
-                domain_id=domain_id,
-                trace=trace,
-            )
-            debate_context_json = self._build_debate_review_context(
-                debate_output,
-                stage1_ate=stage1["ate"],
-                stage1_atsa=stage1["atsa"],
-                language_code=language_code,
-            )
-            try:
-                self.debate_review_context = json.loads(debate_context_json)
-            except Exception:
-                self.debate_review_context = None
+        rounds = self._plan_debate_rounds(ctx, concurrent=False) if self.enable_debate else None
+        if rounds is not None:
+            debate_output = self._degradable(ctx, "debate", lambda: self.debate.run(**self._debate_kwargs(ctx, stage1, rounds)))
+        if debate_output is not None:
+            debate_context_json = self._absorb_debate(ctx, debate_output, stage1)
+            yield self._event("debate", "debate", started, ctx, self._debate_event_payload(debate_output))
+
+        stage2 = self._run_stage2(ctx, debate_context=debate_context_json)
+        result = self._finalize(ctx, stage1, stage2, debate_output, debate_context_json)
+        yield self._event("final", "moderator", started, ctx, result)
+
+    async def astream(self, example: InternalExample | str, *, deadline: Deadline | float | None = None) -> AsyncIterator[SupervisorStreamEvent]:
+        """Async generator form of arun(); same events as stream()."""
+        started = time.perf_counter()
+        ctx = self._new_context(example, deadline)
+        stage1 = await self._arun_stage1(ctx)
+        ctx.stage1_outputs = stage1
+        yield self._event("provisional", "stage1", started, ctx, self._provisional_result(stage1))
 
-        stage2 = self._run_stage2(
-            text,
-            trace,
-            text_id,
-            demos=demos,
-            language_code=language_code,
-            domain_id=domain_id,
-            debate_context=debate_context_json,
+        debate_output = None
+        debate_context_json = None
+        rounds = self._plan_debate_rounds(ctx, concurrent=True) if self.enable_debate else None
+        if rounds is not None:
+            debate_output = await self._adegradable(ctx, "debate", self.debate.arun(**self._debate_kwargs(ctx, stage1, rounds)))
+        if debate_output is not None:
+            debate_context_json = self._absorb_debate(ctx, debate_output, stage1)
+            yield self._event("debate", "debate", started, ctx, self._debate_event_payload(debate_output))
+
+        stage2 = await self._arun_stage2(ctx, debate_context=debate_context_json)
+        result = self._finalize(ctx, stage1, stage2, debate_output, debate_context_json)
+        yield self._event("final", "moderator", started, ctx, result)
+
+    @staticmethod
+    def _event(event: str, stage: str, started: float, ctx: SupervisorRequestContext, payload: Any) -> SupervisorStreamEvent:
+        elapsed_ms = round((time.perf_counter() - started) * 1000.0, 1)
+        return SupervisorStreamEvent(event=event, stage=stage, elapsed_ms=elapsed_ms, text_id=ctx.text_id, payload=payload)
+
+    def _provisional_result(self, stage1: Dict[str, object]) -> Dict[str, Any]:
+        """Stage1-only answer in FinalResult shape (read-only: Stage1 outputs are still used by _finalize)."""
+        agg = self._aggregate_label_from_sentiments(stage1["atsa"])
+        kept_terms = {a.term for a in getattr(stage1["ate"], "aspects", [])}
+        sentiments = [s for s in getattr(stage1["atsa"], "aspect_sentiments", []) or [] if s.aspect_ref in kept_terms]
+        provisional = FinalResult(
+            label=agg.label,
+            confidence=agg.confidence,
+            rationale=agg.rationale,
+            final_aspects=self.moderator.build_final_aspects(sentiments),
         )
+        return {
+            "final_result": provisional.model_dump(),
+            "structural_risks": [r.type for r in getattr(stage1["validator"], "structural_risks", [])],
+        }
 
-        # Stage1 anchoring check (non-invasive)
-        stage1_anchor_issues = self._find_unanchored_aspects(stage1["ate"], stage1["atsa"])
+    @staticmethod
+    def _debate_event_payload(debate_output) -> Dict[str, Any]:
+        return {"summary": debate_output.summary.model_dump(), "rounds": len(debate_output.rounds)}
+
+    def _new_context(self, example: InternalExample | str, deadline: Deadline | float | None = None) -> SupervisorRequestContext:
+        if isinstance(example, str):
+            example = InternalExample(uid="text", text=example)
+        ctx = SupervisorRequestContext.from_example(example)
+        ctx.deadline = Deadline.coerce(deadline if deadline is not None else self.deadline_s)
+        ctx.call_estimate_s = self.call_estimate_s
+        return ctx
+
+    # ---------------- deadline degradation ----------------
+    def _slots(self, unit: str, *, concurrent: bool) -> int:
+        """Sequential LLM-call slots a unit occupies; gathered calls (arun) share one slot."""
+        if unit == "stage1":
+            return 1 if concurrent else 2 + int(self.enable_validator)
+        if unit == "debate_round":
+            return self.debate.turns_per_round()
+        if unit == "debate_judge":
+            return 1
+        if unit == "stage2":
+            return 0 if not self.enable_stage2 else (1 if concurrent else 3)
+        raise ValueError(f"unknown unit '{unit}'")
+
+    def _fits(self, ctx: SupervisorRequestContext, slots: int) -> bool:
+        return ctx.deadline.remaining() - self.deadline_reserve_s >= slots * ctx.call_estimate_s
+
+    def _degrade(self, ctx: SupervisorRequestContext, stage: str, reason: str, **extra: Any) -> None:
+        ctx.degraded.append({"stage": stage, "reason": reason, "at_ms": round(ctx.deadline.elapsed() * 1000.0, 1), **extra})
+
+    def _degradable(self, ctx: SupervisorRequestContext, stage: str, fn):
+        """fn() or None when it missed the deadline (recorded as a degradation of `stage`)."""
+        try:
+            return fn()
+        except DeadlineExceeded:
+            self._degrade(ctx, stage, "deadline_exceeded")
+            return None
+
+    async def _adegradable(self, ctx: SupervisorRequestContext, stage: str, aw):
+        try:
+            return await aw
+        except DeadlineExceeded:
+            self._degrade(ctx, stage, "deadline_exceeded")
+            return None
+
+    def _plan_validator(self, ctx: SupervisorRequestContext, *, concurrent: bool) -> bool:
+        # Validator is the last stage to drop: only when Stage1 with it no longer fits the budget
+        # (by then the debate and Stage2 cannot fit either). Gathered (arun) it costs no extra slot, so it
+        # is only dropped there if its own call misses the deadline.
+        if not self.enable_validator:
+            return False
+        if ctx.deadline is None or concurrent or self._fits(ctx, self._slots("stage1", concurrent=concurrent)):
+            return True
+        self._degrade(ctx, "validator", "budget")
+        return False
+
+    def _observe_stage1(self, ctx: SupervisorRequestContext, seconds: float, *, concurrent: bool) -> None:
+        """Replace the configured per-call prior with this request's measured Stage1 latency per slot."""
+        if ctx.deadline is not None and seconds > 0:
+            ctx.call_estimate_s = seconds / max(1, self._slots("stage1", concurrent=concurrent))
+
+    def _plan_debate_rounds(self, ctx: SupervisorRequestContext, *, concurrent: bool) -> Optional[int]:
+        """Debate rounds that fit while still leaving room for the judge and Stage2 (None = skip the debate)."""
+        planned = self.debate.rounds
+        if ctx.deadline is None:
+            return planned
+        reserved = self._slots("stage2", concurrent=concurrent) + self._slots("debate_judge", concurrent=concurrent)
+        spare = ctx.deadline.remaining() - self.deadline_reserve_s - reserved * ctx.call_estimate_s
+        per_round = self._slots("debate_round", concurrent=concurrent) * ctx.call_estimate_s
+        rounds = planned if per_round <= 0 else min(planned, int(max(spare, 0.0) // per_round))
+        if spare < 0 or rounds == 0 < planned:
+            self._degrade(ctx, "debate", "budget", planned_rounds=planned)
+            return None
+        if rounds < planned:
+            self._degrade(ctx, "debate_rounds", "budget", planned_rounds=planned, rounds=rounds)
+        return rounds
+
+    def _plan_stage2(self, ctx: SupervisorRequestContext, *, concurrent: bool) -> bool:
+        if ctx.deadline is None or self._fits(ctx, self._slots("stage2", concurrent=concurrent)):
+            return True
+        self._degrade(ctx, "stage2", "budget")
+        return False
+
+    def _debate_kwargs(self, ctx: SupervisorRequestContext, stage1: Dict[str, object], rounds: int) -> Dict[str, Any]:
+        debate_context = self._build_debate_context(
+            text=ctx.text,
+            stage1_ate=stage1["ate"],
+            stage1_atsa=stage1["atsa"],
+            stage1_validator=stage1["validator"],
+        )
+        return dict(
+            topic=ctx.text,
+            context_json=debate_context,
+            run_id=self.run_id,
+            text_id=ctx.text_id,
+            language_code=ctx.language_code,
+            domain_id=ctx.domain_id,
+            trace=ctx.trace,
+            rounds=rounds,
+            deadline=ctx.deadline,
+        )
+
+    def _absorb_debate(self, ctx: SupervisorRequestContext, debate_output, stage1: Dict[str, object]) -> str:
+        """Build the Stage2 debate review context JSON and keep its parsed form on the request context."""
+        debate_context_json = self._build_debate_review_context(
+            debate_output,
+            stage1_ate=stage1["ate"],
+            stage1_atsa=stage1["atsa"],
+            language_code=ctx.language_code,
+        )
+        try:
+            ctx.debate_review_context = json.loads(debate_context_json)
+        except Exception:
+            ctx.debate_review_context = None
+        return debate_context_json
 
-        # Apply stage2 reviews to stage1 outputs to obtain patched stage2 outputs
-        patched_stage2_ate, patched_stage2_atsa, stage2_anchor_issues, correction_applied_log = self._apply_stage2_reviews(
+    def decide(
+        self,
+        stage1: Dict[str, object],
+        stage2: Dict[str, object],
+        *,
+        debate_review_context: dict | None = None,
+        debate_summary: DebateSummary | None = None,
+        override_stats: Dict[str, int] | None = None,
+    ) -> SupervisorDecision:
+        """
+        Deterministic post-LLM step of one example (no backbone calls): apply Stage2 reviews and debate
+        overrides to Stage1, aggregate sentence labels and run the Moderator. stage1/stage2 are the
+        {"ate", "atsa", "validator"} dicts of the stage runners (stage2 is the Stage1 dict when Stage2 was skipped).
+        Offline replay of saved traces (evaluation/replay.py) goes through this same method.
+        """
+        stage1_anchor_issues = self._find_unanchored_aspects(stage1["ate"], stage1["atsa"])
+        patched_ate, patched_atsa, stage2_anchor_issues, correction_applied_log = self._apply_stage2_reviews(
             stage1_ate=stage1["ate"],
             stage1_atsa=stage1["atsa"],
             stage2_ate_review=stage2["ate"],
             stage2_atsa_review=stage2["atsa"],
             stage2_validator=stage2["validator"],
             stage1_validator=stage1["validator"],
-            debate_review_context=self.debate_review_context,
+            debate_review_context=debate_review_context,
+            override_stats=override_stats,
         )
-        self.patched_stage2_ate = patched_stage2_ate
-        self.patched_stage2_atsa = patched_stage2_atsa
 
         # Aggregate ATE/ATSA into legacy outputs for moderator decision
-        agg_stage1_ate = self._aggregate_label_from_sentiments(stage1["atsa"])
-        agg_stage2_ate = self._aggregate_label_from_sentiments(patched_stage2_atsa)
-        stage1_atsa_out = ATSAOutput(target=None, label=agg_stage1_ate.label, confidence=agg_stage1_ate.confidence, rationale=agg_stage1_ate.rationale)
-        stage2_atsa_out = ATSAOutput(target=None, label=agg_stage2_ate.label, confidence=agg_stage2_ate.confidence, rationale=agg_stage2_ate.rationale)
-        stage1_validator_out = ValidatorOutput(agrees_with_ate=True, agrees_with_atsa=True, suggested_label=None, issues=stage1_anchor_issues, confidence=agg_stage1_ate.confidence)
-        stage2_validator_out = ValidatorOutput(agrees_with_ate=True, agrees_with_atsa=True, suggested_label=None, issues=stage2_anchor_issues, confidence=agg_stage2_ate.confidence)
-
-        # Get final aspect_sentiments (only from ATE-kept aspects)
-        final_aspect_sentiments = getattr(patched_stage2_atsa, "aspect_sentiments", []) or []
-        # Ensure only ATE-kept aspects are included
-        kept_aspect_terms = {a.term for a in getattr(patched_stage2_ate, "aspects", [])}
-        final_aspect_sentiments = [s for s in final_aspect_sentiments if s.aspect_ref in kept_aspect_terms]
-        
+        agg_stage1 = self._aggregate_label_from_sentiments(stage1["atsa"])
+        agg_stage2 = self._aggregate_label_from_sentiments(patched_atsa)
+
+        # Final aspect_sentiments: only those anchored on ATE-kept aspects
+        kept_aspect_terms = {a.term for a in getattr(patched_ate, "aspects", [])}
+        final_aspect_sentiments = [
+            s for s in getattr(patched_atsa, "aspect_sentiments", []) or [] if s.aspect_ref in kept_aspect_terms
+        ]
+        stage1_validator_out = ValidatorOutput(agrees_with_ate=True, agrees_with_atsa=True, suggested_label=None, issues=stage1_anchor_issues, confidence=agg_stage1.confidence)
         moderator_out = self.moderator.decide(
-            agg_stage1_ate,
-            agg_stage1_ate,  # use same for ATE/ATSA labels placeholder
+            agg_stage1,
+            agg_stage1,  # use same for ATE/ATSA labels placeholder
             stage1_validator_out,
-            agg_stage2_ate,
-            agg_stage2_ate,
+            agg_stage2,
+            agg_stage2,
             final_aspect_sentiments=final_aspect_sentiments,
+            debate_summary=debate_summary,
+        )
+        return SupervisorDecision(
+            patched_ate=patched_ate,
+            patched_atsa=patched_atsa,
+            stage1_anchor_issues=stage1_anchor_issues,
+            stage2_anchor_issues=stage2_anchor_issues,
+            correction_applied_log=correction_applied_log,
+            agg_stage1=agg_stage1,
+            agg_stage2=agg_stage2,
+            final_aspect_sentiments=final_aspect_sentiments,
+            moderator=moderator_out,
+        )
+
+    def _finalize(
+        self,
+        ctx: SupervisorRequestContext,
+        stage1: Dict[str, object],
+        stage2: Dict[str, object],
+        debate_output,
+        debate_context_json: str | None,
+    ) -> FinalOutputSchema:
+        text, text_id, trace = ctx.text, ctx.text_id, ctx.trace
+        case_type, split = ctx.case_type, ctx.split
+        language_code, domain_id = ctx.language_code, ctx.domain_id
+
+        decision = self.decide(
+            stage1,
+            stage2,
+            debate_review_context=ctx.debate_review_context,
             debate_summary=debate_output.summary if debate_output else None,
+            override_stats=ctx.override_stats,
         )
+        ctx.patched_stage2_ate = patched_stage2_ate = decision.patched_ate
+        ctx.patched_stage2_atsa = decision.patched_atsa
+        self.override_stats.add(ctx.override_stats)
+        agg_stage1_ate, agg_stage2_ate = decision.agg_stage1, decision.agg_stage2
+        correction_applied_log = decision.correction_applied_log
+        final_aspect_sentiments = decision.final_aspect_sentiments
+        moderator_out = decision.moderator
+
+        stage1_atsa_out = ATSAOutput(target=None, label=agg_stage1_ate.label, confidence=agg_stage1_ate.confidence, rationale=agg_stage1_ate.rationale)
+        stage2_atsa_out = ATSAOutput(target=None, label=agg_stage2_ate.label, confidence=agg_stage2_ate.confidence, rationale=agg_stage2_ate.rationale)
+        stage1_validator_out = ValidatorOutput(agrees_with_ate=True, agrees_with_atsa=True, suggested_label=None, issues=decision.stage1_anchor_issues, confidence=agg_stage1_ate.confidence)
+        stage2_validator_out = ValidatorOutput(agrees_with_ate=True, agrees_with_atsa=True, suggested_label=None, issues=decision.stage2_anchor_issues, confidence=agg_stage2_ate.confidence)
         trace.append(ProcessTrace(stage="moderator", agent="Moderator", input_text=text, output=moderator_out.model_dump()))
 
         correction_occurred = agg_stage2_ate.label != agg_stage1_ate.label
@@ -381,7 +700,7 @@ class SupervisorAgent:
             correction_occurred=correction_occurred,
             conflict_resolved=conflict_resolved,
             final_confidence_score=final_confidence_score,
-            stage2_executed=True,
+            stage2_executed=not any(d["stage"] == "stage2" for d in ctx.degraded),
         )
 
         meta_extra = {
@@ -400,7 +719,14 @@ class SupervisorAgent:
         if debate_output:
             meta_extra["debate_summary"] = debate_output.summary.model_dump()
             meta_extra["debate_review_context"] = json.loads(debate_context_json) if debate_context_json else None
-            meta_extra["debate_override_stats"] = self._override_stats
+            meta_extra["debate_override_stats"] = dict(ctx.override_stats)
+        if ctx.deadline is not None:
+            meta_extra["deadline"] = {
+                "budget_s": ctx.deadline.budget_s,
+                "elapsed_s": round(ctx.deadline.elapsed(), 3),
+                "degraded_stages": [d["stage"] for d in ctx.degraded],
+                "degradations": list(ctx.degraded),
+            }
 
         result = FinalOutputSchema(
             meta=meta_extra,
@@ -461,10 +787,12 @@ class SupervisorAgent:
         for term in aspect_terms:
             for candidate in [term] + synonym_hints.get(term, []):
                 stripped = self._strip_topic_suffix(candidate, language_code=language_code)
-                norm = re.sub(r"\s+", "", stripped.lower())
-                norm = re.sub(r"[^\w가-힣]", "", norm)
+                norm = _normalize_term(stripped)
                 if norm and norm not in norm_map:
                     norm_map[norm] = term
+        # One automaton per example; each turn is then scanned once regardless of how many terms/synonyms exist.
+        norm_keys = list(norm_map)
+        norm_matcher = compile_terms(norm_keys)
         rebuttals = []
         aspect_map = []
         idx = 0
@@ -479,9 +807,8 @@ class SupervisorAgent:
             for t in r.turns:
                 parts = [t.message or ""] + (t.key_points or [])
                 text_blob = " ".join(parts)
-                blob_norm = re.sub(r"\s+", "", text_blob.lower())
-                blob_norm = re.sub(r"[^\w가-힣]", "", blob_norm)
-                mapped = [orig for key, orig in norm_map.items() if key and key in blob_norm]
+                blob_norm = _normalize_term(text_blob)
+                mapped = [norm_map[norm_keys[i]] for i in norm_matcher.matched_ids(blob_norm)]
                 mapped = list(dict.fromkeys(mapped))
                 direct_mapped = bool(mapped)
                 stance_weight = self._stance_weight(t.stance)
@@ -579,29 +906,11 @@ class SupervisorAgent:
         """
         if not term:
             return []
-        patterns = self._patterns(language_code)
-        from_patterns = patterns.get("aspect_synonyms") or {}
-        synonyms = []
         lower = term.lower()
-        for key, values in from_patterns.items():
-            if not key or not isinstance(values, list):
-                continue
-            if key in lower or lower in key:
-                synonyms += [str(v) for v in values if v]
-        if any(tok in lower for tok in ["가격", "비용", "가성비"]):
-            synonyms += ["가격", "비용", "가성비", "금액"]
-        if any(tok in lower for tok in ["배송", "배달"]):
-            synonyms += ["배송", "배달", "출고"]
-        if any(tok in lower for tok in ["서비스", "응대", "CS"]):
-            synonyms += ["서비스", "응대", "cs", "고객응대"]
-        if any(tok in lower for tok in ["품질", "퀄리티", "quality"]):
-            synonyms += ["품질", "퀄리티", "quality", "마감"]
-        if any(tok in lower for tok in ["맛", "풍미"]):
-            synonyms += ["맛", "풍미", "향"]
-        if any(tok in lower for tok in ["디자인", "외관", "look"]):
-            synonyms += ["디자인", "외관", "look", "스타일"]
-        if any(tok in lower for tok in ["성능", "속도", "퍼포먼스"]):
-            synonyms += ["성능", "속도", "퍼포먼스", "performance"]
+        synonyms = self._patterns(language_code).synonyms_for(lower)
+        groups = sorted({_BUILTIN_SYNONYM_GROUP_OF[i] for i in _BUILTIN_SYNONYM_TRIGGERS.matched_ids(lower)})
+        for gid in groups:
+            synonyms += _BUILTIN_SYNONYM_GROUPS[gid][1]
         # Deduplicate while preserving order
         seen = set()
         result = []
@@ -656,13 +965,7 @@ class SupervisorAgent:
 
     # ---------------- helper transforms ----------------
     def _strip_topic_suffix(self, term: str, *, language_code: str) -> str:
-        patterns = self._patterns(language_code)
-        suffixes = tuple(s for s in patterns.get("topic_particles", []) if isinstance(s, str))
-        if suffixes and term.endswith(suffixes) and len(term) > 1:
-            for suf in sorted(suffixes, key=len, reverse=True):
-                if term.endswith(suf) and len(term) > len(suf):
-                    return term[: -len(suf)]
-        return term
+        return self._patterns(language_code).strip_topic_suffix(term)
 
     def _clean_aspects(self, text: str, aspects: List[AspectExtractionItem], *, language_code: str) -> List[AspectExtractionItem]:
         cleaned: List[AspectExtractionItem] = []
@@ -688,29 +991,18 @@ class SupervisorAgent:
         return cleaned
 
     def _has_contrast(self, text: str, *, language_code: str) -> bool:
-        patterns = self._patterns(language_code)
-        markers = patterns.get("contrast_markers", [])
-        haystack = text.lower()
-        return any((m or "").lower() in haystack for m in markers if isinstance(m, str))
+        return self._patterns(language_code).has_contrast(text)
 
     def _guess_second_aspect(self, text: str, existing_terms: set[str], *, language_code: str) -> AspectExtractionItem | None:
         patterns = self._patterns(language_code)
-        markers = [m for m in patterns.get("contrast_markers", []) if isinstance(m, str)]
-        token_regex = patterns.get("aspect_token_regex") or r"[가-힣A-Za-z]{2,}"
-
-        haystack = text.lower()
         start_idx = 0
-        for m in markers:
-            pos = haystack.find(m.lower())
-            if pos != -1:
-                start_idx = pos + len(m)
-                break
+        hit = patterns.first_contrast(text)
+        if hit is not None:
+            pos, marker = hit
+            start_idx = pos + len(marker)
 
         tail = text[start_idx:]
-        try:
-            m2 = re.search(token_regex, tail)
-        except re.error:
-            m2 = re.search(r"[A-Za-z]{3,}", tail)
+        m2 = (patterns.token_regex or _FALLBACK_TOKEN_RE).search(tail)
         if not m2:
             return None
         term_raw = m2.group(0)
@@ -799,12 +1091,16 @@ class SupervisorAgent:
         stage2_validator: StructuralValidatorStage2Schema | None = None,
         stage1_validator: StructuralValidatorStage1Schema | None = None,
         debate_review_context: dict | None = None,
+        override_stats: Dict[str, int] | None = None,
     ) -> tuple[AspectExtractionStage1Schema, AspectSentimentStage1Schema, list[str], List[Dict[str, Any]]]:
         """
         Apply stage2 review actions to stage1 outputs to construct patched stage2 outputs.
         Keeps original review objects in process_trace; only patched structures are returned.
+        Debate override counters are written to `override_stats` (the caller's per-request dict), never to the instance.
         Returns: (patched_ate, patched_atsa, anchor_issues, correction_applied_log)
         """
+        if override_stats is None:
+            override_stats = _new_override_stats()
         aspects: List[AspectExtractionItem] = [AspectExtractionItem(**a.model_dump()) for a in getattr(stage1_ate, "aspects", [])]
         sentiments: List[AspectSentimentItem] = [AspectSentimentItem(**s.model_dump()) for s in getattr(stage1_atsa, "aspect_sentiments", [])]
 
@@ -977,10 +1273,10 @@ class SupervisorAgent:
                 neg_score = sum(float(h.get("weight") or 0) for h in hints if h.get("polarity_hint") == "negative")
                 total = pos_score + neg_score
                 if total < min_total:
-                    self._override_stats["skipped_low_signal"] += 1
+                    override_stats["skipped_low_signal"] += 1
                     continue
                 if abs(pos_score - neg_score) < min_margin:
-                    self._override_stats["skipped_conflict"] += 1
+                    override_stats["skipped_conflict"] += 1
                     continue
                 target_pol = "positive" if pos_score > neg_score else "negative"
 
@@ -995,7 +1291,7 @@ class SupervisorAgent:
                             polarity_distribution={target_pol: 0.8},
                         )
                     )
-                    self._override_stats["applied"] += 1
+                    override_stats["applied"] += 1
                     correction_applied_log.append(
                         {
                             "proposal_type": "DEBATE_OVERRIDE",
@@ -1013,7 +1309,7 @@ class SupervisorAgent:
                     sentiment.polarity = target_pol
                     sentiment.polarity_distribution = {target_pol: 0.8, old_pol: 0.2}
                     sentiment.confidence = max(sentiment.confidence, min_target_conf)
-                    self._override_stats["applied"] += 1
+                    override_stats["applied"] += 1
                     correction_applied_log.append(
                         {
                             "proposal_type": "DEBATE_OVERRIDE",
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Tuple
 
-from baselines.bl1 import run_bl1_to_bl2
+from baselines.bl1 import arun_bl1_to_bl2, run_bl1_to_bl2
 from schemas import FinalOutputSchema, ATEOutput, ATSAOutput, ValidatorOutput, FinalResult, AnalysisFlags
 from schemas.baselines import BL2OutputSchema
 from tools.backbone_client import BackboneClient
@@ -35,7 +35,37 @@ def run_bl1_wrapped(
         language_code=language_code,
         domain_id=domain_id,
     )
+    return raw_text, _wrap_bl1(raw_text, bl2_output, parse_meta, text=text, text_id=text_id, run_id=run_id)
 
+
+async def arun_bl1_wrapped(
+    backbone: BackboneClient,
+    text: str,
+    text_id: str,
+    *,
+    run_id: str,
+    max_retries: int,
+    errors_path: str,
+    temperature: float | None = None,
+    language_code: str = "unknown",
+    domain_id: str = "unknown",
+) -> Tuple[str, FinalOutputSchema]:
+    """Coroutine counterpart of run_bl1_wrapped."""
+    raw_text, bl2_output, parse_meta = await arun_bl1_to_bl2(
+        backbone=backbone,
+        text=text,
+        run_id=run_id,
+        text_id=text_id,
+        max_retries=max_retries,
+        errors_path=errors_path,
+        temperature=temperature,
+        language_code=language_code,
+        domain_id=domain_id,
+    )
+    return raw_text, _wrap_bl1(raw_text, bl2_output, parse_meta, text=text, text_id=text_id, run_id=run_id)
+
+
+def _wrap_bl1(raw_text, bl2_output, parse_meta, *, text: str, text_id: str, run_id: str) -> FinalOutputSchema:
     aspects = bl2_output.aspects if bl2_output else []
     if aspects:
         best = max(aspects, key=lambda a: a.confidence)
@@ -63,7 +93,7 @@ def run_bl1_wrapped(
             agent="BL1_parser",
             input_text=text,
             output=bl2_output.model_dump() if isinstance(bl2_output, BL2OutputSchema) else {"error": "parsing_failed"},
-            notes=parse_meta.to_notes_str(),
+            call_metadata=parse_meta.to_call_metadata(),
         ),
     ]
 
@@ -87,4 +117,4 @@ def run_bl1_wrapped(
         analysis_flags=flags,
         final_result=final_result,
     )
-    return raw_text, fos
+    return fos
@@ -1,5 +1,14 @@
-from .bl1 import run_bl1_to_bl2, BL1_SYSTEM_PROMPT, BL1_PARSE_PROMPT
-from .bl2 import run_bl2_structured
-from .bl3 import run_bl3_stage1_only
+from .bl1 import arun_bl1_to_bl2, run_bl1_to_bl2, BL1_SYSTEM_PROMPT, BL1_PARSE_PROMPT
+from .bl2 import arun_bl2_structured, run_bl2_structured
+from .bl3 import arun_bl3_stage1_only, run_bl3_stage1_only
 
-__all__ = ["run_bl1_to_bl2", "BL1_SYSTEM_PROMPT", "BL1_PARSE_PROMPT", "run_bl2_structured", "run_bl3_stage1_only"]
+__all__ = [
+    "run_bl1_to_bl2",
+    "arun_bl1_to_bl2",
+    "BL1_SYSTEM_PROMPT",
+    "BL1_PARSE_PROMPT",
+    "run_bl2_structured",
+    "arun_bl2_structured",
+    "run_bl3_stage1_only",
+    "arun_bl3_stage1_only",
+]
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import textwrap
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
 from schemas import BL2OutputSchema
-from tools.llm_runner import run_structured, StructuredResultMeta
+from tools.llm_runner import arun_structured, run_structured, StructuredResultMeta
 from tools.backbone_client import BackboneClient
 from agents.prompts import load_prompt
 from tools.prompt_spec import PromptSpec
@@ -41,6 +41,48 @@ BL1_PARSE_PROMPT = textwrap.dedent(
 ).strip()
 
 
+def _bl1_messages(text: str) -> list:
+    return [
+        {"role": "system", "content": BL1_SYSTEM_PROMPT},
+        {"role": "user", "content": text},
+    ]
+
+
+def _bl1_parse_call(
+    backbone: BackboneClient,
+    text: str,
+    raw_text,
+    *,
+    run_id: str,
+    text_id: str,
+    max_retries: int,
+    errors_path: str,
+    language_code: str,
+    domain_id: str,
+) -> Dict[str, Any]:
+    parse_prompt = BL1_PARSE_PROMPT.format(raw_text=raw_text)
+    spec = PromptSpec(system=[parse_prompt], user=text, language_code=language_code, domain_id=domain_id)
+    return dict(
+        backbone=backbone,
+        system_prompt=parse_prompt,
+        user_text=text,
+        schema=BL2OutputSchema,
+        max_retries=max_retries,
+        run_id=run_id,
+        text_id=text_id,
+        stage="BL1_parse",
+        mode="bl1",
+        errors_path=errors_path,
+        prompt_spec=spec,
+    )
+
+
+def _bl1_unpack(parsed_result) -> Tuple[BL2OutputSchema, StructuredResultMeta]:
+    parsed = parsed_result.model if parsed_result else BL2OutputSchema.model_construct()
+    meta = parsed_result.meta if parsed_result else StructuredResultMeta()
+    return parsed, meta
+
+
 def run_bl1_to_bl2(
     backbone: BackboneClient,
     text: str,
@@ -60,31 +102,47 @@ def run_bl1_to_bl2(
     Returns (raw_text, parsed_model, parse_metadata).
     """
     raw_text = backbone.generate(
-        [
-            {"role": "system", "content": BL1_SYSTEM_PROMPT},
-            {"role": "user", "content": text},
-        ],
+        _bl1_messages(text),
         temperature=temperature,
         response_format="text",
         mode="bl1",
         text_id=text_id,
     )
-
-    parse_prompt = BL1_PARSE_PROMPT.format(raw_text=raw_text)
-    spec = PromptSpec(system=[parse_prompt], user=text, language_code=language_code, domain_id=domain_id)
     parsed_result = run_structured(
-        backbone=backbone,
-        system_prompt=parse_prompt,
-        user_text=text,
-        schema=BL2OutputSchema,
-        max_retries=max_retries,
-        run_id=run_id,
-        text_id=text_id,
-        stage="BL1_parse",
+        **_bl1_parse_call(
+            backbone, text, raw_text, run_id=run_id, text_id=text_id, max_retries=max_retries,
+            errors_path=errors_path, language_code=language_code, domain_id=domain_id,
+        )
+    )
+    parsed, meta = _bl1_unpack(parsed_result)
+    return raw_text, parsed, meta
+
+
+async def arun_bl1_to_bl2(
+    backbone: BackboneClient,
+    text: str,
+    *,
+    run_id: str,
+    text_id: str,
+    max_retries: int,
+    errors_path: str,
+    temperature: float | None = None,
+    language_code: str = "unknown",
+    domain_id: str = "unknown",
+) -> Tuple[str, BL2OutputSchema, StructuredResultMeta]:
+    """Coroutine counterpart of run_bl1_to_bl2 (the parse step depends on the free-form text, so it stays sequential)."""
+    raw_text = await backbone.agenerate(
+        _bl1_messages(text),
+        temperature=temperature,
+        response_format="text",
         mode="bl1",
-        errors_path=errors_path,
-        prompt_spec=spec,
+        text_id=text_id,
     )
-    parsed = parsed_result.model if parsed_result else BL2OutputSchema.model_construct()
-    meta = parsed_result.meta if parsed_result else StructuredResultMeta()
+    parsed_result = await arun_structured(
+        **_bl1_parse_call(
+            backbone, text, raw_text, run_id=run_id, text_id=text_id, max_retries=max_retries,
+            errors_path=errors_path, language_code=language_code, domain_id=domain_id,
+        )
+    )
+    parsed, meta = _bl1_unpack(parsed_result)
     return raw_text, parsed, meta
@@ -1,32 +1,29 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from agents.prompts import load_prompt
 from schemas.baselines import BL2OutputSchema
 from tools.backbone_client import BackboneClient
-from tools.llm_runner import StructuredResult, run_structured
+from tools.llm_runner import StructuredResult, arun_structured, run_structured
 from tools.prompt_spec import PromptSpec
 
 
-def run_bl2_structured(
+def _bl2_call(
     *,
     backbone: BackboneClient,
     text: str,
     run_id: str,
     text_id: str,
-    max_retries: int = 2,
-    errors_path: Optional[str] = None,
-    mode: str = "bl2",
-    language_code: str = "unknown",
-    domain_id: str = "unknown",
-) -> StructuredResult[BL2OutputSchema]:
-    """
-    BL2 baseline: single structured prompt that emits BL2OutputSchema.
-    """
+    max_retries: int,
+    errors_path: Optional[str],
+    mode: str,
+    language_code: str,
+    domain_id: str,
+) -> Dict[str, Any]:
     system_prompt = load_prompt("bl2")
     spec = PromptSpec(system=[system_prompt], user=text, language_code=language_code, domain_id=domain_id)
-    return run_structured(
+    return dict(
         backbone=backbone,
         system_prompt=system_prompt,
         user_text=text,
@@ -39,3 +36,47 @@ def run_bl2_structured(
         errors_path=errors_path,
         prompt_spec=spec,
     )
+
+
+def run_bl2_structured(
+    *,
+    backbone: BackboneClient,
+    text: str,
+    run_id: str,
+    text_id: str,
+    max_retries: int = 2,
+    errors_path: Optional[str] = None,
+    mode: str = "bl2",
+    language_code: str = "unknown",
+    domain_id: str = "unknown",
+) -> StructuredResult[BL2OutputSchema]:
+    """
+    BL2 baseline: single structured prompt that emits BL2OutputSchema.
+    """
+    return run_structured(
+        **_bl2_call(
+            backbone=backbone, text=text, run_id=run_id, text_id=text_id, max_retries=max_retries,
+            errors_path=errors_path, mode=mode, language_code=language_code, domain_id=domain_id,
+        )
+    )
+
+
+async def arun_bl2_structured(
+    *,
+    backbone: BackboneClient,
+    text: str,
+    run_id: str,
+    text_id: str,
+    max_retries: int = 2,
+    errors_path: Optional[str] = None,
+    mode: str = "bl2",
+    language_code: str = "unknown",
+    domain_id: str = "unknown",
+) -> StructuredResult[BL2OutputSchema]:
+    """Coroutine counterpart of run_bl2_structured."""
+    return await arun_structured(
+        **_bl2_call(
+            backbone=backbone, text=text, run_id=run_id, text_id=text_id, max_retries=max_retries,
+            errors_path=errors_path, mode=mode, language_code=language_code, domain_id=domain_id,
+        )
+    )
@@ -13,6 +13,8 @@ from schemas import (
     ValidatorOutput,
 )
 from schemas.agent_outputs import AspectSentimentStage1Schema
+from tools.async_utils import gather_all
+from tools.llm_runner import StructuredResult
 
 
 def _aggregate_label_from_sentiments(atsa_output: AspectSentimentStage1Schema) -> ATEOutput:
@@ -50,19 +52,63 @@ def run_bl3_stage1_only(
     """
     BL3: run Stage1 only. Stage2 is marked not_applicable in process_trace and analysis_flags.
     """
+    kwargs = dict(run_id=run_id, text_id=text_id, mode="bl3", language_code=language_code, domain_id=domain_id)
+    ate_s1_result = ate_agent.run_stage1(text, **kwargs)
+    atsa_s1_result = atsa_agent.run_stage1(text, **kwargs)
+    validator_s1_result = validator.run_stage1(text, **kwargs)
+    return _bl3_finish(
+        text, text_id, run_id, ate_s1_result, atsa_s1_result, validator_s1_result,
+        moderator=moderator, language_code=language_code, domain_id=domain_id,
+    )
+
+
+async def arun_bl3_stage1_only(
+    *,
+    text: str,
+    text_id: str,
+    run_id: str,
+    ate_agent: ATEAgent,
+    atsa_agent: ATSAAgent,
+    validator: ValidatorAgent,
+    moderator: Moderator,
+    language_code: str = "unknown",
+    domain_id: str = "unknown",
+) -> FinalOutputSchema:
+    """Coroutine counterpart of run_bl3_stage1_only; the three independent Stage1 calls run concurrently."""
+    kwargs = dict(run_id=run_id, text_id=text_id, mode="bl3", language_code=language_code, domain_id=domain_id)
+    ate_s1_result, atsa_s1_result, validator_s1_result = await gather_all(
+        ate_agent.arun_stage1(text, **kwargs),
+        atsa_agent.arun_stage1(text, **kwargs),
+        validator.arun_stage1(text, **kwargs),
+    )
+    return _bl3_finish(
+        text, text_id, run_id, ate_s1_result, atsa_s1_result, validator_s1_result,
+        moderator=moderator, language_code=language_code, domain_id=domain_id,
+    )
+
+
+def _bl3_finish(
+    text: str,
+    text_id: str,
+    run_id: str,
+    ate_s1_result: StructuredResult,
+    atsa_s1_result: StructuredResult,
+    validator_s1_result: StructuredResult,
+    *,
+    moderator: Moderator,
+    language_code: str,
+    domain_id: str,
+) -> FinalOutputSchema:
     trace: List[ProcessTrace] = []
 
-    ate_s1_result = ate_agent.run_stage1(text, run_id=run_id, text_id=text_id, mode="bl3", language_code=language_code, domain_id=domain_id)
     ate_s1 = ate_s1_result.model
-    trace.append(ProcessTrace(stage="stage1", agent="ATE", input_text=text, output=ate_s1.model_dump(), notes=ate_s1_result.meta.to_notes_str()))
+    trace.append(ProcessTrace(stage="stage1", agent="ATE", input_text=text, output=ate_s1.model_dump(), call_metadata=ate_s1_result.meta.to_call_metadata()))
 
-    atsa_s1_result = atsa_agent.run_stage1(text, run_id=run_id, text_id=text_id, mode="bl3", language_code=language_code, domain_id=domain_id)
     atsa_s1 = atsa_s1_result.model
-    trace.append(ProcessTrace(stage="stage1", agent="ATSA", input_text=text, output=atsa_s1.model_dump(), notes=atsa_s1_result.meta.to_notes_str()))
+    trace.append(ProcessTrace(stage="stage1", agent="ATSA", input_text=text, output=atsa_s1.model_dump(), call_metadata=atsa_s1_result.meta.to_call_metadata()))
 
-    validator_s1_result = validator.run_stage1(text, run_id=run_id, text_id=text_id, mode="bl3", language_code=language_code, domain_id=domain_id)
     validator_s1 = validator_s1_result.model
-    trace.append(ProcessTrace(stage="stage1", agent="Validator", input_text=text, output=validator_s1.model_dump(), notes=validator_s1_result.meta.to_notes_str()))
+    trace.append(ProcessTrace(stage="stage1", agent="Validator", input_text=text, output=validator_s1.model_dump(), call_metadata=validator_s1_result.meta.to_call_metadata()))
 
     # Explicit Stage2 status marker
     trace.append(
@@ -8,7 +8,21 @@ from .loader import (
     load_internal_json_dir,
     load_nikluge_sa2022,
     load_split_examples,
+    iter_csv_examples,
+    iter_internal_json_dir,
+    iter_nikluge_sa2022,
+    iter_split_examples,
+    split_is_configured,
 )
+from importlib import import_module
+
+# The snapshot cache needs numpy; load it on first access (PEP 562) so importing the loader stays cheap.
+_LAZY = {
+    "DatasetSnapshot": ".cache",
+    "open_split_snapshot": ".cache",
+    "split_snapshot_key": ".cache",
+    "warm_split_snapshots": ".cache",
+}
 
 __all__ = [
     "InternalExample",
@@ -20,4 +34,22 @@ __all__ = [
     "load_internal_json_dir",
     "load_nikluge_sa2022",
     "load_split_examples",
+    "iter_csv_examples",
+    "iter_internal_json_dir",
+    "iter_nikluge_sa2022",
+    "iter_split_examples",
+    "split_is_configured",
+    "DatasetSnapshot",
+    "open_split_snapshot",
+    "split_snapshot_key",
+    "warm_split_snapshots",
 ]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,375 @@
+"""
+Hash-keyed dataset snapshot cache.
+
+Parsed splits are stored as column files (UTF-8 blobs + int64 offsets, `.npy`) under
+`<snapshot_cache_root>/snapshots/<key>/` and reopened with numpy memory-mapping, so repeated runs,
+modes and parallel seed workers skip CSV/JSON parsing and share the page cache instead of each
+holding its own parsed copy. Snapshots are built from the source stream in chunks, so a miss never
+holds the whole split in memory either.
+
+The snapshot key is derived from the sha256 of every source file plus the loader options. Source
+hashes are memoized in `<snapshot_cache_root>/fingerprints.json` keyed on (path, size, mtime_ns),
+so unchanged files are not re-read.
+
+Enable via the data config:
+    data:
+      snapshot_cache: true
+      snapshot_cache_root: .cache/datasets   # optional (default)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+from .loader import InternalExample, _json_loads, _source_split_examples, resolve_data_path, split_is_configured
+
+SNAPSHOT_VERSION = 2  # 2: CSV columns read as strings (uids no longer '1.0')
+DEFAULT_CACHE_ROOT = ".cache/datasets"
+
+_STR_COLUMNS = ("uid", "text", "case_type", "split", "language_code", "domain_id")
+_NULLABLE_COLUMNS = ("label", "target", "metadata")
+# span_kind: 0 = no span, 1 = int span (nikluge offsets), 2 = float span (internal JSON timings)
+_SPAN_NONE, _SPAN_INT, _SPAN_FLOAT = 0, 1, 2
+
+_WRITE_CHUNK_ROWS = 50_000  # rows encoded per step when building a snapshot
+
+_fingerprint_lock = threading.Lock()
+
+
+def snapshot_cache_enabled(data_cfg: Dict[str, Any]) -> bool:
+    return bool(data_cfg.get("snapshot_cache"))
+
+
+def snapshot_cache_root(data_cfg: Dict[str, Any]) -> Path:
+    return Path(data_cfg.get("snapshot_cache_root") or DEFAULT_CACHE_ROOT)
+
+
+# -------------- Source fingerprints --------------
+def _sha256_path(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_fingerprints(index_path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        return json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def file_sha256(paths: Sequence[Union[str, Path]], cache_root: Union[str, Path]) -> List[str]:
+    """
+    sha256 of each path, reusing the stored digest when (size, mtime_ns) are unchanged.
+    Newly hashed files are merged into the fingerprint index (last writer wins; entries are idempotent).
+    """
+    index_path = Path(cache_root) / "fingerprints.json"
+    index = _load_fingerprints(index_path)
+    digests: List[str] = []
+    updates: Dict[str, Dict[str, Any]] = {}
+    for raw in paths:
+        p = Path(raw).resolve()
+        st = p.stat()
+        entry = index.get(str(p))
+        if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            digests.append(entry["sha256"])
+            continue
+        digest = _sha256_path(p)
+        updates[str(p)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        digests.append(digest)
+    if updates:
+        with _fingerprint_lock:
+            merged = _load_fingerprints(index_path)
+            merged.update(updates)
+            _write_json_atomic(index_path, merged)
+    return digests
+
+
+# -------------- Snapshot keys --------------
+def _split_sources(data_cfg: Dict[str, Any], split: str) -> Optional[List[Path]]:
+    """Source files backing a split, or None when the split has no on-disk source."""
+    fmt = data_cfg.get("input_format", "csv")
+    root = data_cfg.get("dataset_root")
+    if fmt == "json_internal":
+        json_dir = resolve_data_path(root, data_cfg.get(f"json_dir_{split}"))
+        return sorted(Path(json_dir).glob("*.json")) if json_dir else None
+    path = resolve_data_path(root, data_cfg.get(f"{split}_file"))
+    if not path or not Path(path).exists():
+        return None
+    return [Path(path)]
+
+
+def _loader_options(data_cfg: Dict[str, Any], split: str) -> Dict[str, Any]:
+    """Config values that change parsed rows (anything else, e.g. chunk size or workers, does not)."""
+    fmt = data_cfg.get("input_format", "csv")
+    opts: Dict[str, Any] = {
+        "input_format": fmt,
+        "split": split,
+        "language_code": data_cfg.get("language_code", "unknown"),
+        "domain_id": data_cfg.get("domain_id", "unknown"),
+    }
+    if fmt == "csv":
+        opts.update(
+            text_column=data_cfg.get("text_column", "text"),
+            label_column=data_cfg.get("label_column", "label"),
+            target_column=data_cfg.get("target_column"),
+        )
+    elif fmt == "json_internal":
+        opts.update(
+            text_key=data_cfg.get("text_key", "Text"),
+            label_key=data_cfg.get("label_key", "VerifyEmotionCategory"),
+        )
+    return opts
+
+
+def split_snapshot_key(data_cfg: Dict[str, Any], split: str) -> Optional[str]:
+    """Content-addressed key for a split (None when the split has no source files)."""
+    sources = _split_sources(data_cfg, split)
+    if not sources:
+        return None
+    digests = file_sha256(sources, snapshot_cache_root(data_cfg))
+    # File names are part of the key: CSV stems and JSON file names feed generated uids.
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "options": _loader_options(data_cfg, split),
+        "sources": [[p.name, d] for p, d in zip(sources, digests)],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# -------------- Column storage --------------
+def _encode_strings(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    encoded = [b"" if v is None else v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    return offsets, blob, nulls
+
+
+class _ColumnWriter:
+    """Appends one string column chunk by chunk to raw offsets/data/null files in the snapshot tmp dir."""
+
+    def __init__(self, directory: Path, name: str, nullable: bool) -> None:
+        self._files = {"offsets": (directory / f"{name}.offsets.raw").open("wb"), "data": (directory / f"{name}.data.raw").open("wb")}
+        if nullable:
+            self._files["null"] = (directory / f"{name}.null.raw").open("wb")
+        self._files["offsets"].write(np.zeros(1, dtype=np.int64).tobytes())
+        self._end = 0
+
+    def append(self, values: Sequence[Optional[str]]) -> None:
+        offsets, blob, nulls = _encode_strings(values)
+        self._files["offsets"].write((offsets[1:] + self._end).tobytes())
+        self._files["data"].write(blob.tobytes())
+        if "null" in self._files:
+            self._files["null"].write(nulls.tobytes())
+        self._end += int(offsets[-1])
+
+    def finish(self, n_rows: int) -> None:
+        shapes = {"offsets": (np.int64, (n_rows + 1,)), "data": (np.uint8, (self._end,)), "null": (np.bool_, (n_rows,))}
+        for part, f in self._files.items():
+            f.close()
+            _finalize_npy(Path(f.name), *shapes[part])
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+
+
+def _finalize_npy(raw: Path, dtype: Any, shape: Tuple[int, ...]) -> None:
+    """Turn a raw column file into `<stem>.npy` (header + streamed copy) so np.load can memory-map it."""
+    header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": shape}
+    with raw.open("rb") as src, raw.with_suffix(".npy").open("wb") as dst:
+        np.lib.format.write_array_header_1_0(dst, header)
+        shutil.copyfileobj(src, dst, 1 << 20)
+    raw.unlink()
+
+
+def _write_snapshot(
+    examples: Iterable[InternalExample], target: Path, meta: Dict[str, Any], chunk_rows: int = _WRITE_CHUNK_ROWS
+) -> bool:
+    """
+    Write a snapshot directory atomically, consuming `examples` in chunks of `chunk_rows` so only one chunk
+    is held in memory. Returns False when rows cannot round-trip (e.g. non-JSON metadata).
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=target.parent, prefix=f".{target.name}."))
+    writers = {name: _ColumnWriter(tmp, name, False) for name in _STR_COLUMNS}
+    writers.update({name: _ColumnWriter(tmp, name, True) for name in _NULLABLE_COLUMNS})
+    try:
+        n_rows = 0
+        with (tmp / "span_kind.raw").open("wb") as kind_file, (tmp / "span.raw").open("wb") as span_file:
+            rows = iter(examples)
+            while True:
+                chunk = list(islice(rows, chunk_rows))
+                if not chunk:
+                    break
+                try:
+                    metadata = [None if ex.metadata is None else json.dumps(ex.metadata, ensure_ascii=False) for ex in chunk]
+                except (TypeError, ValueError):
+                    return False
+                for name in _STR_COLUMNS:
+                    writers[name].append([getattr(ex, name) for ex in chunk])
+                writers["label"].append([ex.label for ex in chunk])
+                writers["target"].append([ex.target for ex in chunk])
+                writers["metadata"].append(metadata)
+
+                span_kind = np.zeros(len(chunk), dtype=np.int8)
+                spans = np.zeros((len(chunk), 2), dtype=np.float64)
+                for i, ex in enumerate(chunk):
+                    if ex.span is None:
+                        continue
+                    start, end = ex.span
+                    span_kind[i] = _SPAN_INT if isinstance(start, int) and isinstance(end, int) else _SPAN_FLOAT
+                    spans[i] = (start, end)
+                kind_file.write(span_kind.tobytes())
+                span_file.write(spans.tobytes())
+                n_rows += len(chunk)
+        for writer in writers.values():
+            writer.finish(n_rows)
+        _finalize_npy(tmp / "span_kind.raw", np.int8, (n_rows,))
+        _finalize_npy(tmp / "span.raw", np.float64, (n_rows, 2))
+        _write_json_atomic(tmp / "meta.json", {**meta, "n_rows": n_rows, "version": SNAPSHOT_VERSION})
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            # Another worker published the same key first; its snapshot is identical.
+            if not (target / "meta.json").exists():
+                raise
+    finally:
+        for writer in writers.values():
+            writer.close()
+        if tmp.exists():
+            shutil.rmtree(tmp, ignore_errors=True)
+    return True
+
+
+def _mmap(path: Path) -> np.ndarray:
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:  # zero-length arrays cannot be mapped
+        return np.load(path)
+
+
+class _StringColumn:
+    """Memory-mapped UTF-8 column; values are decoded on access only."""
+
+    def __init__(self, directory: Path, name: str, nullable: bool) -> None:
+        self._offsets = _mmap(directory / f"{name}.offsets.npy")
+        self._data = _mmap(directory / f"{name}.data.npy")
+        self._nulls = _mmap(directory / f"{name}.null.npy") if nullable else None
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if self._nulls is not None and self._nulls[i]:
+            return None
+        return self._data[self._offsets[i] : self._offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class DatasetSnapshot(Sequence[InternalExample]):
+    """
+    Read-only, memory-mapped view of one cached split.
+
+    Opening is O(1) in the number of rows; InternalExample objects are built lazily on indexing/iteration.
+    """
+
+    def __init__(self, directory: Union[str, Path], *, key: str, hit: bool) -> None:
+        self.path = Path(directory)
+        self.key = key
+        self.hit = hit
+        self.meta: Dict[str, Any] = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        self._n = int(self.meta["n_rows"])
+        self._columns = {name: _StringColumn(self.path, name, False) for name in _STR_COLUMNS}
+        self._columns.update({name: _StringColumn(self.path, name, True) for name in _NULLABLE_COLUMNS})
+        self._span_kind = _mmap(self.path / "span_kind.npy")
+        self._span = _mmap(self.path / "span.npy")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _row(self, i: int) -> InternalExample:
+        cols = self._columns
+        kind = int(self._span_kind[i])
+        span = None
+        if kind == _SPAN_INT:
+            span = (int(self._span[i, 0]), int(self._span[i, 1]))
+        elif kind == _SPAN_FLOAT:
+            span = (float(self._span[i, 0]), float(self._span[i, 1]))
+        metadata_raw = cols["metadata"][i]
+        return InternalExample(
+            uid=cols["uid"][i],
+            text=cols["text"][i],
+            case_type=cols["case_type"][i],
+            split=cols["split"][i],
+            label=cols["label"][i],
+            target=cols["target"][i],
+            span=span,
+            metadata=None if metadata_raw is None else _json_loads(metadata_raw),
+            language_code=cols["language_code"][i],
+            domain_id=cols["domain_id"][i],
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> InternalExample: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[InternalExample]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("snapshot index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[InternalExample]:
+        for i in range(self._n):
+            yield self._row(i)
+
+
+def open_split_snapshot(data_cfg: Dict[str, Any], split: str) -> Optional[DatasetSnapshot]:
+    """
+    Open the cached snapshot for a split, building it from the source files on a miss.
+    Returns None when the split has no source or its rows cannot be cached (callers fall back to parsing).
+    """
+    key = split_snapshot_key(data_cfg, split)
+    if key is None:
+        return None
+    directory = snapshot_cache_root(data_cfg) / "snapshots" / key
+    if (directory / "meta.json").exists():
+        return DatasetSnapshot(directory, key=key, hit=True)
+    meta = {"split": split, "input_format": data_cfg.get("input_format", "csv")}
+    if not _write_snapshot(_source_split_examples(data_cfg, split), directory, meta):
+        return None
+    return DatasetSnapshot(directory, key=key, hit=False)
+
+
+def warm_split_snapshots(data_cfg: Dict[str, Any], splits: Sequence[str] = ("train", "valid", "test")) -> Dict[str, Optional[str]]:
+    """Build (or validate) snapshots for the configured splits; returns {split: key}. Used before fanning out seed workers."""
+    keys: Dict[str, Optional[str]] = {}
+    for split in splits:
+        if split_is_configured(data_cfg, split):
+            snap = open_split_snapshot(data_cfg, split)
+            keys[split] = snap.key if snap is not None else None
+    return keys
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import pandas as pd
+if TYPE_CHECKING:  # pandas costs ~0.3s to import; only the CSV/DataFrame paths load it
+    import pandas as pd
+
+try:
+    import orjson as _orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    _orjson = None
 
 
 @dataclass(frozen=True)
@@ -64,10 +73,10 @@ class InternalExample:
 
 
 def _clean_value(value: Any) -> Any:
-    """Normalize pandas/JSON values to plain Python primitives."""
+    """Normalize JSON values to plain Python primitives (NaN -> None)."""
     if value is None:
         return None
-    if pd.isna(value):  # type: ignore[arg-type]
+    if isinstance(value, float) and value != value:
         return None
     return value
 
@@ -128,6 +137,121 @@ def resolve_dataset_paths(data_cfg: Dict[str, Any]) -> Tuple[Dict[str, Any], Dic
     return resolved_cfg, resolved_paths, allowed_roots_abs
 
 
+_CSV_CHUNK_ROWS = 50_000
+_PARALLEL_MIN_FILES = 64
+
+
+def _json_loads(raw: bytes | str) -> Any:
+    """Decode JSON with orjson when available; stdlib json otherwise (and for inputs orjson rejects, e.g. NaN)."""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(raw)
+        except _orjson.JSONDecodeError:
+            pass
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    return json.loads(raw)
+
+
+def _column_values(df: pd.DataFrame, column: str) -> List[Any]:
+    """Return one column as plain Python values with NaN/NA mapped to None (vectorized)."""
+    series = df[column]
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _csv_chunk_to_examples(
+    chunk: pd.DataFrame,
+    *,
+    csv_path: str,
+    text_column: str,
+    label_column: Optional[str],
+    target_column: Optional[str],
+    split: str,
+    default_language_code: str,
+    default_domain_id: str,
+) -> Iterator[InternalExample]:
+    """
+    Convert one CSV chunk column-wise; per-row work is limited to building the InternalExample.
+    Chunks are read with dtype=str: per-chunk dtype inference could turn the same id into "1" in one chunk
+    and "1.0" in another (a missing value makes the column float), breaking uid joins.
+    """
+    if text_column not in chunk.columns:
+        raise KeyError(f"Missing text column '{text_column}' in {csv_path}")
+    n_rows = len(chunk)
+    columns = {str(col): _column_values(chunk, col) for col in chunk.columns}
+    missing: List[Any] = [None] * n_rows
+
+    texts = columns[text_column]
+    labels = columns.get(label_column, missing) if label_column else missing
+    targets = columns.get(target_column, missing) if target_column else missing
+    uids = columns.get("uid", missing)
+    ids = columns.get("id", missing)
+    lang_cols = [columns.get("language_code", missing), columns.get("lang", missing)]
+    domain_cols = [columns.get("domain_id", missing), columns.get("domain", missing)]
+    case_cols = [columns[c] for c in ("case_type", "type") if c in columns]
+    meta_cols = [(col, vals) for col, vals in columns.items() if col not in {text_column, label_column, target_column}]
+    stem = Path(csv_path).stem
+
+    for i, idx in enumerate(chunk.index.tolist()):
+        label_val = labels[i]
+        target_val = targets[i]
+        metadata = {col: vals[i] for col, vals in meta_cols if vals[i] is not None}
+
+        case_type_val = None
+        for vals in case_cols:
+            case_type_val = None if vals[i] is None else str(vals[i])
+            if case_type_val:
+                break
+
+        uid_val = uids[i] if uids[i] is not None else ids[i]
+        uid_str = str(uid_val).strip() if uid_val is not None else ""
+        if not uid_str:
+            uid_str = f"{stem}:{idx}"
+
+        language_code = str(lang_cols[0][i] or lang_cols[1][i] or default_language_code or "unknown")
+        domain_id = str(domain_cols[0][i] or domain_cols[1][i] or default_domain_id or "unknown")
+
+        yield InternalExample(
+            uid=uid_str,
+            text=str(texts[i] or ""),
+            case_type=case_type_val or "unknown",
+            split=split or "unknown",
+            label=None if label_val is None else str(label_val),
+            target=None if target_val is None else str(target_val),
+            metadata=metadata or None,
+            language_code=language_code or "unknown",
+            domain_id=domain_id or "unknown",
+        )
+
+
+def iter_csv_examples(
+    csv_path: str,
+    *,
+    text_column: str = "text",
+    label_column: Optional[str] = "label",
+    target_column: Optional[str] = None,
+    split: str = "unknown",
+    default_language_code: str = "unknown",
+    default_domain_id: str = "unknown",
+    chunk_rows: int = _CSV_CHUNK_ROWS,
+) -> Iterator[InternalExample]:
+    """Stream a CSV file as InternalExample rows, reading `chunk_rows` rows at a time."""
+    import pandas as pd
+
+    with pd.read_csv(csv_path, dtype=str, chunksize=max(1, int(chunk_rows))) as reader:
+        for chunk in reader:
+            yield from _csv_chunk_to_examples(
+                chunk,
+                csv_path=csv_path,
+                text_column=text_column,
+                label_column=label_column,
+                target_column=target_column,
+                split=split,
+                default_language_code=default_language_code,
+                default_domain_id=default_domain_id,
+            )
+
+
 def load_csv_examples(
     csv_path: str,
     *,
@@ -139,64 +263,141 @@ def load_csv_examples(
     default_domain_id: str = "unknown",
 ) -> List[InternalExample]:
     """Load a CSV file into InternalExample rows."""
-    df = pd.read_csv(csv_path)
-    if text_column not in df.columns:
-        raise KeyError(f"Missing text column '{text_column}' in {csv_path}")
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, dtype=str)
+    return list(
+        _csv_chunk_to_examples(
+            df,
+            csv_path=csv_path,
+            text_column=text_column,
+            label_column=label_column,
+            target_column=target_column,
+            split=split,
+            default_language_code=default_language_code,
+            default_domain_id=default_domain_id,
+        )
+    )
+
 
+def _parse_internal_json_file(
+    path: Path,
+    *,
+    text_key: str,
+    label_key: str,
+    split: str,
+    default_language_code: str,
+    default_domain_id: str,
+) -> List[InternalExample]:
+    """
+    Parse one conversation JSON file. Turns without TextNo get an empty uid; the caller assigns the
+    running-count uid so results are identical to a serial parse regardless of worker scheduling.
+    """
+    obj = _json_loads(Path(path).read_bytes())
+    file_name = obj.get("File", {}).get("FileName", Path(path).stem)
     examples: List[InternalExample] = []
-    for idx, row in df.iterrows():
-        text = str(_clean_value(row[text_column]) or "")
-        label = None
-        if label_column and label_column in df.columns:
-            label_val = _clean_value(row[label_column])
-            label = None if label_val is None else str(label_val)
-
-        target = None
-        if target_column and target_column in df.columns:
-            target_val = _clean_value(row[target_column])
-            target = None if target_val is None else str(target_val)
-
-        metadata: Dict[str, Any] = {}
-        for col in df.columns:
-            if col in {text_column, label_column, target_column}:
-                continue
-            cleaned = _clean_value(row[col])
-            if cleaned is not None:
-                metadata[col] = cleaned
+    for turn in obj.get("Conversation", []):
+        text = str(_clean_value(turn.get(text_key)) or "").strip()
+        if not text:
+            continue
+        label_val = _clean_value(turn.get(label_key))
+        label = None if label_val is None else str(label_val)
+        target = _clean_value(turn.get("VerifyEmotionTarget")) or _clean_value(turn.get("SpeakerEmotionTarget"))
+        target = None if target is None else str(target)
+
+        span = None
+        start = _clean_value(turn.get("StartTime"))
+        end = _clean_value(turn.get("EndTime"))
+        if start is not None and end is not None:
+            try:
+                span = (float(start), float(end))
+            except (TypeError, ValueError):
+                span = None
 
-        language_code = str(_clean_value(row.get("language_code")) or _clean_value(row.get("lang")) or default_language_code or "unknown")
-        domain_id = str(_clean_value(row.get("domain_id")) or _clean_value(row.get("domain")) or default_domain_id or "unknown")
+        metadata = {
+            "file": file_name,
+            "text_no": _clean_value(turn.get("TextNo")),
+            "speaker_no": _clean_value(turn.get("SpeakerNo")),
+            "verify_target": _clean_value(turn.get("VerifyEmotionTarget")),
+            "speaker_target": _clean_value(turn.get("SpeakerEmotionTarget")),
+            "verify_level": _clean_value(turn.get("VerifyEmotionLevel")),
+            "speaker_level": _clean_value(turn.get("SpeakerEmotionLevel")),
+        }
+        metadata = {k: v for k, v in metadata.items() if v is not None}
 
-        case_type_val = None
-        for candidate in ("case_type", "type"):
-            if candidate in df.columns:
-                ct_val = _clean_value(row[candidate])
-                case_type_val = None if ct_val is None else str(ct_val)
-                if case_type_val:
-                    break
-
-        uid_val = _clean_value(row.get("uid") or row.get("id"))
-        uid_str = str(uid_val).strip() if uid_val is not None else ""
-        if not uid_str:
-            uid_str = f"{Path(csv_path).stem}:{idx}"
+        language_code = str(_clean_value(turn.get("language_code") or turn.get("Language")) or default_language_code or "unknown")
+        domain_id = str(_clean_value(turn.get("domain_id") or turn.get("Domain")) or default_domain_id or "unknown")
 
         examples.append(
             InternalExample(
-                uid=uid_str,
+                uid=f"{file_name}:{turn['TextNo']}" if "TextNo" in turn else "",
                 text=text,
-                case_type=case_type_val or "unknown",
+                case_type=str(_clean_value(turn.get("case_type") or turn.get("CaseType")) or "unknown"),
                 split=split or "unknown",
                 label=label,
                 target=target,
+                span=span,
                 metadata=metadata or None,
                 language_code=language_code or "unknown",
                 domain_id=domain_id or "unknown",
             )
         )
-
     return examples
 
 
+def _default_workers() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def iter_internal_json_dir(
+    json_dir: str,
+    *,
+    text_key: str = "Text",
+    label_key: str = "VerifyEmotionCategory",
+    split: str = "unknown",
+    default_language_code: str = "unknown",
+    default_domain_id: str = "unknown",
+    workers: Optional[int] = None,
+) -> Iterator[InternalExample]:
+    """
+    Stream conversation-style internal JSON files as InternalExample rows (file order is preserved).
+
+    Directories with many files are parsed in a process pool (`workers`, default min(8, cpu_count));
+    small directories and workers=1 parse serially.
+    """
+    paths = sorted(Path(json_dir).glob("*.json"))
+    parse = partial(
+        _parse_internal_json_file,
+        text_key=text_key,
+        label_key=label_key,
+        split=split,
+        default_language_code=default_language_code,
+        default_domain_id=default_domain_id,
+    )
+    n_workers = _default_workers() if workers is None else max(1, int(workers))
+    count = 0
+
+    def _emit(file_examples: List[InternalExample]) -> Iterator[InternalExample]:
+        nonlocal count
+        for ex in file_examples:
+            if not ex.uid:
+                ex = replace(ex, uid=f"{(ex.metadata or {}).get('file')}:{count}")
+            count += 1
+            yield ex
+
+    if n_workers > 1 and len(paths) >= _PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            chunksize = max(1, len(paths) // (n_workers * 4))
+            for file_examples in pool.map(parse, paths, chunksize=chunksize):
+                yield from _emit(file_examples)
+    else:
+        for path in paths:
+            yield from _emit(parse(path))
+
+    if count == 0:
+        raise ValueError(f"No records parsed from {json_dir}")
+
+
 def load_internal_json_dir(
     json_dir: str,
     *,
@@ -205,79 +406,35 @@ def load_internal_json_dir(
     split: str = "unknown",
     default_language_code: str = "unknown",
     default_domain_id: str = "unknown",
+    workers: Optional[int] = None,
 ) -> List[InternalExample]:
     """
     Load conversation-style internal JSON files into InternalExample rows.
 
     Each JSON file contains a Conversation list; every turn becomes an example.
     """
-    examples: List[InternalExample] = []
-    for path in sorted(Path(json_dir).glob("*.json")):
-        with open(path, "r", encoding="utf-8") as f:
-            obj = json.load(f)
-
-        file_name = obj.get("File", {}).get("FileName", Path(path).stem)
-        for turn in obj.get("Conversation", []):
-            text = str(_clean_value(turn.get(text_key)) or "").strip()
-            if not text:
-                continue
-            label_val = _clean_value(turn.get(label_key))
-            label = None if label_val is None else str(label_val)
-            target = _clean_value(turn.get("VerifyEmotionTarget")) or _clean_value(turn.get("SpeakerEmotionTarget"))
-            target = None if target is None else str(target)
-
-            span = None
-            start = _clean_value(turn.get("StartTime"))
-            end = _clean_value(turn.get("EndTime"))
-            if start is not None and end is not None:
-                try:
-                    span = (float(start), float(end))
-                except (TypeError, ValueError):
-                    span = None
-
-            metadata = {
-                "file": file_name,
-                "text_no": _clean_value(turn.get("TextNo")),
-                "speaker_no": _clean_value(turn.get("SpeakerNo")),
-                "verify_target": _clean_value(turn.get("VerifyEmotionTarget")),
-                "speaker_target": _clean_value(turn.get("SpeakerEmotionTarget")),
-                "verify_level": _clean_value(turn.get("VerifyEmotionLevel")),
-                "speaker_level": _clean_value(turn.get("SpeakerEmotionLevel")),
-            }
-            metadata = {k: v for k, v in metadata.items() if v is not None}
-
-            language_code = str(_clean_value(turn.get("language_code") or turn.get("Language")) or default_language_code or "unknown")
-            domain_id = str(_clean_value(turn.get("domain_id") or turn.get("Domain")) or default_domain_id or "unknown")
-
-            examples.append(
-                InternalExample(
-                    uid=f"{file_name}:{turn.get('TextNo', len(examples))}",
-                    text=text,
-                    case_type=str(_clean_value(turn.get("case_type") or turn.get("CaseType")) or "unknown"),
-                    split=split or "unknown",
-                    label=label,
-                    target=target,
-                    span=span,
-                    metadata=metadata or None,
-                    language_code=language_code or "unknown",
-                    domain_id=domain_id or "unknown",
-                )
-            )
-
-    if not examples:
-        raise ValueError(f"No records parsed from {json_dir}")
-    return examples
+    return list(
+        iter_internal_json_dir(
+            json_dir,
+            text_key=text_key,
+            label_key=label_key,
+            split=split,
+            default_language_code=default_language_code,
+            default_domain_id=default_domain_id,
+            workers=workers,
+        )
+    )
 
 
-def load_nikluge_sa2022(jsonl_path: str, *, split: str = "unknown") -> List[InternalExample]:
-    """Load the nikluge-sa-2022 train/dev/test JSONL into InternalExample rows."""
-    examples: List[InternalExample] = []
-    with open(jsonl_path, "r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f):
-            line = line.strip()
+def iter_nikluge_sa2022(jsonl_path: str, *, split: str = "unknown") -> Iterator[InternalExample]:
+    """Stream the nikluge-sa-2022 train/dev/test JSONL as InternalExample rows (one per annotation)."""
+    count = 0
+    with open(jsonl_path, "rb") as f:
+        for line_no, raw in enumerate(f):
+            line = raw.strip()
             if not line:
                 continue
-            obj = json.loads(line)
+            obj = _json_loads(line)
             base_id = obj.get("id", f"nikluge-sa-2022-{line_no:05d}")
             text = str(obj.get("sentence_form", "")).strip()
             annotations = obj.get("annotation") or []
@@ -285,17 +442,16 @@ def load_nikluge_sa2022(jsonl_path: str, *, split: str = "unknown") -> List[Inte
             domain_id = str(obj.get("domain_id") or "nikluge_sa2022" or "unknown")
 
             if not annotations:
-                examples.append(
-                    InternalExample(
-                        uid=base_id,
-                        text=text,
-                        case_type="unknown",
-                        split=split or "unknown",
-                        label=None,
-                        metadata={"source": "nikluge_sa_2022"},
-                        language_code=language_code,
-                        domain_id=domain_id,
-                    )
+                count += 1
+                yield InternalExample(
+                    uid=base_id,
+                    text=text,
+                    case_type="unknown",
+                    split=split or "unknown",
+                    label=None,
+                    metadata={"source": "nikluge_sa_2022"},
+                    language_code=language_code,
+                    domain_id=domain_id,
                 )
                 continue
 
@@ -321,35 +477,62 @@ def load_nikluge_sa2022(jsonl_path: str, *, split: str = "unknown") -> List[Inte
                 if span_text not in (None, ""):
                     meta["span_text"] = span_text
 
-                examples.append(
-                    InternalExample(
-                        uid=f"{base_id}::ann{ann_idx}",
-                        text=text,
-                        case_type="unknown",
-                        split=split or "unknown",
-                        label=label,
-                        target=target,
-                        span=span,
-                        metadata=meta or None,
-                        language_code=language_code,
-                        domain_id=domain_id,
-                    )
+                count += 1
+                yield InternalExample(
+                    uid=f"{base_id}::ann{ann_idx}",
+                    text=text,
+                    case_type="unknown",
+                    split=split or "unknown",
+                    label=label,
+                    target=target,
+                    span=span,
+                    metadata=meta or None,
+                    language_code=language_code,
+                    domain_id=domain_id,
                 )
 
-    if not examples:
+    if count == 0:
         raise ValueError(f"No records parsed from {jsonl_path}")
-    return examples
 
 
-def load_split_examples(data_cfg: Dict[str, Any], split: str) -> List[InternalExample]:
+def load_nikluge_sa2022(jsonl_path: str, *, split: str = "unknown") -> List[InternalExample]:
+    """Load the nikluge-sa-2022 train/dev/test JSONL into InternalExample rows."""
+    return list(iter_nikluge_sa2022(jsonl_path, split=split))
+
+
+def split_is_configured(data_cfg: Dict[str, Any], split: str) -> bool:
+    """True when data_cfg names a source for `split` under its input_format."""
+    fmt = data_cfg.get("input_format", "csv")
+    if fmt == "json_internal":
+        return f"json_dir_{split}" in data_cfg
+    if fmt in {"csv", "nikluge_sa_2022"}:
+        return f"{split}_file" in data_cfg
+    return False
+
+
+def iter_split_examples(data_cfg: Dict[str, Any], split: str) -> Iterator[InternalExample]:
     """
-    Load a specific split using the configured input_format.
+    Stream a specific split using the configured input_format without materializing it.
 
     Supported formats:
-        - csv: expects `<split>_file`
-        - json_internal: expects `json_dir_<split>`
+        - csv: expects `<split>_file` (read in `csv_chunk_rows` chunks, default 50k)
+        - json_internal: expects `json_dir_<split>` (parsed with `loader_workers` processes)
         - nikluge_sa_2022: expects `<split>_file`
+
+    With `snapshot_cache: true` rows are served from the memory-mapped snapshot cache
+    (see data.datasets.cache), building it on first use.
     """
+    if data_cfg.get("snapshot_cache"):
+        from .cache import open_split_snapshot
+
+        snapshot = open_split_snapshot(data_cfg, split)
+        if snapshot is not None:
+            return iter(snapshot)
+    return _source_split_examples(data_cfg, split)
+
+
+def _source_split_examples(data_cfg: Dict[str, Any], split: str) -> Iterator[InternalExample]:
+    """Parse a split directly from its source files (no snapshot cache)."""
     fmt = data_cfg.get("input_format", "csv")
     root = data_cfg.get("dataset_root")
     default_language_code = data_cfg.get("language_code", "unknown")
@@ -358,7 +541,7 @@ def load_split_examples(data_cfg: Dict[str, Any], split: str) -> List[InternalEx
         file_key = f"{split}_file"
         if file_key not in data_cfg:
             raise KeyError(f"{file_key} missing in data config for split '{split}'")
-        return load_csv_examples(
+        return iter_csv_examples(
             resolve_data_path(root, data_cfg[file_key]),
             text_column=data_cfg.get("text_column", "text"),
             label_column=data_cfg.get("label_column", "label"),
@@ -366,29 +549,43 @@ def load_split_examples(data_cfg: Dict[str, Any], split: str) -> List[InternalEx
             split=split,
             default_language_code=default_language_code,
             default_domain_id=default_domain_id,
+            chunk_rows=int(data_cfg.get("csv_chunk_rows") or _CSV_CHUNK_ROWS),
         )
     if fmt == "json_internal":
         dir_key = f"json_dir_{split}"
         if dir_key not in data_cfg:
             raise KeyError(f"{dir_key} missing in data config for split '{split}'")
-        return load_internal_json_dir(
+        return iter_internal_json_dir(
             resolve_data_path(root, data_cfg[dir_key]),
             text_key=data_cfg.get("text_key", "Text"),
             label_key=data_cfg.get("label_key", "VerifyEmotionCategory"),
             split=split,
             default_language_code=default_language_code,
             default_domain_id=default_domain_id,
+            workers=data_cfg.get("loader_workers"),
         )
     if fmt == "nikluge_sa_2022":
         file_key = f"{split}_file"
         path = resolve_data_path(root, data_cfg.get(file_key))
         if path is None:
-            return []
-        return load_nikluge_sa2022(path, split=split)
+            return iter(())
+        return iter_nikluge_sa2022(path, split=split)
 
     raise ValueError(f"Unsupported input_format '{fmt}'")
 
 
+def load_split_examples(data_cfg: Dict[str, Any], split: str) -> List[InternalExample]:
+    """
+    Load a specific split using the configured input_format.
+
+    Supported formats:
+        - csv: expects `<split>_file`
+        - json_internal: expects `json_dir_<split>`
+        - nikluge_sa_2022: expects `<split>_file`
+    """
+    return list(iter_split_examples(data_cfg, split))
+
+
 def load_datasets(
     data_cfg: Dict[str, Any],
     splits_to_load: Optional[Sequence[str]] = None,
@@ -400,21 +597,10 @@ def load_datasets(
     When splits_to_load is set (e.g. ["valid"]), only those splits are loaded;
     others return empty lists. Use this for eval-only runs to avoid loading train.
     """
-    fmt = data_cfg.get("input_format", "csv")
     want = set(splits_to_load) if splits_to_load is not None else {"train", "valid", "test"}
-
-    has_train = (
-        (fmt == "json_internal" and "json_dir_train" in data_cfg)
-        or (fmt in {"csv", "nikluge_sa_2022"} and "train_file" in data_cfg)
-    )
-    has_valid = (
-        (fmt == "json_internal" and "json_dir_valid" in data_cfg)
-        or (fmt in {"csv", "nikluge_sa_2022"} and "valid_file" in data_cfg)
-    )
-    has_test = (
-        (fmt == "json_internal" and "json_dir_test" in data_cfg)
-        or (fmt in {"csv", "nikluge_sa_2022"} and "test_file" in data_cfg)
-    )
+    has_train = split_is_configured(data_cfg, "train")
+    has_valid = split_is_configured(data_cfg, "valid")
+    has_test = split_is_configured(data_cfg, "test")
 
     train_examples = (
         load_split_examples(data_cfg, "train") if "train" in want and has_train else []
@@ -435,5 +621,7 @@ def examples_to_dataframe(
     include_metadata: bool = False,
 ) -> pd.DataFrame:
     """Convert InternalExample list to a DataFrame with normalized columns."""
+    import pandas as pd
+
     rows = [ex.to_record(include_metadata=include_metadata, label2id=label2id) for ex in examples]
     return pd.DataFrame(rows)
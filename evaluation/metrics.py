@@ -1,10 +1,10 @@
 from typing import Dict, Any
-import torch
-from evaluate import load as load_metric
 
 
 def compute_metrics(eval_pred) -> Dict[str, float]:
     """Compute evaluation metrics for sentiment analysis."""
+    from evaluate import load as load_metric
+
     logits, labels = eval_pred
     preds = logits.argmax(axis=-1)
     
@@ -0,0 +1,292 @@
+"""
+Offline replay of the deterministic post-LLM step of the proposed pipeline.
+
+Stage1 / debate / Stage2 agent outputs are rebuilt from the process_trace entries saved in outputs.jsonl,
+and only SupervisorAgent.decide() runs again (Stage2 review patching, debate override, label aggregation,
+Moderator rules). Changing debate_override thresholds, Moderator rules or _apply_stage2_reviews can then be
+evaluated in seconds instead of re-running the LLM pipeline.
+
+sweep_override_thresholds() evaluates a whole grid of debate-override thresholds in one pass: for every
+example the grid points are grouped (numpy) by which debate hints they let through, and each distinct
+outcome is replayed once.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from agents.specialized_agents import Moderator
+from agents.supervisor_agent import SupervisorAgent, SupervisorDecision, _new_override_stats
+from metrics.scorecard import gold_triplets_with_span_variants, precision_recall_f1_ap, triplets_from_list
+from schemas import (
+    AspectExtractionStage1Schema,
+    AspectExtractionStage2Schema,
+    AspectSentimentStage1Schema,
+    AspectSentimentStage2Schema,
+    DebateSummary,
+    StructuralValidatorStage1Schema,
+    StructuralValidatorStage2Schema,
+)
+from tools.backbone_client import BackboneClient
+
+OVERRIDE_KEYS = ("min_total", "min_margin", "min_target_conf")
+OVERRIDE_DEFAULTS = {"min_total": 1.6, "min_margin": 0.8, "min_target_conf": 0.7}
+
+_TRACE_SCHEMAS = {
+    ("stage1", "ATE"): AspectExtractionStage1Schema,
+    ("stage1", "ATSA"): AspectSentimentStage1Schema,
+    ("stage1", "Validator"): StructuralValidatorStage1Schema,
+    ("stage2", "ATE"): AspectExtractionStage2Schema,
+    ("stage2", "ATSA"): AspectSentimentStage2Schema,
+    ("stage2", "Validator"): StructuralValidatorStage2Schema,
+}
+
+
+@dataclass
+class ReplayCase:
+    """Saved LLM outputs of one example, as SupervisorAgent.decide() consumes them."""
+
+    text_id: str
+    stage1: Dict[str, Any]
+    stage2: Dict[str, Any]
+    debate_review_context: Optional[dict]
+    debate_summary: Optional[DebateSummary]
+    saved_label: Optional[str]
+    saved_aspects: List[Dict[str, Any]]
+    gold: Optional[set] = None
+
+    def hint_scores(self) -> tuple[np.ndarray, np.ndarray]:
+        """(total, |pos - neg|) debate hint weight per aspect, as the debate override computes them."""
+        hints = (self.debate_review_context or {}).get("aspect_hints") or {}
+        totals, margins = [], []
+        for aspect_ref, items in hints.items():
+            if not aspect_ref or not isinstance(items, list):
+                continue
+            pos = sum(float(h.get("weight") or 0) for h in items if h.get("polarity_hint") == "positive")
+            neg = sum(float(h.get("weight") or 0) for h in items if h.get("polarity_hint") == "negative")
+            totals.append(pos + neg)
+            margins.append(abs(pos - neg))
+        return np.asarray(totals, dtype=float), np.asarray(margins, dtype=float)
+
+
+def case_from_output(row: Dict[str, Any], gold: Optional[List[Dict[str, Any]]] = None) -> Optional[ReplayCase]:
+    """ReplayCase from one outputs.jsonl row; None for rows without proposed-pipeline Stage1 traces (baselines)."""
+    meta = row.get("meta") or {}
+    outputs: Dict[tuple, Any] = {}
+    for entry in row.get("process_trace") or []:
+        key = (entry.get("stage"), entry.get("agent"))
+        if key in _TRACE_SCHEMAS and key not in outputs:
+            outputs[key] = _TRACE_SCHEMAS[key].model_validate(entry.get("output") or {})
+    if meta.get("mode", "proposed") != "proposed" or not all(("stage1", a) in outputs for a in ("ATE", "ATSA", "Validator")):
+        return None
+    stage1 = {"ate": outputs[("stage1", "ATE")], "atsa": outputs[("stage1", "ATSA")], "validator": outputs[("stage1", "Validator")]}
+    # Stage2 skipped (disabled/degraded): the supervisor passes Stage1 through as Stage2
+    if all(("stage2", a) in outputs for a in ("ATE", "ATSA", "Validator")):
+        stage2 = {"ate": outputs[("stage2", "ATE")], "atsa": outputs[("stage2", "ATSA")], "validator": outputs[("stage2", "Validator")]}
+    else:
+        stage2 = dict(stage1)
+    summary = (row.get("debate") or {}).get("summary")
+    final = row.get("final_result") or {}
+    return ReplayCase(
+        text_id=str(meta.get("text_id") or meta.get("uid") or ""),
+        stage1=stage1,
+        stage2=stage2,
+        debate_review_context=meta.get("debate_review_context") if isinstance(meta.get("debate_review_context"), dict) else None,
+        debate_summary=DebateSummary.model_validate(summary) if row.get("debate") else None,
+        saved_label=final.get("label"),
+        saved_aspects=list(final.get("final_aspects") or []),
+        gold=gold_triplets_with_span_variants(gold) if gold else None,
+    )
+
+
+def _read_jsonl(path: Path) -> Iterable[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_gold(path: Path | str) -> Dict[str, List[Dict[str, Any]]]:
+    """text_id -> gold_triplets from an eval gold JSONL ({uid|text_id|id, gold_triplets}) or a scorecards.jsonl."""
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for row in _read_jsonl(Path(path)):
+        gold = row.get("gold_triplets") or (row.get("inputs") or {}).get("gold_triplets")
+        uid = row.get("uid") or row.get("text_id") or row.get("id") or (row.get("meta") or {}).get("text_id")
+        if uid and isinstance(gold, list):
+            out[str(uid)] = gold
+    return out
+
+
+def load_replay_cases(run: Path | str, *, gold: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> List[ReplayCase]:
+    """
+    ReplayCases of a run directory (outputs.jsonl) or an outputs.jsonl path. Gold triplets come from `gold`,
+    else from the run's scorecards.jsonl (inputs.gold_triplets) when present.
+    """
+    path = Path(run)
+    outputs_path = path / "outputs.jsonl" if path.is_dir() else path
+    if gold is None:
+        scorecards = outputs_path.with_name("scorecards.jsonl")
+        gold = load_gold(scorecards) if scorecards.exists() else {}
+    cases = []
+    for row in _read_jsonl(outputs_path):
+        text_id = str((row.get("meta") or {}).get("text_id") or "")
+        case = case_from_output(row, gold.get(text_id))
+        if case is not None:
+            cases.append(case)
+    return cases
+
+
+def run_pipeline_config(run: Path | str) -> Dict[str, Any]:
+    """`pipeline` block the run was made with (manifest.json cfg_canonical); {} if unknown."""
+    path = Path(run)
+    manifest = (path if path.is_dir() else path.parent) / "manifest.json"
+    if not manifest.exists():
+        return {}
+    try:
+        cfg = json.loads(json.loads(manifest.read_text(encoding="utf-8")).get("cfg_canonical") or "{}")
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return dict(cfg.get("pipeline") or {})
+
+
+def make_replayer(
+    pipeline_cfg: Optional[Dict[str, Any]] = None,
+    *,
+    override_cfg: Optional[Dict[str, Any]] = None,
+    moderator: Optional[Moderator] = None,
+) -> SupervisorAgent:
+    """SupervisorAgent used only for decide(); override_cfg replaces the debate_override thresholds."""
+    agent = SupervisorAgent(backbone=BackboneClient(provider="mock"), config=pipeline_cfg, moderator=moderator, run_id="replay")
+    if override_cfg:
+        agent.debate_override_cfg = {**agent.debate_override_cfg, **override_cfg}
+    return agent
+
+
+def replay_case(agent: SupervisorAgent, case: ReplayCase) -> tuple[SupervisorDecision, Dict[str, int]]:
+    override_stats = _new_override_stats()
+    decision = agent.decide(
+        case.stage1,
+        case.stage2,
+        debate_review_context=case.debate_review_context,
+        debate_summary=case.debate_summary,
+        override_stats=override_stats,
+    )
+    return decision, override_stats
+
+
+def _final_triplets(decision: SupervisorDecision) -> set:
+    return triplets_from_list([s.model_dump() for s in decision.final_aspect_sentiments])
+
+
+def replay(cases: Sequence[ReplayCase], agent: SupervisorAgent) -> List[Dict[str, Any]]:
+    """One row per case: replayed final label/aspects, whether they match the saved run, override counts, F1."""
+    rows = []
+    for case in cases:
+        decision, override_stats = replay_case(agent, case)
+        aspects = [s.model_dump() for s in decision.final_aspect_sentiments]
+        row = {
+            "text_id": case.text_id,
+            "saved_label": case.saved_label,
+            "final_label": decision.moderator.final_label,
+            "applied_rules": decision.moderator.applied_rules,
+            "matches_saved": decision.moderator.final_label == case.saved_label
+            and json.dumps(aspects, sort_keys=True) == json.dumps(case.saved_aspects, sort_keys=True),
+            "override_stats": override_stats,
+            "final_aspects": aspects,
+        }
+        if case.gold is not None:
+            row["ap_f1"] = precision_recall_f1_ap(_final_triplets(decision), case.gold)[2]
+        rows.append(row)
+    return rows
+
+
+def override_grid(spec: Dict[str, Sequence[float]], base: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """(G, 3) array of (min_total, min_margin, min_target_conf) points; axes missing from spec stay at base."""
+    base = {**OVERRIDE_DEFAULTS, **(base or {})}
+    axes = [list(spec.get(k) or [float(base[k])]) for k in OVERRIDE_KEYS]
+    return np.asarray(list(itertools.product(*axes)), dtype=float)
+
+
+def sweep_override_thresholds(
+    cases: Sequence[ReplayCase],
+    grid: np.ndarray,
+    *,
+    pipeline_cfg: Optional[Dict[str, Any]] = None,
+    moderator: Optional[Moderator] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate every (min_total, min_margin, min_target_conf) row of `grid` over all cases.
+    The override only depends on the thresholds through which aspect hints pass (total >= min_total and
+    margin >= min_margin) and, when any passes, min_target_conf; grid points sharing that signature give the
+    same decision, so each case is replayed once per distinct signature rather than once per grid point.
+    Returns one row per grid point: thresholds, n, n_gold, mean aspect-polarity F1 (None without gold),
+    labels changed vs. the saved run and overrides applied.
+    """
+    grid = np.asarray(grid, dtype=float).reshape(-1, len(OVERRIDE_KEYS))
+    n_points = len(grid)
+    f1_sum = np.zeros(n_points)
+    changed = np.zeros(n_points, dtype=int)
+    applied = np.zeros(n_points, dtype=int)
+    n_gold = 0
+    agents: Dict[tuple, SupervisorAgent] = {}
+
+    for case in cases:
+        totals, margins = case.hint_scores()
+        passes = (totals[None, :] >= grid[:, 0:1]) & (margins[None, :] >= grid[:, 1:2])  # (G, H)
+        target_conf = np.where(passes.any(axis=1), grid[:, 2], -1.0)
+        signatures = np.column_stack([passes.astype(float), target_conf])
+        _, first, inverse = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        f1_by_sig = np.zeros(len(first))
+        changed_by_sig = np.zeros(len(first), dtype=int)
+        applied_by_sig = np.zeros(len(first), dtype=int)
+        for sig, point in enumerate(first):
+            thresholds = tuple(float(v) for v in grid[point])
+            agent = agents.get(thresholds)
+            if agent is None:
+                agent = agents[thresholds] = make_replayer(
+                    pipeline_cfg, override_cfg=dict(zip(OVERRIDE_KEYS, thresholds)), moderator=moderator
+                )
+            decision, override_stats = replay_case(agent, case)
+            changed_by_sig[sig] = int(decision.moderator.final_label != case.saved_label)
+            applied_by_sig[sig] = override_stats["applied"]
+            if case.gold is not None:
+                f1_by_sig[sig] = precision_recall_f1_ap(_final_triplets(decision), case.gold)[2]
+        changed += changed_by_sig[inverse]
+        applied += applied_by_sig[inverse]
+        if case.gold is not None:
+            f1_sum += f1_by_sig[inverse]
+            n_gold += 1
+
+    rows = []
+    for idx, point in enumerate(grid):
+        row = dict(zip(OVERRIDE_KEYS, (float(v) for v in point)))
+        row.update(
+            n=len(cases),
+            n_gold=n_gold,
+            ap_f1=float(f1_sum[idx] / n_gold) if n_gold else None,
+            label_changed=int(changed[idx]),
+            override_applied=int(applied[idx]),
+        )
+        rows.append(row)
+    return rows
+
+
+__all__ = [
+    "ReplayCase",
+    "case_from_output",
+    "load_gold",
+    "load_replay_cases",
+    "make_replayer",
+    "override_grid",
+    "replay",
+    "replay_case",
+    "run_pipeline_config",
+    "sweep_override_thresholds",
+]
@@ -0,0 +1,284 @@
+"""
+Sequential (early-stopping) evaluation against a stored baseline run.
+
+Regression checks (regression_50, smoke profiles) usually only need to know whether a prompt/config
+change moved the key metric by more than a tolerated amount. With a `sequential:` config block,
+run_experiments processes the examples in a stratified random order (stratified_order), feeds every
+finished scorecard to a SequentialMonitor, and stops once the confidence interval of
+mean(run - baseline) over (split, uid) pairs shared with the baseline is conclusive for the regression threshold δ:
+
+- ci_high < -δ                 -> "regression"     (the metric dropped by more than δ)
+- ci_low  > -δ                 -> "no_regression"  (any drop is smaller than δ)
+- still open after the last example -> "inconclusive"
+
+Looks are taken every `check_every` paired examples once `min_examples` are paired. Each look uses
+alpha / planned looks (Bonferroni), so stopping at the first conclusive look keeps the overall error
+rate at most alpha, as far as each interval holds its nominal coverage. Binary metrics (quality_pass,
+accuracy) use Newcombe's hybrid score interval for paired proportions (paired_proportion_ci); f1 uses a
+normal interval whose standard deviation is never below that of a single changed example
+(mean_diff_ci). Both stay wide when no pair changed, so a short unchanged prefix cannot stop the run;
+certifying a drop below δ with zero changed pairs needs roughly 19·z² pairs (z of alpha / looks),
+e.g. about 110 at δ = 0.05 with 3 looks and 170 with 17, so short lists mostly stop early on a regression.
+
+  sequential:
+    baseline: results/regression_50_proposed   # run dir or scorecards.jsonl
+    metric: quality_pass                       # quality_pass | accuracy | f1
+    threshold: 0.05
+"""
+from __future__ import annotations
+
+import math
+import random
+from statistics import NormalDist
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from data.datasets.loader import InternalExample
+from metrics.paper_rows import extract_final_triplets, extract_gold_triplets, precision_recall_f1, structural_pass
+from metrics.streaming import iter_scorecards
+from tools.pattern_set import get_pattern_set
+
+STRATA = ("case_type", "contrast", "negation")
+
+
+def _quality_pass(record: Dict[str, Any]) -> Optional[float]:
+    passed = structural_pass(record)
+    return None if passed is None else float(passed)
+
+
+def _accuracy(record: Dict[str, Any]) -> Optional[float]:
+    gold = extract_gold_triplets(record)
+    return None if gold is None else float(extract_final_triplets(record) == gold)
+
+
+def _f1(record: Dict[str, Any]) -> Optional[float]:
+    gold = extract_gold_triplets(record)
+    return None if not gold else precision_recall_f1(extract_final_triplets(record), gold)[2]
+
+
+# Per-example key metrics in [0, 1]; None = not scorable for this example (e.g. no gold)
+EXAMPLE_METRICS: Dict[str, Callable[[Dict[str, Any]], Optional[float]]] = {
+    "quality_pass": _quality_pass,
+    "accuracy": _accuracy,
+    "f1": _f1,
+}
+
+
+@dataclass
+class SequentialConfig:
+    baseline: str
+    metric: str = "quality_pass"
+    threshold: float = 0.05
+    alpha: float = 0.05
+    min_examples: int = 20
+    check_every: int = 5
+    strata: Tuple[str, ...] = STRATA
+    seed: int = 42
+
+    @classmethod
+    def from_cfg(cls, block: Optional[Dict[str, Any]], baseline: Optional[str] = None) -> Optional["SequentialConfig"]:
+        """Config from the `sequential:` block (None when absent or enabled: false); `baseline` overrides block.baseline."""
+        block = dict(block or {})
+        if baseline:
+            block["baseline"] = baseline
+        elif not block or not block.pop("enabled", True):
+            return None
+        block.pop("enabled", None)
+        if not block.get("baseline"):
+            raise ValueError("sequential evaluation needs a baseline run (sequential.baseline or --sequential-baseline)")
+        unknown = set(block) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown sequential option(s): {', '.join(sorted(unknown))}")
+        config = cls(**{**block, "strata": tuple(block.get("strata") or STRATA)})
+        if config.metric not in EXAMPLE_METRICS:
+            raise ValueError(f"Unsupported sequential metric '{config.metric}' (expected one of {', '.join(EXAMPLE_METRICS)})")
+        unknown_strata = set(config.strata) - set(STRATA)
+        if unknown_strata:
+            raise ValueError(f"Unsupported sequential strata: {', '.join(sorted(unknown_strata))}")
+        return config
+
+
+# Metrics whose per-example values are 0/1 (paired proportions)
+BINARY_METRICS = ("quality_pass", "accuracy")
+
+
+def _wilson(successes: float, n: int, z: float) -> Tuple[float, float]:
+    p = successes / n
+    centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def paired_proportion_ci(pairs: Sequence[Tuple[float, float]], alpha: float) -> Dict[str, float]:
+    """
+    Newcombe (1998) method 10 interval for p(run) - p(baseline) over (run, baseline) 0/1 pairs:
+    Wilson score intervals of both margins combined with the continuity-corrected phi of the 2x2 table.
+    """
+    n = len(pairs)
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    both = sum(1 for r, b in pairs if r and b)
+    gained = sum(1 for r, b in pairs if r and not b)
+    lost = sum(1 for r, b in pairs if b and not r)
+    neither = n - both - gained - lost
+    p1, p2 = (both + gained) / n, (both + lost) / n
+    l1, u1 = _wilson(both + gained, n, z)
+    l2, u2 = _wilson(both + lost, n, z)
+    denom = math.sqrt((both + gained) * (lost + neither) * (both + lost) * (gained + neither))
+    cross = both * neither - gained * lost
+    if cross > 0:
+        cross = max(cross - n / 2, 0.0)
+    phi = cross / denom if denom else 0.0
+    delta = p1 - p2
+    low = delta - math.sqrt(max(0.0, (p1 - l1) ** 2 - 2 * phi * (p1 - l1) * (u2 - p2) + (u2 - p2) ** 2))
+    high = delta + math.sqrt(max(0.0, (u1 - p1) ** 2 - 2 * phi * (u1 - p1) * (p2 - l2) + (p2 - l2) ** 2))
+    return {"mean": delta, "ci_low": max(-1.0, low), "ci_high": min(1.0, high), "n": n}
+
+
+def mean_diff_ci(diffs: Sequence[float], alpha: float) -> Dict[str, float]:
+    """
+    Normal interval for the mean of per-example differences in [-1, 1]; the standard deviation is floored
+    at that of one changed example among n, so unchanged prefixes do not give a zero-width interval.
+    """
+    n = len(diffs)
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    mean = sum(diffs) / n
+    var = sum((d - mean) ** 2 for d in diffs) / (n - 1) if n > 1 else 1.0
+    half = z * math.sqrt(max(var, 1.0 / n) / n)
+    return {"mean": mean, "ci_low": max(-1.0, mean - half), "ci_high": min(1.0, mean + half), "n": n}
+
+
+def example_key(record: Dict[str, Any]) -> Tuple[str, str]:
+    """(split, uid) of a scorecard: the same uid may be processed once per split."""
+    meta = record.get("meta") or {}
+    return str(meta.get("split") or record.get("split") or ""), str(meta.get("text_id") or record.get("uid") or "")
+
+
+def baseline_scores(path: Path, metric: str) -> Dict[Tuple[str, str], float]:
+    """(split, uid) -> key metric of a stored run (run dir or scorecards file); the last row of a key wins."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / "scorecards.jsonl"
+    if not path.exists():
+        raise FileNotFoundError(f"sequential baseline scorecards not found: {path}")
+    fn = EXAMPLE_METRICS[metric]
+    out: Dict[Tuple[str, str], float] = {}
+    for record in iter_scorecards(path):
+        key, value = example_key(record), fn(record)
+        if key[1] and value is not None:
+            out[key] = value
+    return out
+
+
+def stratum_key(example: InternalExample, strata: Sequence[str] = STRATA) -> Tuple[Any, ...]:
+    patterns = get_pattern_set(example.language_code)
+    text = (example.text or "").lower()
+    values = {
+        "case_type": example.case_type or "unknown",
+        "contrast": patterns.has_contrast(text),
+        "negation": bool(patterns.negation and patterns.negation.contains_any(text)),
+    }
+    return tuple(values[s] for s in strata)
+
+
+def stratified_order(examples: Sequence[InternalExample], strata: Sequence[str] = STRATA, seed: int = 42) -> List[InternalExample]:
+    """
+    Seeded shuffle within each stratum, then interleave strata proportionally (item i of a stratum of size n
+    sits at (i + u) / n for a random offset u), so every prefix of the order is close to a stratified sample.
+    """
+    rng = random.Random(seed)
+    groups: Dict[Tuple[Any, ...], List[InternalExample]] = {}
+    for ex in examples:
+        groups.setdefault(stratum_key(ex, strata), []).append(ex)
+    keyed = []
+    for g, key in enumerate(sorted(groups, key=repr)):
+        members = groups[key]
+        rng.shuffle(members)
+        offset = rng.random()
+        keyed += [((i + offset) / len(members), g, ex) for i, ex in enumerate(members)]
+    keyed.sort(key=lambda item: (item[0], item[1]))
+    return [ex for _, _, ex in keyed]
+
+
+@dataclass
+class SequentialMonitor:
+    """Paired key-metric differences vs the baseline, with a stopping decision after each look."""
+
+    config: SequentialConfig
+    baseline: Dict[Tuple[str, str], float]
+    planned: int  # examples the run would process without stopping
+    pairs: List[Tuple[float, float]] = field(default_factory=list)  # (run, baseline) key metric
+    n_seen: int = 0
+    looks: int = 0
+    decision: Optional[str] = None
+    stopped_at: Optional[int] = None
+    ci: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def planned_looks(self) -> int:
+        paired = min(self.planned, len(self.baseline))
+        return 1 + math.ceil(max(0, paired - self.config.min_examples) / max(1, self.config.check_every))
+
+    @property
+    def done(self) -> bool:
+        return self.decision is not None
+
+    def add(self, scorecard: Dict[str, Any]) -> Optional[str]:
+        """Record one finished example; returns the decision once conclusive."""
+        self.n_seen += 1
+        if self.done:
+            return self.decision
+        base = self.baseline.get(example_key(scorecard))
+        value = EXAMPLE_METRICS[self.config.metric](scorecard)
+        if base is None or value is None:
+            return None
+        self.pairs.append((value, base))
+        n = len(self.pairs)
+        if n >= self.config.min_examples and (n - self.config.min_examples) % max(1, self.config.check_every) == 0:
+            self._look()
+        return self.decision
+
+    def _look(self) -> None:
+        self.looks += 1
+        alpha = self.config.alpha / self.planned_looks
+        if self.config.metric in BINARY_METRICS:
+            self.ci = paired_proportion_ci(self.pairs, alpha)
+        else:
+            self.ci = mean_diff_ci([r - b for r, b in self.pairs], alpha)
+        if self.ci["ci_high"] < -self.config.threshold:
+            self.decision = "regression"
+        elif self.ci["ci_low"] > -self.config.threshold:
+            self.decision = "no_regression"
+        if self.decision:
+            self.stopped_at = self.n_seen
+
+    def finish(self) -> Dict[str, Any]:
+        """Final look over every paired example when the run ended undecided; returns summary()."""
+        if not self.done and self.pairs and len(self.pairs) != self.ci.get("n"):
+            self._look()
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """Manifest block: settings, stopping point and the last CI (inconclusive when never decided)."""
+        cfg = self.config
+        return {
+            "baseline": str(cfg.baseline),
+            "metric": cfg.metric,
+            "threshold": cfg.threshold,
+            "alpha": cfg.alpha,
+            "min_examples": cfg.min_examples,
+            "check_every": cfg.check_every,
+            "strata": list(cfg.strata),
+            "seed": cfg.seed,
+            "decision": self.decision or "inconclusive",
+            "stopped_early": self.stopped_at is not None and self.stopped_at < self.planned,
+            "processed": self.n_seen,
+            "planned": self.planned,
+            "paired": len(self.pairs),
+            "looks": self.looks,
+            "planned_looks": self.planned_looks,
+            "mean_delta": self.ci.get("mean"),
+            "ci_low": self.ci.get("ci_low"),
+            "ci_high": self.ci.get("ci_high"),
+            "saved_fraction": round(1 - self.n_seen / self.planned, 4) if self.planned else 0.0,
+        }
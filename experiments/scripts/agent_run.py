@@ -8,7 +8,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from evaluation.baselines import make_runner, resolve_run_mode
-from tools.backbone_client import BackboneClient
+from tools.backbone_pool import build_backbone
 from tools.data_tools import InternalExample
 
 
@@ -33,7 +33,7 @@ def main():
     mode = resolve_run_mode(args.mode, os.getenv("RUN_MODE"), cfg.get("run_mode") or cfg.get("mode"))
 
     backbone_cfg = cfg.get("backbone", {})
-    backbone = BackboneClient(provider=backbone_cfg.get("provider"), model=backbone_cfg.get("model"))
+    backbone = build_backbone(backbone_cfg)
 
     modes = ["proposed", "bl1", "bl2", "bl3"] if mode == "all" else [mode]
 
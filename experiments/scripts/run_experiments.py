@@ -7,24 +7,36 @@ import os
 import subprocess
 import sys
 import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from evaluation.baselines import make_runner, resolve_run_mode
-from tools.backbone_client import BackboneClient
+from evaluation.sequential import SequentialConfig, SequentialMonitor, baseline_scores, stratified_order
+from tools.backbone_pool import BackbonePool, build_backbone
 from tools.data_tools import InternalExample
-from tools.llm_runner import default_errors_path
-from data.datasets.loader import load_datasets, resolve_dataset_paths, BlockedDatasetPathError
+from tools.llm_runner import default_errors_path, prefix_scope
+from data.datasets.loader import (
+    BlockedDatasetPathError,
+    iter_split_examples,
+    load_datasets,
+    resolve_dataset_paths,
+    split_is_configured,
+)
+from data.datasets.cache import snapshot_cache_enabled, split_snapshot_key
 from agents.prompts import PROMPT_DIR
-from tools.demo_sampler import DemoSampler, compute_eval_hashes
+from tools.demo_sampler import DemoSampler, _compute_text_hash
+from tools.near_duplicate import NearDuplicateIndex, summarize_near_duplicates
+from tools.output_index import OutputIndexWriter, index_path_for
+from tools.trace_format import render_output, resolve_trace_level
 from tools.pattern_loader import load_patterns
 
 # Reuse existing scorecard generator to avoid metric drift
 from scripts.scorecard_from_smoke import make_scorecard
-from tools.aux_hf_runner import build_hf_signal
 
 
 # -------------- Hashing / utils --------------
@@ -88,30 +100,63 @@ def _load_allow_terms(path: Optional[str]) -> Tuple[set[str], Optional[str]]:
     return terms, _sha256_file(allow_path)
 
 
-def _flatten_examples(train: Sequence[InternalExample], valid: Sequence[InternalExample], test: Sequence[InternalExample]) -> List[InternalExample]:
-    result: List[InternalExample] = []
-    result.extend(train or [])
-    result.extend(valid or [])
-    result.extend(test or [])
-    return result
+def _iter_processing_examples(
+    data_cfg: Dict[str, Any],
+    processing_splits: Sequence[str],
+    materialized: Dict[str, Sequence[InternalExample]],
+) -> Iterator[InternalExample]:
+    """
+    Yield inference-loop examples from only the given splits (P1: paper eval-only), in train/valid/test order.
+    Splits already materialized (demo pool) are reused; the rest are streamed from disk so the loop never
+    holds a whole split in memory.
+    """
+    want = set(processing_splits)
+    for split in ("train", "valid", "test"):
+        if split not in want:
+            continue
+        if split in materialized:
+            yield from materialized[split]
+        elif split_is_configured(data_cfg, split):
+            yield from iter_split_examples(data_cfg, split)
 
 
-def _examples_from_splits(
-    train: Sequence[InternalExample],
-    valid: Sequence[InternalExample],
-    test: Sequence[InternalExample],
+def _scan_processing_examples(
+    data_cfg: Dict[str, Any],
     processing_splits: Sequence[str],
-) -> List[InternalExample]:
-    """Build the example list for the inference loop from only the given splits (P1: paper eval-only)."""
-    want = set(processing_splits)
-    result: List[InternalExample] = []
-    if "train" in want:
-        result.extend(train or [])
-    if "valid" in want:
-        result.extend(valid or [])
-    if "test" in want:
-        result.extend(test or [])
-    return result
+    materialized: Dict[str, Sequence[InternalExample]],
+    *,
+    eval_splits: Iterable[str],
+    leakage_guard: bool,
+    near_dup_index: Optional[NearDuplicateIndex] = None,
+) -> Dict[str, Any]:
+    """
+    One streaming pass over the processing splits collecting what the run needs up front
+    (split counts, eval uids/text hashes for demo exclusion, language codes) and enforcing the leakage guard.
+    Eval texts are also added to near_dup_index when given (MinHash signatures for demo near-duplicate filtering).
+    """
+    eval_split_set = set(eval_splits)
+    split_counts = {"train": 0, "valid": 0, "test": 0}
+    uids: set[str] = set()
+    text_hashes: set[str] = set()
+    language_codes: set[str] = set()
+    for ex in _iter_processing_examples(data_cfg, processing_splits, materialized):
+        if leakage_guard:
+            _enforce_leakage_guard((ex,), split=ex.split, source_path=_resolve_split_source_path(data_cfg, ex.split))
+        if ex.split in split_counts:
+            split_counts[ex.split] += 1
+        uids.add(ex.uid)
+        language_codes.add(ex.language_code or "unknown")
+        if ex.split in eval_split_set:
+            text_hashes.add(_compute_text_hash(ex.text))
+            if near_dup_index is not None:
+                near_dup_index.add(ex.uid, ex.text)
+    return {
+        "split_counts": split_counts,
+        "count": sum(split_counts.values()),
+        "uids": uids,
+        "text_hashes": text_hashes,
+        "language_codes": language_codes,
+    }
 
 
 def _resolve_split_source_path(data_cfg: Dict[str, Any], split: str) -> Optional[str]:
@@ -238,13 +283,14 @@ def _attach_case_meta(
         }
     )
     result.meta = meta
+    input_hash = _sha256_text(example.text)
     for tr in getattr(result, "process_trace", []) or []:
         tr.case_type = case_type
         tr.split = split
         tr.uid = uid
         tr.language_code = example.language_code or "unknown"
         tr.domain_id = example.domain_id or "unknown"
-        tr.input_hash = tr.input_hash or _sha256_text(example.text)
+        tr.input_hash = tr.input_hash or input_hash
         _inflate_call_metadata(tr)
 
 
@@ -304,9 +350,13 @@ def _build_case_trace(
     cfg_hash: str,
     latency_sec: float,
     prompt_versions: Dict[str, Optional[str]],
+    stages: Optional[List[Dict[str, Any]]] = None,
+    trace_level: str = "full",
 ) -> Dict[str, Any]:
-    stages = [tr.model_dump() if hasattr(tr, "model_dump") else tr for tr in getattr(result, "process_trace", [])]
-    return {
+    """stages: process_trace as already rendered for outputs.jsonl (dumped from result when None)."""
+    if stages is None:
+        stages = [tr.model_dump() if hasattr(tr, "model_dump") else tr for tr in getattr(result, "process_trace", [])]
+    row = {
         "uid": example.uid,
         "case_type": example.case_type,
         "split": example.split,
@@ -329,6 +379,9 @@ def _build_case_trace(
         "demo_k": result.meta.get("demo_k") if isinstance(result.meta, dict) else None,
         "demo_seed": result.meta.get("demo_seed") if isinstance(result.meta, dict) else None,
     }
+    if trace_level != "full":
+        row["trace_level"] = trace_level
+    return row
 
 
 def _infer_run_purpose(cfg: Dict[str, Any], cfg_path: str) -> str:
@@ -440,6 +493,8 @@ def _write_manifest(
     *,
     run_id: str,
     mode: str,
+    runner_mode: Optional[str] = None,
+    errors_path: Optional[str] = None,
     cfg: Dict[str, Any],
     cfg_path: str,
     data_cfg: Dict[str, Any],
@@ -507,9 +562,17 @@ def _write_manifest(
             "splits_loaded": list(splits_loaded) if splits_loaded else None,
         },
         "mode": mode,
+        "runner_mode": runner_mode or mode,  # differs from mode for ablation variants (mode = variant name)
+        "errors_path": errors_path,
         "blocked_path_error": blocked_path_error,
         "integrity": integrity or {},
     }
+    if snapshot_cache_enabled(data_cfg) and not blocked_path_error:
+        manifest["dataset"]["snapshots"] = {
+            split: split_snapshot_key(data_cfg, split)
+            for split in ("train", "valid", "test")
+            if split_is_configured(data_cfg, split)
+        }
     if integrity is not None:
         manifest["integrity"] = integrity
     if isinstance(eval_paths, dict) and eval_paths:
@@ -532,11 +595,143 @@ def read_config(path: str) -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
+RUNNER_MODES = ("proposed", "bl1", "bl2", "bl3")
+
+
+@dataclass
+class _ModeRun:
+    """One output directory of an invocation: a run mode, or an ablation variant of the base config."""
+
+    name: str
+    runner_mode: str
+    cfg: Dict[str, Any]
+    cfg_path: str
+    cfg_hash: str
+    cfg_canonical: str
+    run_id: str
+    runner: Any = None
+    demo_k: int = 0
+    outdir: Path = field(default_factory=Path)
+    report_dir: Path = field(default_factory=Path)
+    manifest_path: Path = field(default_factory=Path)
+    f_out: Any = None
+    out_index: Optional[OutputIndexWriter] = None
+    f_trace: Any = None
+    f_raw: Any = None
+    trace_level: str = "full"
+    f_score: Any = None
+    demo_overlap_removed: int = 0
+    demo_near_dup_removed: int = 0
+
+    @property
+    def output_path(self) -> Path:
+        return self.outdir / "outputs.jsonl"
+
+    @property
+    def output_index_path(self) -> Path:
+        return index_path_for(self.output_path)
+
+    @property
+    def trace_path(self) -> Path:
+        return self.outdir / "traces.jsonl"
+
+    @property
+    def raw_responses_path(self) -> Path:
+        return self.outdir / "raw_responses.jsonl"
+
+    @property
+    def scorecard_path(self) -> Path:
+        return self.outdir / "scorecards.jsonl"
+
+    @property
+    def errors_path(self) -> str:
+        """Structured-call error log; the runner writes under the runner mode's bucket, not the variant name."""
+        return (self.cfg.get("pipeline") or {}).get("errors_path") or default_errors_path(self.run_id, self.runner_mode)
+
+    def manifest_files(self) -> List[Path]:
+        return [self.outdir / "manifest.json", self.report_dir / "manifest.json"]
+
+
+def _plan_mode_runs(
+    mode: str,
+    cfg: Dict[str, Any],
+    cfg_path: str,
+    run_id: str,
+    *,
+    ablation_configs: Optional[Sequence[str]] = None,
+) -> List[_ModeRun]:
+    """
+    Mode runs of one invocation: `mode` may be one mode, a comma-separated list, or "all"; each ablation
+    config adds a variant named after its file stem whose `pipeline` block overrides the base one.
+    Variants share the base data/backbone (examples and calls must be the same for prefixes to be shared).
+    """
+    names: List[str] = []
+    for part in (mode or "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        for name in RUNNER_MODES if part == "all" else [part]:
+            if name not in RUNNER_MODES:
+                raise ValueError(f"Unsupported run_mode '{name}' (expected one of {', '.join(RUNNER_MODES)}, all)")
+            if name not in names:
+                names.append(name)
+    cfg_hash, cfg_canonical = _hash_cfg(cfg)
+    runs = [_ModeRun(m, m, cfg, cfg_path, cfg_hash, cfg_canonical, f"{run_id}_{m}") for m in names]
+
+    for variant_path in ablation_configs or []:
+        variant = read_config(variant_path) or {}
+        name = Path(variant_path).stem
+        if any(r.name == name for r in runs):
+            raise ValueError(f"Duplicate mode/variant name '{name}'")
+        for key in ("data", "backbone", "data_roles", "demo"):
+            if key in variant and variant[key] != cfg.get(key):
+                print(f"[warn] {variant_path}: '{key}' differs from {cfg_path}; variants share the base {key}", file=sys.stderr)
+        runner_mode = str(variant.get("run_mode") or "proposed").lower()
+        if runner_mode not in RUNNER_MODES:
+            runner_mode = "proposed"
+        merged = {**cfg, "pipeline": {**(cfg.get("pipeline") or {}), **(variant.get("pipeline") or {})}}
+        merged_hash, merged_canonical = _hash_cfg(merged)
+        runs.append(_ModeRun(name, runner_mode, merged, variant_path, merged_hash, merged_canonical, f"{run_id}_{name}"))
+    if not runs:
+        raise ValueError("No run modes selected")
+    return runs
+
+
+def _mode_demo_k(runner_mode: str, demo_k: int, enabled_for: Iterable[str], force_proposed: bool) -> int:
+    """
+    Demo enable/disable per mode. Keyed on the runner mode, so ablation variants of proposed use the same
+    demos (and prompts) as proposed itself.
+    """
+    enabled_for = set(enabled_for)
+    if enabled_for and runner_mode not in enabled_for:
+        return 0
+    if runner_mode == "proposed" and not force_proposed and "proposed" not in enabled_for:
+        return 0
+    return demo_k
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", type=str, default="experiments/configs/default.yaml")
     parser.add_argument("--run-id", type=str, default=None)
-    parser.add_argument("--mode", type=str, choices=["proposed", "bl1", "bl2", "bl3", "all"], default=None, help="Pipeline mode (CLI overrides config/env).")
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default=None,
+        help="Pipeline mode: proposed|bl1|bl2|bl3|all or a comma-separated list (CLI overrides config/env).",
+    )
+    parser.add_argument(
+        "--ablation-configs",
+        nargs="*",
+        default=None,
+        help="Ablation configs run alongside the mode(s); their pipeline block overrides the base config's.",
+    )
+    parser.add_argument(
+        "--sequential-baseline",
+        type=str,
+        default=None,
+        help="Baseline run dir (or scorecards.jsonl) for sequential early stopping; overrides/enables the config's sequential block.",
+    )
     args = parser.parse_args()
 
     cfg_path = args.config
@@ -544,7 +739,7 @@ def main():
     run_id = cfg.get("run_id") or args.run_id or "run"
     mode = resolve_run_mode(args.mode, os.getenv("RUN_MODE"), cfg.get("run_mode") or cfg.get("mode"))
     backbone_cfg = cfg.get("backbone", {})
-    backbone = BackboneClient(provider=backbone_cfg.get("provider"), model=backbone_cfg.get("model"))
+    backbone = build_backbone(backbone_cfg)
 
     blocked_error = None
     resolved_data_cfg = cfg["data"]
@@ -586,10 +781,17 @@ def main():
         run_purpose = _infer_run_purpose(cfg, cfg_path)
         demo_pool_splits = set(data_roles.get("demo_pool", ["train"]))
         splits_to_load = processing_splits_set if demo_k == 0 else (processing_splits_set | demo_pool_splits)
-        train, valid, test = load_datasets(resolved_data_cfg, splits_to_load=splits_to_load)
+        # Only the demo pool is materialized (sampling needs random access); processing splits are streamed.
+        demo_splits_to_load = demo_pool_splits if demo_k > 0 else set()
+        demo_train, demo_valid, demo_test = load_datasets(resolved_data_cfg, splits_to_load=demo_splits_to_load)
+        materialized = {
+            split: examples
+            for split, examples in (("train", demo_train), ("valid", demo_valid), ("test", demo_test))
+            if split in demo_splits_to_load and split_is_configured(resolved_data_cfg, split)
+        }
     except BlockedDatasetPathError as e:
         blocked_error = str(e)
-        train, valid, test = [], [], []
+        materialized = {}
         data_roles = cfg.get("data_roles") or {}
         processing_splits = []
         processing_splits_set = set()
@@ -604,16 +806,38 @@ def main():
 
     leakage_guard_enabled = bool(cfg.get("pipeline", {}).get("leakage_guard", True))
     if leakage_guard_enabled:
-        for split_name, split_examples in (("train", train), ("valid", valid), ("test", test)):
+        for split_name, split_examples in materialized.items():
+            if split_name in processing_splits_set:
+                continue  # checked during the processing scan below
             _enforce_leakage_guard(
                 split_examples,
                 split=split_name,
                 source_path=_resolve_split_source_path(resolved_data_cfg, split_name),
             )
-    all_loaded = _flatten_examples(train, valid, test)
-    if not all_loaded:
+    # Near-duplicate demo filter (MinHash/LSH over eval texts); default follows the exact-hash filter policy
+    near_dup_enabled = bool(
+        demo_cfg.get("forbid_near_duplicates", run_purpose == "paper" or demo_cfg.get("hash_filter", False))
+    )
+    near_dup_index = (
+        NearDuplicateIndex(float(demo_cfg.get("near_duplicate_threshold", 0.8)))
+        if demo_k > 0 and near_dup_enabled
+        else None
+    )
+    processing_scan = _scan_processing_examples(
+        resolved_data_cfg,
+        processing_splits,
+        materialized,
+        eval_splits=eval_splits,
+        leakage_guard=leakage_guard_enabled,
+        near_dup_index=near_dup_index,
+    )
+    split_counts = dict(processing_scan["split_counts"])
+    for split_name, split_examples in materialized.items():
+        split_counts[split_name] = len(split_examples)
+    if not any(split_counts.values()):
         raise ValueError("No examples found in any split (train/valid/test).")
-    language_codes = {ex.language_code or "unknown" for ex in all_loaded}
+    language_codes = set(processing_scan["language_codes"])
+    language_codes.update(ex.language_code or "unknown" for exs in materialized.values() for ex in exs)
     for lang in sorted(language_codes):
         _, path, sha = load_patterns(lang)
         if path and path.exists():
@@ -621,7 +845,7 @@ def main():
 
     # demo_pool from loaded splits; used only when demo.k>0 for sampling
     demo_pool_splits = set(data_roles.get("demo_pool", ["train"]))
-    demo_pool = [ex for ex in (list(train) + list(valid) + list(test)) if ex.split in demo_pool_splits]
+    demo_pool = [ex for split_examples in materialized.values() for ex in split_examples if ex.split in demo_pool_splits]
     demo_sampler = DemoSampler(demo_pool)
 
     # Eval gold (optional): load gold_triplets by uid for scorecard injection
@@ -644,41 +868,53 @@ def main():
             "Policy P1: paper runs are eval-only (valid/test)."
         )
 
-    # Build examples for the inference loop from processing_splits only (no train in loop when paper + demo.k=0)
-    examples = _examples_from_splits(train, valid, test, processing_splits)
-    if not examples:
+    # The inference loop streams processing_splits only (no train in loop when paper + demo.k=0)
+    processing_count = processing_scan["count"]
+    if not processing_count:
         raise ValueError("No examples in processing_splits; check report_sources/blind_sources or report_set/blind_set.")
-    eval_uid_set = {ex.uid for ex in examples}
-    eval_hashes = compute_eval_hashes(examples, eval_splits)
+    eval_uid_set = processing_scan["uids"]
+    eval_hashes = processing_scan["text_hashes"]
 
-    cfg_hash, cfg_canonical = _hash_cfg(cfg)
     prompt_versions = _prompt_hashes()
     allow_terms, allow_hash = _load_allow_terms(cfg.get("aspect_allowlist"))
     strict_integrity = bool(cfg.get("pipeline", {}).get("strict_integrity", False))
 
-    modes = ["proposed", "bl1", "bl2", "bl3"] if mode == "all" else [mode]
+    mode_runs = _plan_mode_runs(mode, cfg, cfg_path, run_id, ablation_configs=args.ablation_configs)
+    # Sequential regression check: stratified order, stop once every mode's CI vs the baseline is conclusive
+    seq_cfg = SequentialConfig.from_cfg(cfg.get("sequential"), args.sequential_baseline)
+    monitors: Dict[str, SequentialMonitor] = {}
+    if seq_cfg is not None:
+        seq_baseline = baseline_scores(Path(seq_cfg.baseline), seq_cfg.metric)
+        monitors = {mr.name: SequentialMonitor(seq_cfg, seq_baseline, processing_count) for mr in mode_runs}
+        print(
+            f"[sequential] baseline={seq_cfg.baseline} ({len(seq_baseline)} scored) | metric={seq_cfg.metric} "
+            f"threshold={seq_cfg.threshold} alpha={seq_cfg.alpha} | strata={','.join(seq_cfg.strata)}"
+        )
+    # Modes/variants of one run process each example back to back inside a prefix_scope, so identical
+    # structured calls (Stage1, debate, ...) are computed once per example and reused by the others.
+    share_prefixes = len(mode_runs) > 1
+    prefix_calls = prefix_shared = 0
+
+    # Enable hash-based demo filtering for paper runs (default on), optional for smoke/sanity
+    enable_demo_hash_filter = run_purpose == "paper" or cfg.get("demo", {}).get("hash_filter", False)
+    demo_forbid_hashes = eval_hashes if enable_demo_hash_filter else None
 
-    for m in modes:
-        run_id_mode = f"{run_id}_{m}"
-        runner = make_runner(run_mode=m, backbone=backbone, config=cfg.get("pipeline", {}), run_id=run_id_mode)
+    for mr in mode_runs:
+        m = mr.name
+        mr.runner = make_runner(run_mode=mr.runner_mode, backbone=backbone, config=mr.cfg.get("pipeline", {}), run_id=mr.run_id)
+        mr.trace_level = resolve_trace_level((mr.cfg.get("pipeline") or {}).get("trace_level"))
 
-        # Demo enable/disable per mode
-        demo_k_mode = demo_k
-        if demo_enabled_for:
-            if m not in demo_enabled_for:
-                demo_k_mode = 0
-        if m == "proposed" and not force_proposed and "proposed" not in demo_enabled_for:
-            demo_k_mode = 0
+        mr.demo_k = _mode_demo_k(mr.runner_mode, demo_k, demo_enabled_for, force_proposed)
 
         base_outdir = cfg.get("output_dir")
-        outdir = Path(base_outdir) / run_id_mode if base_outdir else Path(f"results/{run_id_mode}")
-        outdir.mkdir(parents=True, exist_ok=True)
-        report_dir = Path("experiments/reports") / run_id_mode
+        mr.outdir = Path(base_outdir) / mr.run_id if base_outdir else Path(f"results/{mr.run_id}")
+        mr.outdir.mkdir(parents=True, exist_ok=True)
+        mr.report_dir = Path("experiments/reports") / mr.run_id
 
         # Run-start log: loaded counts, processing_splits, processing_count, policy
         print(
-            f"[{m}] run start | loaded counts train={len(train)} valid={len(valid)} test={len(test)} | "
-            f"processing_splits={processing_splits} | processing_count={len(examples)}"
+            f"[{m}] run start | loaded counts train={split_counts['train']} valid={split_counts['valid']} test={split_counts['test']} | "
+            f"processing_splits={processing_splits} | processing_count={processing_count}"
         )
         if run_purpose == "paper":
             print(f"[{m}] policy P1: paper is eval only (valid/test); train not in inference loop when demo.k=0")
@@ -686,23 +922,25 @@ def main():
         # Prepare integrity tracking dict (demo overlap removal count added later)
         integrity_info: Dict[str, Any] = {}
 
-        manifest_path = _write_manifest(
+        mr.manifest_path = _write_manifest(
             run_id=run_id,
             mode=m,
-            cfg=cfg,
-            cfg_path=cfg_path,
+            runner_mode=mr.runner_mode,
+            errors_path=mr.errors_path,
+            cfg=mr.cfg,
+            cfg_path=mr.cfg_path,
             data_cfg=resolved_data_cfg,
-            train_count=len(train),
-            valid_count=len(valid),
-            test_count=len(test),
+            train_count=split_counts["train"],
+            valid_count=split_counts["valid"],
+            test_count=split_counts["test"],
             backbone_cfg=backbone_cfg,
             allowlist_path=cfg.get("aspect_allowlist"),
             allowlist_hash=allow_hash,
             prompt_versions=prompt_versions,
-            cfg_hash=cfg_hash,
-            cfg_canonical=cfg_canonical,
+            cfg_hash=mr.cfg_hash,
+            cfg_canonical=mr.cfg_canonical,
             resolved_paths=resolved_paths,
-            manifest_paths=[outdir / "manifest.json", report_dir / "manifest.json"],
+            manifest_paths=mr.manifest_files(),
             allowed_roots=allowed_roots,
             blocked_path_error=blocked_error,
             pattern_versions=pattern_versions,
@@ -712,7 +950,7 @@ def main():
             eval_paths=eval_paths_for_manifest if eval_paths_for_manifest else None,
             data_roles=data_roles,
             processing_splits=processing_splits,
-            processing_count=len(examples),
+            processing_count=processing_count,
             splits_loaded=list(splits_to_load) if splits_to_load else None,
         )
 
@@ -720,174 +958,245 @@ def main():
             # Fail-fast after logging manifest
             raise RuntimeError(blocked_error)
 
-        output_path = outdir / "outputs.jsonl"
-        trace_path = outdir / "traces.jsonl"
-        scorecard_path = outdir / "scorecards.jsonl"
-
-        # Enable hash-based demo filtering for paper runs (default on), optional for smoke/sanity
-        enable_demo_hash_filter = run_purpose == "paper" or cfg.get("demo", {}).get("hash_filter", False)
-        demo_forbid_hashes = eval_hashes if enable_demo_hash_filter else None
-
-        # Track demo exclusion stats for integrity logging
-        total_demo_overlap_removed = 0
-
-        with output_path.open("w", encoding="utf-8", newline="\n") as f_out, trace_path.open(
-            "w", encoding="utf-8", newline="\n"
-        ) as f_trace, scorecard_path.open("w", encoding="utf-8", newline="\n") as f_score:
-            for idx, ex in enumerate(examples):
-                normalized = _normalize_example(ex, idx=idx)
-                demo_result = demo_sampler.sample_with_stats(
-                    demo_k_mode, demo_seed, forbid_uids=eval_uid_set, forbid_hashes=demo_forbid_hashes
-                )
-                demo_examples = demo_result.demos
-                total_demo_overlap_removed += demo_result.removed_by_hash
-                demo_uids = [d.uid for d in demo_examples]
-                demo_texts = [d.text for d in demo_examples]
-                meta_aug = dict(normalized.metadata or {})
-                meta_aug["demo_texts"] = demo_texts
-                meta_aug["demo_uids"] = demo_uids
-                normalized = InternalExample(
-                    uid=normalized.uid,
-                    text=normalized.text,
-                    case_type=normalized.case_type,
-                    split=normalized.split,
-                    label=normalized.label,
-                    target=normalized.target,
-                    span=normalized.span,
-                    metadata=meta_aug,
-                )
-                start = time.time()
-                result = runner.run(normalized)
-                latency = time.time() - start
-                # attach demo info before meta propagation
-                if isinstance(result.meta, dict):
-                    result.meta["demo_uids"] = demo_uids
-                    result.meta["demo_k"] = demo_k_mode
-                    result.meta["demo_seed"] = demo_seed
-                _attach_case_meta(
-                    result,
-                    normalized,
-                    cfg_hash,
-                    manifest_path,
-                    latency_sec=latency,
-                    backbone_model_id=backbone_cfg.get("model"),
-                )
-                # Profile for latency gate and scorecard: smoke | regression | paper_main
-                profile = "smoke" if run_purpose == "smoke" else ("paper_main" if run_purpose == "paper" else "regression")
-                if isinstance(result.meta, dict):
-                    result.meta["profile"] = profile
-                _check_case_integrity(result, normalized, strict=strict_integrity)
-
-                span_flag = any(
-                    _span_out_of_range(normalized.text, tr.output) for tr in getattr(result, "process_trace", []) or []
-                )
-                if isinstance(result.meta, dict):
-                    result.meta["span_out_of_range"] = span_flag
-                if span_flag and strict_integrity:
-                    raise RuntimeError(f"[span_integrity] uid={normalized.uid} split={normalized.split} span out of range")
-
-                payload = result.model_dump()
-                # HF aux signal only (no impact on Validator/Moderator); append-only, toggleable
-                pipeline_cfg = cfg.get("pipeline") or {}
-                aux_hf_enabled = pipeline_cfg.get("aux_hf_enabled", False)
-                aux_hf_checkpoint = pipeline_cfg.get("aux_hf_checkpoint") or ""
-                if aux_hf_enabled and aux_hf_checkpoint and not (aux_hf_checkpoint.strip().startswith("llm:")):
-                    stage1_final = (payload.get("stage1_ate") or {}).get("label") or "neutral"
-                    stage2_final = (payload.get("final_result") or {}).get("label") or (payload.get("moderator") or {}).get("final_label") or stage1_final or "neutral"
-                    aux_hf_id2label = pipeline_cfg.get("aux_hf_id2label")
-                    if isinstance(aux_hf_id2label, list):
-                        aux_hf_id2label = {i: str(v) for i, v in enumerate(aux_hf_id2label)}
-                    hf_signal = build_hf_signal(
-                        normalized.text,
-                        aux_hf_checkpoint,
-                        aux_hf_id2label,
-                        stage1_final,
-                        stage2_final,
-                        model_id=pipeline_cfg.get("aux_hf_model_id"),
-                    )
-                    payload["aux_signals"] = {"hf": hf_signal} if hf_signal else {}
-                else:
-                    payload.setdefault("aux_signals", {})
-                f_out.write(json.dumps(payload, ensure_ascii=False) + "\n")
-
-                case_trace = _build_case_trace(
-                    normalized,
-                    result,
-                    run_id=run_id_mode,
-                    manifest_path=manifest_path,
-                    cfg_hash=cfg_hash,
-                    latency_sec=latency,
-                    prompt_versions=prompt_versions,
-                )
-                f_trace.write(json.dumps(case_trace, ensure_ascii=False) + "\n")
-
-                if isinstance(payload.get("meta"), dict) and "profile" not in payload["meta"]:
-                    payload["meta"]["profile"] = "smoke" if run_purpose == "smoke" else ("paper_main" if run_purpose == "paper" else "regression")
-                scorecard = make_scorecard(payload, extra_allow=allow_terms)
-                if uid_to_gold and normalized.uid in uid_to_gold:
-                    scorecard.setdefault("inputs", {})["gold_triplets"] = uid_to_gold[normalized.uid]
-                meta = scorecard.get("meta", {})
-                meta.update(
-                    {
-                        "run_id": run_id_mode,
-                        "text_id": normalized.uid,
-                        "case_type": normalized.case_type,
-                        "split": normalized.split,
-                        "language_code": normalized.language_code,
-                        "domain_id": normalized.domain_id,
-                        "manifest_path": str(manifest_path),
-                        "cfg_hash": cfg_hash,
-                        "backbone_model_id": result.meta.get("backbone_model_id") if isinstance(result.meta, dict) else None,
-                        "latency_ms": result.meta.get("latency_ms") if isinstance(result.meta, dict) else None,
-                        "demo_uids": result.meta.get("demo_uids") if isinstance(result.meta, dict) else demo_uids,
-                        "demo_k": demo_k_mode,
-                        "demo_seed": demo_seed,
-                        "span_out_of_range": bool(result.meta.get("span_out_of_range")) if isinstance(result.meta, dict) else span_flag,
-                    }
-                )
-                scorecard["meta"] = meta
-                scorecard.setdefault("summary", {})
-                scorecard["summary"]["span_out_of_range"] = bool(
-                    result.meta.get("span_out_of_range") if isinstance(result.meta, dict) else span_flag
-                )
-                f_score.write(json.dumps(scorecard, ensure_ascii=False) + "\n")
-
-        print(f"[{m}] Saved outputs to {output_path}")
-        print(f"[{m}] Saved traces to {trace_path}")
-        print(f"[{m}] Saved scorecards to {scorecard_path}")
-        run_errors_path = cfg.get("pipeline", {}).get("errors_path") or default_errors_path(run_id_mode, m)
-        print(f"Errors (if any) are logged to {run_errors_path}")
-
-        # Update manifest with final integrity info (demo overlap counts, forbid_hashes source)
-        if total_demo_overlap_removed > 0 or enable_demo_hash_filter or data_roles.get("report_sources") is not None or data_roles.get("blind_sources") is not None:
+    # Serving counters cover every mode of this invocation (modes interleave per example when shared)
+    if backbone.call_policy is not None:
+        backbone.call_policy.stats.reset()
+    if isinstance(backbone, BackbonePool):
+        backbone.reset_stats()
+
+    def run_case(mr: _ModeRun, normalized: InternalExample) -> Dict[str, Any]:
+        demo_result = demo_sampler.sample_with_stats(
+            mr.demo_k,
+            demo_seed,
+            forbid_uids=eval_uid_set,
+            forbid_hashes=demo_forbid_hashes,
+            forbid_near_duplicates=near_dup_index,
+        )
+        demo_examples = demo_result.demos
+        mr.demo_overlap_removed += demo_result.removed_by_hash
+        mr.demo_near_dup_removed += demo_result.removed_by_near_duplicate
+        demo_uids = [d.uid for d in demo_examples]
+        demo_texts = [d.text for d in demo_examples]
+        meta_aug = dict(normalized.metadata or {})
+        meta_aug["demo_texts"] = demo_texts
+        meta_aug["demo_uids"] = demo_uids
+        normalized = InternalExample(
+            uid=normalized.uid,
+            text=normalized.text,
+            case_type=normalized.case_type,
+            split=normalized.split,
+            label=normalized.label,
+            target=normalized.target,
+            span=normalized.span,
+            metadata=meta_aug,
+        )
+        start = time.time()
+        result = mr.runner.run(normalized)
+        latency = time.time() - start
+        # attach demo info before meta propagation
+        if isinstance(result.meta, dict):
+            result.meta["demo_uids"] = demo_uids
+            result.meta["demo_k"] = mr.demo_k
+            result.meta["demo_seed"] = demo_seed
+        _attach_case_meta(
+            result,
+            normalized,
+            mr.cfg_hash,
+            mr.manifest_path,
+            latency_sec=latency,
+            backbone_model_id=backbone_cfg.get("model"),
+        )
+        # Profile for latency gate and scorecard: smoke | regression | paper_main
+        profile = "smoke" if run_purpose == "smoke" else ("paper_main" if run_purpose == "paper" else "regression")
+        if isinstance(result.meta, dict):
+            result.meta["profile"] = profile
+        _check_case_integrity(result, normalized, strict=strict_integrity)
+
+        span_flag = any(
+            _span_out_of_range(normalized.text, tr.output) for tr in getattr(result, "process_trace", []) or []
+        )
+        if isinstance(result.meta, dict):
+            result.meta["span_out_of_range"] = span_flag
+        if span_flag and strict_integrity:
+            raise RuntimeError(f"[span_integrity] uid={normalized.uid} split={normalized.split} span out of range")
+
+        payload = result.model_dump()
+        # HF aux signal only (no impact on Validator/Moderator); append-only, toggleable
+        pipeline_cfg = mr.cfg.get("pipeline") or {}
+        aux_hf_enabled = pipeline_cfg.get("aux_hf_enabled", False)
+        aux_hf_checkpoint = pipeline_cfg.get("aux_hf_checkpoint") or ""
+        if aux_hf_enabled and aux_hf_checkpoint and not (aux_hf_checkpoint.strip().startswith("llm:")):
+            stage1_final = (payload.get("stage1_ate") or {}).get("label") or "neutral"
+            stage2_final = (payload.get("final_result") or {}).get("label") or (payload.get("moderator") or {}).get("final_label") or stage1_final or "neutral"
+            aux_hf_id2label = pipeline_cfg.get("aux_hf_id2label")
+            if isinstance(aux_hf_id2label, list):
+                aux_hf_id2label = {i: str(v) for i, v in enumerate(aux_hf_id2label)}
+            from tools.aux_hf_runner import build_hf_signal
+
+            hf_signal = build_hf_signal(
+                normalized.text,
+                aux_hf_checkpoint,
+                aux_hf_id2label,
+                stage1_final,
+                stage2_final,
+                model_id=pipeline_cfg.get("aux_hf_model_id"),
+            )
+            payload["aux_signals"] = {"hf": hf_signal} if hf_signal else {}
+        else:
+            payload.setdefault("aux_signals", {})
+        # payload keeps the full trace for the scorecard; outputs/traces get the configured trace_level shape
+        written = render_output(payload, mr.trace_level, raw_out=mr.f_raw)
+        output_ref = mr.out_index.write(normalized.uid, written)
+
+        case_trace = _build_case_trace(
+            normalized,
+            result,
+            run_id=mr.run_id,
+            manifest_path=mr.manifest_path,
+            cfg_hash=mr.cfg_hash,
+            latency_sec=latency,
+            prompt_versions=prompt_versions,
+            stages=written.get("process_trace") or [],
+            trace_level=mr.trace_level,
+        )
+        mr.f_trace.write(json.dumps(case_trace, ensure_ascii=False) + "\n")
+
+        if isinstance(payload.get("meta"), dict) and "profile" not in payload["meta"]:
+            payload["meta"]["profile"] = "smoke" if run_purpose == "smoke" else ("paper_main" if run_purpose == "paper" else "regression")
+        scorecard = make_scorecard(payload, extra_allow=allow_terms, output_ref=output_ref)
+        if uid_to_gold and normalized.uid in uid_to_gold:
+            scorecard.setdefault("inputs", {})["gold_triplets"] = uid_to_gold[normalized.uid]
+        meta = scorecard.get("meta", {})
+        meta.update(
+            {
+                "run_id": mr.run_id,
+                "text_id": normalized.uid,
+                "case_type": normalized.case_type,
+                "split": normalized.split,
+                "language_code": normalized.language_code,
+                "domain_id": normalized.domain_id,
+                "manifest_path": str(mr.manifest_path),
+                "cfg_hash": mr.cfg_hash,
+                "backbone_model_id": result.meta.get("backbone_model_id") if isinstance(result.meta, dict) else None,
+                "latency_ms": result.meta.get("latency_ms") if isinstance(result.meta, dict) else None,
+                "demo_uids": result.meta.get("demo_uids") if isinstance(result.meta, dict) else demo_uids,
+                "demo_k": mr.demo_k,
+                "demo_seed": demo_seed,
+                "span_out_of_range": bool(result.meta.get("span_out_of_range")) if isinstance(result.meta, dict) else span_flag,
+            }
+        )
+        scorecard["meta"] = meta
+        scorecard.setdefault("summary", {})
+        scorecard["summary"]["span_out_of_range"] = bool(
+            result.meta.get("span_out_of_range") if isinstance(result.meta, dict) else span_flag
+        )
+        mr.f_score.write(json.dumps(scorecard, ensure_ascii=False) + "\n")
+        return scorecard
+
+    with ExitStack() as stack:
+        for mr in mode_runs:
+            mr.f_out = stack.enter_context(mr.output_path.open("w", encoding="utf-8", newline="\n"))
+            f_index = stack.enter_context(mr.output_index_path.open("w", encoding="utf-8", newline="\n"))
+            mr.out_index = OutputIndexWriter(mr.f_out, f_index, file_name=mr.output_path.name)
+            mr.f_trace = stack.enter_context(mr.trace_path.open("w", encoding="utf-8", newline="\n"))
+            if mr.trace_level == "compact" and (mr.cfg.get("pipeline") or {}).get("trace_raw_responses", False):
+                mr.f_raw = stack.enter_context(mr.raw_responses_path.open("w", encoding="utf-8", newline="\n"))
+            mr.f_score = stack.enter_context(mr.scorecard_path.open("w", encoding="utf-8", newline="\n"))
+        examples: Iterable[InternalExample] = (
+            _normalize_example(ex, idx=idx)
+            for idx, ex in enumerate(_iter_processing_examples(resolved_data_cfg, processing_splits, materialized))
+        )
+        if seq_cfg is not None:
+            # uids are assigned above, before reordering (the uid fallback depends on the file position)
+            examples = stratified_order(list(examples), seq_cfg.strata, seq_cfg.seed)
+        for normalized in examples:
+            if not share_prefixes:
+                scorecards = {mode_runs[0].name: run_case(mode_runs[0], normalized)}
+            else:
+                with prefix_scope() as memo:
+                    scorecards = {mr.name: run_case(mr, normalized) for mr in mode_runs}
+                prefix_calls += memo.calls
+                prefix_shared += memo.shared
+            for name, monitor in monitors.items():
+                monitor.add(scorecards[name])
+            if monitors and all(monitor.done for monitor in monitors.values()):
+                break
+
+    prefix_stats = {"modes": [mr.name for mr in mode_runs], "calls": prefix_calls, "shared": prefix_shared}
+    if share_prefixes:
+        print(f"[prefix] {'/'.join(prefix_stats['modes'])} | reused {prefix_shared} of {prefix_calls} structured calls")
+
+    for mr in mode_runs:
+        m, outdir, report_dir = mr.name, mr.outdir, mr.report_dir
+        print(f"[{m}] Saved outputs to {mr.output_path}")
+        print(f"[{m}] Saved traces to {mr.trace_path} (trace_level={mr.trace_level})")
+        if mr.f_raw is not None:
+            print(f"[{m}] Saved raw responses to {mr.raw_responses_path}")
+        print(f"[{m}] Saved scorecards to {mr.scorecard_path}")
+        print(f"Errors (if any) are logged to {mr.errors_path}")
+
+        # Serving stats: hedging/timeouts and which pool target answered, plus prefix reuse when modes shared
+        # stages (all counters cover the whole invocation); the sequential stopping point goes to the same update
+        serving_stats: Dict[str, Any] = {}
+        if backbone.call_policy is not None:
+            call_stats = serving_stats["call_policy"] = backbone.call_policy.snapshot()
+            print(
+                f"[{m}] call policy | calls={call_stats['calls']} hedged={call_stats['hedged']} "
+                f"hedge_wins={call_stats['hedge_wins']} timeouts={call_stats['timeouts']} "
+                f"wasted_tokens={call_stats['wasted_tokens_in'] + call_stats['wasted_tokens_out']}"
+            )
+        if isinstance(backbone, BackbonePool):
+            pool_stats = serving_stats["backbone_pool"] = backbone.snapshot()
+            print(f"[{m}] backbone pool | served={pool_stats['served']} failovers={pool_stats['failovers']}")
+        if share_prefixes:
+            serving_stats["prefix_sharing"] = prefix_stats
+        if m in monitors:
+            seq = serving_stats["sequential"] = monitors[m].finish()
+            ci = f"{seq['mean_delta']:+.4f} [{seq['ci_low']:+.4f}, {seq['ci_high']:+.4f}]" if seq["paired"] else "n/a"
+            print(
+                f"[{m}] sequential | {seq['decision']} after {seq['processed']}/{seq['planned']} examples "
+                f"(paired={seq['paired']}, delta {seq['metric']}={ci}, threshold=-{seq['threshold']})"
+            )
+        if serving_stats:
             try:
-                primary_manifest = outdir / "manifest.json"
-                if primary_manifest.exists():
-                    manifest_data = json.loads(primary_manifest.read_text(encoding="utf-8"))
+                for manifest_file in mr.manifest_files():
+                    if not manifest_file.exists():
+                        continue
+                    manifest_data = json.loads(manifest_file.read_text(encoding="utf-8"))
+                    manifest_data.update(serving_stats)
+                    manifest_file.write_text(json.dumps(manifest_data, ensure_ascii=False, indent=2), encoding="utf-8")
+            except Exception as e:
+                print(f"[warn] Failed to update manifest with serving stats: {e}", file=sys.stderr)
+
+        # Update manifest with final integrity info (demo overlap counts, forbid_hashes source, near-duplicates)
+        if (
+            mr.demo_overlap_removed > 0
+            or enable_demo_hash_filter
+            or near_dup_index is not None
+            or data_roles.get("report_sources") is not None
+            or data_roles.get("blind_sources") is not None
+        ):
+            try:
+                for manifest_file in mr.manifest_files():
+                    if not manifest_file.exists():
+                        continue
+                    manifest_data = json.loads(manifest_file.read_text(encoding="utf-8"))
                     manifest_data.setdefault("integrity", {})
-                    manifest_data["integrity"]["demo_overlap_removed"] = total_demo_overlap_removed
+                    manifest_data["integrity"]["demo_overlap_removed"] = mr.demo_overlap_removed
                     manifest_data["integrity"]["demo_hash_filter_enabled"] = enable_demo_hash_filter
                     if data_roles.get("report_sources") is not None or data_roles.get("blind_sources") is not None:
                         manifest_data["integrity"]["forbid_hashes_source"] = {
                             "report_sources": data_roles.get("report_sources"),
                             "blind_sources": data_roles.get("blind_sources"),
                         }
-                    primary_manifest.write_text(json.dumps(manifest_data, ensure_ascii=False, indent=2), encoding="utf-8")
-                backup_manifest = report_dir / "manifest.json"
-                if backup_manifest.exists():
-                    backup_data = json.loads(backup_manifest.read_text(encoding="utf-8"))
-                    backup_data.setdefault("integrity", {})
-                    backup_data["integrity"]["demo_overlap_removed"] = total_demo_overlap_removed
-                    backup_data["integrity"]["demo_hash_filter_enabled"] = enable_demo_hash_filter
-                    if data_roles.get("report_sources") is not None or data_roles.get("blind_sources") is not None:
-                        backup_data["integrity"]["forbid_hashes_source"] = {
-                            "report_sources": data_roles.get("report_sources"),
-                            "blind_sources": data_roles.get("blind_sources"),
-                        }
-                    backup_manifest.write_text(json.dumps(backup_data, ensure_ascii=False, indent=2), encoding="utf-8")
+                    if near_dup_index is not None:
+                        manifest_data["integrity"]["demo_near_duplicate_removed"] = mr.demo_near_dup_removed
+                        manifest_data["integrity"]["near_duplicates"] = summarize_near_duplicates(
+                            demo_sampler.near_duplicate_matches(near_dup_index), near_dup_index
+                        )
+                    manifest_file.write_text(json.dumps(manifest_data, ensure_ascii=False, indent=2), encoding="utf-8")
             except Exception as e:
                 print(f"[warn] Failed to update manifest with integrity info: {e}", file=sys.stderr)
 
-
 if __name__ == "__main__":
     main()
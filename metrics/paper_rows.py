@@ -0,0 +1,177 @@
+"""
+Per-record scorecard readers with the paper-table semantics (scripts/build_paper_tables.py).
+
+These differ from metrics/scorecard.py on purpose and are kept as-is so paper tables stay comparable
+across versions: final = inputs.aspect_sentiments, stage1 = runtime.process_trace ATSA output (else final),
+gold without span variants, full-triplet match, F1 = NaN when gold is empty.
+metrics/run_tables.py turns these per-record values into columnar tables.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# ---------- Text & triplet helpers ----------
+
+PUNCT = ".,;:!?\"'`“”‘’()[]{}"
+
+
+def normalize_text(text: Optional[str]) -> str:
+    if text is None:
+        return ""
+    text = text.strip().lower()
+    text = text.strip(PUNCT)
+    # collapse whitespace
+    text = " ".join(text.split())
+    return text
+
+
+Triplet = Tuple[str, str, str]
+
+
+def triplet_from_sentiment(sent: Dict) -> Triplet:
+    aspect = normalize_text(sent.get("aspect_ref") or sent.get("term"))
+    opinion = normalize_text((sent.get("opinion_term") or {}).get("term"))
+    polarity = normalize_text(sent.get("polarity") or sent.get("label"))
+    return (aspect, opinion, polarity)
+
+
+def triplets_from_list(items: Iterable[Dict]) -> Set[Triplet]:
+    return {triplet_from_sentiment(it) for it in items if it}
+
+
+# ---------- Extraction from artifacts ----------
+
+
+def extract_final_triplets(sc_row: Dict) -> Set[Triplet]:
+    aspect_sents = sc_row.get("inputs", {}).get("aspect_sentiments")
+    if isinstance(aspect_sents, list):
+        return triplets_from_list(aspect_sents)
+    return set()
+
+
+def extract_stage1_triplets(sc_row: Dict) -> Set[Triplet]:
+    trace = sc_row.get("runtime", {}).get("process_trace") or []
+    for entry in trace:
+        if entry.get("stage") == "stage1" and entry.get("agent", "").lower() == "atsa":
+            sents = entry.get("output", {}).get("aspect_sentiments")
+            if isinstance(sents, list):
+                return triplets_from_list(sents)
+    # fallback to final if missing
+    return extract_final_triplets(sc_row)
+
+
+def extract_stage2_triplets(sc_row: Dict) -> Set[Triplet]:
+    # Stage2 review outputs are deltas; use final as post-review proxy.
+    return extract_final_triplets(sc_row)
+
+
+def extract_gold_triplets(sc_row: Dict) -> Optional[Set[Triplet]]:
+    gold = sc_row.get("gold_triplets") or sc_row.get("inputs", {}).get("gold_triplets")
+    if isinstance(gold, list):
+        return triplets_from_list(gold)
+    return None
+
+
+def has_structural_risk(sc_row: Dict) -> bool:
+    # scorecards flags first
+    flags = sc_row.get("flags", {})
+    if flags.get("structural_risk"):
+        return True
+    # look into validator output inside process_trace
+    trace = sc_row.get("runtime", {}).get("process_trace") or []
+    for entry in trace:
+        if entry.get("agent", "").lower() == "validator":
+            risks = entry.get("output", {}).get("structural_risks")
+            if isinstance(risks, list) and len(risks) > 0:
+                return True
+    return False
+
+
+def has_unanchored_ref(sc_row: Dict) -> bool:
+    analysis = sc_row.get("analysis_flags") or sc_row.get("flags", {}).get("analysis_flags", {})
+    if isinstance(analysis, dict) and analysis.get("unanchored_aspect_ref"):
+        return True
+    return False
+
+
+def is_targetless(sc_row: Dict) -> bool:
+    sp = sc_row.get("stage_policy_score") or {}
+    if sp.get("targetless_policy_applied"):
+        return True
+    return False
+
+
+def polarity_conflict_flag(final_triplets: Set[Triplet]) -> bool:
+    by_aspect: Dict[str, Set[str]] = defaultdict(set)
+    for aspect, _op, pol in final_triplets:
+        by_aspect[aspect].add(pol)
+    return any(len(pols) >= 2 for pols in by_aspect.values())
+
+
+def get_flags(sc_row: Dict) -> Dict[str, bool]:
+    flags = sc_row.get("flags", {}) or {}
+    return {
+        "parse_failed": bool(flags.get("parse_failed")),
+        "generate_failed": bool(flags.get("generate_failed")),
+        "fallback_used": bool(flags.get("fallback_used")),
+    }
+
+
+def fallback_from_trace(sc_row: Dict) -> bool:
+    trace = sc_row.get("runtime", {}).get("process_trace") or []
+    for entry in trace:
+        cm = entry.get("call_metadata") or {}
+        if cm.get("fallback_construct_used"):
+            return True
+    return False
+
+
+def structural_pass(sc_row: Dict) -> Optional[bool]:
+    summary = sc_row.get("summary") or {}
+    if "quality_pass" in summary:
+        return bool(summary.get("quality_pass"))
+    return None
+
+
+def token_cost_latency(sc_row: Dict):
+    meta = sc_row.get("meta") or {}
+    rt = sc_row.get("runtime") or {}
+    tokens_in = rt.get("tokens_in") if rt else meta.get("tokens_in")
+    tokens_out = rt.get("tokens_out") if rt else meta.get("tokens_out")
+    cost = rt.get("cost_usd") if rt else meta.get("cost_usd")
+    latency = meta.get("latency_ms")
+    return tokens_in, tokens_out, cost, latency
+
+
+# ---------- Metric computations ----------
+
+
+def precision_recall_f1(pred: Set[Triplet], gold: Set[Triplet]) -> Tuple[float, float, float]:
+    if gold is None or len(gold) == 0:
+        return (math.nan, math.nan, math.nan)
+    if pred is None:
+        pred = set()
+    tp = len(pred & gold)
+    fp = len(pred - gold)
+    fn = len(gold - pred)
+    prec = tp / (tp + fp) if (tp + fp) > 0 else 0.0
+    rec = tp / (tp + fn) if (tp + fn) > 0 else 0.0
+    if prec + rec == 0:
+        f1 = 0.0
+    else:
+        f1 = 2 * prec * rec / (prec + rec)
+    return (prec, rec, f1)
+
+
+def mean_std(values: List[float]) -> Tuple[Optional[float], Optional[float]]:
+    vals = [v for v in values if v is not None and not math.isnan(v)]
+    if not vals:
+        return (None, None)
+    if len(vals) == 1:
+        return (vals[0], 0.0)
+    return (statistics.mean(vals), statistics.pstdev(vals))
@@ -0,0 +1,363 @@
+"""
+Per-example report data as lazily loaded shards.
+
+The HTML reports render KPIs server-side and stay a fixed size; per-example rows, error samples and
+trace drill-downs live next to them under <reports_dir>/data/ and are loaded by the browser only when
+the "Examples" explorer is opened:
+
+  data/index.js           columns, facet values/counts and one compact filter code per example
+  data/examples-NNNN.js   SHARD_SIZE example rows (uid, split, case_type, label, mismatch, risks, ...)
+  data/traces-NNNN.js     drill-down for the same rows (triplets, validator risks, process_trace summary)
+
+Each file is one JSON payload wrapped in `window.__reportShard("<key>", {...});` so it also loads from
+file:// (browsers block fetch() of local JSON; <script> tags are allowed). read_shard() unwraps it.
+Filtering and pagination run client-side over index.js; a page touches at most two example shards.
+
+  writer = ExampleShardWriter(reports_dir / "data", store=OutputStore(run_dir))
+  # or build_example_shards(run_dir / "scorecards.jsonl", reports_dir / "data", run_dir)
+  MetricsPass().register("shards", writer)      # or writer.feed(rows)
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics.paper_rows import extract_final_triplets, extract_gold_triplets, extract_stage1_triplets, precision_recall_f1
+from metrics.streaming import MetricAccumulator, ScorecardView, iter_scorecards
+from tools.output_index import OutputStore
+from tools.trace_format import trace_call_metadata
+
+DATA_DIR = "data"
+SHARD_SIZE = 500
+PAGE_SIZE = 50
+INPUT_PREVIEW_CHARS = 120
+OUTPUT_PREVIEW_CHARS = 600
+EXAMPLE_COLUMNS = (
+    "uid", "split", "case_type", "final_label", "selected_stage", "mismatch", "f1",
+    "risk_ids", "stage1_risks", "stage2_risks", "changed", "latency_ms", "error", "input",
+)
+FACETS = ("split", "case_type", "risk")
+_SHARD_PATTERNS = ("index.js", "examples-*.js", "traces-*.js")
+
+
+def shard_key(kind: str, number: int) -> str:
+    return f"{kind}-{number:04d}"
+
+
+def write_shard(path: Path, key: str, payload: Any) -> None:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    Path(path).write_text(f"window.__reportShard({json.dumps(key)},{body});\n", encoding="utf-8")
+
+
+def read_shard(path: Path) -> Any:
+    """JSON payload of a shard file written by write_shard."""
+    text = Path(path).read_text(encoding="utf-8")
+    return json.loads(text[text.index(",") + 1:text.rindex(");")])
+
+
+def _triplets(items: Optional[set]) -> Optional[List[List[str]]]:
+    return None if items is None else [list(t) for t in sorted(items)]
+
+
+def _risks(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"stage": block.get("stage"), "risk_id": r.get("risk_id"), "severity": r.get("severity")}
+        for block in (record.get("validator") or [])
+        for r in (block.get("structural_risks") or [])
+    ]
+
+
+def _error(record: Dict[str, Any]) -> Optional[str]:
+    error = ((record.get("runtime") or {}).get("flags") or {}).get("error")
+    if error:
+        return str(error)
+    flags = record.get("flags") or {}
+    for key in ("parse_failed", "generate_failed"):
+        if flags.get(key):
+            return key
+    return None
+
+
+def _preview(value: Any, limit: int) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return text[:limit] + ("…" if len(text) > limit else "")
+
+
+def _trace_summary(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    out = []
+    for entry in entries:
+        cm = trace_call_metadata(entry)
+        out.append({
+            "stage": entry.get("stage"),
+            "agent": entry.get("agent"),
+            "status": entry.get("stage_status"),
+            "tokens_in": cm.get("tokens_in"),
+            "tokens_out": cm.get("tokens_out"),
+            "retries": cm.get("retries"),
+            "error": cm.get("error"),
+            "output": _preview(entry.get("output"), OUTPUT_PREVIEW_CHARS) if entry.get("output") is not None else None,
+        })
+    return out
+
+
+class ExampleShardWriter(MetricAccumulator):
+    """
+    Streams one compact row (and one drill-down entry) per accepted scorecard into shard files of
+    `shard_size` rows; memory is bounded by one shard plus the per-example filter codes for index.js.
+    traces: also write the drill-down shards; store: OutputStore used to attach each example's
+    process_trace summary from outputs.jsonl (None = only a trace embedded in the scorecard).
+    Existing shard files in out_dir are removed on construction so a smaller rerun leaves no stale pages.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        shard_size: int = SHARD_SIZE,
+        traces: bool = True,
+        store: Optional[OutputStore] = None,
+        profile: Optional[str] = None,
+        where: Optional[Callable[[ScorecardView], bool]] = None,
+    ):
+        super().__init__(profile, where)
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        for pattern in _SHARD_PATTERNS:
+            for stale in self.out_dir.glob(pattern):
+                stale.unlink()
+        self.shard_size = max(1, shard_size)
+        self.traces = traces
+        self.store = store
+        self.n = 0
+        self.n_shards = 0
+        self._rows: List[List[Any]] = []
+        self._traces: List[Dict[str, Any]] = []
+        self._values: Dict[str, Dict[str, int]] = {f: {} for f in FACETS}
+        self._counts: Dict[str, List[int]] = {f: [] for f in FACETS}
+        self._filters: Dict[str, List[Any]] = {"split": [], "case_type": [], "risk": [], "mismatch": [], "error": []}
+
+    def _code(self, facet: str, value: Any) -> int:
+        value = "" if value is None else str(value)
+        codes = self._values[facet]
+        if value not in codes:
+            codes[value] = len(codes)
+            self._counts[facet].append(0)
+        self._counts[facet][codes[value]] += 1
+        return codes[value]
+
+    def add(self, view: ScorecardView) -> None:
+        r = view.record
+        meta = r.get("meta") or {}
+        runtime = r.get("runtime") or {}
+        moderator = r.get("moderator") or {}
+        final, gold = extract_final_triplets(r), extract_gold_triplets(r)
+        f1 = precision_recall_f1(final, gold)[2] if gold else None
+        risks = _risks(r)
+        risk_ids = sorted({str(x["risk_id"] or "") for x in risks})
+        error = _error(r)
+        latency = meta.get("latency_ms") if meta.get("latency_ms") is not None else runtime.get("latency_ms")
+        row = {
+            "uid": meta.get("text_id") or r.get("uid"),
+            "split": meta.get("split") or r.get("split"),
+            "case_type": meta.get("case_type"),
+            "final_label": moderator.get("final_label"),
+            "selected_stage": view.selected_stage,
+            "mismatch": None if gold is None else final != gold,
+            "f1": None if f1 is None else round(f1, 4),
+            "risk_ids": risk_ids,
+            "stage1_risks": view.stage1_risks,
+            "stage2_risks": view.stage2_risks,
+            "changed": bool(view.changed),
+            "latency_ms": latency,
+            "error": error,
+            "input": _preview(meta.get("input_text") or "", INPUT_PREVIEW_CHARS),
+        }
+        self._rows.append([row[c] for c in EXAMPLE_COLUMNS])
+        self._filters["split"].append(self._code("split", row["split"]))
+        self._filters["case_type"].append(self._code("case_type", row["case_type"]))
+        self._filters["risk"].append([self._code("risk", rid) for rid in risk_ids])
+        self._filters["mismatch"].append(None if row["mismatch"] is None else int(row["mismatch"]))
+        self._filters["error"].append(int(error is not None))
+
+        if not self.traces:
+            self._count()
+            return
+        full = self.store.for_scorecard(r) if self.store is not None else None
+        self._traces.append({
+            "uid": row["uid"],
+            "moderator": {k: moderator.get(k) for k in ("final_label", "confidence", "selected_stage", "applied_rules", "decision_reason")},
+            "triplets": {"final": _triplets(final), "stage1": _triplets(extract_stage1_triplets(r)), "gold": _triplets(gold)},
+            "risks": risks,
+            "flags": r.get("flags") or {},
+            "error": error,
+            "trace": _trace_summary((full or {}).get("process_trace") or runtime.get("process_trace") or []),
+        })
+        self._count()
+
+    def _count(self) -> None:
+        self.n += 1
+        if len(self._rows) >= self.shard_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        number = self.n_shards
+        write_shard(self.out_dir / f"{shard_key('examples', number)}.js", shard_key("examples", number), {"rows": self._rows})
+        if self.traces:
+            write_shard(self.out_dir / f"{shard_key('traces', number)}.js", shard_key("traces", number), {"rows": self._traces})
+        self.n_shards += 1
+        self._rows, self._traces = [], []
+
+    def result(self) -> Dict[str, Any]:
+        self._flush()
+        index = {
+            "version": 1,
+            "n": self.n,
+            "shard_size": self.shard_size,
+            "n_shards": self.n_shards,
+            "columns": list(EXAMPLE_COLUMNS),
+            "has_traces": self.traces,
+            "facets": {f: {"values": list(self._values[f]), "counts": self._counts[f]} for f in FACETS},
+            "filters": self._filters,
+        }
+        write_shard(self.out_dir / "index.js", "index", index)
+        return {"n": self.n, "n_shards": self.n_shards, "dir": str(self.out_dir)}
+
+
+_EXPLORER_CSS = """
+.ex-controls { display: flex; flex-wrap: wrap; gap: 0.5rem; align-items: center; margin: 0.5rem 0; font-size: 0.85rem; }
+.ex-table { border-collapse: collapse; width: 100%; font-size: 0.8rem; }
+.ex-table th, .ex-table td { border: 1px solid rgba(128,128,128,0.35); padding: 3px 6px; text-align: left; vertical-align: top; }
+.ex-table tbody tr { cursor: pointer; }
+.ex-table tbody tr:hover { background: rgba(128,128,128,0.15); }
+.ex-bad { color: #d9534f; }
+.ex-detail { white-space: pre-wrap; font-size: 0.75rem; max-height: 28rem; overflow: auto; border: 1px solid rgba(128,128,128,0.35); padding: 0.5rem; }
+"""
+
+_EXPLORER_JS = """
+(function () {
+  var root = document.getElementById("example-explorer");
+  var base = root.getAttribute("data-src");
+  var pageSize = parseInt(root.getAttribute("data-page-size"), 10);
+  var shown = ["uid", "split", "case_type", "final_label", "selected_stage", "mismatch", "f1", "risk_ids", "latency_ms", "error", "input"];
+  var $ = function (sel) { return root.querySelector(sel); };
+  var pending = {}, cache = {}, index = null, matches = [], page = 0;
+  window.__reportShard = function (key, payload) { if (pending[key]) { pending[key](payload); delete pending[key]; } };
+  function load(key) {
+    if (!cache[key]) {
+      cache[key] = new Promise(function (resolve, reject) {
+        pending[key] = resolve;
+        var s = document.createElement("script");
+        s.src = base + "/" + key + ".js";
+        s.onerror = function () { delete pending[key]; delete cache[key]; reject(new Error(key)); };
+        document.head.appendChild(s);
+      });
+    }
+    return cache[key];
+  }
+  function pad(n) { return ("000" + n).slice(-4); }
+  function el(tag, text, cls) { var e = document.createElement(tag); if (text !== undefined) e.textContent = text; if (cls) e.className = cls; return e; }
+  function fillSelect(sel, facet) {
+    var f = index.facets[facet];
+    f.values.forEach(function (v, i) { var o = el("option", (v || "(none)") + " (" + f.counts[i] + ")"); o.value = i; sel.appendChild(o); });
+  }
+  function applyFilters() {
+    var split = $(".ex-split").value, ct = $(".ex-case").value, risk = $(".ex-risk").value, mm = $(".ex-mismatch").value, err = $(".ex-error").checked;
+    var F = index.filters;
+    matches = [];
+    for (var i = 0; i < index.n; i++) {
+      if (split !== "" && F.split[i] !== +split) continue;
+      if (ct !== "" && F.case_type[i] !== +ct) continue;
+      if (risk === "any" ? !F.risk[i].length : (risk !== "" && F.risk[i].indexOf(+risk) < 0)) continue;
+      if (mm === "mismatch" ? F.mismatch[i] !== 1 : mm === "match" ? F.mismatch[i] !== 0 : mm === "nogold" ? F.mismatch[i] !== null : false) continue;
+      if (err && !F.error[i]) continue;
+      matches.push(i);
+    }
+    page = 0;
+    render();
+  }
+  function render() {
+    var pages = Math.max(1, Math.ceil(matches.length / pageSize));
+    var ids = matches.slice(page * pageSize, (page + 1) * pageSize);
+    $(".ex-status").textContent = matches.length + " / " + index.n + " examples, page " + (page + 1) + " / " + pages;
+    var shards = {};
+    ids.forEach(function (i) { shards[Math.floor(i / index.shard_size)] = true; });
+    Promise.all(Object.keys(shards).map(function (s) { return load("examples-" + pad(+s)).then(function (p) { return [+s, p]; }); })).then(function (loaded) {
+      var byShard = {};
+      loaded.forEach(function (x) { byShard[x[0]] = x[1]; });
+      var tbody = $(".ex-table tbody");
+      tbody.textContent = "";
+      ids.forEach(function (i) {
+        var row = byShard[Math.floor(i / index.shard_size)].rows[i % index.shard_size];
+        var tr = el("tr");
+        shown.forEach(function (c) {
+          var v = row[index.columns.indexOf(c)];
+          if (Array.isArray(v)) v = v.join(", ");
+          tr.appendChild(el("td", v === null || v === undefined ? "" : String(v), (c === "mismatch" && v === true) || (c === "error" && v) ? "ex-bad" : ""));
+        });
+        tr.addEventListener("click", function () { detail(i); });
+        tbody.appendChild(tr);
+      });
+    }).catch(function (e) { $(".ex-status").textContent = "failed to load " + e.message; });
+  }
+  function detail(i) {
+    var box = $(".ex-detail");
+    if (!index.has_traces) { box.textContent = "no trace shards"; return; }
+    box.textContent = "loading…";
+    load("traces-" + pad(Math.floor(i / index.shard_size))).then(function (p) {
+      box.textContent = JSON.stringify(p.rows[i % index.shard_size], null, 2);
+    }).catch(function (e) { box.textContent = "failed to load " + e.message; });
+  }
+  function start() {
+    load("index").then(function (idx) {
+      index = idx;
+      fillSelect($(".ex-split"), "split");
+      fillSelect($(".ex-case"), "case_type");
+      fillSelect($(".ex-risk"), "risk");
+      ["ex-split", "ex-case", "ex-risk", "ex-mismatch", "ex-error"].forEach(function (c) { $("." + c).addEventListener("change", applyFilters); });
+      $(".ex-prev").addEventListener("click", function () { if (page > 0) { page--; render(); } });
+      $(".ex-next").addEventListener("click", function () { if ((page + 1) * pageSize < matches.length) { page++; render(); } });
+      var head = $(".ex-table thead tr");
+      shown.forEach(function (c) { head.appendChild(el("th", c)); });
+      applyFilters();
+    }).catch(function () { $(".ex-status").textContent = "no example shards in " + base + "/ (build_report_shards)"; });
+  }
+  root.addEventListener("toggle", function () { if (root.open && !index && !cache.index) start(); });
+})();
+"""
+
+
+def explorer_html(data_dir: str = DATA_DIR, page_size: int = PAGE_SIZE, title: str = "Examples") -> str:
+    """
+    Collapsible example explorer (filters: split, case_type, risk, gold mismatch, errors; paging; row
+    click = trace drill-down). Nothing is loaded until it is opened; size does not depend on the run.
+    """
+    return f"""
+<style>{_EXPLORER_CSS}</style>
+<details id="example-explorer" data-src="{data_dir}" data-page-size="{page_size}">
+<summary>{title} — 필터/페이지 (data shards, 열 때 로드)</summary>
+<div class="ex-controls">
+  <label>split <select class="ex-split"><option value="">all</option></select></label>
+  <label>case_type <select class="ex-case"><option value="">all</option></select></label>
+  <label>risk <select class="ex-risk"><option value="">all</option><option value="any">any risk</option></select></label>
+  <label>gold <select class="ex-mismatch"><option value="">all</option><option value="mismatch">mismatch</option><option value="match">match</option><option value="nogold">no gold</option></select></label>
+  <label><input type="checkbox" class="ex-error"> errors only</label>
+  <button type="button" class="ex-prev">&lt; prev</button><button type="button" class="ex-next">next &gt;</button>
+  <span class="ex-status"></span>
+</div>
+<table class="ex-table"><thead><tr></tr></thead><tbody></tbody></table>
+<div class="ex-detail">행을 클릭하면 trace drill-down이 표시됩니다.</div>
+</details>
+<script>{_EXPLORER_JS}</script>
+"""
+
+
+def build_example_shards(scorecards_path: Path, out_dir: Path, run_dir: Optional[Path] = None, shard_size: int = SHARD_SIZE, traces: bool = True) -> Dict[str, Any]:
+    """One streaming pass over scorecards.jsonl -> out_dir/{index,examples-*,traces-*}.js."""
+    # merged runs have no outputs file of their own: refs then resolve next to each seed's manifest
+    if run_dir is not None and not any((Path(run_dir) / f).exists() for f in ("outputs.jsonl", "smoke_outputs.jsonl")):
+        run_dir = None
+    with OutputStore(run_dir) as store:
+        return ExampleShardWriter(out_dir, shard_size, traces, store).feed(iter_scorecards(scorecards_path))
@@ -0,0 +1,334 @@
+"""
+Cross-run results index: one SQLite file that ingests each run directory once and answers
+multi-run questions with SQL instead of re-globbing and re-parsing every scorecards.jsonl.
+
+Tables (run_dir is the key everywhere; it is the resolved run directory path):
+  runs         one row per run: run_id, mode, purpose, cfg_hash, prompt_hash, backbone_model, seed,
+               timestamp_utc, n_rows, file fingerprint (size/mtime + sha256 of the ingested files)
+  examples     one row per scorecard: examples table of metrics/run_tables.py + final_key
+               (canonical JSON of the sorted final triplets, for per-uid prediction diffs)
+  triplets     (run_dir, row, source, aspect, opinion, polarity)
+  errors       example / call / log level errors with error_category (429_rate_limit, timeout, ...)
+  run_metrics  (run_dir, metric, value) from derived/metrics/structural_metrics.csv when present
+
+ingest_runs() is incremental: a run whose files have the same size/mtime is skipped without reading,
+and one whose sha256 is unchanged only refreshes the stat; changed runs are replaced atomically.
+Queries: prediction_diff(), error_taxonomy(), metric_history().
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from metrics.run_tables import build_run_tables
+from metrics.streaming import iter_scorecards
+from tools.llm_runner import default_errors_path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INDEX_PATH = PROJECT_ROOT / "results" / "results_index.sqlite"
+
+_EXAMPLE_COLUMNS = (
+    "row", "uid", "split", "case_type", "final_label", "selected_stage",
+    "parse_failed", "generate_failed", "fallback_used", "structural_risk", "unanchored", "targetless",
+    "quality_pass", "tokens_in", "tokens_out", "cost_usd", "latency_ms", "stage1_risks", "stage2_risks",
+    "has_gold", "error",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_dir TEXT PRIMARY KEY, run_id TEXT, mode TEXT, purpose TEXT, cfg_hash TEXT, prompt_hash TEXT,
+    backbone_model TEXT, seed INTEGER, timestamp_utc TEXT, n_rows INTEGER,
+    files_stat TEXT, files_sha256 TEXT, ingested_at REAL
+);
+CREATE TABLE IF NOT EXISTS examples (
+    run_dir TEXT, row INTEGER, uid TEXT, split TEXT, case_type TEXT, final_label TEXT, selected_stage TEXT,
+    parse_failed INTEGER, generate_failed INTEGER, fallback_used INTEGER, structural_risk INTEGER,
+    unanchored INTEGER, targetless INTEGER, quality_pass INTEGER, tokens_in INTEGER, tokens_out INTEGER,
+    cost_usd REAL, latency_ms REAL, stage1_risks INTEGER, stage2_risks INTEGER, has_gold INTEGER,
+    error TEXT, final_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_examples_run_uid ON examples (run_dir, uid, row);
+CREATE INDEX IF NOT EXISTS idx_examples_uid ON examples (uid);
+CREATE TABLE IF NOT EXISTS triplets (run_dir TEXT, row INTEGER, source TEXT, aspect TEXT, opinion TEXT, polarity TEXT);
+CREATE INDEX IF NOT EXISTS idx_triplets_run_row ON triplets (run_dir, row);
+CREATE TABLE IF NOT EXISTS errors (
+    run_dir TEXT, level TEXT, uid TEXT, stage TEXT, agent TEXT, error_category TEXT, error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_errors_run ON errors (run_dir);
+CREATE TABLE IF NOT EXISTS run_metrics (run_dir TEXT, metric TEXT, value REAL, PRIMARY KEY (run_dir, metric));
+"""
+
+
+def categorize_error(error: str) -> str:
+    """Error taxonomy shared with scripts/error_inspector.py."""
+    err_lower = error.lower()
+    if "429" in err_lower or "rate" in err_lower:
+        return "429_rate_limit"
+    if "timeout" in err_lower or "timed out" in err_lower:
+        return "timeout"
+    if "jsondecodeerror" in err_lower or "parse" in err_lower:
+        return "parse_json"
+    if "validationerror" in err_lower or "validate" in err_lower:
+        return "schema_validation"
+    return "other"
+
+
+def connect(index_path: Path = DEFAULT_INDEX_PATH) -> sqlite3.Connection:
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(index_path))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# ---------- Ingest ----------
+
+
+def _load_manifest(run_dir: Path) -> Dict[str, Any]:
+    path = run_dir / "manifest.json"
+    if not path.exists():
+        return {"run_id": run_dir.name}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {"run_id": run_dir.name}
+
+
+def _errors_log_path(manifest: Dict[str, Any]) -> Optional[Path]:
+    """Recorded errors_path, else the runner mode's default bucket (older manifests: mode)."""
+    run_id = manifest.get("run_id")
+    if not run_id:
+        return None
+    path = Path(manifest.get("errors_path") or default_errors_path(run_id, manifest.get("runner_mode") or manifest.get("mode")))
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _run_files(run_dir: Path, manifest: Dict[str, Any]) -> List[Path]:
+    files = [run_dir / "manifest.json", run_dir / "scorecards.jsonl", run_dir / "derived" / "metrics" / "structural_metrics.csv"]
+    errors_log = _errors_log_path(manifest)
+    if errors_log is not None:
+        files.append(errors_log)
+    return [p for p in files if p.exists()]
+
+
+def _files_stat(files: Sequence[Path]) -> str:
+    return json.dumps([[str(p), p.stat().st_size, p.stat().st_mtime_ns] for p in files])
+
+
+def _files_sha256(files: Sequence[Path]) -> str:
+    digest = hashlib.sha256()
+    for p in files:
+        digest.update(str(p).encode("utf-8"))
+        with p.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _prompt_hash(manifest: Dict[str, Any]) -> Optional[str]:
+    versions = manifest.get("prompt_versions")
+    if not versions:
+        return None
+    return hashlib.sha256(json.dumps(versions, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _iter_log_errors(path: Optional[Path]) -> Iterator[Dict[str, Any]]:
+    if path is None or not path.exists():
+        return
+    for obj in iter_scorecards(path):
+        error = str(obj.get("error", ""))
+        yield {"level": "log", "uid": obj.get("text_id"), "stage": obj.get("stage"), "agent": obj.get("agent"), "error": error}
+
+
+def _structural_metrics(run_dir: Path) -> List[tuple]:
+    path = run_dir / "derived" / "metrics" / "structural_metrics.csv"
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return []
+    out = []
+    for metric, value in rows[0].items():
+        try:
+            out.append((str(run_dir), metric, float(value)))
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def _final_keys(examples: pd.DataFrame, triplets: pd.DataFrame) -> pd.Series:
+    final = triplets[triplets["source"] == "final"].astype({"aspect": object, "opinion": object, "polarity": object})
+    keys = (
+        final.assign(t=list(zip(final["aspect"], final["opinion"], final["polarity"])))
+        .groupby("row")["t"]
+        .agg(lambda ts: json.dumps(sorted(set(ts)), ensure_ascii=False))
+    )
+    return examples["row"].map(keys).fillna("[]").astype(object)
+
+
+def _db_value(value: Any) -> Any:
+    if value is None or value is pd.NA or (isinstance(value, float) and value != value):
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _rows(frame: pd.DataFrame, columns: Sequence[str]) -> Iterable[tuple]:
+    for values in frame.reindex(columns=list(columns)).astype(object).itertuples(index=False, name=None):
+        yield tuple(_db_value(v) for v in values)
+
+
+def ingest_run(conn: sqlite3.Connection, run_dir: Path) -> str:
+    """Ingest one run directory. Returns 'added', 'updated', 'unchanged' or 'missing'."""
+    run_dir = Path(run_dir).resolve()
+    if not (run_dir / "scorecards.jsonl").exists():
+        return "missing"
+    key = str(run_dir)
+    manifest = _load_manifest(run_dir)
+    files = _run_files(run_dir, manifest)
+    stat = _files_stat(files)
+    known = conn.execute("SELECT files_stat, files_sha256 FROM runs WHERE run_dir = ?", (key,)).fetchone()
+    if known and known[0] == stat:
+        return "unchanged"
+    sha = _files_sha256(files)
+    if known and known[1] == sha:
+        conn.execute("UPDATE runs SET files_stat = ? WHERE run_dir = ?", (stat, key))
+        conn.commit()
+        return "unchanged"
+
+    tables = build_run_tables(run_dir)
+    examples, triplets = tables["examples"], tables["triplets"]
+    examples = examples.assign(final_key=_final_keys(examples, triplets)) if len(examples) else examples
+    errors = [
+        {**e, "error_category": categorize_error(e["error"])}
+        for e in tables["errors"].astype(object).to_dict("records") + list(_iter_log_errors(_errors_log_path(manifest)))
+    ]
+    backbone = manifest.get("backbone") or {}
+    with conn:
+        for table in ("runs", "examples", "triplets", "errors", "run_metrics"):
+            conn.execute(f"DELETE FROM {table} WHERE run_dir = ?", (key,))
+        conn.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key, manifest.get("run_id"), manifest.get("mode"), manifest.get("purpose"), manifest.get("cfg_hash"),
+                _prompt_hash(manifest), backbone.get("model"), backbone.get("seed"), manifest.get("timestamp_utc"),
+                len(examples), stat, sha, time.time(),
+            ),
+        )
+        columns = _EXAMPLE_COLUMNS + ("final_key",)
+        conn.executemany(
+            f"INSERT INTO examples (run_dir, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 1))})",
+            ((key, *values) for values in _rows(examples, columns)),
+        )
+        conn.executemany("INSERT INTO triplets VALUES (?, ?, ?, ?, ?, ?)", ((key, *values) for values in _rows(triplets, ("row", "source", "aspect", "opinion", "polarity"))))
+        conn.executemany(
+            "INSERT INTO errors VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((key, e["level"], _db_value(e["uid"]), _db_value(e["stage"]), _db_value(e["agent"]), e["error_category"], e["error"]) for e in errors),
+        )
+        conn.executemany("INSERT INTO run_metrics VALUES (?, ?, ?)", _structural_metrics(run_dir))
+    return "updated" if known else "added"
+
+
+def discover_run_dirs(paths: Iterable[Path]) -> List[Path]:
+    """Run directories among `paths`: each path itself if it has scorecards.jsonl, else its direct children that do."""
+    found: List[Path] = []
+    for path in paths:
+        path = Path(path)
+        if (path / "scorecards.jsonl").exists():
+            found.append(path)
+        elif path.is_dir():
+            found.extend(sorted(p.parent for p in path.glob("*/scorecards.jsonl")))
+    return found
+
+
+def ingest_runs(conn: sqlite3.Connection, paths: Iterable[Path], prune: bool = False) -> Dict[str, str]:
+    """Ingest every run under `paths`. prune drops indexed runs whose directory no longer exists."""
+    status = {str(Path(run_dir).resolve()): ingest_run(conn, run_dir) for run_dir in discover_run_dirs(paths)}
+    if prune:
+        for (key,) in conn.execute("SELECT run_dir FROM runs").fetchall():
+            if not (Path(key) / "scorecards.jsonl").exists():
+                with conn:
+                    for table in ("runs", "examples", "triplets", "errors", "run_metrics"):
+                        conn.execute(f"DELETE FROM {table} WHERE run_dir = ?", (key,))
+                status[key] = "pruned"
+    return status
+
+
+# ---------- Queries ----------
+
+
+def resolve_run(conn: sqlite3.Connection, run: str) -> str:
+    """run_dir for a run_dir path, run_id or directory name (latest ingested match wins)."""
+    row = conn.execute(
+        "SELECT run_dir FROM runs WHERE run_dir = ? OR run_id = ? OR run_dir LIKE ? ORDER BY timestamp_utc DESC LIMIT 1",
+        (str(Path(run).resolve()), run, f"%/{Path(run).name}"),
+    ).fetchone()
+    if row is None:
+        raise KeyError(f"run not in index: {run}")
+    return row[0]
+
+
+def query(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+    return pd.read_sql_query(sql, conn, params=list(params))
+
+
+def prediction_diff(conn: sqlite3.Connection, run_a: str, run_b: str, split: Optional[str] = None) -> pd.DataFrame:
+    """uids present in both runs whose final triplets or final label differ (last scorecard row per uid)."""
+    a, b = resolve_run(conn, run_a), resolve_run(conn, run_b)
+    last = "SELECT * FROM examples e WHERE run_dir = ? AND row = (SELECT MAX(row) FROM examples WHERE run_dir = e.run_dir AND uid = e.uid)"
+    sql = f"""
+        SELECT a.uid, a.split, a.case_type, a.final_label AS label_a, b.final_label AS label_b,
+               a.final_key AS triplets_a, b.final_key AS triplets_b
+        FROM ({last}) a JOIN ({last}) b ON a.uid = b.uid
+        WHERE (a.final_key IS NOT b.final_key OR a.final_label IS NOT b.final_label)
+    """
+    params: List[Any] = [a, b]
+    if split:
+        sql += " AND a.split = ?"
+        params.append(split)
+    return query(conn, sql + " ORDER BY a.uid", params)
+
+
+def error_taxonomy(conn: sqlite3.Connection, runs: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Error counts per run x level x category (all indexed runs when `runs` is empty)."""
+    sql = """
+        SELECT r.run_dir, r.run_id, r.mode, e.level, e.error_category, COUNT(*) AS n, COUNT(DISTINCT e.uid) AS n_uids
+        FROM errors e JOIN runs r ON r.run_dir = e.run_dir
+    """
+    params: List[str] = []
+    if runs:
+        keys = [resolve_run(conn, r) for r in runs]
+        sql += f" WHERE e.run_dir IN ({', '.join('?' * len(keys))})"
+        params = keys
+    return query(conn, sql + " GROUP BY r.run_dir, e.level, e.error_category ORDER BY r.timestamp_utc, n DESC", params)
+
+
+def metric_history(conn: sqlite3.Connection, by: str = "cfg_hash", metrics: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Per-run core rates from examples (+ requested structural_metrics.csv columns) ordered by time,
+    grouped under `by` (cfg_hash | prompt_hash | mode | backbone_model).
+    """
+    if by not in ("cfg_hash", "prompt_hash", "mode", "backbone_model"):
+        raise ValueError(f"unsupported history key '{by}'")
+    extra = "".join(
+        f", (SELECT value FROM run_metrics m WHERE m.run_dir = r.run_dir AND m.metric = ?) AS \"{name}\"" for name in metrics
+    )
+    sql = f"""
+        SELECT r.{by} AS {by}, r.run_id,{" r.mode," if by != "mode" else ""} r.timestamp_utc, r.n_rows,
+               AVG(e.quality_pass) AS pass_rate, AVG(e.parse_failed) AS parse_failure_rate,
+               AVG(e.generate_failed) AS generate_failure_rate, AVG(e.structural_risk) AS structural_risk_rate,
+               AVG(e.latency_ms) AS latency_ms_mean{extra}
+        FROM runs r LEFT JOIN examples e ON e.run_dir = r.run_dir
+        GROUP BY r.run_dir ORDER BY r.{by}, r.timestamp_utc
+    """
+    return query(conn, sql, list(metrics))
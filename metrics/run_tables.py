@@ -0,0 +1,480 @@
+"""
+Columnar run tables: flat DataFrames per entity instead of nested JSONL dicts re-parsed by every script.
+
+  examples     one row per scorecard (ids, split/case_type, failure/risk flags, tokens/cost/latency)
+  triplets     one row per (example, source, triplet); source = final | stage1 | gold (metrics/paper_rows.py)
+  trace_calls  one row per process_trace entry of outputs.jsonl (call metadata; full and compact traces)
+  errors       one row per error: example-level runtime.flags.error and call-level call_metadata.error
+
+examples/triplets join on `row` (scorecard line index within the run). Tables are cached as Parquet under
+<run_dir>/derived/tables/ by scripts/export_run_tables.py; repeated strings are written as categoricals,
+which pyarrow stores dictionary-encoded. load_run_tables() reads the cache when it is newer than
+scorecards.jsonl and otherwise builds the tables from JSONL in memory (pyarrow not required).
+
+Query helpers compute the build_paper_tables / aggregate_seed_metrics numbers with merge/groupby:
+  paper_run_metrics(tables, report_splits)   -> (metrics dict, case rows)
+  self_consistency_exact([tables, ...], split)
+  per_uid_scores(tables, splits)             -> per-uid F1 / exact match (metrics/significance.py)
+  mean_std_frame(rows)                        -> per-column mean / population std
+
+Cross-run metrics are merged from small per-run results (final_triplet_keys / per_uid_scores), so the
+per-run part can run in worker processes: map_runs(fn, run_dirs) keeps only those results in the parent.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from metrics.paper_rows import (
+    extract_final_triplets,
+    extract_gold_triplets,
+    extract_stage1_triplets,
+    fallback_from_trace,
+    get_flags,
+    has_structural_risk,
+    has_unanchored_ref,
+    is_targetless,
+    mean_std,
+    structural_pass,
+    token_cost_latency,
+)
+from metrics.scorecard import count_stage1_risks, count_stage2_risks
+from metrics.streaming import iter_scorecards
+from tools.trace_format import trace_call_metadata
+
+try:
+    import pyarrow  # noqa: F401  (pandas Parquet engine)
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+TABLES = ("examples", "triplets", "trace_calls", "errors")
+TRIPLET_SOURCES = ("final", "stage1", "gold")
+# Low-cardinality string columns stored as categoricals (dictionary-encoded in Parquet)
+CATEGORY_COLUMNS = {
+    "examples": ("run_id", "mode", "split", "record_split", "case_type", "language_code", "domain_id", "profile", "backbone_model_id", "final_label", "selected_stage"),
+    "triplets": ("source", "aspect", "opinion", "polarity"),
+    "trace_calls": ("run_id", "stage", "agent", "stage_status", "served_model"),
+    "errors": ("run_id", "level", "stage", "agent", "error_type"),
+}
+_NUMERIC_COLUMNS = ("tokens_in", "tokens_out", "cost_usd", "latency_ms")
+
+
+def tables_dir(run_dir: Path) -> Path:
+    return Path(run_dir) / "derived" / "tables"
+
+
+# ---------- Building ----------
+
+
+def _nullable_numeric(series: pd.Series) -> pd.Series:
+    """Int64 when every value is integral (so means of ints stay ints downstream), else Float64."""
+    values = series.dropna()
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+        return series.astype("Int64")
+    return pd.to_numeric(series, errors="coerce").astype("Float64")
+
+
+def _error_type(error: Any) -> str:
+    return str(error).split(":", 1)[0].strip() if error else ""
+
+
+def _examples_and_triplets(records: Iterable[Dict[str, Any]], run_id: Optional[str]) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Any]]]:
+    examples: List[Dict[str, Any]] = []
+    triplets: Dict[str, List[Any]] = {k: [] for k in ("row", "source", "aspect", "opinion", "polarity")}
+    errors: List[Dict[str, Any]] = []
+    for row, r in enumerate(records):
+        meta = r.get("meta") or {}
+        runtime = r.get("runtime") or {}
+        moderator = r.get("moderator") or {}
+        uid = meta.get("text_id") or r.get("uid")
+        flags = get_flags(r)
+        tokens_in, tokens_out, cost, latency = token_cost_latency(r)
+        gold = extract_gold_triplets(r)
+        error = (runtime.get("flags") or {}).get("error")
+        examples.append(
+            {
+                "row": row,
+                "uid": uid,
+                "run_id": run_id or r.get("run_id") or meta.get("run_id"),
+                "mode": meta.get("mode") or runtime.get("runner_name"),
+                "split": meta.get("split"),
+                "record_split": r.get("split"),
+                "case_type": meta.get("case_type"),
+                "language_code": meta.get("language_code"),
+                "domain_id": meta.get("domain_id"),
+                "profile": r.get("profile") or meta.get("profile"),
+                "backbone_model_id": meta.get("backbone_model_id") or runtime.get("backbone_model_id"),
+                "parse_failed": flags["parse_failed"],
+                "generate_failed": flags["generate_failed"],
+                "fallback_used": flags["fallback_used"] or fallback_from_trace(r),
+                "structural_risk": has_structural_risk(r),
+                "unanchored": has_unanchored_ref(r),
+                "targetless": is_targetless(r),
+                "quality_pass": structural_pass(r),
+                "tokens_in": tokens_in,
+                "tokens_out": tokens_out,
+                "cost_usd": cost,
+                "latency_ms": latency,
+                "final_label": moderator.get("final_label"),
+                "selected_stage": moderator.get("selected_stage"),
+                "stage1_risks": count_stage1_risks(r),
+                "stage2_risks": count_stage2_risks(r),
+                "has_gold": gold is not None,
+                "error": error,
+            }
+        )
+        for source, items in (("final", extract_final_triplets(r)), ("stage1", extract_stage1_triplets(r)), ("gold", gold or ())):
+            for aspect, opinion, polarity in items:
+                triplets["row"].append(row)
+                triplets["source"].append(source)
+                triplets["aspect"].append(aspect)
+                triplets["opinion"].append(opinion)
+                triplets["polarity"].append(polarity)
+        if error:
+            errors.append({"row": row, "uid": uid, "run_id": examples[-1]["run_id"], "level": "example", "stage": None, "agent": None, "error_type": _error_type(error), "error": str(error)})
+    ex = pd.DataFrame(examples, columns=list(examples[0]) if examples else ["row", "uid", "run_id", "split"])
+    for col in _NUMERIC_COLUMNS:
+        if col in ex:
+            ex[col] = _nullable_numeric(ex[col])
+    if "quality_pass" in ex:
+        ex["quality_pass"] = ex["quality_pass"].astype("boolean")
+    return ex, pd.DataFrame(triplets), errors
+
+
+def _trace_calls(outputs_path: Path, run_id: Optional[str], errors: List[Dict[str, Any]]) -> pd.DataFrame:
+    rows: List[Dict[str, Any]] = []
+    if not outputs_path.exists():
+        return pd.DataFrame(rows, columns=["uid", "index", "stage", "agent"])
+    for out in iter_scorecards(outputs_path):
+        meta = out.get("meta") or {}
+        uid = meta.get("text_id") or meta.get("uid")
+        for index, entry in enumerate(out.get("process_trace") or []):
+            cm = trace_call_metadata(entry)
+            rows.append(
+                {
+                    "run_id": run_id or meta.get("run_id"),
+                    "uid": uid,
+                    "index": index,
+                    "stage": entry.get("stage"),
+                    "agent": entry.get("agent"),
+                    "stage_status": entry.get("stage_status"),
+                    "has_call": bool(cm),
+                    "retries": cm.get("retries"),
+                    "repair_used": bool(cm.get("repair_used")),
+                    "fallback_construct_used": bool(cm.get("fallback_construct_used")),
+                    "tokens_in": cm.get("tokens_in"),
+                    "tokens_out": cm.get("tokens_out"),
+                    "cost_usd": cm.get("cost_usd"),
+                    "served_model": cm.get("served_model"),
+                    "coalesced": bool(cm.get("coalesced")),
+                    "prefix_shared": bool(cm.get("prefix_shared")),
+                    "error": cm.get("error"),
+                }
+            )
+            if cm.get("error"):
+                errors.append(
+                    {"row": None, "uid": uid, "run_id": rows[-1]["run_id"], "level": "call", "stage": entry.get("stage"), "agent": entry.get("agent"), "error_type": _error_type(cm["error"]), "error": str(cm["error"])}
+                )
+    calls = pd.DataFrame(rows)
+    for col in ("retries", "tokens_in", "tokens_out", "cost_usd"):
+        if col in calls:
+            calls[col] = _nullable_numeric(calls[col])
+    return calls
+
+
+def build_run_tables(run_dir: Path, tables: Sequence[str] = TABLES) -> Dict[str, pd.DataFrame]:
+    """Tables of one run directory built from scorecards.jsonl (+ outputs.jsonl for trace_calls/errors)."""
+    run_dir = Path(run_dir)
+    manifest_run_id = None
+    manifest_path = run_dir / "manifest.json"
+    if manifest_path.exists():
+        import json
+
+        try:
+            manifest_run_id = json.loads(manifest_path.read_text(encoding="utf-8")).get("run_id")
+        except ValueError:
+            manifest_run_id = None
+    score_path = run_dir / "scorecards.jsonl"
+    records = iter_scorecards(score_path) if score_path.exists() else iter(())
+    examples, triplets, errors = _examples_and_triplets(records, manifest_run_id)
+    out = {"examples": examples, "triplets": triplets}
+    if "trace_calls" in tables or "errors" in tables:
+        out["trace_calls"] = _trace_calls(run_dir / "outputs.jsonl", manifest_run_id, errors)
+        out["errors"] = pd.DataFrame(errors, columns=["row", "uid", "run_id", "level", "stage", "agent", "error_type", "error"])
+    return {name: out[name] for name in tables if name in out}
+
+
+def dictionary_encode(name: str, frame: pd.DataFrame) -> pd.DataFrame:
+    """Repeated string columns -> categoricals (pyarrow writes them dictionary-encoded)."""
+    frame = frame.copy()
+    for col in CATEGORY_COLUMNS.get(name, ()):
+        if col in frame and not isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype("category")
+    return frame
+
+
+def write_run_tables(tables: Dict[str, pd.DataFrame], outdir: Path) -> Dict[str, Path]:
+    """Write tables as <outdir>/<name>.parquet."""
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is required for Parquet export (pip install pyarrow)")
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name, frame in tables.items():
+        paths[name] = outdir / f"{name}.parquet"
+        dictionary_encode(name, frame).to_parquet(paths[name], engine="pyarrow", index=False)
+    return paths
+
+
+def export_run_tables(run_dir: Path, tables: Sequence[str] = TABLES) -> Dict[str, Path]:
+    return write_run_tables(build_run_tables(run_dir, tables), tables_dir(run_dir))
+
+
+def _cached_tables(run_dir: Path, tables: Sequence[str]) -> Optional[Dict[str, pd.DataFrame]]:
+    if pyarrow is None:
+        return None
+    paths = {name: tables_dir(run_dir) / f"{name}.parquet" for name in tables}
+    if not all(p.exists() for p in paths.values()):
+        return None
+    score_path = Path(run_dir) / "scorecards.jsonl"
+    source_mtime = score_path.stat().st_mtime if score_path.exists() else 0.0
+    if any(p.stat().st_mtime < source_mtime for p in paths.values()):
+        return None
+    return {name: pd.read_parquet(p, engine="pyarrow") for name, p in paths.items()}
+
+
+def load_run_tables(run_dirs: Any, tables: Sequence[str] = ("examples", "triplets")) -> Dict[str, pd.DataFrame]:
+    """
+    Tables for one run dir or a list of them (concatenated with a categorical `run_dir` column).
+    Uses the Parquet cache when present and current, else builds from JSONL.
+    """
+    if isinstance(run_dirs, (str, Path)):
+        run_dir = Path(run_dirs)
+        return _cached_tables(run_dir, tables) or build_run_tables(run_dir, tables)
+    parts: Dict[str, List[pd.DataFrame]] = {name: [] for name in tables}
+    for run_dir in run_dirs:
+        for name, frame in load_run_tables(run_dir, tables).items():
+            parts[name].append(frame.assign(run_dir=Path(run_dir).name))
+    out = {}
+    for name, frames in parts.items():
+        frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if "run_dir" in frame:
+            frame["run_dir"] = frame["run_dir"].astype("category")
+        out[name] = frame
+    return out
+
+
+def default_workers() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def map_runs(fn: Callable[..., Any], runs: Sequence[Any], workers: Optional[int] = None, **kwargs: Any) -> List[Any]:
+    """
+    [fn(run, **kwargs) for run in runs] in a process pool (`workers`, default min(8, cpu_count)); a single run
+    or workers=1 runs serially. `fn` must be a module-level function and `run` picklable (a run dir or a
+    small handle); order is preserved.
+    """
+    runs = list(runs)
+    call = partial(fn, **kwargs)
+    n_workers = default_workers() if workers is None else max(1, int(workers))
+    if n_workers > 1 and len(runs) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(runs))) as pool:
+            return list(pool.map(call, runs))
+    return [call(run) for run in runs]
+
+
+# ---------- Queries ----------
+
+
+def _values(series: pd.Series) -> List[Any]:
+    """Non-null values as Python scalars (ints stay ints so mean_std output matches the row-loop version)."""
+    return [v.item() if hasattr(v, "item") else v for v in series.dropna().tolist()]
+
+
+def _objects(series: pd.Series) -> pd.Series:
+    """Column values as Python objects with missing values as None (as the JSON rows had them)."""
+    return pd.Series(series.astype(object).where(series.notna(), None).values, dtype=object)
+
+
+def _rate(mask: pd.Series) -> Optional[float]:
+    return int(mask.sum()) / len(mask) if len(mask) else None
+
+
+def filter_examples(examples: pd.DataFrame, splits: Optional[Set[str]]) -> pd.DataFrame:
+    """Rows whose meta.split or record-level split is in `splits` (all rows when empty)."""
+    if not splits:
+        return examples
+    splits = list(splits)
+    return examples[examples["split"].isin(splits) | examples["record_split"].isin(splits)]
+
+
+def _per_uid(examples: pd.DataFrame, triplets: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per uid (its last scorecard row, as the dict-by-uid loops did) with triplet counts per source,
+    true positives vs gold, final polarity conflict and exact-match flags.
+    """
+    last = examples.drop_duplicates("uid", keep="last")[["row", "uid", "has_gold", "structural_risk"]].set_index("row")
+    trip = triplets[triplets["row"].isin(last.index)].astype({"source": object, "aspect": object, "opinion": object, "polarity": object})
+    keys = ["row", "aspect", "opinion", "polarity"]
+    by_source = {s: trip[trip["source"] == s][keys].drop_duplicates() for s in TRIPLET_SOURCES}
+    out = last.copy()
+    for s in TRIPLET_SOURCES:
+        out[f"n_{s}"] = by_source[s].groupby("row").size().reindex(out.index, fill_value=0)
+    for s in ("final", "stage1"):
+        tp = by_source[s].merge(by_source["gold"], on=keys).groupby("row").size()
+        out[f"tp_{s}"] = tp.reindex(out.index, fill_value=0)
+        out[f"exact_{s}"] = (out[f"tp_{s}"] == out[f"n_{s}"]) & (out[f"tp_{s}"] == out["n_gold"])
+        prec = np.where(out[f"n_{s}"] > 0, out[f"tp_{s}"] / out[f"n_{s}"].where(out[f"n_{s}"] > 0, 1), 0.0)
+        rec = np.where(out["n_gold"] > 0, out[f"tp_{s}"] / out["n_gold"].where(out["n_gold"] > 0, 1), 0.0)
+        denom = prec + rec
+        f1 = np.where(denom > 0, 2 * prec * rec / np.where(denom > 0, denom, 1), 0.0)
+        out[f"f1_{s}"] = np.where(out["n_gold"] > 0, f1, np.nan)
+    final = by_source["final"]
+    conflict = final.groupby(["row", "aspect"])["polarity"].nunique()
+    out["polarity_conflict"] = (conflict >= 2).groupby(level="row").any().reindex(out.index, fill_value=False).astype(bool)
+    return out
+
+
+def paper_run_metrics(tables: Dict[str, pd.DataFrame], report_splits: Optional[Set[str]]) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """
+    Vectorized build_paper_tables.compute_run_metrics: metrics dict (rates, means/stds, F1, correction)
+    plus one case row per included scorecard row (uid-level values taken from the uid's last row).
+    """
+    ex = filter_examples(tables["examples"], report_splits)
+    per_uid = _per_uid(ex, tables["triplets"]) if len(ex) else pd.DataFrame(columns=["uid", "n_final", "n_stage1", "polarity_conflict"])
+    uid_final = per_uid.set_index("uid")
+    hard_uids = set(ex.loc[ex["structural_risk"].astype(bool), "uid"]) if len(ex) else set()
+    n_final = ex["uid"].map(uid_final["n_final"]) if len(ex) else pd.Series(dtype=float)
+    conflict = ex["uid"].map(uid_final["polarity_conflict"]).astype(bool) if len(ex) else pd.Series(dtype=bool)
+
+    quality = ex["quality_pass"].dropna() if len(ex) else pd.Series(dtype=bool)
+    tokens_in, tokens_out = (mean_std(_values(ex[c])) if len(ex) else (None, None) for c in ("tokens_in", "tokens_out"))
+    cost = mean_std(_values(ex["cost_usd"])) if len(ex) else (None, None)
+    latency = mean_std(_values(ex["latency_ms"])) if len(ex) else (None, None)
+    flags = {c: ex[c].astype(bool) if len(ex) else pd.Series(dtype=bool) for c in ("parse_failed", "generate_failed", "fallback_used", "structural_risk", "unanchored", "targetless")}
+    metrics: Dict[str, Any] = {
+        "included_row_count": len(ex),
+        "pass_rate": _rate(quality.astype(bool)),
+        "valid_aspect_rate": _rate(n_final > 0),
+        "polarity_conflict_rate": _rate(conflict),
+        "unanchored_rate": _rate(flags["unanchored"]),
+        "structural_risk_rate": _rate(flags["structural_risk"]),
+        "targetless_rate": _rate(flags["targetless"]),
+        "parse_failure_rate": _rate(flags["parse_failed"]),
+        "generate_failure_rate": _rate(flags["generate_failed"]),
+        "fallback_used_rate": _rate(flags["fallback_used"]),
+        "tokens_in_mean": tokens_in[0],
+        "tokens_in_std": tokens_in[1],
+        "tokens_out_mean": tokens_out[0],
+        "tokens_out_std": tokens_out[1],
+        "cost_usd_mean": cost[0],
+        "cost_usd_std": cost[1],
+        "latency_ms_mean": latency[0],
+        "latency_ms_std": latency[1],
+        "count_structural_risk": int(flags["structural_risk"].sum()),
+        "count_unanchored": int(flags["unanchored"].sum()),
+        "count_targetless": int(flags["targetless"].sum()),
+        "count_polarity_conflict": int(conflict.sum()),
+        "count_parse_failed": int(flags["parse_failed"].sum()),
+        "count_generate_failed": int(flags["generate_failed"].sum()),
+    }
+
+    gold_rows = per_uid[per_uid["has_gold"].astype(bool)] if len(per_uid) else per_uid
+    if len(gold_rows):
+        hard = gold_rows[gold_rows["uid"].isin(hard_uids)]
+        f1_1, f1_2 = mean_std(gold_rows["f1_stage1"].tolist())[0], mean_std(gold_rows["f1_final"].tolist())[0]
+        hard_1, hard_2 = mean_std(hard["f1_stage1"].tolist())[0], mean_std(hard["f1_final"].tolist())[0]
+        metrics.update(
+            {
+                "f1_stage1": f1_1,
+                "f1_stage2": f1_2,
+                "delta_f1": f1_2 - f1_1 if f1_1 is not None and f1_2 is not None else None,
+                "hard_f1_stage1": hard_1,
+                "hard_f1_stage2": hard_2,
+                "hard_delta_f1": hard_2 - hard_1 if len(hard) and hard_1 is not None and hard_2 is not None else None,
+            }
+        )
+        n = len(gold_rows)
+        c01 = int((~gold_rows["exact_stage1"] & gold_rows["exact_final"]).sum())
+        c10 = int((gold_rows["exact_stage1"] & ~gold_rows["exact_final"]).sum())
+        metrics.update({"net_error_correction_rate": (c01 - c10) / n, "correction_rate": c01 / n, "degradation_rate": c10 / n})
+    else:
+        metrics.update({k: None for k in ("f1_stage1", "f1_stage2", "delta_f1", "hard_f1_stage1", "hard_f1_stage2", "hard_delta_f1", "net_error_correction_rate", "correction_rate", "degradation_rate")})
+
+    cases = pd.DataFrame(
+        {
+            "uid": _objects(ex["uid"]) if len(ex) else [],
+            "split": _objects(ex["split"]) if len(ex) else [],
+            "case_type": _objects(ex["case_type"]) if len(ex) else [],
+            "structural_risk": ex["uid"].isin(hard_uids).values if len(ex) else [],
+            "parse_failed": flags["parse_failed"].values,
+            "generate_failed": flags["generate_failed"].values,
+            "fallback_used": flags["fallback_used"].values,
+            "polarity_conflict": conflict.values,
+            "final_triplet_count": n_final.astype(int).values if len(ex) else [],
+            "stage1_triplet_count": ex["uid"].map(uid_final["n_stage1"]).astype(int).values if len(ex) else [],
+        }
+    )
+    return metrics, cases
+
+
+def per_uid_scores(tables: Dict[str, pd.DataFrame], splits: Optional[Set[str]]) -> pd.DataFrame:
+    """
+    Gold-bearing uids (last row per uid) with per-example triplet F1 (NaN when gold is empty) and exact match
+    for final and stage1 triplets, indexed by uid: f1_final, f1_stage1, exact_final, exact_stage1.
+    """
+    ex = filter_examples(tables["examples"], splits)
+    if not len(ex):
+        return pd.DataFrame(columns=["f1_final", "f1_stage1", "exact_final", "exact_stage1"])
+    per_uid = _per_uid(ex, tables["triplets"])
+    per_uid = per_uid[per_uid["has_gold"].astype(bool)]
+    return per_uid.set_index("uid")[["f1_final", "f1_stage1", "exact_final", "exact_stage1"]].astype(float)
+
+
+def final_triplet_keys(tables: Dict[str, pd.DataFrame], splits: Optional[Set[str]]) -> pd.Series:
+    """uid -> sorted tuple of final triplets (last row per uid), for cross-run exact-match comparisons."""
+    ex = filter_examples(tables["examples"], splits).drop_duplicates("uid", keep="last")
+    trip = tables["triplets"]
+    trip = trip[(trip["source"] == "final") & trip["row"].isin(ex["row"])]
+    keys = (
+        trip.astype({"aspect": object, "opinion": object, "polarity": object})
+        .assign(t=lambda d: list(zip(d["aspect"], d["opinion"], d["polarity"])))
+        .groupby("row")["t"]
+        .agg(lambda ts: tuple(sorted(set(ts))))
+    )
+    return pd.Series(ex["row"].map(keys).apply(lambda k: k if isinstance(k, tuple) else ()).values, index=ex["uid"].values)
+
+
+def self_consistency_exact(run_tables: Sequence[Dict[str, pd.DataFrame]], splits: Optional[Set[str]]) -> Optional[float]:
+    """Share of uids present in every run whose final triplet set is identical across all runs."""
+    return self_consistency_from_keys([final_triplet_keys(t, splits) for t in run_tables])
+
+
+def self_consistency_from_keys(run_keys: Sequence[pd.Series]) -> Optional[float]:
+    """self_consistency_exact from per-run final_triplet_keys (merge step of per-run workers)."""
+    if not run_keys:
+        return None
+    frame = pd.concat(list(run_keys), axis=1, join="inner")
+    if frame.empty:
+        return None
+    same = frame.apply(lambda row: all(v == row.iloc[0] for v in row.iloc[1:]), axis=1)
+    return float(same.mean())
+
+
+def mean_std_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Per-column mean and population std over per-run metric rows (CSV strings allowed; 'N/A'/'' ignored).
+    Keys starting with '_' are skipped; columns without any numeric value are dropped.
+    """
+    frame = pd.DataFrame(rows)
+    frame = frame[[c for c in frame.columns if not str(c).startswith("_")]]
+    numeric = frame.apply(lambda s: pd.to_numeric(s.astype(str).str.strip(), errors="coerce") if s.dtype == object else pd.to_numeric(s, errors="coerce"))
+    numeric = numeric.loc[:, numeric.notna().any()].reindex(sorted(numeric.columns[numeric.notna().any()]), axis=1)
+    return pd.DataFrame({"mean": numeric.mean(), "std": numeric.std(ddof=0), "n": numeric.count()})
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+"""
+Per-record scorecard field readers shared by the metric/report scripts.
+
+Every function reads ONE scorecard row (scorecards.jsonl line) and returns a plain value;
+aggregation lives in metrics/streaming.py. Missing/None fields default to safe fallbacks.
+
+Triplet = (aspect, opinion, polarity), normalized with norm_text().
+Gold matching (evaluation-only, no leakage):
+- gold_triplets_with_span_variants(): canonical triplets plus (opinion span, opinion span, polarity)
+  so span-based predictions can match categorical aspect_ref annotations.
+- precision_recall_f1_ap(): aspect-polarity F1 (match on (aspect, polarity) only).
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+Triplet = Tuple[str, str, str]
+
+_PUNCT = ".,;:!?\"'`""''()[]{}"
+
+
+def norm_text(t: Optional[str]) -> str:
+    if t is None:
+        return ""
+    t = (t or "").strip().lower()
+    for p in _PUNCT:
+        t = t.strip(p)
+    return " ".join(t.split())
+
+
+def triplet_from_sentiment(sent: Dict[str, Any]) -> Triplet:
+    aspect = norm_text(sent.get("aspect_ref") or sent.get("term"))
+    op = sent.get("opinion_term")
+    opinion = norm_text(op.get("term") if isinstance(op, dict) else op)
+    polarity = norm_text(sent.get("polarity") or sent.get("label"))
+    return (aspect, opinion, polarity)
+
+
+def triplets_from_list(items: Any) -> set:
+    if not items or not isinstance(items, (list, tuple)):
+        return set()
+    return {triplet_from_sentiment(it) for it in items if it and isinstance(it, dict)}
+
+
+def gold_triplets_with_span_variants(gold_list: List[Dict[str, Any]]) -> set:
+    """
+    Build gold set with canonical triplets plus span-based variants for matching.
+    When annotation uses categorical aspect_ref (e.g. '제품 전체#편의성') and opinion_term.term
+    as the surface span, we add (opinion_term.term, opinion_term.term, polarity) so that
+    model predictions using span-based aspect_ref can match. Evaluation-only; no leakage.
+    """
+    out: set = set()
+    for it in gold_list or []:
+        if not it or not isinstance(it, dict):
+            continue
+        out.add(triplet_from_sentiment(it))
+        op = it.get("opinion_term")
+        op_term = norm_text(op.get("term") if isinstance(op, dict) else op)
+        aspect_canon = norm_text(it.get("aspect_ref") or it.get("term"))
+        polarity = norm_text(it.get("polarity") or it.get("label"))
+        if op_term and aspect_canon != op_term:
+            out.add((op_term, op_term, polarity))
+    return out
+
+
+def gold_list(record: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Non-empty gold_triplets list (top level or inputs), else None."""
+    gold = record.get("gold_triplets") or (record.get("inputs") or {}).get("gold_triplets")
+    return gold if isinstance(gold, list) and gold else None
+
+
+def extract_gold_triplets(record: Dict[str, Any]) -> Optional[set]:
+    gold = gold_list(record)
+    return gold_triplets_with_span_variants(gold) if gold is not None else None
+
+
+def get_process_trace(record: Dict[str, Any]) -> list:
+    """Get process_trace from runtime or runtime.parsed_output (scorecard stores it inside parsed_output)."""
+    runtime = record.get("runtime") or {}
+    trace = runtime.get("process_trace") or record.get("process_trace") or []
+    if not trace and isinstance(runtime.get("parsed_output"), dict):
+        trace = runtime["parsed_output"].get("process_trace") or []
+    return trace if isinstance(trace, list) else []
+
+
+def extract_final_triplets(record: Dict[str, Any]) -> set:
+    """Prefer Stage2+Moderator final_aspects (parsed_output.final_result or runtime.final_aspects), then inputs.aspect_sentiments (Stage1)."""
+    runtime = record.get("runtime") or {}
+    parsed = runtime.get("parsed_output") if isinstance(runtime.get("parsed_output"), dict) else {}
+    final_aspects = (parsed.get("final_result") or {}).get("final_aspects") or runtime.get("final_aspects")
+    if final_aspects:
+        out = triplets_from_list(final_aspects)
+        if out:
+            return out
+    inputs = record.get("inputs") or {}
+    sents = inputs.get("aspect_sentiments")
+    if sents:
+        return triplets_from_list(sents)
+    return set()
+
+
+def stage1_atsa_sentiments(trace: Any) -> Optional[list]:
+    """First non-empty output.aspect_sentiments of a stage1 ATSA entry in process_trace."""
+    for entry in trace or []:
+        if (entry.get("stage") or "").lower() == "stage1" and (entry.get("agent") or "").lower() == "atsa":
+            sents = (entry.get("output") or {}).get("aspect_sentiments")
+            if sents:
+                return sents
+    return None
+
+
+def extract_stage1_triplets(record: Dict[str, Any]) -> set:
+    """Stage1 ATSA trace output (embedded trace or the scorecard's runtime.stage1_atsa_sentiments), else final."""
+    sents = stage1_atsa_sentiments(get_process_trace(record)) or (record.get("runtime") or {}).get("stage1_atsa_sentiments")
+    if sents:
+        return triplets_from_list(sents)
+    return extract_final_triplets(record)
+
+
+def triplets_to_ap_pairs(triplets: set) -> set:
+    """(aspect, opinion, polarity) -> {(aspect, polarity)} for aspect-polarity F1 (evaluation-only)."""
+    return {(a, p) for (a, o, p) in (triplets or set())}
+
+
+def precision_recall_f1(pred: set, gold: set) -> Tuple[float, float, float]:
+    if not gold:
+        return (0.0, 0.0, 0.0)
+    pred = pred or set()
+    tp = len(pred & gold)
+    fp = len(pred - gold)
+    fn = len(gold - pred)
+    prec = tp / (tp + fp) if (tp + fp) > 0 else 0.0
+    rec = tp / (tp + fn) if (tp + fn) > 0 else 0.0
+    f1 = (2 * prec * rec / (prec + rec)) if (prec + rec) > 0 else 0.0
+    return (prec, rec, f1)
+
+
+def precision_recall_f1_ap(pred_triplets: set, gold_triplets: set) -> Tuple[float, float, float]:
+    """
+    Aspect-polarity F1: match on (aspect, polarity) only so categorical gold and span-based pred
+    are comparable. Evaluation-only; no leakage.
+    """
+    return precision_recall_f1(triplets_to_ap_pairs(pred_triplets), triplets_to_ap_pairs(gold_triplets))
+
+
+# ---------- Structural signals (canonical sources) ----------
+# Hallucinated aspect: ate vs input span match -> ate.hallucination_flag or derived from ate_score
+# Unsupported polarity: atsa.evidence_flags / sentiment_judgements issues
+# Polarity conflict: aggregator.conflict_flags / stage1 vs stage2 label conflict
+# Negation/contrast: validator.structural_risks (risk_id NEGATION_SCOPE, CONTRAST_SCOPE)
+# Stage1↔2 change: stage_delta
+
+
+def get_profile(record: Dict[str, Any]) -> Optional[str]:
+    return record.get("profile") or (record.get("meta") or {}).get("profile")
+
+
+def has_hallucinated_aspect(record: Dict[str, Any]) -> bool:
+    """Input span에 매칭되지 않는 aspect 비율 소스: ate_score filtered drop or ate.hallucination_flag."""
+    if record.get("ate", {}).get("hallucination_flag") is True:
+        return True
+    filtered = (record.get("inputs") or {}).get("ate_debug", {}).get("filtered", [])
+    drops = [f for f in filtered if f.get("action") == "drop"]
+    return len(drops) > 0 and len(filtered) > 0
+
+
+def has_unsupported_polarity(record: Dict[str, Any]) -> bool:
+    """evidence 없거나 aspect와 비정합인 polarity: atsa_score sentiment_judgements issues."""
+    atsa = record.get("atsa") or record.get("atsa_score") or {}
+    judgements = atsa.get("sentiment_judgements") or []
+    for j in judgements:
+        if j.get("issues") or not j.get("opinion_grounded", True) or not j.get("evidence_relevant", True):
+            return True
+    return False
+
+
+def has_polarity_conflict(record: Dict[str, Any]) -> bool:
+    """동일 aspect 상충 polarity: moderator RuleM or stage1 vs stage2 label conflict."""
+    mod = record.get("moderator") or {}
+    if "RuleM" in (mod.get("applied_rules") or []):
+        return True
+    stage1_label = (record.get("stage1_ate") or {}).get("label") or ""
+    stage2_ate = record.get("stage2_ate") or {}
+    stage2_label = stage2_ate.get("label") if isinstance(stage2_ate, dict) else None
+    if stage2_label is not None and stage1_label != stage2_label:
+        return True
+    return False
+
+
+def count_negation_contrast_risks(record: Dict[str, Any]) -> int:
+    """validator.structural_risks 중 NEGATION_SCOPE, CONTRAST_SCOPE."""
+    count = 0
+    for stage_block in record.get("validator") or []:
+        for r in (stage_block.get("structural_risks") or []):
+            rid = (r.get("risk_id") or "").upper()
+            if "NEGATION" in rid or "CONTRAST" in rid:
+                count += 1
+    return count
+
+
+def stage_delta_guided_unguided(record: Dict[str, Any]) -> Tuple[bool, bool]:
+    """(has_guided_change, has_unguided_drift)."""
+    delta = record.get("stage_delta") or {}
+    changed = delta.get("changed", False)
+    change_type = (delta.get("change_type") or "none").lower()
+    guided = changed and change_type == "guided"
+    unguided = changed and change_type == "unguided"
+    return guided, unguided
+
+
+def count_stage1_risks(record: Dict[str, Any]) -> int:
+    for stage_block in record.get("validator") or []:
+        if (stage_block.get("stage") or "").lower() == "stage1":
+            return len(stage_block.get("structural_risks") or [])
+    return 0
+
+
+def count_stage2_risks(record: Dict[str, Any]) -> int:
+    for stage_block in record.get("validator") or []:
+        if (stage_block.get("stage") or "").lower() == "stage2":
+            return len(stage_block.get("structural_risks") or [])
+    return 0
+
+
+def residual_risk_severity(record: Dict[str, Any]) -> float:
+    """Stage2 (final) structural_risks severity 가중합: high=3, mid=2, low=1."""
+    weight = {"high": 3.0, "mid": 2.0, "low": 1.0}
+    total = 0.0
+    for stage_block in record.get("validator") or []:
+        if (stage_block.get("stage") or "").lower() != "stage2":
+            continue
+        for r in (stage_block.get("structural_risks") or []):
+            total += weight.get((r.get("severity") or "mid").lower(), 2.0)
+    return total
+
+
+def risk_id_set(record: Dict[str, Any]) -> Tuple[str, ...]:
+    """Sorted validator risk_ids over all stages (risk_set_consistency key)."""
+    ids = []
+    for s in (record.get("validator") or []):
+        for v in (s.get("structural_risks") or []):
+            ids.append(v.get("risk_id") or "")
+    return tuple(sorted(ids))
+
+
+def parse_generate_failed(record: Dict[str, Any]) -> bool:
+    flags = record.get("flags") or {}
+    return bool(flags.get("parse_failed") or flags.get("generate_failed"))
+
+
+# ---------- HF aux signal (external reference only; not a correctness criterion) ----------
+def norm_polarity(label: str) -> str:
+    """Normalize to pos/neg/neu for HF–LLM comparison."""
+    if not label:
+        return "neu"
+    key = (label or "").strip().lower()
+    norm = {"positive": "pos", "pos": "pos", "negative": "neg", "neg": "neg", "neutral": "neu", "neu": "neu", "mixed": "neu"}
+    return norm.get(key) or "neu"
+
+
+def get_final_polarity(record: Dict[str, Any]) -> str:
+    """Final polarity (moderator.final_label or final_result.label) normalized pos/neg/neu."""
+    mod = record.get("moderator") or {}
+    final = (mod.get("final_label") or (record.get("final_result") or {}).get("label") or "")
+    return norm_polarity(final)
+
+
+def get_hf_label(record: Dict[str, Any]) -> Optional[str]:
+    """HF label from aux_signals.hf if present."""
+    hf = (record.get("aux_signals") or {}).get("hf") or {}
+    return hf.get("label")
+
+
+def hf_disagrees_with_final(record: Dict[str, Any]) -> bool:
+    """HF label ≠ final polarity (for HF–LLM Polarity Disagreement Rate)."""
+    hf_label = get_hf_label(record)
+    if hf_label is None:
+        return False
+    return norm_polarity(hf_label) != get_final_polarity(record)
+
+
+def has_validator_risk(record: Dict[str, Any]) -> bool:
+    """Validator structural_risks 존재 여부."""
+    return count_stage1_risks(record) > 0 or count_stage2_risks(record) > 0
+
+
+def hf_disagreement_coverage_of_structural_risks(record: Dict[str, Any]) -> Optional[bool]:
+    """Among samples with Validator risk: HF disagrees with final? (None if no HF or no risk)."""
+    if not has_validator_risk(record):
+        return None
+    if get_hf_label(record) is None:
+        return None
+    return hf_disagrees_with_final(record)
+
+
+# ---------- S1→S2 correctness snapshot (label experiments) ----------
+def get_sample_correctness(record: Dict[str, Any]) -> Optional[Tuple[bool, bool]]:
+    """
+    Return (C1, C2) for sample: stage1 correct, stage2 correct.
+    Returns None if correctness/triplet_correctness not present.
+    """
+    # 1) Sample-level correctness block
+    correctness = record.get("correctness")
+    if isinstance(correctness, dict):
+        s1 = correctness.get("stage1")
+        s2 = correctness.get("stage2")
+        if isinstance(s1, dict) and isinstance(s2, dict):
+            c1 = s1.get("is_correct")
+            c2 = s2.get("is_correct")
+            if c1 is not None and c2 is not None:
+                return (bool(c1), bool(c2))
+
+    # 2) Derive from triplet_correctness: sample correct iff all triplets correct
+    triplets = record.get("triplet_correctness")
+    if isinstance(triplets, list) and len(triplets) > 0:
+        c1_all = all(
+            bool(t.get("stage1_correct", False)) for t in triplets if isinstance(t, dict)
+        )
+        c2_all = all(
+            bool(t.get("stage2_correct", False)) for t in triplets if isinstance(t, dict)
+        )
+        return (c1_all, c2_all)
+
+    return None
@@ -0,0 +1,625 @@
+from __future__ import annotations
+
+"""
+Single-pass streaming metrics over scorecards.jsonl.
+
+Every report script used to load the whole scorecards file into a list and walk it once per
+metric family (structural_error_aggregator, transition_aggregator and build_metric_report even
+re-read the same file in subprocesses). Here the file is read line by line exactly once; each
+row is wrapped in a ScorecardView (derived fields computed at most once per row) and handed to
+every registered accumulator. Accumulators keep counters/sums only, so memory is bounded by the
+number of cases (consistency keys) and latencies, not by scorecard size.
+
+Usage:
+  mp = MetricsPass()
+  structural = mp.register("structural", StructuralMetricsAccumulator(profile="paper_main"))
+  transitions = mp.register("transitions", TransitionAccumulator(profile="paper_main"))
+  results = mp.run(iter_scorecards(path))   # {"structural": {...}, "transitions": {...}}
+
+Adding a metric family = subclass MetricAccumulator (add(view) / result()) and register it.
+"""
+
+import json
+from collections import Counter
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from metrics.scorecard import (
+    count_negation_contrast_risks,
+    count_stage1_risks,
+    count_stage2_risks,
+    extract_final_triplets,
+    extract_gold_triplets,
+    extract_stage1_triplets,
+    get_hf_label,
+    get_profile,
+    get_sample_correctness,
+    has_hallucinated_aspect,
+    has_polarity_conflict,
+    has_unsupported_polarity,
+    hf_disagrees_with_final,
+    parse_generate_failed,
+    precision_recall_f1,
+    residual_risk_severity,
+    risk_id_set,
+    stage_delta_guided_unguided,
+    triplets_to_ap_pairs,
+)
+
+
+def iter_scorecards(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield scorecard rows one at a time (utf-8-sig, undecodable bytes replaced, bad JSON lines skipped)."""
+    path = Path(path)
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(row, dict):
+                yield row
+
+
+def _rate(num: int, denom: int) -> float:
+    return (num / denom) if denom else 0.0
+
+
+class ScorecardView:
+    """One scorecard row plus lazily computed fields shared by all accumulators."""
+
+    def __init__(self, record: Dict[str, Any]):
+        self.record = record
+
+    @cached_property
+    def profile(self) -> Optional[str]:
+        return get_profile(self.record)
+
+    @cached_property
+    def stage1_risks(self) -> int:
+        return count_stage1_risks(self.record)
+
+    @cached_property
+    def stage2_risks(self) -> int:
+        return count_stage2_risks(self.record)
+
+    @cached_property
+    def changed(self) -> bool:
+        return (self.record.get("stage_delta") or {}).get("changed", False)
+
+    @cached_property
+    def selected_stage(self) -> Optional[str]:
+        return (self.record.get("moderator") or {}).get("selected_stage")
+
+    @cached_property
+    def polarity_conflict(self) -> bool:
+        return has_polarity_conflict(self.record)
+
+    @cached_property
+    def hf_label(self) -> Optional[str]:
+        return get_hf_label(self.record)
+
+    @cached_property
+    def hf_disagrees(self) -> bool:
+        return hf_disagrees_with_final(self.record)
+
+
+class MetricAccumulator:
+    """
+    One metric family fed one ScorecardView at a time.
+    profile: only rows whose profile (or meta.profile) equals it are added (None = all rows).
+    where: optional extra row predicate on the view.
+    """
+
+    def __init__(self, profile: Optional[str] = None, where: Optional[Callable[[ScorecardView], bool]] = None):
+        self.profile = profile
+        self.where = where
+
+    def accepts(self, view: ScorecardView) -> bool:
+        if self.profile and view.profile != self.profile:
+            return False
+        return self.where is None or bool(self.where(view))
+
+    def add(self, view: ScorecardView) -> None:
+        raise NotImplementedError
+
+    def result(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def feed(self, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Standalone use over an in-memory list: add accepted rows, return result()."""
+        for row in rows:
+            view = ScorecardView(row)
+            if self.accepts(view):
+                self.add(view)
+        return self.result()
+
+
+class MetricsPass:
+    """Registered accumulators sharing one read of the scorecards."""
+
+    def __init__(self) -> None:
+        self._accumulators: Dict[str, MetricAccumulator] = {}
+        self.n_records = 0
+
+    def register(self, key: str, accumulator: MetricAccumulator) -> MetricAccumulator:
+        if key in self._accumulators:
+            raise ValueError(f"accumulator '{key}' already registered")
+        self._accumulators[key] = accumulator
+        return accumulator
+
+    def run(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        accumulators = list(self._accumulators.values())
+        for record in records:
+            self.n_records += 1
+            view = ScorecardView(record)
+            for acc in accumulators:
+                if acc.accepts(view):
+                    acc.add(view)
+        return {key: acc.result() for key, acc in self._accumulators.items()}
+
+
+# ---------- Gold-based Stage2 correction ----------
+class Stage2CorrectionAccumulator(MetricAccumulator):
+    """
+    Triplet F1 S1/S2, ΔF1, Fix/Break/NetGain, CorrPrec, CIS over rows with gold triplets.
+    Defaults follow structural_error_aggregator: span-variant gold, aspect-polarity matching
+    (project=triplets_to_ap_pairs). build_metric_report passes its own extractors and project=None
+    (full-triplet matching).
+    """
+
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        where: Optional[Callable[[ScorecardView], bool]] = None,
+        *,
+        gold_fn: Callable[[Dict[str, Any]], Optional[set]] = extract_gold_triplets,
+        stage1_fn: Callable[[Dict[str, Any]], set] = extract_stage1_triplets,
+        final_fn: Callable[[Dict[str, Any]], set] = extract_final_triplets,
+        project: Optional[Callable[[set], set]] = triplets_to_ap_pairs,
+    ):
+        super().__init__(profile, where)
+        self.gold_fn, self.stage1_fn, self.final_fn, self.project = gold_fn, stage1_fn, final_fn, project
+        self.n = 0
+        self.f1_s1_sum = 0.0
+        self.f1_s2_sum = 0.0
+        self.n_fix = self.n_break = self.n_still = self.n_keep = 0
+
+    def add(self, view: ScorecardView) -> None:
+        gold = self.gold_fn(view.record)
+        if gold is None:
+            return
+        s1 = self.stage1_fn(view.record)
+        s2 = self.final_fn(view.record)
+        if self.project is not None:
+            gold, s1, s2 = self.project(gold), self.project(s1), self.project(s2)
+        self.n += 1
+        self.f1_s1_sum += precision_recall_f1(s1, gold)[2]
+        self.f1_s2_sum += precision_recall_f1(s2, gold)[2]
+        st1 = s1 == gold
+        st2 = s2 == gold
+        if not st1 and st2:
+            self.n_fix += 1
+        if st1 and not st2:
+            self.n_break += 1
+        if not st1 and not st2:
+            self.n_still += 1
+        if st1 and st2:
+            self.n_keep += 1
+
+    def result(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "triplet_f1_s1": None, "triplet_f1_s2": None, "delta_f1": None,
+            "fix_rate": None, "break_rate": None, "net_gain": None,
+            "correction_precision": None, "conservative_improvement_score": None,
+            "n_fix": 0, "n_break": 0, "n_still": 0, "n_keep": 0, "N_gold": 0,
+        }
+        N = self.n
+        if not N:
+            return out
+        n_fix, n_break, n_still, n_keep = self.n_fix, self.n_break, self.n_still, self.n_keep
+        out.update({"N_gold": N, "n_fix": n_fix, "n_break": n_break, "n_still": n_still, "n_keep": n_keep})
+        out["triplet_f1_s1"] = self.f1_s1_sum / N
+        out["triplet_f1_s2"] = self.f1_s2_sum / N
+        out["delta_f1"] = out["triplet_f1_s2"] - out["triplet_f1_s1"]
+        # FixRate = n_fix / (n_fix + n_still); BreakRate = n_break / (n_break + n_keep); NetGain = (n_fix - n_break) / N
+        need_fix = n_fix + n_still
+        out["fix_rate"] = _rate(n_fix, need_fix) if need_fix else None
+        keep_break = n_break + n_keep
+        out["break_rate"] = _rate(n_break, keep_break) if keep_break else None
+        out["net_gain"] = (n_fix - n_break) / N
+        change_denom = n_fix + n_break
+        out["correction_precision"] = _rate(n_fix, change_denom) if change_denom else None
+        # CIS = (n_fix - 2*n_break) / (n_fix + n_still), λ=2
+        out["conservative_improvement_score"] = (n_fix - 2 * n_break) / need_fix if need_fix else None
+        return out
+
+
+# ---------- Structural metrics (structural_metrics.csv) ----------
+_DEBATE_FAIL_KEYS = ("no_aspects", "no_match", "neutral_stance", "fallback_used")
+STAGE2_CORRECTION_KEYS = ("triplet_f1_s1", "triplet_f1_s2", "delta_f1", "fix_rate", "break_rate", "net_gain", "N_gold")
+
+
+class StructuralAccumulator(MetricAccumulator):
+    """structural_error_aggregator.aggregate_single_run as running counters."""
+
+    def __init__(self, profile: Optional[str] = None, where: Optional[Callable[[ScorecardView], bool]] = None):
+        super().__init__(profile, where)
+        self.n = 0
+        self.hallucinated = self.unsupported = self.polarity_conflict = 0
+        self.negation_contrast_risks = 0
+        self.guided_changes = self.unguided_drifts = self.all_changes = 0
+        self.risk_s1 = self.risk_s2 = 0
+        self.residual_sev = 0.0
+        self.parse_gen_fail = 0
+        # Risk decomposition: risk-flagged, risk-affected change, resolved with/without change, ignored proposal
+        self.n_risk_flagged = self.n_risk_affected_change = self.n_ignored_proposal = 0
+        self.n_with_change = self.n_resolved_with_change = 0
+        self.n_without_change = self.n_resolved_without_change = 0
+        # HF aux metrics: external reference signal only (not a correctness criterion)
+        self.n_with_hf = self.hf_disagree_count = 0
+        self.n_risk_hf = self.risk_hf_disagree = 0
+        # Debate mapping: per-row rates are averaged over rows that had rebuttals
+        self.n_debate_rows = 0
+        self.debate_coverage_sum = self.debate_direct_sum = self.debate_fallback_sum = self.debate_none_sum = 0.0
+        self.debate_total_rebuttals = 0
+        self.debate_fail_counts = {k: 0 for k in _DEBATE_FAIL_KEYS}
+        self.debate_override_applied = self.debate_override_skipped_low = self.debate_override_skipped_conflict = 0
+        self.correction = Stage2CorrectionAccumulator()
+
+    def add(self, view: ScorecardView) -> None:
+        r = view.record
+        self.n += 1
+        self.hallucinated += has_hallucinated_aspect(r)
+        self.unsupported += has_unsupported_polarity(r)
+        self.polarity_conflict += view.polarity_conflict
+        self.negation_contrast_risks += count_negation_contrast_risks(r)
+        guided, unguided = stage_delta_guided_unguided(r)
+        self.guided_changes += bool(guided)
+        self.unguided_drifts += bool(unguided)
+        changed = view.changed
+        self.all_changes += bool(changed)
+        s1, s2 = view.stage1_risks, view.stage2_risks
+        self.risk_s1 += s1
+        self.risk_s2 += s2
+        self.residual_sev += residual_risk_severity(r)
+        self.parse_gen_fail += parse_generate_failed(r)
+
+        is_resolved = s1 > 0 and s2 < s1
+        if s1 > 0:
+            self.n_risk_flagged += 1
+            if changed:
+                self.n_risk_affected_change += 1
+            else:
+                self.n_ignored_proposal += 1
+        if changed:
+            self.n_with_change += 1
+            self.n_resolved_with_change += is_resolved
+        else:
+            self.n_without_change += 1
+            self.n_resolved_without_change += is_resolved
+
+        if view.hf_label is not None:
+            self.n_with_hf += 1
+            self.hf_disagree_count += view.hf_disagrees
+            if s1 > 0 or s2 > 0:
+                self.n_risk_hf += 1
+                self.risk_hf_disagree += view.hf_disagrees
+
+        debate = r.get("debate") or {}
+        meta = r.get("meta") or {}
+        mapping_stats = debate.get("mapping_stats") or meta.get("debate_mapping_stats") or {}
+        total = sum(int(v) for v in mapping_stats.values()) if mapping_stats else 0
+        if total > 0:
+            direct = int(mapping_stats.get("direct") or 0)
+            fallback = int(mapping_stats.get("fallback") or 0)
+            none = int(mapping_stats.get("none") or 0)
+            self.n_debate_rows += 1
+            self.debate_coverage_sum += (direct + fallback) / total
+            self.debate_direct_sum += direct / total
+            self.debate_fallback_sum += fallback / total
+            self.debate_none_sum += none / total
+            self.debate_total_rebuttals += total
+            fail = debate.get("mapping_fail_reasons") or meta.get("debate_mapping_fail_reasons") or {}
+            for key in _DEBATE_FAIL_KEYS:
+                self.debate_fail_counts[key] += int(fail.get(key) or 0)
+        override = debate.get("override_stats") or meta.get("debate_override_stats") or {}
+        self.debate_override_applied += int(override.get("applied") or 0)
+        self.debate_override_skipped_low += int(override.get("skipped_low_signal") or 0)
+        self.debate_override_skipped_conflict += int(override.get("skipped_conflict") or 0)
+
+        self.correction.add(view)
+
+    def result(self) -> Dict[str, Any]:
+        N = self.n
+        if N == 0:
+            return {"n": 0}
+        resolved = self.risk_s1 - self.risk_s2  # simplified: residual risk count decrease
+        rebuttals = self.debate_total_rebuttals
+        n_debate = self.n_debate_rows
+        out = {
+            "n": N,
+            "aspect_hallucination_rate": _rate(self.hallucinated, N),
+            "unsupported_polarity_rate": _rate(self.unsupported, N),
+            "polarity_conflict_rate": _rate(self.polarity_conflict, max(N, 1)),
+            "negation_contrast_failure_rate": _rate(self.negation_contrast_risks, N),
+            "guided_change_rate": _rate(self.guided_changes, self.all_changes) if self.all_changes else 0.0,
+            "unguided_drift_rate": _rate(self.unguided_drifts, N),
+            "risk_resolution_rate": _rate(max(0, resolved), self.risk_s1) if self.risk_s1 else 0.0,
+            "risk_flagged_rate": _rate(self.n_risk_flagged, N),
+            "risk_affected_change_rate": _rate(self.n_risk_affected_change, self.n_risk_flagged),
+            "risk_resolved_with_change_rate": _rate(self.n_resolved_with_change, self.n_with_change),
+            "risk_resolved_without_change_rate": _rate(self.n_resolved_without_change, self.n_without_change),
+            "ignored_proposal_rate": _rate(self.n_ignored_proposal, self.n_risk_flagged),
+            "residual_risk_severity_sum": self.residual_sev,
+            "parse_generate_failure_rate": _rate(self.parse_gen_fail, N),
+            "hf_polarity_disagreement_rate": _rate(self.hf_disagree_count, self.n_with_hf) if self.n_with_hf else None,
+            "hf_disagreement_coverage_of_structural_risks": _rate(self.risk_hf_disagree, self.n_risk_hf) if self.n_risk_hf else None,
+            # Conditional Improvement Gain (ΔTriplet F1 | HF-disagree / HF-agree): requires gold; placeholder
+            "conditional_improvement_gain_hf_disagree": None,
+            "conditional_improvement_gain_hf_agree": None,
+            "debate_mapping_coverage": self.debate_coverage_sum / n_debate if n_debate else None,
+            "debate_mapping_direct_rate": self.debate_direct_sum / n_debate if n_debate else None,
+            "debate_mapping_fallback_rate": self.debate_fallback_sum / n_debate if n_debate else None,
+            "debate_mapping_none_rate": self.debate_none_sum / n_debate if n_debate else None,
+            "debate_fail_no_aspects_rate": _rate(self.debate_fail_counts["no_aspects"], rebuttals) if rebuttals else None,
+            "debate_fail_no_match_rate": _rate(self.debate_fail_counts["no_match"], rebuttals) if rebuttals else None,
+            "debate_fail_neutral_stance_rate": _rate(self.debate_fail_counts["neutral_stance"], rebuttals) if rebuttals else None,
+            "debate_fail_fallback_used_rate": _rate(self.debate_fail_counts["fallback_used"], rebuttals) if rebuttals else None,
+            "debate_override_applied": self.debate_override_applied,
+            "debate_override_skipped_low_signal": self.debate_override_skipped_low,
+            "debate_override_skipped_conflict": self.debate_override_skipped_conflict,
+        }
+        # Gold-based F1 / correction metrics (for aggregate_seed_metrics mean±std)
+        correction = self.correction.result()
+        for k in STAGE2_CORRECTION_KEYS:
+            out[k] = correction.get(k)
+        return out
+
+
+class ConsistencyAccumulator(MetricAccumulator):
+    """
+    self_consistency_exact / risk_set_consistency over merged runs (several rows per case_id).
+    Keeps only the first label/risk set per case and whether later rows agreed with it.
+    """
+
+    def __init__(self, profile: Optional[str] = None, where: Optional[Callable[[ScorecardView], bool]] = None):
+        super().__init__(profile, where)
+        self.by_case: Dict[str, List[Any]] = {}  # cid -> [label, risk_set, label_agree, risk_agree]
+
+    def add(self, view: ScorecardView) -> None:
+        r = view.record
+        meta = r.get("meta") or {}
+        cid = meta.get("case_id") or meta.get("text_id") or meta.get("uid") or ""
+        if not cid:
+            return
+        label = str((r.get("final_result") or {}).get("label", meta.get("label", "")))
+        risks = risk_id_set(r)
+        state = self.by_case.get(cid)
+        if state is None:
+            self.by_case[cid] = [label, risks, True, True]
+            return
+        state[2] = state[2] and label == state[0]
+        state[3] = state[3] and risks == state[1]
+
+    def result(self) -> Dict[str, Any]:
+        n_cases = len(self.by_case)
+        if not n_cases:
+            return {"self_consistency_exact": 0.0, "risk_set_consistency": 0.0}
+        return {
+            "self_consistency_exact": _rate(sum(1 for s in self.by_case.values() if s[2]), n_cases),
+            "risk_set_consistency": _rate(sum(1 for s in self.by_case.values() if s[3]), n_cases),
+        }
+
+
+class StructuralMetricsAccumulator(MetricAccumulator):
+    """
+    structural_metrics.csv row: profile-filtered StructuralAccumulator plus consistency over all rows
+    (aggregate_merged). fallback_to_all: when the profile matches no row, report unfiltered metrics
+    with profile_filter set — computed in the same pass instead of a second read.
+    """
+
+    def __init__(self, profile: Optional[str] = None, *, merged: bool = True, fallback_to_all: bool = True):
+        super().__init__(None)
+        self.filter_profile = profile
+        self.filtered = StructuralAccumulator(profile)
+        self.unfiltered = StructuralAccumulator() if (profile and fallback_to_all) else None
+        self.consistency = ConsistencyAccumulator() if merged else None
+
+    def add(self, view: ScorecardView) -> None:
+        if self.filtered.accepts(view):
+            self.filtered.add(view)
+        if self.unfiltered is not None:
+            self.unfiltered.add(view)
+        if self.consistency is not None:
+            self.consistency.add(view)
+
+    def result(self) -> Dict[str, Any]:
+        metrics = self.filtered.result()
+        if metrics.get("n", 0) == 0:
+            if self.unfiltered is not None and self.unfiltered.n:
+                metrics = self.unfiltered.result()
+                metrics["profile_filter"] = self.filter_profile
+            return metrics
+        if self.consistency is not None:
+            metrics.update(self.consistency.result())
+        return metrics
+
+
+# ---------- S1→S2 transitions (transition_summary.json) ----------
+class TransitionAccumulator(MetricAccumulator):
+    """Fix/Keep/Break/Still-wrong counts from correctness / triplet_correctness snapshots."""
+
+    def __init__(self, profile: Optional[str] = None, where: Optional[Callable[[ScorecardView], bool]] = None):
+        super().__init__(profile, where)
+        self.n_rows = 0
+        self.n_fix = self.n_keep = self.n_break = self.n_still = 0
+
+    def add(self, view: ScorecardView) -> None:
+        self.n_rows += 1
+        pair = get_sample_correctness(view.record)
+        if pair is None:
+            return
+        c1, c2 = pair
+        if not c1 and c2:
+            self.n_fix += 1
+        elif c1 and c2:
+            self.n_keep += 1
+        elif c1 and not c2:
+            self.n_break += 1
+        else:
+            self.n_still += 1
+
+    def result(self) -> Dict[str, Any]:
+        n_total = self.n_fix + self.n_keep + self.n_break + self.n_still
+        has_total = n_total > 0
+        return {
+            "n_fix": self.n_fix,
+            "n_keep": self.n_keep,
+            "n_break": self.n_break,
+            "n_still": self.n_still,
+            "n_total": n_total,
+            "n_skipped": self.n_rows - n_total,
+            "fix_rate": _rate(self.n_fix, n_total) if has_total else None,
+            "keep_rate": _rate(self.n_keep, n_total) if has_total else None,
+            "break_rate": _rate(self.n_break, n_total) if has_total else None,
+            "still_wrong_rate": _rate(self.n_still, n_total) if has_total else None,
+        }
+
+
+# ---------- Report-level summaries (build_metric_report) ----------
+class SubsetRatesAccumulator(MetricAccumulator):
+    """Risk Resolution Rate, Stage2 Adoption Rate, Polarity Conflict Rate for the rows passing `where`."""
+
+    def __init__(self, profile: Optional[str] = None, where: Optional[Callable[[ScorecardView], bool]] = None):
+        super().__init__(profile, where)
+        self.n = self.risk_s1 = self.risk_s2 = self.stage2_count = self.polarity_conflict_count = 0
+
+    def add(self, view: ScorecardView) -> None:
+        self.n += 1
+        self.risk_s1 += view.stage1_risks
+        self.risk_s2 += view.stage2_risks
+        self.stage2_count += view.selected_stage == "stage2"
+        self.polarity_conflict_count += view.polarity_conflict
+
+    def result(self) -> Dict[str, Optional[float]]:
+        N = self.n
+        if N == 0:
+            return {"risk_resolution_rate": None, "stage2_adoption_rate": None, "polarity_conflict_rate": None}
+        resolved = max(0, self.risk_s1 - self.risk_s2)
+        return {
+            "risk_resolution_rate": _rate(resolved, self.risk_s1) if self.risk_s1 else None,
+            "stage2_adoption_rate": _rate(self.stage2_count, N),
+            "polarity_conflict_rate": _rate(self.polarity_conflict_count, N),
+        }
+
+
+class RunStatsAccumulator(MetricAccumulator):
+    """Structural PASS, Stage2 adoption, rule/risk_id counters, latency p50/p95, gate and failure counts."""
+
+    def __init__(self, profile: Optional[str] = None, where: Optional[Callable[[ScorecardView], bool]] = None):
+        super().__init__(profile, where)
+        self.n = self.pass_count = self.stage2_count = 0
+        self.rule_counter: Counter = Counter()
+        self.risk_counter: Counter = Counter()
+        self.risk_resolved_count = self.risk_s1_total = 0
+        self.latencies: List[float] = []
+        self.gate_status_counter: Counter = Counter()
+        self.parse_fail = self.gen_fail = self.fallback = 0
+
+    def add(self, view: ScorecardView) -> None:
+        r = view.record
+        self.n += 1
+        self.pass_count += (r.get("summary") or {}).get("quality_pass") is True
+        self.stage2_count += view.selected_stage == "stage2"
+        for rule in (r.get("moderator") or {}).get("applied_rules") or []:
+            self.rule_counter[rule] += 1
+        s1_risks = s2_risks = 0
+        for stage_block in r.get("validator") or []:
+            risks = stage_block.get("structural_risks") or []
+            for risk in risks:
+                rid = (risk.get("risk_id") or risk.get("type") or "").strip()
+                if rid:
+                    self.risk_counter[rid] += 1
+            stage = (stage_block.get("stage") or "").lower()
+            if stage == "stage1":
+                s1_risks = len(risks)
+            elif stage == "stage2":
+                s2_risks = len(risks)
+        if s1_risks > 0:
+            self.risk_s1_total += s1_risks
+            if s2_risks < s1_risks:
+                self.risk_resolved_count += 1  # at least one resolved for this sample
+        lat = (r.get("meta") or {}).get("latency_ms")
+        if lat is not None:
+            try:
+                self.latencies.append(float(lat))
+            except (TypeError, ValueError):
+                pass
+        gate = (r.get("latency") or {}).get("gate_status") or ""
+        if gate:
+            self.gate_status_counter[gate] += 1
+        fl = r.get("flags") or {}
+        self.parse_fail += bool(fl.get("parse_failed"))
+        self.gen_fail += bool(fl.get("generate_failed"))
+        self.fallback += bool(fl.get("fallback_used"))
+
+    def result(self) -> Dict[str, Any]:
+        N = self.n
+        if N == 0:
+            return {"n": 0}
+        latencies = sorted(self.latencies)
+        n_lat = len(latencies)
+        latency_p50 = latencies[n_lat // 2] if n_lat else None
+        latency_p95 = latencies[int(n_lat * 0.95)] if n_lat and n_lat >= 2 else (latencies[-1] if latencies else None)
+        return {
+            "n": N,
+            "structural_pass_rate": _rate(self.pass_count, N),
+            "stage2_adoption_rate": _rate(self.stage2_count, N),
+            "rule_counts": dict(self.rule_counter),
+            "risk_id_counts": dict(self.risk_counter),
+            "risk_resolved_samples": self.risk_resolved_count,
+            "risk_s1_total": self.risk_s1_total,
+            "latency_p50_ms": latency_p50,
+            "latency_p95_ms": latency_p95,
+            "latencies": latencies,
+            "gate_status": dict(self.gate_status_counter),
+            "parse_failure_count": self.parse_fail,
+            "generate_failure_count": self.gen_fail,
+            "fallback_used_count": self.fallback,
+            "parse_failure_rate": _rate(self.parse_fail, N),
+            "generate_failure_rate": _rate(self.gen_fail, N),
+            "fallback_used_rate": _rate(self.fallback, N),
+        }
+
+
+class HeadAccumulator(MetricAccumulator):
+    """First `limit` rows as-is (report appendix / run profile), so callers need not keep the whole file."""
+
+    def __init__(self, limit: int, profile: Optional[str] = None, where: Optional[Callable[[ScorecardView], bool]] = None):
+        super().__init__(profile, where)
+        self.limit = max(0, int(limit))
+        self.rows: List[Dict[str, Any]] = []
+
+    def accepts(self, view: ScorecardView) -> bool:
+        return len(self.rows) < self.limit and super().accepts(view)
+
+    def add(self, view: ScorecardView) -> None:
+        self.rows.append(view.record)
+
+    def result(self) -> Dict[str, Any]:
+        return {"rows": self.rows}
+
+
+def stream_metrics(path: Path, accumulators: Dict[str, MetricAccumulator]) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """Convenience: one pass over `path` with the given accumulators -> (n_records, results by key)."""
+    mp = MetricsPass()
+    for key, acc in accumulators.items():
+        mp.register(key, acc)
+    results = mp.run(iter_scorecards(path))
+    return mp.n_records, results
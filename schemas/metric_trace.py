@@ -18,6 +18,6 @@ class ProcessTrace(BaseModel):
     input_hash: Optional[str] = Field(default=None, description="SHA256 of the input text for integrity checks.")
     input_text: str = Field(default="", description="Input text provided to the agent.")
     output: Dict[str, Any] = Field(default_factory=dict, description="Raw output dict.")
-    call_metadata: Optional[Dict[str, Any]] = Field(default=None, description="LLM call metadata (model, tokens, latency, retries).")
+    call_metadata: Optional[Dict[str, Any]] = Field(default=None, description="LLM call metadata (StructuredResultMeta.to_call_metadata(): retries, tokens, cost, error, ...).")
     stage_status: Optional[str] = Field(default=None, description="Optional status marker per stage (e.g., not_applicable).")
     notes: Optional[str] = Field(default=None, description="Optional notes or repair info.")
@@ -15,12 +15,17 @@ from __future__ import annotations
 
 import argparse
 import csv
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.run_tables import mean_std_frame  # noqa: E402
+from metrics.significance import METRICS, bootstrap_ci, build_correctness_matrix  # noqa: E402
+from scripts.step_graph import metric_report_step, report_shards_step, run_steps, structural_metrics_step  # noqa: E402
 
 
 def load_csv_row(path: Path) -> Optional[Dict[str, Any]]:
@@ -32,15 +37,6 @@ def load_csv_row(path: Path) -> Optional[Dict[str, Any]]:
     return rows[0] if rows else None
 
 
-def parse_float(v: Any) -> Optional[float]:
-    if v is None or v == "" or (isinstance(v, str) and v.strip().upper() in ("N/A", "NA", "")):
-        return None
-    try:
-        return float(v)
-    except (TypeError, ValueError):
-        return None
-
-
 def collect_per_seed_metrics(run_dirs: List[Path], metrics_path: str = "derived/metrics/structural_metrics.csv") -> List[Dict[str, Any]]:
     """Collect one row per run_dir from <run_dir>/derived/metrics/structural_metrics.csv."""
     rows = []
@@ -65,56 +61,20 @@ def compute_mean_std(per_seed_rows: List[Dict[str, Any]]) -> tuple[Dict[str, str
     if not per_seed_rows:
         return {}, {}, []
 
-    all_keys = set()
-    for r in per_seed_rows:
-        all_keys.update(k for k in r if not k.startswith("_"))
-
-    numeric_cols = []
-    for col in sorted(all_keys):
-        values = [parse_float(r.get(col)) for r in per_seed_rows]
-        values = [v for v in values if v is not None]
-        if len(values) >= 1:
-            numeric_cols.append(col)
-
-    mean_dict: Dict[str, str] = {}
-    std_dict: Dict[str, str] = {}
-
-    for col in numeric_cols:
-        values = [parse_float(r.get(col)) for r in per_seed_rows]
-        values = [v for v in values if v is not None]
-        if not values:
-            mean_dict[col] = "N/A"
-            std_dict[col] = "N/A"
-            continue
-        n = len(values)
-        mean = sum(values) / n
-        variance = sum((x - mean) ** 2 for x in values) / n if n else 0
-        std = variance ** 0.5
-        mean_dict[col] = f"{mean:.4f}"
-        std_dict[col] = f"{std:.4f}"
+    stats = mean_std_frame(per_seed_rows)
+    numeric_cols = [str(c) for c in stats.index]
+    mean_dict: Dict[str, str] = {col: f"{stats.at[col, 'mean']:.4f}" for col in numeric_cols}
+    std_dict: Dict[str, str] = {col: f"{stats.at[col, 'std']:.4f}" for col in numeric_cols}
 
     return mean_dict, std_dict, numeric_cols
 
 
-def ensure_structural_metrics(run_dir: Path, profile: str = "paper_main") -> bool:
-    """Run structural_error_aggregator if structural_metrics.csv missing."""
+def ensure_structural_metrics(run_dir: Path, profile: str = "paper_main", force: bool = False) -> bool:
+    """Run structural_error_aggregator unless structural_metrics.csv is up to date with scorecards.jsonl (step stamp)."""
     metrics_dir = run_dir / "derived" / "metrics"
-    csv_path = metrics_dir / "structural_metrics.csv"
-    if csv_path.exists():
-        return True
-    scorecards = run_dir / "scorecards.jsonl"
-    if not scorecards.exists():
-        return False
-    metrics_dir.mkdir(parents=True, exist_ok=True)
-    cmd = [
-        sys.executable,
-        str(PROJECT_ROOT / "scripts" / "structural_error_aggregator.py"),
-        "--input", str(scorecards),
-        "--outdir", str(metrics_dir),
-        "--profile", profile,
-    ]
-    r = subprocess.run(cmd, cwd=str(PROJECT_ROOT), capture_output=True, text=True)
-    return r.returncode == 0 and csv_path.exists()
+    step = structural_metrics_step(run_dir / "scorecards.jsonl", metrics_dir, profile)
+    status = run_steps([step], run_dir / "derived", force=force)
+    return status[step.name] in ("ok", "up_to_date") and (metrics_dir / "structural_metrics.csv").exists()
 
 
 def main() -> None:
@@ -132,7 +92,9 @@ def main() -> None:
     ap.add_argument("--outdir", type=str, default=None, help="Output directory (default: results/<base_run_id>_aggregated)")
     ap.add_argument("--metrics_profile", type=str, default="paper_main", choices=["smoke", "regression", "paper_main"])
     ap.add_argument("--with_metric_report", action="store_true", help="Run build_metric_report for merged run (HTML)")
-    ap.add_argument("--ensure_per_seed_metrics", action="store_true", help="Run structural_error_aggregator for each seed if CSV missing")
+    ap.add_argument("--ensure_per_seed_metrics", action="store_true", help="Run structural_error_aggregator for each seed if CSV missing or stale")
+    ap.add_argument("--bootstrap_resamples", type=int, default=10000, help="Resamples for per-example bootstrap CIs of gold F1/accuracy (0 disables)")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes for per-seed scoring (default: min(8, cpu_count); 1 = serial)")
 
     args = ap.parse_args()
 
@@ -161,12 +123,12 @@ def main() -> None:
     outdir = outdir if outdir.is_absolute() else PROJECT_ROOT / outdir
     outdir.mkdir(parents=True, exist_ok=True)
 
-    # Ensure per-seed structural_metrics.csv exist
+    # Ensure per-seed structural_metrics.csv exist and match each seed's scorecards (seeds in parallel)
     if args.ensure_per_seed_metrics:
-        for d in run_dirs:
-            if not (d / "derived" / "metrics" / "structural_metrics.csv").exists():
-                print(f"[aggregate] Ensuring metrics for {d.name}...")
-                ensure_structural_metrics(d, args.metrics_profile)
+        with ThreadPoolExecutor(max_workers=min(4, len(run_dirs))) as pool:
+            for d, ok in zip(run_dirs, pool.map(lambda d: ensure_structural_metrics(d, args.metrics_profile), run_dirs)):
+                if not ok:
+                    print(f"[WARN] structural metrics unavailable for {d.name}")
 
     # 1) Merge scorecards
     merged_path = outdir / "merged_scorecards.jsonl"
@@ -183,16 +145,9 @@ def main() -> None:
     # 2) Merged metrics (structural_error_aggregator on merged scorecards)
     merged_metrics_dir = outdir / "merged_metrics"
     merged_metrics_dir.mkdir(parents=True, exist_ok=True)
-    cmd = [
-        sys.executable,
-        str(PROJECT_ROOT / "scripts" / "structural_error_aggregator.py"),
-        "--input", str(merged_path),
-        "--outdir", str(merged_metrics_dir),
-        "--profile", args.metrics_profile,
-    ]
-    r = subprocess.run(cmd, cwd=str(PROJECT_ROOT), capture_output=True, text=True)
-    if r.returncode != 0:
-        print(f"[WARN] structural_error_aggregator failed: {r.stderr[:500]}")
+    status = run_steps([structural_metrics_step(merged_path, merged_metrics_dir, args.metrics_profile)], outdir)
+    if "failed" in status.values():
+        print(f"[WARN] structural_error_aggregator failed (see {outdir / 'structural_error_aggregator.log'})")
     else:
         print(f"[OK] Merged metrics -> {merged_metrics_dir}")
 
@@ -222,6 +177,25 @@ def main() -> None:
         (outdir / "aggregated_mean_std.md").write_text("\n".join(md_lines), encoding="utf-8")
         print(f"[OK] Wrote {outdir / 'aggregated_mean_std.md'}")
 
+    # 3b) Per-example bootstrap CI (gold F1 / exact-match accuracy, seeds averaged per uid)
+    ci_rows: List[Dict[str, Any]] = []
+    if args.bootstrap_resamples > 0:
+        matrix = build_correctness_matrix(run_dirs, workers=args.workers)
+        if matrix.uids:
+            for metric in METRICS:
+                ci = bootstrap_ci(matrix.pooled(metric), args.bootstrap_resamples)
+                if ci["n"]:
+                    ci_rows.append({"metric": metric, **{k: ci[k] if k == "n" else f"{ci[k]:.4f}" for k in ("mean", "ci_low", "ci_high", "n")}})
+        if ci_rows:
+            ci_path = outdir / "aggregated_bootstrap_ci.csv"
+            with ci_path.open("w", encoding="utf-8", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=list(ci_rows[0].keys()))
+                w.writeheader()
+                w.writerows(ci_rows)
+            print(f"[OK] Wrote {ci_path}")
+        else:
+            print("[INFO] No gold triplets in seed runs; skipping bootstrap CI.")
+
     # 4) Integrated report (markdown)
     report_path = outdir / "integrated_report.md"
     report_lines = [
@@ -272,6 +246,19 @@ def main() -> None:
         if len(numeric_cols) > 15:
             report_lines.append(f"| ... | ({len(numeric_cols)} metrics total) | |")
 
+    if ci_rows:
+        report_lines.extend([
+            "",
+            f"### 3b. 예제 단위 bootstrap 95% CI (gold, {args.bootstrap_resamples} resamples)",
+            "",
+            f"- **파일**: `{outdir.name}/aggregated_bootstrap_ci.csv` (uid별로 시드 평균 후 예제를 재표집)",
+            "",
+            "| Metric | Mean | CI low | CI high | n |",
+            "|--------|------|--------|---------|---|",
+        ])
+        for row in ci_rows:
+            report_lines.append(f"| {row['metric']} | {row['mean']} | {row['ci_low']} | {row['ci_high']} | {row['n']} |")
+
     report_lines.extend([
         "",
         "## 4. 머지 메트릭 (self_consistency 등)",
@@ -323,18 +310,14 @@ def main() -> None:
             (merged_run_dir / "manifest.json").write_text(manifest, encoding="utf-8")
         reports_out = PROJECT_ROOT / "reports" / merged_run_dir.name
         reports_out.mkdir(parents=True, exist_ok=True)
-        cmd_mr = [
-            sys.executable,
-            str(PROJECT_ROOT / "scripts" / "build_metric_report.py"),
-            "--run_dir", str(merged_run_dir),
-            "--out_dir", str(reports_out),
-            "--metrics_profile", args.metrics_profile,
-        ]
-        r2 = subprocess.run(cmd_mr, cwd=str(PROJECT_ROOT), capture_output=True, text=True)
-        if r2.returncode == 0:
+        status = run_steps(
+            [metric_report_step(merged_run_dir, reports_out, args.metrics_profile), report_shards_step(merged_run_dir, reports_out)],
+            merged_run_dir / "derived",
+        )
+        if status.get("build_metric_report") in ("ok", "up_to_date"):
             print(f"[OK] Merged metric_report.html -> {reports_out / 'metric_report.html'}")
         else:
-            print(f"[WARN] build_metric_report failed: {r2.stderr[:300]}")
+            print(f"[WARN] build_metric_report failed (see {merged_run_dir / 'derived' / 'build_metric_report.log'})")
 
     print("")
     print(f"Output directory: {outdir}")
@@ -22,6 +22,11 @@ try:
 except ImportError:  # pragma: no cover
     yaml = None
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.report_shards import explorer_html  # noqa: E402
+
 
 # ---------------- I/O helpers ----------------
 def load_json(path: Path) -> Dict[str, Any]:
@@ -309,6 +314,9 @@ def render_html(report: Dict[str, Any]) -> str:
     parts.append(report["top_issues_html"])
     parts.append("</details>")
 
+    # Per-example rows, error samples and traces: data/*.js shards, loaded when opened
+    parts.append(explorer_html())
+
     if report.get("paper3_html"):
         parts.append("<details open><summary>Paper Table 3 (main results)</summary>")
         parts.append(report["paper3_html"])
@@ -405,7 +413,7 @@ def build_report(run_dir: Path, out_dir: Path, profile: str, rules_path: Path, s
     return out_path
 
 
-def main() -> None:
+def main(argv=None) -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--run_dir", required=True, help="results/<run_id>_<mode>")
     ap.add_argument("--out_dir", required=True, help="reports/<run_id>_<mode>")
@@ -413,7 +421,7 @@ def main() -> None:
     ap.add_argument("--rules", default=None, help="Rules file path (default: auto-select based on profile)")
     ap.add_argument("--strict", action="store_true", help="missing required artifacts -> fatal")
     ap.add_argument("--open", action="store_true", help="print output path only")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     run_dir = Path(args.run_dir)
     out_dir = Path(args.out_dir)
@@ -423,9 +431,9 @@ def main() -> None:
         rules_path = Path(args.rules)
     else:
         if args.profile == "paper":
-            rules_path = Path("scripts/paper_rules.yaml")
+            rules_path = Path(__file__).resolve().parent / "paper_rules.yaml"
         else:
-            rules_path = Path("scripts/ops_rules.yaml")
+            rules_path = Path(__file__).resolve().parent / "ops_rules.yaml"
 
     out_path = build_report(run_dir, out_dir, args.profile, rules_path, strict=args.strict)
     print(out_path)
@@ -17,13 +17,29 @@ import argparse
 import csv
 import json
 import os
-import subprocess
 import sys
-from collections import Counter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.report_shards import explorer_html  # noqa: E402
+from metrics.scorecard import triplets_from_list  # noqa: E402
+from metrics.streaming import (  # noqa: E402
+    HeadAccumulator,
+    MetricsPass,
+    RunStatsAccumulator,
+    ScorecardView,
+    Stage2CorrectionAccumulator,
+    StructuralMetricsAccumulator,
+    SubsetRatesAccumulator,
+    TransitionAccumulator,
+    iter_scorecards,
+    stream_metrics,
+)
+from scripts.structural_error_aggregator import write_structural_metrics  # noqa: E402
+from scripts.transition_aggregator import write_transition_outputs  # noqa: E402
 DEBATE_THRESHOLDS_PATH = PROJECT_ROOT / "experiments" / "configs" / "debate_thresholds.json"
 
 # Triplet = (aspect, opinion, polarity) normalized strings
@@ -60,18 +76,7 @@ def load_debate_thresholds() -> Dict[str, float]:
 
 
 def load_jsonl(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    out = []
-    for line in path.read_text(encoding="utf-8-sig", errors="replace").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            out.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue
-    return out
+    return list(iter_scorecards(path))
 
 
 def load_structural_metrics_csv(path: Path) -> Dict[str, Any]:
@@ -82,8 +87,10 @@ def load_structural_metrics_csv(path: Path) -> Dict[str, Any]:
     return rows[0] if rows else {}
 
 
-def ensure_structural_metrics(run_dir: Path, derived_dir: Path, profile: str = "paper_main") -> Path:
-    """Run structural_error_aggregator if structural_metrics.csv missing; return path to CSV."""
+def ensure_structural_metrics(
+    run_dir: Path, derived_dir: Path, profile: str = "paper_main", metrics: Optional[Dict[str, Any]] = None
+) -> Path:
+    """Write structural_metrics.csv if missing (from `metrics` of the report pass, else its own pass); return path to CSV."""
     metrics_dir = derived_dir / "metrics"
     csv_path = metrics_dir / "structural_metrics.csv"
     if csv_path.exists():
@@ -92,33 +99,30 @@ def ensure_structural_metrics(run_dir: Path, derived_dir: Path, profile: str = "
     scorecards = run_dir / "scorecards.jsonl"
     if not scorecards.exists():
         return csv_path
-    cmd = [
-        sys.executable,
-        str(PROJECT_ROOT / "scripts" / "structural_error_aggregator.py"),
-        "--input", str(scorecards),
-        "--outdir", str(metrics_dir),
-        "--profile", profile,
-    ]
-    subprocess.run(cmd, cwd=str(PROJECT_ROOT), check=False)
+    if metrics is None:
+        _, results = stream_metrics(scorecards, {"structural": StructuralMetricsAccumulator(profile)})
+        metrics = results["structural"]
+    if metrics.get("n", 0):
+        write_structural_metrics(metrics, metrics_dir)
     return csv_path
 
 
-def ensure_transition_metrics(run_dir: Path, derived_dir: Path, profile: str = "paper_main") -> Path:
-    """Run transition_aggregator on scorecards; write transition_summary.json + transition_table.csv. Return path to summary."""
+def ensure_transition_metrics(
+    run_dir: Path, derived_dir: Path, profile: str = "paper_main", summary: Optional[Dict[str, Any]] = None
+) -> Path:
+    """Write transition_summary.json + transition_table.csv (from `summary` of the report pass, else its own pass). Return path to summary."""
     metrics_dir = derived_dir / "metrics"
     summary_path = metrics_dir / "transition_summary.json"
     metrics_dir.mkdir(parents=True, exist_ok=True)
     scorecards = run_dir / "scorecards.jsonl"
     if not scorecards.exists():
         return summary_path
-    cmd = [
-        sys.executable,
-        str(PROJECT_ROOT / "scripts" / "transition_aggregator.py"),
-        "--input", str(scorecards),
-        "--outdir", str(metrics_dir),
-        "--profile", profile,
-    ]
-    subprocess.run(cmd, cwd=str(PROJECT_ROOT), check=False)
+    if summary is None:
+        n_records, results = stream_metrics(scorecards, {"transitions": TransitionAccumulator(profile)})
+        if not n_records:
+            return summary_path
+        summary = results["transitions"]
+    write_transition_outputs(summary, metrics_dir)
     return summary_path
 
 
@@ -144,71 +148,10 @@ def _num(v: Any) -> str:
         return str(v)
 
 
-# ---------- HF agree/disagree (same logic as structural_error_aggregator) ----------
-def _norm_polarity(label: str) -> str:
-    if not label:
-        return "neu"
-    key = (label or "").strip().lower()
-    norm = {"positive": "pos", "pos": "pos", "negative": "neg", "neg": "neg", "neutral": "neu", "neu": "neu", "mixed": "neu"}
-    return norm.get(key) or "neu"
-
-
-def _get_hf_label(record: Dict[str, Any]) -> Optional[str]:
-    hf = (record.get("aux_signals") or {}).get("hf") or {}
-    return hf.get("label")
-
-
-def _get_final_polarity(record: Dict[str, Any]) -> str:
-    mod = record.get("moderator") or {}
-    final = (mod.get("final_label") or (record.get("final_result") or {}).get("label") or "")
-    return _norm_polarity(final)
-
-
-def _hf_disagrees_with_final(record: Dict[str, Any]) -> bool:
-    hf_label = _get_hf_label(record)
-    if hf_label is None:
-        return False
-    return _norm_polarity(hf_label) != _get_final_polarity(record)
-
-
-def _has_polarity_conflict(record: Dict[str, Any]) -> bool:
-    mod = record.get("moderator") or {}
-    if "RuleM" in (mod.get("applied_rules") or []):
-        return True
-    s1 = (record.get("stage1_ate") or {}).get("label") or ""
-    s2_ate = record.get("stage2_ate")
-    s2 = s2_ate.get("label") if isinstance(s2_ate, dict) else None
-    if s2 is not None and s1 != s2:
-        return True
-    return False
-
-
-def _norm_txt(t: Optional[str]) -> str:
-    if t is None:
-        return ""
-    t = (t or "").strip().lower()
-    for p in ".,;:!?\"'`""''()[]{}":
-        t = t.strip(p)
-    return " ".join(t.split())
-
-
-def _triplet_from_sent(sent: Dict[str, Any]) -> Triplet:
-    aspect = _norm_txt(sent.get("aspect_ref") or sent.get("term"))
-    op = sent.get("opinion_term")
-    opinion = _norm_txt(op.get("term") if isinstance(op, dict) else op)
-    polarity = _norm_txt(sent.get("polarity") or sent.get("label"))
-    return (aspect, opinion, polarity)
-
-
-def _triplets_from_list(items: Any) -> Set[Triplet]:
-    if not items or not isinstance(items, (list, tuple)):
-        return set()
-    return {_triplet_from_sent(it) for it in items if it and isinstance(it, dict)}
-
-
+# ---------- Report triplet sources (final = inputs.aspect_sentiments, gold without span variants, full-triplet match) ----------
 def _extract_final_triplets(record: Dict[str, Any]) -> Set[Triplet]:
     sents = (record.get("inputs") or {}).get("aspect_sentiments")
-    return _triplets_from_list(sents) if sents else set()
+    return triplets_from_list(sents) if sents else set()
 
 
 def _extract_stage1_triplets(record: Dict[str, Any]) -> Set[Triplet]:
@@ -217,220 +160,46 @@ def _extract_stage1_triplets(record: Dict[str, Any]) -> Set[Triplet]:
         if (entry.get("stage") or "").lower() == "stage1" and (entry.get("agent") or "").lower() == "atsa":
             sents = (entry.get("output") or {}).get("aspect_sentiments")
             if sents:
-                return _triplets_from_list(sents)
+                return triplets_from_list(sents)
     return _extract_final_triplets(record)
 
 
 def _extract_gold_triplets(record: Dict[str, Any]) -> Optional[Set[Triplet]]:
     gold = record.get("gold_triplets") or (record.get("inputs") or {}).get("gold_triplets")
     if isinstance(gold, list) and gold:
-        return _triplets_from_list(gold)
+        return triplets_from_list(gold)
     return None
 
 
-def _precision_recall_f1(pred: Set[Triplet], gold: Set[Triplet]) -> Tuple[float, float, float]:
-    if not gold:
-        return (0.0, 0.0, 0.0)
-    pred = pred or set()
-    tp = len(pred & gold)
-    fp = len(pred - gold)
-    fn = len(gold - pred)
-    prec = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-    rec = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-    f1 = (2 * prec * rec / (prec + rec)) if (prec + rec) > 0 else 0.0
-    return (prec, rec, f1)
+def _report_correction_accumulator() -> Stage2CorrectionAccumulator:
+    return Stage2CorrectionAccumulator(
+        gold_fn=_extract_gold_triplets,
+        stage1_fn=_extract_stage1_triplets,
+        final_fn=_extract_final_triplets,
+        project=None,
+    )
 
 
 def compute_stage2_correction_metrics(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
     """When gold triplets exist: FixRate, BreakRate, NetGain, CorrPrec, CIS, Triplet F1 S1/S2, ΔF1. Else N/A."""
-    out: Dict[str, Any] = {
-        "triplet_f1_s1": None, "triplet_f1_s2": None, "delta_f1": None,
-        "fix_rate": None, "break_rate": None, "net_gain": None,
-        "correction_precision": None, "conservative_improvement_score": None,
-        "n_fix": 0, "n_break": 0, "n_still": 0, "n_keep": 0, "N_gold": 0,
-    }
-    rows_with_gold = [(r, _extract_gold_triplets(r)) for r in rows if _extract_gold_triplets(r) is not None]
-    if not rows_with_gold:
-        return out
-    N = len(rows_with_gold)
-    f1_s1_list: List[float] = []
-    f1_s2_list: List[float] = []
-    n_fix = n_break = n_still = n_keep = 0
-    for record, gold in rows_with_gold:
-        gold = gold or set()
-        s1 = _extract_stage1_triplets(record)
-        s2 = _extract_final_triplets(record)
-        _, _, f1_1 = _precision_recall_f1(s1, gold)
-        _, _, f1_2 = _precision_recall_f1(s2, gold)
-        f1_s1_list.append(f1_1)
-        f1_s2_list.append(f1_2)
-        st1 = s1 == gold
-        st2 = s2 == gold
-        if not st1 and st2:
-            n_fix += 1
-        if st1 and not st2:
-            n_break += 1
-        if not st1 and not st2:
-            n_still += 1
-        if st1 and st2:
-            n_keep += 1
-    out["N_gold"] = N
-    out["n_fix"] = n_fix
-    out["n_break"] = n_break
-    out["n_still"] = n_still
-    out["n_keep"] = n_keep
-    if f1_s1_list:
-        out["triplet_f1_s1"] = sum(f1_s1_list) / len(f1_s1_list)
-    if f1_s2_list:
-        out["triplet_f1_s2"] = sum(f1_s2_list) / len(f1_s2_list)
-    if f1_s1_list and f1_s2_list:
-        out["delta_f1"] = out["triplet_f1_s2"] - out["triplet_f1_s1"]
-    # FixRate = n_fix / (n_fix + n_still); BreakRate = n_break / (n_break + n_keep); NetGain = (n_fix - n_break) / N
-    need_fix = n_fix + n_still
-    out["fix_rate"] = _rate(n_fix, need_fix) if need_fix else None
-    keep_break = n_break + n_keep
-    out["break_rate"] = _rate(n_break, keep_break) if keep_break else None
-    out["net_gain"] = (n_fix - n_break) / N if N else None
-    change_denom = n_fix + n_break
-    out["correction_precision"] = _rate(n_fix, change_denom) if change_denom else None
-    # CIS = (n_fix - 2*n_break) / (n_fix + n_still), λ=2
-    cis_denom = n_fix + n_still
-    out["conservative_improvement_score"] = (n_fix - 2 * n_break) / cis_denom if cis_denom else None
-    return out
+    return _report_correction_accumulator().feed(rows)
 
 
-def _count_stage1_risks(record: Dict[str, Any]) -> int:
-    for vb in record.get("validator") or []:
-        if (vb.get("stage") or "").lower() == "stage1":
-            return len(vb.get("structural_risks") or [])
-    return 0
+def _hf_agrees(view: ScorecardView) -> bool:
+    return view.hf_label is not None and not view.hf_disagrees
 
 
-def _count_stage2_risks(record: Dict[str, Any]) -> int:
-    for vb in record.get("validator") or []:
-        if (vb.get("stage") or "").lower() == "stage2":
-            return len(vb.get("structural_risks") or [])
-    return 0
+def _hf_disagrees(view: ScorecardView) -> bool:
+    return view.hf_label is not None and view.hf_disagrees
 
 
 def compute_subset_rates(rows: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
     """Risk Resolution Rate, Stage2 Adoption Rate, Polarity Conflict Rate for a subset of rows."""
-    N = len(rows)
-    if N == 0:
-        return {"risk_resolution_rate": None, "stage2_adoption_rate": None, "polarity_conflict_rate": None}
-    risk_s1 = sum(_count_stage1_risks(r) for r in rows)
-    risk_s2 = sum(_count_stage2_risks(r) for r in rows)
-    resolved = max(0, risk_s1 - risk_s2)
-    risk_resolution_rate = _rate(resolved, risk_s1) if risk_s1 else None
-    stage2_count = sum(1 for r in rows if (r.get("moderator") or {}).get("selected_stage") == "stage2")
-    stage2_adoption_rate = _rate(stage2_count, N)
-    polarity_conflict_count = sum(1 for r in rows if _has_polarity_conflict(r))
-    polarity_conflict_rate = _rate(polarity_conflict_count, N)
-    return {
-        "risk_resolution_rate": risk_resolution_rate,
-        "stage2_adoption_rate": stage2_adoption_rate,
-        "polarity_conflict_rate": polarity_conflict_rate,
-    }
+    return SubsetRatesAccumulator().feed(rows)
 
 
 def compute_from_scorecards(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
-    N = len(rows)
-    if N == 0:
-        return {"n": 0}
-
-    # Structural PASS: summary.quality_pass
-    pass_count = sum(1 for r in rows if (r.get("summary") or {}).get("quality_pass") is True)
-    structural_pass_rate = _rate(pass_count, N)
-
-    # Stage2 Adoption: moderator.selected_stage == "stage2"
-    stage2_count = sum(1 for r in rows if (r.get("moderator") or {}).get("selected_stage") == "stage2")
-    stage2_adoption_rate = _rate(stage2_count, N)
-
-    # Rule A/B/M/D breakdown (applied_rules)
-    rule_counter: Counter = Counter()
-    for r in rows:
-        rules = (r.get("moderator") or {}).get("applied_rules") or []
-        for rule in rules:
-            rule_counter[rule] += 1
-
-    # risk_id frequency (validator.structural_risks)
-    risk_counter: Counter = Counter()
-    for r in rows:
-        for stage_block in r.get("validator") or []:
-            for risk in stage_block.get("structural_risks") or []:
-                rid = (risk.get("risk_id") or risk.get("type") or "").strip()
-                if rid:
-                    risk_counter[rid] += 1
-
-    # risk resolution: stage1 risks vs stage2 risks (resolved = s1 - s2)
-    risk_resolved_count = 0
-    risk_s1_total = 0
-    for r in rows:
-        validator = r.get("validator") or []
-        s1_risks = 0
-        s2_risks = 0
-        for vb in validator:
-            stage = (vb.get("stage") or "").lower()
-            n_risk = len(vb.get("structural_risks") or [])
-            if stage == "stage1":
-                s1_risks = n_risk
-            elif stage == "stage2":
-                s2_risks = n_risk
-        if s1_risks > 0:
-            risk_s1_total += s1_risks
-            if s2_risks < s1_risks:
-                risk_resolved_count += 1  # at least one resolved for this sample
-
-    # Latencies for p50/p95
-    latencies: List[float] = []
-    gate_status_counter: Counter = Counter()
-    parse_fail = 0
-    gen_fail = 0
-    fallback = 0
-    for r in rows:
-        meta = r.get("meta") or {}
-        lat = meta.get("latency_ms")
-        if lat is not None:
-            try:
-                latencies.append(float(lat))
-            except (TypeError, ValueError):
-                pass
-        lat_block = r.get("latency") or {}
-        gate = lat_block.get("gate_status") or ""
-        if gate:
-            gate_status_counter[gate] += 1
-        fl = r.get("flags") or {}
-        if fl.get("parse_failed"):
-            parse_fail += 1
-        if fl.get("generate_failed"):
-            gen_fail += 1
-        if fl.get("fallback_used"):
-            fallback += 1
-
-    latencies.sort()
-    n_lat = len(latencies)
-    latency_p50 = latencies[n_lat // 2] if n_lat else None
-    latency_p95 = latencies[int(n_lat * 0.95)] if n_lat and n_lat >= 2 else (latencies[-1] if latencies else None)
-
-    return {
-        "n": N,
-        "structural_pass_rate": structural_pass_rate,
-        "stage2_adoption_rate": stage2_adoption_rate,
-        "rule_counts": dict(rule_counter),
-        "risk_id_counts": dict(risk_counter),
-        "risk_resolved_samples": risk_resolved_count,
-        "risk_s1_total": risk_s1_total,
-        "latency_p50_ms": latency_p50,
-        "latency_p95_ms": latency_p95,
-        "latencies": latencies,
-        "gate_status": dict(gate_status_counter),
-        "parse_failure_count": parse_fail,
-        "generate_failure_count": gen_fail,
-        "fallback_used_count": fallback,
-        "parse_failure_rate": _rate(parse_fail, N),
-        "generate_failure_rate": _rate(gen_fail, N),
-        "fallback_used_rate": _rate(fallback, N),
-    }
+    return RunStatsAccumulator().feed(rows)
 
 
 def generate_conclusion_3lines(metrics: Dict[str, Any], struct: Dict[str, Any]) -> List[str]:
@@ -474,13 +243,14 @@ def _to_float(v: Any) -> Optional[float]:
 def build_html(
     run_dir: Path,
     manifest: Dict[str, Any],
-    scorecards: List[Dict[str, Any]],
+    top_cases: List[Dict[str, Any]],
     struct_metrics: Dict[str, Any],
     computed: Dict[str, Any],
     stage2_correction: Dict[str, Any],
     transition_summary: Dict[str, Any],
     out_path: Path,
     top_n: int = 15,
+    subset_rates: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> None:
     run_id = manifest.get("run_id") or run_dir.name
     date_utc = (manifest.get("timestamp_utc") or "").replace("Z", " UTC")
@@ -598,11 +368,10 @@ def build_html(
 
     # HF: external reference only (not correctness criterion). HF-agree/disagree for Appendix / error analysis only.
     hf_sentence = "HF-based polarity agreement is used as an external reference signal, not as a correctness criterion."
-    hf_agree_rows = [r for r in scorecards if _get_hf_label(r) is not None and not _hf_disagrees_with_final(r)]
-    hf_disagree_rows = [r for r in scorecards if _get_hf_label(r) is not None and _hf_disagrees_with_final(r)]
-    overall_rates = compute_subset_rates(scorecards)
-    hf_agree_rates = compute_subset_rates(hf_agree_rows) if hf_agree_rows else {}
-    hf_disagree_rates = compute_subset_rates(hf_disagree_rows) if hf_disagree_rows else {}
+    subset_rates = subset_rates or {}
+    overall_rates = subset_rates.get("overall") or {}
+    hf_agree_rates = subset_rates.get("hf_agree") or {}
+    hf_disagree_rates = subset_rates.get("hf_disagree") or {}
 
     def _fmt_rate(v: Any) -> str:
         if v is None:
@@ -639,10 +408,12 @@ def build_html(
         d = hf_disagree_rates.get(metric_key) if hf_disagree_rates else None
         hf_split_table += f'<tr><td>{metric_name}</td><td>{_fmt_rate(o)}</td><td>{_fmt_rate(a)}</td><td>{_fmt_rate(d)}</td></tr>'
     hf_split_table += "</tbody></table>"
-    if not (hf_agree_rows or hf_disagree_rows):
+    n_hf_agree = hf_agree_rates.get("n") or 0
+    n_hf_disagree = hf_disagree_rates.get("n") or 0
+    if not (n_hf_agree or n_hf_disagree):
         hf_appendix_note = "<p class=\"header-meta\">HF-agree / HF-disagree: N/A (aux_signals.hf not present in this run). Overall uses structural_metrics.csv when available. To populate HF columns, enable pipeline aux_hf and provide HF checkpoint.</p>"
     else:
-        hf_appendix_note = f"<p class=\"header-meta\">HF-agree n={len(hf_agree_rows)}, HF-disagree n={len(hf_disagree_rows)}. For error analysis / drill-down only.</p>"
+        hf_appendix_note = f"<p class=\"header-meta\">HF-agree n={n_hf_agree}, HF-disagree n={n_hf_disagree}. For error analysis / drill-down only.</p>"
 
     # RQ1: risk_id top table, unsupported/hallucination (from struct)
     risk_counts = computed.get("risk_id_counts") or {}
@@ -790,7 +561,7 @@ def build_html(
     eff_table += "</tbody></table>"
 
     # Appendix: top cases (collapsible)
-    top_cases = scorecards[:top_n]
+    top_cases = top_cases[:top_n]
     rows_html = []
     for i, card in enumerate(top_cases):
         meta = card.get("meta") or {}
@@ -946,6 +717,7 @@ h1 { font-size: 1.5rem; margin-bottom: 0.5rem; }
 <summary>Top cases ({len(top_cases)}개) — 접기/펼치기</summary>
 <div class="details-content">{appendix_table}</div>
 </details>
+{explorer_html()}
 <p class="header-meta">{env_note}</p>
 </section>
 <div id="kpi-modal" class="modal" role="dialog" aria-modal="true">
@@ -979,13 +751,13 @@ h1 { font-size: 1.5rem; margin-bottom: 0.5rem; }
     out_path.write_text(html, encoding="utf-8")
 
 
-def main() -> None:
+def main(argv=None) -> None:
     ap = argparse.ArgumentParser(description="Build metric report HTML from run_dir")
     ap.add_argument("--run_dir", required=True, help="Run directory (e.g. results/real_mini_r1_proposed)")
     ap.add_argument("--out_dir", default=None, help="Output directory (default: reports/<run_dir.name>)")
     ap.add_argument("--metrics_profile", default="paper_main", help="Profile for structural_error_aggregator if run")
     ap.add_argument("--top_n", type=int, default=15, help="Number of top cases in appendix")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     run_dir = Path(args.run_dir)
     if not run_dir.is_absolute():
@@ -1002,25 +774,46 @@ def main() -> None:
     if not manifest:
         print(f"[WARN] manifest.json not found or empty in {run_dir}", file=sys.stderr)
 
+    # One streaming pass feeds the report KPIs, structural_metrics.csv and transition_summary.json
     scorecards_path = run_dir / "scorecards.jsonl"
-    scorecards = load_jsonl(scorecards_path)
-    if not scorecards:
+    mp = MetricsPass()
+    mp.register("structural", StructuralMetricsAccumulator(args.metrics_profile))
+    mp.register("transitions", TransitionAccumulator(args.metrics_profile))
+    mp.register("computed", RunStatsAccumulator())
+    mp.register("stage2_correction", _report_correction_accumulator())
+    subsets = {
+        "overall": mp.register("overall", SubsetRatesAccumulator()),
+        "hf_agree": mp.register("hf_agree", SubsetRatesAccumulator(where=_hf_agrees)),
+        "hf_disagree": mp.register("hf_disagree", SubsetRatesAccumulator(where=_hf_disagrees)),
+    }
+    mp.register("head", HeadAccumulator(max(args.top_n, 1)))
+    results = mp.run(iter_scorecards(scorecards_path))
+    if not mp.n_records:
         print(f"[WARN] scorecards.jsonl not found or empty in {run_dir}", file=sys.stderr)
+    head = results["head"]["rows"]
 
     derived_dir = run_dir / "derived"
-    csv_path = ensure_structural_metrics(run_dir, derived_dir, args.metrics_profile)
+    csv_path = ensure_structural_metrics(
+        run_dir, derived_dir, args.metrics_profile, metrics=results["structural"] if mp.n_records else None
+    )
     struct_metrics = load_structural_metrics_csv(csv_path)
-    ensure_transition_metrics(run_dir, derived_dir, args.metrics_profile)
+    ensure_transition_metrics(
+        run_dir, derived_dir, args.metrics_profile, summary=results["transitions"] if mp.n_records else None
+    )
     transition_summary_path = derived_dir / "metrics" / "transition_summary.json"
     transition_summary = load_json(transition_summary_path) if transition_summary_path.exists() else {}
 
-    computed = compute_from_scorecards(scorecards)
-    computed["profile"] = (manifest.get("purpose") or "").strip() or (scorecards[0].get("profile") if scorecards else "")
-    stage2_correction = compute_stage2_correction_metrics(scorecards)
+    computed = results["computed"]
+    computed["profile"] = (manifest.get("purpose") or "").strip() or (head[0].get("profile") if head else "")
+    stage2_correction = results["stage2_correction"]
     n_gold = stage2_correction.get("N_gold") or 0
-    print(f"Metric report: run_dir={run_dir.name}, scorecards={len(scorecards)}, rows_with_gold={n_gold}")
+    print(f"Metric report: run_dir={run_dir.name}, scorecards={mp.n_records}, rows_with_gold={n_gold}")
 
-    build_html(run_dir, manifest, scorecards, struct_metrics, computed, stage2_correction, transition_summary, out_path, top_n=args.top_n)
+    subset_rates = {k: {**results[k], "n": acc.n} for k, acc in subsets.items()}
+    build_html(
+        run_dir, manifest, head, struct_metrics, computed, stage2_correction, transition_summary, out_path,
+        top_n=args.top_n, subset_rates=subset_rates,
+    )
     print(f"Wrote {out_path}")
 
 
@@ -1,8 +1,11 @@
 """
 Paper-ready table builder for ABSA runs.
 
-Reads existing artifacts (manifest.json, scorecards.jsonl, traces.jsonl, optional smoke_outputs.jsonl)
+Reads existing artifacts (manifest.json, scorecards.jsonl, optional smoke_outputs.jsonl)
 and produces summary CSV/MD tables under <run_dir>/paper_outputs/.
+Per-run metrics are computed on the columnar run tables (metrics/run_tables.py; Parquet cache from
+scripts/export_run_tables.py when present), one worker process per run when several runs are given
+(--workers); cross-run metrics (self-consistency, significance) are merged from the per-run results.
 
 Non-intrusive: does not touch model code, prompts, or integrity guards.
 """
@@ -13,11 +16,43 @@ import argparse
 import csv
 import json
 import math
-import statistics
 import sys
-from collections import defaultdict
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from metrics.paper_rows import (  # noqa: E402,F401  (re-exported for existing callers)
+    PUNCT,
+    Triplet,
+    extract_final_triplets,
+    extract_gold_triplets,
+    extract_stage1_triplets,
+    extract_stage2_triplets,
+    fallback_from_trace,
+    get_flags,
+    has_structural_risk,
+    has_unanchored_ref,
+    is_targetless,
+    mean_std,
+    normalize_text,
+    polarity_conflict_flag,
+    precision_recall_f1,
+    structural_pass,
+    token_cost_latency,
+    triplet_from_sentiment,
+    triplets_from_list,
+)
+from metrics.run_tables import (  # noqa: E402
+    final_triplet_keys,
+    load_run_tables,
+    map_runs,
+    paper_run_metrics,
+    per_uid_scores,
+    self_consistency_from_keys,
+)
+from metrics.significance import compare_systems, scores_matrix  # noqa: E402
 
 
 # ---------- IO helpers ----------
@@ -38,168 +73,6 @@ def load_jsonl(path: Path) -> List[Dict]:
     return rows
 
 
-# ---------- Text & triplet helpers ----------
-
-PUNCT = ".,;:!?\"'`“”‘’()[]{}"
-
-
-def normalize_text(text: Optional[str]) -> str:
-    if text is None:
-        return ""
-    text = text.strip().lower()
-    text = text.strip(PUNCT)
-    # collapse whitespace
-    text = " ".join(text.split())
-    return text
-
-
-Triplet = Tuple[str, str, str]
-
-
-def triplet_from_sentiment(sent: Dict) -> Triplet:
-    aspect = normalize_text(sent.get("aspect_ref") or sent.get("term"))
-    opinion = normalize_text((sent.get("opinion_term") or {}).get("term"))
-    polarity = normalize_text(sent.get("polarity") or sent.get("label"))
-    return (aspect, opinion, polarity)
-
-
-def triplets_from_list(items: Iterable[Dict]) -> Set[Triplet]:
-    return {triplet_from_sentiment(it) for it in items if it}
-
-
-# ---------- Extraction from artifacts ----------
-
-
-def extract_final_triplets(sc_row: Dict) -> Set[Triplet]:
-    aspect_sents = sc_row.get("inputs", {}).get("aspect_sentiments")
-    if isinstance(aspect_sents, list):
-        return triplets_from_list(aspect_sents)
-    return set()
-
-
-def extract_stage1_triplets(sc_row: Dict) -> Set[Triplet]:
-    trace = sc_row.get("runtime", {}).get("process_trace") or []
-    for entry in trace:
-        if entry.get("stage") == "stage1" and entry.get("agent", "").lower() == "atsa":
-            sents = entry.get("output", {}).get("aspect_sentiments")
-            if isinstance(sents, list):
-                return triplets_from_list(sents)
-    # fallback to final if missing
-    return extract_final_triplets(sc_row)
-
-
-def extract_stage2_triplets(sc_row: Dict) -> Set[Triplet]:
-    # Stage2 review outputs are deltas; use final as post-review proxy.
-    return extract_final_triplets(sc_row)
-
-
-def extract_gold_triplets(sc_row: Dict) -> Optional[Set[Triplet]]:
-    gold = sc_row.get("gold_triplets") or sc_row.get("inputs", {}).get("gold_triplets")
-    if isinstance(gold, list):
-        return triplets_from_list(gold)
-    return None
-
-
-def has_structural_risk(sc_row: Dict) -> bool:
-    # scorecards flags first
-    flags = sc_row.get("flags", {})
-    if flags.get("structural_risk"):
-        return True
-    # look into validator output inside process_trace
-    trace = sc_row.get("runtime", {}).get("process_trace") or []
-    for entry in trace:
-        if entry.get("agent", "").lower() == "validator":
-            risks = entry.get("output", {}).get("structural_risks")
-            if isinstance(risks, list) and len(risks) > 0:
-                return True
-    return False
-
-
-def has_unanchored_ref(sc_row: Dict) -> bool:
-    analysis = sc_row.get("analysis_flags") or sc_row.get("flags", {}).get("analysis_flags", {})
-    if isinstance(analysis, dict) and analysis.get("unanchored_aspect_ref"):
-        return True
-    return False
-
-
-def is_targetless(sc_row: Dict) -> bool:
-    sp = sc_row.get("stage_policy_score") or {}
-    if sp.get("targetless_policy_applied"):
-        return True
-    return False
-
-
-def polarity_conflict_flag(final_triplets: Set[Triplet]) -> bool:
-    by_aspect: Dict[str, Set[str]] = defaultdict(set)
-    for aspect, _op, pol in final_triplets:
-        by_aspect[aspect].add(pol)
-    return any(len(pols) >= 2 for pols in by_aspect.values())
-
-
-def get_flags(sc_row: Dict) -> Dict[str, bool]:
-    flags = sc_row.get("flags", {}) or {}
-    return {
-        "parse_failed": bool(flags.get("parse_failed")),
-        "generate_failed": bool(flags.get("generate_failed")),
-        "fallback_used": bool(flags.get("fallback_used")),
-    }
-
-
-def fallback_from_trace(sc_row: Dict) -> bool:
-    trace = sc_row.get("runtime", {}).get("process_trace") or []
-    for entry in trace:
-        cm = entry.get("call_metadata") or {}
-        if cm.get("fallback_construct_used"):
-            return True
-    return False
-
-
-def structural_pass(sc_row: Dict) -> Optional[bool]:
-    summary = sc_row.get("summary") or {}
-    if "quality_pass" in summary:
-        return bool(summary.get("quality_pass"))
-    return None
-
-
-def token_cost_latency(sc_row: Dict):
-    meta = sc_row.get("meta") or {}
-    rt = sc_row.get("runtime") or {}
-    tokens_in = rt.get("tokens_in") if rt else meta.get("tokens_in")
-    tokens_out = rt.get("tokens_out") if rt else meta.get("tokens_out")
-    cost = rt.get("cost_usd") if rt else meta.get("cost_usd")
-    latency = meta.get("latency_ms")
-    return tokens_in, tokens_out, cost, latency
-
-
-# ---------- Metric computations ----------
-
-
-def precision_recall_f1(pred: Set[Triplet], gold: Set[Triplet]) -> Tuple[float, float, float]:
-    if gold is None or len(gold) == 0:
-        return (math.nan, math.nan, math.nan)
-    if pred is None:
-        pred = set()
-    tp = len(pred & gold)
-    fp = len(pred - gold)
-    fn = len(gold - pred)
-    prec = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-    rec = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-    if prec + rec == 0:
-        f1 = 0.0
-    else:
-        f1 = 2 * prec * rec / (prec + rec)
-    return (prec, rec, f1)
-
-
-def mean_std(values: List[float]) -> Tuple[Optional[float], Optional[float]]:
-    vals = [v for v in values if v is not None and not math.isnan(v)]
-    if not vals:
-        return (None, None)
-    if len(vals) == 1:
-        return (vals[0], 0.0)
-    return (statistics.mean(vals), statistics.pstdev(vals))
-
-
 # ---------- Core processing ----------
 
 
@@ -219,15 +92,17 @@ class RunArtifacts:
             # continue even if placeholder is used
         if manifest_path.exists():
             self.manifest = load_json(manifest_path)
-        if score_path.exists():
-            self.scorecards = load_jsonl(score_path)
-        else:
+        if not score_path.exists():
             print(f"[build_paper_tables] Warning: scorecards.jsonl not found in {run_dir}; proceeding with empty rows.")
-            self.scorecards = []
-        self.traces = load_jsonl(run_dir / "traces.jsonl") if (run_dir / "traces.jsonl").exists() else []
-        self.smoke_outputs = (
-            load_jsonl(run_dir / "smoke_outputs.jsonl") if (run_dir / "smoke_outputs.jsonl").exists() else []
-        )
+
+    @cached_property
+    def tables(self) -> Dict:
+        return load_run_tables(self.run_dir)
+
+    @cached_property
+    def smoke_outputs(self) -> List[Dict]:
+        smoke_path = self.run_dir / "smoke_outputs.jsonl"
+        return load_jsonl(smoke_path) if smoke_path.exists() else []
 
 
 def build_smoke_preview_map(smoke_rows: List[Dict]) -> Dict[str, str]:
@@ -240,262 +115,60 @@ def build_smoke_preview_map(smoke_rows: List[Dict]) -> Dict[str, str]:
     return preview
 
 
-def filter_splits(rows: List[Dict], splits: Set[str]) -> List[Dict]:
-    if not splits:
-        return rows
-    return [
-        r
-        for r in rows
-        if ((r.get("meta") or {}).get("split") in splits) or (r.get("split") in splits)
-    ]
-
-
 def compute_run_metrics(art: RunArtifacts, report_splits: Set[str], smoke_preview: Dict[str, str]) -> Dict:
-    rows = filter_splits(art.scorecards, report_splits)
-    included_uids = set((r.get("meta") or {}).get("text_id") or r.get("uid") for r in rows)
-
-    # Triplets
-    final_triplets_by_uid: Dict[str, Set[Triplet]] = {}
-    stage1_triplets_by_uid: Dict[str, Set[Triplet]] = {}
-    stage2_triplets_by_uid: Dict[str, Set[Triplet]] = {}
-    gold_by_uid: Dict[str, Optional[Set[Triplet]]] = {}
-
-    for r in rows:
-        uid = (r.get("meta") or {}).get("text_id") or r.get("uid")
-        final_triplets_by_uid[uid] = extract_final_triplets(r)
-        stage1_triplets_by_uid[uid] = extract_stage1_triplets(r)
-        stage2_triplets_by_uid[uid] = extract_stage2_triplets(r)
-        gold_by_uid[uid] = extract_gold_triplets(r)
-
-    # Metrics containers
-    pass_flags = []
-    valid_triplet = []
-    parse_failed = []
-    generate_failed = []
-    fallback_used = []
-    conflict_flags = []
-    structural_risk_flags = []
-    unanchored_flags = []
-    targetless_flags = []
-    tokens_in_vals = []
-    tokens_out_vals = []
-    cost_vals = []
-    latency_vals = []
-
-    # Hard subset ids
-    hard_subset_uids: Set[str] = set()
-
-    for r in rows:
-        uid = (r.get("meta") or {}).get("text_id") or r.get("uid")
-        flags = get_flags(r)
-        parse_failed.append(flags["parse_failed"])
-        generate_failed.append(flags["generate_failed"])
-        fb = flags["fallback_used"] or fallback_from_trace(r)
-        fallback_used.append(fb)
-
-        srisk = has_structural_risk(r)
-        structural_risk_flags.append(srisk)
-        if srisk:
-            hard_subset_uids.add(uid)
-
-        unanchored_flags.append(has_unanchored_ref(r))
-        targetless_flags.append(is_targetless(r))
-
-        final_ts = final_triplets_by_uid[uid]
-        conflict_flags.append(polarity_conflict_flag(final_ts))
-        valid_triplet.append(len(final_ts) > 0)
-
-        sp = structural_pass(r)
-        if sp is not None:
-            pass_flags.append(sp)
-
-        ti, to, cost, lat = token_cost_latency(r)
-        tokens_in_vals.append(ti)
-        tokens_out_vals.append(to)
-        cost_vals.append(cost)
-        latency_vals.append(lat)
-
-    # Rates
-    def mean_bool(lst: List[bool]) -> Optional[float]:
-        if not lst:
-            return None
-        return sum(1 for x in lst if x) / len(lst)
-
+    metrics, cases = paper_run_metrics(art.tables, report_splits)
     metrics = {
         "run_id": art.manifest.get("run_id"),
         "runner_name": art.manifest.get("mode"),
         "backbone_model_id": (art.manifest.get("backbone") or {}).get("model"),
-        "included_row_count": len(rows),
-        "pass_rate": mean_bool(pass_flags),
-        "valid_aspect_rate": mean_bool(valid_triplet),
-        "polarity_conflict_rate": mean_bool(conflict_flags),
-        "unanchored_rate": mean_bool(unanchored_flags),
-        "structural_risk_rate": mean_bool(structural_risk_flags),
-        "targetless_rate": mean_bool(targetless_flags),
-        "parse_failure_rate": mean_bool(parse_failed),
-        "generate_failure_rate": mean_bool(generate_failed),
-        "fallback_used_rate": mean_bool(fallback_used),
-        "tokens_in_mean": mean_std(tokens_in_vals)[0],
-        "tokens_in_std": mean_std(tokens_in_vals)[1],
-        "tokens_out_mean": mean_std(tokens_out_vals)[0],
-        "tokens_out_std": mean_std(tokens_out_vals)[1],
-        "cost_usd_mean": mean_std(cost_vals)[0],
-        "cost_usd_std": mean_std(cost_vals)[1],
-        "latency_ms_mean": mean_std(latency_vals)[0],
-        "latency_ms_std": mean_std(latency_vals)[1],
+        **metrics,
     }
-
-    # Failure breakdown counts
-    metrics.update(
+    case_rows = [
         {
-            "count_structural_risk": sum(structural_risk_flags),
-            "count_unanchored": sum(unanchored_flags),
-            "count_targetless": sum(targetless_flags),
-            "count_polarity_conflict": sum(conflict_flags),
-            "count_parse_failed": sum(parse_failed),
-            "count_generate_failed": sum(generate_failed),
+            "uid": c["uid"],
+            "run_id": art.manifest.get("run_id"),
+            "timestamp_utc": art.manifest.get("timestamp_utc"),
+            "split": c["split"],
+            "case_type": c["case_type"],
+            "structural_risk": c["structural_risk"],
+            "parse_failed": c["parse_failed"],
+            "generate_failed": c["generate_failed"],
+            "fallback_used": c["fallback_used"],
+            "polarity_conflict": c["polarity_conflict"],
+            "final_triplet_count": c["final_triplet_count"],
+            "stage1_triplet_count": c["stage1_triplet_count"],
+            "text_preview": smoke_preview.get(c["uid"]),
         }
-    )
-
-    # Hard subset F1 and stage deltas (if gold exists)
-    gold_available = any(g is not None for g in gold_by_uid.values())
-    if gold_available:
-        f1_stage1 = []
-        f1_stage2 = []
-        f1_final = []
-        hard_f1_stage1 = []
-        hard_f1_stage2 = []
-        for uid in included_uids:
-            gold = gold_by_uid.get(uid)
-            if gold is None:
-                continue
-            _, _, f1_1 = precision_recall_f1(stage1_triplets_by_uid.get(uid, set()), gold)
-            _, _, f1_2 = precision_recall_f1(stage2_triplets_by_uid.get(uid, set()), gold)
-            _, _, f1_f = precision_recall_f1(final_triplets_by_uid.get(uid, set()), gold)
-            f1_stage1.append(f1_1)
-            f1_stage2.append(f1_2)
-            f1_final.append(f1_f)
-            if uid in hard_subset_uids:
-                hard_f1_stage1.append(f1_1)
-                hard_f1_stage2.append(f1_2)
-
-        metrics.update(
-            {
-                "f1_stage1": mean_std(f1_stage1)[0],
-                "f1_stage2": mean_std(f1_stage2)[0],
-                "delta_f1": (mean_std(f1_stage2)[0] - mean_std(f1_stage1)[0])
-                if f1_stage1 and f1_stage2
-                else None,
-                "hard_f1_stage1": mean_std(hard_f1_stage1)[0],
-                "hard_f1_stage2": mean_std(hard_f1_stage2)[0],
-                "hard_delta_f1": (mean_std(hard_f1_stage2)[0] - mean_std(hard_f1_stage1)[0])
-                if hard_f1_stage1 and hard_f1_stage2
-                else None,
-            }
-        )
-
-        # Error correction
-        c01 = c10 = 0
-        n = 0
-        for uid in included_uids:
-            gold = gold_by_uid.get(uid)
-            if gold is None:
-                continue
-            n += 1
-            st1 = stage1_triplets_by_uid.get(uid, set()) == gold
-            st2 = stage2_triplets_by_uid.get(uid, set()) == gold
-            if not st1 and st2:
-                c01 += 1
-            if st1 and not st2:
-                c10 += 1
-        if n > 0:
-            metrics.update(
-                {
-                    "net_error_correction_rate": (c01 - c10) / n,
-                    "correction_rate": c01 / n,
-                    "degradation_rate": c10 / n,
-                }
-            )
-    else:
-        metrics.update(
-            {
-                "f1_stage1": None,
-                "f1_stage2": None,
-                "delta_f1": None,
-                "hard_f1_stage1": None,
-                "hard_f1_stage2": None,
-                "hard_delta_f1": None,
-                "net_error_correction_rate": None,
-                "correction_rate": None,
-                "degradation_rate": None,
-            }
-        )
-
-    # Case summary
-    case_rows = []
-    for r in rows:
-        uid = (r.get("meta") or {}).get("text_id") or r.get("uid")
-        final_ts = final_triplets_by_uid[uid]
-        stage1_ts = stage1_triplets_by_uid[uid]
-        case_rows.append(
-            {
-                "uid": uid,
-                "run_id": art.manifest.get("run_id"),
-                "timestamp_utc": art.manifest.get("timestamp_utc"),
-                "split": (r.get("meta") or {}).get("split"),
-                "case_type": (r.get("meta") or {}).get("case_type"),
-                "structural_risk": uid in hard_subset_uids,
-                "parse_failed": get_flags(r)["parse_failed"],
-                "generate_failed": get_flags(r)["generate_failed"],
-                "fallback_used": fallback_from_trace(r) or get_flags(r)["fallback_used"],
-                "polarity_conflict": polarity_conflict_flag(final_ts),
-                "final_triplet_count": len(final_ts),
-                "stage1_triplet_count": len(stage1_ts),
-                "text_preview": smoke_preview.get(uid),
-            }
-        )
+        for c in cases.to_dict("records")
+    ]
+    return {"metrics": metrics, "case_rows": case_rows}
 
-    # row count check
-    if len(case_rows) != len(rows):
-        raise ValueError(f"Case summary row count mismatch for run {art.manifest.get('run_id')}: {len(case_rows)} vs {len(rows)}")
 
-    return {
-        "metrics": metrics,
-        "case_rows": case_rows,
-        "included_uids": included_uids,
-        "hard_subset_uids": hard_subset_uids,
-    }
+def summarize_run(art: RunArtifacts, report_splits: Set[str], consistency_splits: Optional[Set[str]], with_scores: bool) -> Dict:
+    """
+    Per-run part of build_tables_for_runs (run in a worker process): metrics and case rows, plus the per-uid
+    final triplet keys and gold scores that the cross-run merge needs. Tables and smoke outputs are read here.
+    """
+    res = compute_run_metrics(art, report_splits, build_smoke_preview_map(art.smoke_outputs))
+    res["final_keys"] = final_triplet_keys(art.tables, consistency_splits)
+    res["scores"] = per_uid_scores(art.tables, report_splits) if with_scores else None
+    return res
 
 
-def compute_self_consistency(run_metric_list: List[Dict], runs_data: List[RunArtifacts], report_split: str, n_runs_required: int) -> Optional[float]:
-    if len(runs_data) < n_runs_required:
+def compute_self_consistency(per_run_results: List[Dict], n_runs_required: int) -> Optional[float]:
+    if len(per_run_results) < n_runs_required:
         return None
+    return self_consistency_from_keys([res["final_keys"] for res in per_run_results])
 
-    # Load final triplets per run
-    per_run_uid_triplets: List[Dict[str, Set[Triplet]]] = []
-    uid_sets = []
-    for art in runs_data:
-        rows = filter_split(art.scorecards, report_split)
-        uid_to_triplets = {}
-        for r in rows:
-            uid = (r.get("meta") or {}).get("text_id") or r.get("uid")
-            uid_to_triplets[uid] = extract_final_triplets(r)
-        per_run_uid_triplets.append(uid_to_triplets)
-        uid_sets.append(set(uid_to_triplets.keys()))
-
-    eligible_uids = set.intersection(*uid_sets) if uid_sets else set()
-    if not eligible_uids:
-        return None
 
-    exact_matches = []
-    for uid in eligible_uids:
-        first = per_run_uid_triplets[0].get(uid, set())
-        exact = all(per_run_uid_triplets[i].get(uid, set()) == first for i in range(1, len(per_run_uid_triplets)))
-        exact_matches.append(1 if exact else 0)
-
-    if not exact_matches:
-        return None
-    return sum(exact_matches) / len(exact_matches)
+def compute_significance(runs_data: List[RunArtifacts], per_run_results: List[Dict], n_resamples: int) -> List[Dict]:
+    """Paired F1/accuracy tests: proposed vs bl1/bl2/bl3 and ablation variants vs proposed (seeds pooled per mode)."""
+    if n_resamples <= 0 or len(runs_data) < 2:
+        return []
+    matrix = scores_matrix(
+        [(art.manifest.get("mode") or art.run_dir.name, art.run_dir.name, res["scores"]) for art, res in zip(runs_data, per_run_results)]
+    )
+    return [row for row in compare_systems(matrix, n_resamples=n_resamples) if row["n"]]
 
 
 # ---------- Output writers ----------
@@ -593,6 +266,8 @@ def build_tables_for_runs(
     force_smoke_sanity: bool = False,
     smoke_sanity_warning: Optional[str] = None,
     strict: bool = False,
+    bootstrap_resamples: int = 10000,
+    workers: Optional[int] = None,
 ):
     run_artifacts = [RunArtifacts(rd) for rd in run_dirs]
 
@@ -623,17 +298,20 @@ def build_tables_for_runs(
             report_splits = {FILE_KEY_TO_SPLIT[k] for k in report_src if k in FILE_KEY_TO_SPLIT}
         else:
             report_splits = set(roles.get("report_set") or ["valid"])
-    per_run_results = []
-    for art in run_artifacts:
-        smoke_preview = build_smoke_preview_map(art.smoke_outputs)
-        res = compute_run_metrics(art, report_splits, smoke_preview)
-        per_run_results.append(res)
-
-    # self consistency across provided runs
-    self_consistency = compute_self_consistency(
-        [r["metrics"] for r in per_run_results], run_artifacts, list(report_splits)[0] if report_splits else "", n_runs_for_consistency
+    consistency_split = list(report_splits)[0] if report_splits else ""
+    per_run_results = map_runs(
+        summarize_run,
+        run_artifacts,
+        workers,
+        report_splits=report_splits,
+        consistency_splits={consistency_split} if consistency_split else None,
+        with_scores=bootstrap_resamples > 0 and len(run_artifacts) > 1,
     )
+
+    # cross-run merge: self consistency and significance across provided runs
+    self_consistency = compute_self_consistency(per_run_results, n_runs_for_consistency)
     agg_rows = aggregate_metrics(per_run_results)
+    significance_rows = compute_significance(run_artifacts, per_run_results, bootstrap_resamples)
 
     report_split_label = ",".join(sorted(report_splits)) if report_splits else "all"
 
@@ -732,6 +410,11 @@ def build_tables_for_runs(
             write_csv(outdir / "paper_table_3_main_results_agg.csv", agg_rows)
             write_md_table(outdir / "paper_table_3_main_results_agg.md", agg_rows)
 
+        # Table 5: paired significance across modes / ablations (if gold and >1 system)
+        if significance_rows:
+            write_csv(outdir / "paper_table_5_significance.csv", significance_rows)
+            write_md_table(outdir / "paper_table_5_significance.md", significance_rows)
+
         # Table 4: failure breakdown
         t4_rows = [
             {
@@ -788,13 +471,17 @@ def build_tables_for_runs(
             report_lines.append(f"- {name} (md/csv) in paper_outputs/")
         if len(run_dirs) > 1 and agg_rows:
             report_lines.append("- paper_table_3_main_results_agg (md/csv) aggregated across provided runs")
+        if significance_rows:
+            report_lines.append(
+                f"- paper_table_5_significance (md/csv) paired bootstrap 95% CI + randomization p ({bootstrap_resamples} resamples)"
+            )
         (outdir / "paper_report.md").write_text("\n".join(report_lines), encoding="utf-8")
 
 
 # ---------- CLI ----------
 
 
-def parse_args():
+def parse_args(argv=None):
     p = argparse.ArgumentParser(description="Build paper-ready tables from run artifacts.")
     p.add_argument("--run_dir", type=str, help="Single run directory containing manifest/scorecards/traces.")
     p.add_argument("--run_dirs", nargs="+", help="Multiple run directories for consistency analysis.")
@@ -826,7 +513,19 @@ def parse_args():
         action="store_true",
         help="Strict mode: missing required fields in paper tables -> FAIL (exit code 1).",
     )
-    return p.parse_args()
+    p.add_argument(
+        "--bootstrap_resamples",
+        type=int,
+        default=10000,
+        help="Resamples for paired bootstrap CIs / randomization tests in paper_table_5 (0 disables).",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for per-run metrics (default: min(8, cpu_count); 1 = serial).",
+    )
+    return p.parse_args(argv)
 
 
 def _check_smoke_sanity_enforcement(run_dirs: List[Path], force: bool) -> Optional[str]:
@@ -851,8 +550,8 @@ def _check_smoke_sanity_enforcement(run_dirs: List[Path], force: bool) -> Option
     return None
 
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
     if args.run_dir and args.run_dirs:
         run_dirs = [Path(args.run_dir)] + [Path(p) for p in args.run_dirs]
     elif args.run_dir:
@@ -880,7 +579,7 @@ def main():
         report_splits = include_splits
     else:
         report_splits = {args.report_split} if args.report_split else None
-    build_tables_for_runs(run_dirs, report_splits, args.hard_subset_source, args.n_runs_for_consistency, args.force, smoke_sanity_warning, strict=args.strict)
+    build_tables_for_runs(run_dirs, report_splits, args.hard_subset_source, args.n_runs_for_consistency, args.force, smoke_sanity_warning, strict=args.strict, bootstrap_resamples=args.bootstrap_resamples, workers=args.workers)
 
 
 if __name__ == "__main__":
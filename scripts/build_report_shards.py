@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Write the per-example data shards behind the reports' "Examples" explorer.
+
+=== INPUT ===
+  --run_dir PATH (required)
+      Run directory with scorecards.jsonl (outputs.jsonl is read for trace drill-downs).
+  --out_dir PATH (default: reports/<run_dir.name>)
+      Reports directory; shards go to <out_dir>/data/.
+  --shard_size N (default: 500)
+      Examples per shard file.
+  --no_traces
+      Skip traces-NNNN.js (no drill-down, no outputs.jsonl reads).
+
+=== OUTPUT ===
+  <out_dir>/data/index.js, examples-NNNN.js, traces-NNNN.js (see metrics/report_shards.py).
+  index.html and metric_report.html load them on demand; their own size does not depend on the run.
+
+Usage:
+  python scripts/build_report_shards.py --run_dir results/<run_id>_<mode> --out_dir reports/<run_id>_<mode>
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.report_shards import DATA_DIR, SHARD_SIZE, build_example_shards  # noqa: E402
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Write lazily loaded example shards for the HTML reports")
+    ap.add_argument("--run_dir", required=True, help="results/<run_id>_<mode>")
+    ap.add_argument("--out_dir", default=None, help="Reports directory (default: reports/<run_dir.name>)")
+    ap.add_argument("--shard_size", type=int, default=SHARD_SIZE, help="Examples per shard file")
+    ap.add_argument("--no_traces", action="store_true", help="Do not write trace drill-down shards")
+    args = ap.parse_args(argv)
+
+    run_dir = Path(args.run_dir)
+    scorecards = run_dir / "scorecards.jsonl"
+    if not scorecards.exists():
+        print(f"[ERROR] scorecards.jsonl not found in {run_dir}", file=sys.stderr)
+        sys.exit(1)
+    out_dir = (Path(args.out_dir) if args.out_dir else PROJECT_ROOT / "reports" / run_dir.name) / DATA_DIR
+    result = build_example_shards(scorecards, out_dir, run_dir, args.shard_size, traces=not args.no_traces)
+    print(f"Wrote {result['n']} examples in {result['n_shards']} shard(s) to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
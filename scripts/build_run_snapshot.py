@@ -3,16 +3,26 @@ ops-only run snapshot generator.
 
 Reads existing artifacts in a run directory and produces lightweight ops summaries
 that work even without gold labels. No changes to inference/pipeline.
+scorecards.jsonl is aggregated in one streaming pass (metrics.streaming); traces.jsonl and
+smoke_outputs.jsonl are streamed only for the input_hash fallback and the top-issue previews.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import heapq
 import json
 import math
 import statistics
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.streaming import MetricAccumulator, ScorecardView, iter_scorecards, stream_metrics  # noqa: E402
 
 
 # ---------- IO helpers ----------
@@ -24,18 +34,6 @@ def load_json(path: Path) -> Optional[Dict]:
         return json.load(f)
 
 
-def load_jsonl(path: Path) -> List[Dict]:
-    if not path.exists():
-        return []
-    rows = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                rows.append(json.loads(line))
-    return rows
-
-
 def save_text(path: Path, text: str):
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(text, encoding="utf-8")
@@ -81,39 +79,50 @@ def percentile(lst: List[Optional[float]], p: float) -> Optional[float]:
 # ---------- Split overlap helpers ----------
 
 
-def _compute_split_overlap(scorecards: List[Dict], traces: List[Dict]) -> Dict[str, Any]:
+def _trace_input_hashes(traces: Iterable[Dict]) -> Dict[Any, Optional[str]]:
+    """uid -> input_hash of the first trace row for that uid (fallback when a scorecard has no input_hash)."""
+    hashes: Dict[Any, Optional[str]] = {}
+    for tr in traces:
+        uid = tr.get("uid")
+        if uid not in hashes:
+            hashes[uid] = tr.get("input_hash")
+    return hashes
+
+
+def _add_split_hash(hashes_by_split: Dict[str, set], row: Dict, trace_hashes: Dict[Any, Optional[str]]) -> None:
+    meta = row.get("meta") or {}
+    split = meta.get("split") or row.get("split")
+    # Try to get input_hash from meta or compute from text
+    input_hash = meta.get("input_hash")
+    if not input_hash:
+        # Try traces for this uid
+        uid = meta.get("text_id") or meta.get("uid") or row.get("uid")
+        input_hash = trace_hashes.get(uid)
+    if not input_hash:
+        # Last resort: hash the input_preview if available
+        preview = meta.get("input_text") or row.get("text")
+        if preview and isinstance(preview, str):
+            # Normalize whitespace for consistent hashing
+            normalized = " ".join(preview.split())
+            input_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    if split in hashes_by_split and input_hash:
+        hashes_by_split[split].add(input_hash)
+
+
+def _compute_split_overlap(scorecards: Iterable[Dict], traces: Iterable[Dict]) -> Dict[str, Any]:
     """
     Compute exact overlap between train/valid/test splits using input_hash.
     Returns overlap rates and notes.
     """
-    # Collect input_hashes by split
     hashes_by_split: Dict[str, set] = {"train": set(), "valid": set(), "test": set()}
-
-    # Prefer scorecards for input_hash, fall back to traces
+    trace_hashes = _trace_input_hashes(traces)
     for row in scorecards:
-        meta = row.get("meta") or {}
-        split = meta.get("split") or row.get("split")
-        # Try to get input_hash from meta or compute from text
-        input_hash = meta.get("input_hash")
-        if not input_hash:
-            # Try traces for this uid
-            uid = meta.get("text_id") or meta.get("uid") or row.get("uid")
-            for tr in traces:
-                if tr.get("uid") == uid:
-                    input_hash = tr.get("input_hash")
-                    break
-        if not input_hash:
-            # Last resort: hash the input_preview if available
-            preview = meta.get("input_text") or row.get("text")
-            if preview and isinstance(preview, str):
-                import hashlib
-                # Normalize whitespace for consistent hashing
-                normalized = " ".join(preview.split())
-                input_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
-
-        if split in hashes_by_split and input_hash:
-            hashes_by_split[split].add(input_hash)
+        _add_split_hash(hashes_by_split, row, trace_hashes)
+    return _split_overlap(hashes_by_split)
+
 
+def _split_overlap(hashes_by_split: Dict[str, set]) -> Dict[str, Any]:
     train_hashes = hashes_by_split.get("train", set())
     valid_hashes = hashes_by_split.get("valid", set())
     test_hashes = hashes_by_split.get("test", set())
@@ -160,6 +169,194 @@ def _compute_split_overlap(scorecards: List[Dict], traces: List[Dict]) -> Dict[s
 # ---------- Core processing ----------
 
 
+def _severity(row: Dict) -> int:
+    flags = row.get("flags") or {}
+    sev = (
+        (3 if flags.get("generate_failed") else 0)
+        + (2 if flags.get("parse_failed") else 0)
+        + (1 if flags.get("fallback_used") else 0)
+    )
+    # empty_output bonus
+    parsed = (row.get("runtime") or {}).get("parsed_output") or {}
+    aspects = parsed.get("stage1_aspects") or parsed.get("stage2_aspects") or []
+    empty = isinstance(aspects, list) and len(aspects) == 0
+    if empty:
+        sev += 1
+    return sev
+
+
+class RunSnapshotAccumulator(MetricAccumulator):
+    """
+    Volume, reliability, usage, ops_table, split hashes and the top_k issue rows of a run in one pass over its
+    scorecards. Keeps counters and per-metric values (for means/percentiles), never the rows themselves.
+    """
+
+    def __init__(self, *, mode: Optional[str], trace_hashes: Dict[Any, Optional[str]], raw_preview_chars: int, top_k: int):
+        super().__init__()
+        self.mode = mode
+        self.trace_hashes = trace_hashes
+        self.raw_preview_chars = raw_preview_chars
+        self.top_k = top_k
+        self.n_total = 0
+        self.by_split: Dict[Any, int] = {}
+        self.by_case_type: Dict[Any, int] = {}
+        self.flag_values: Dict[str, List[bool]] = {"generate_failed": [], "parse_failed": [], "fallback_used": []}
+        self.empty_output_flags: List[bool] = []
+        self.aspects_counts: List[int] = []
+        self.values: Dict[str, List[Any]] = {"tokens_in": [], "tokens_out": [], "cost_usd": [], "latency_ms": [], "retries": []}
+        self.by_key: Dict[Tuple, Dict[str, Any]] = {}
+        self.hashes_by_split: Dict[str, set] = {"train": set(), "valid": set(), "test": set()}
+        self._top: List[Tuple[Tuple[float, float, int], Dict[str, Any]]] = []
+
+    def add(self, view: ScorecardView) -> None:
+        r = view.record
+        meta = r.get("meta") or {}
+        flags = r.get("flags") or {}
+        rt = r.get("runtime") or {}
+        idx = self.n_total
+        self.n_total += 1
+        for counts, key in ((self.by_split, meta.get("split")), (self.by_case_type, meta.get("case_type"))):
+            if key is not None:
+                counts[key] = counts.get(key, 0) + 1
+        _add_split_hash(self.hashes_by_split, r, self.trace_hashes)
+
+        # Reliability
+        for key, values in self.flag_values.items():
+            if flags.get(key) is not None:
+                values.append(bool(flags.get(key)))
+        # empty_output detection
+        parsed = rt.get("parsed_output") or {}
+        aspects = parsed.get("stage1_aspects") or parsed.get("stage2_aspects") or parsed.get("final_aspects") or []
+        if isinstance(aspects, list):
+            self.aspects_counts.append(len(aspects))
+            self.empty_output_flags.append(len(aspects) == 0)
+        row_values = {
+            "tokens_in": rt.get("tokens_in"),
+            "tokens_out": rt.get("tokens_out"),
+            "cost_usd": rt.get("cost_usd"),
+            "latency_ms": meta.get("latency_ms"),
+            "retries": rt.get("retries"),
+        }
+        for key, val in row_values.items():
+            if val is not None:
+                self.values[key].append(val)
+
+        # ops_table rows
+        runner_name = meta.get("runner_name") or meta.get("mode") or self.mode
+        key = (runner_name, meta.get("backbone_model_id"), meta.get("split"))
+        if key not in self.by_key:
+            self.by_key[key] = {
+                "runner_name": key[0],
+                "backbone_model_id": key[1],
+                "split": key[2],
+                "n": 0,
+                "parse_failed": [],
+                "generate_failed": [],
+                "fallback_used": [],
+                "tokens_in": [],
+                "tokens_out": [],
+                "cost_usd": [],
+                "latency_ms": [],
+                "retries": [],
+            }
+        bucket = self.by_key[key]
+        bucket["n"] += 1
+        for flag in ("parse_failed", "generate_failed", "fallback_used"):
+            bucket[flag].append(bool(flags.get(flag)))
+        for name, val in row_values.items():
+            bucket[name].append(val)
+
+        # top issues: the top_k smallest (severity, latency, input order) keys, same order as a full sort
+        if self.top_k <= 0:
+            return
+        sev = _severity(r)
+        sort_key = (-(sev or 0), -(meta.get("latency_ms") or -1), idx)
+        self._top.append((sort_key, {
+            "uid": meta.get("text_id") or r.get("uid"),
+            "split": meta.get("split"),
+            "case_type": meta.get("case_type"),
+            "runner_name": runner_name,
+            "backbone_model_id": meta.get("backbone_model_id"),
+            "tokens_in": rt.get("tokens_in"),
+            "tokens_out": rt.get("tokens_out"),
+            "cost_usd": rt.get("cost_usd"),
+            "latency_ms": meta.get("latency_ms"),
+            "retries": rt.get("retries"),
+            "flags": json.dumps(flags, ensure_ascii=False),
+            "text_preview": None,
+            "raw_output_preview": (rt.get("raw_output") or "")[: self.raw_preview_chars],
+        }))
+        if len(self._top) >= 2 * self.top_k + 64:
+            self._top = heapq.nsmallest(self.top_k, self._top, key=lambda item: item[0])
+
+    def result(self) -> Dict[str, Any]:
+        def rate(values: List[bool]) -> Optional[float]:
+            return (sum(values) / len(values)) if values else None
+
+        tokens_in, tokens_out, costs = self.values["tokens_in"], self.values["tokens_out"], self.values["cost_usd"]
+        latencies, retries = self.values["latency_ms"], self.values["retries"]
+        reliability = {
+            "generate_failed_rate": rate(self.flag_values["generate_failed"]),
+            "parse_failed_rate": rate(self.flag_values["parse_failed"]),
+            "fallback_used_rate": rate(self.flag_values["fallback_used"]),
+            "empty_output_rate": rate(self.empty_output_flags),
+            "avg_aspect_count": safe_mean(self.aspects_counts) if self.aspects_counts else None,
+        }
+        usage = {
+            "tokens_in_total": sum(tokens_in) if tokens_in else None,
+            "tokens_out_total": sum(tokens_out) if tokens_out else None,
+            "cost_usd_total": sum(costs) if costs else None,
+            "latency_ms_mean": safe_mean(latencies),
+            "latency_ms_p50": percentile(latencies, 0.5),
+            "latency_ms_p95": percentile(latencies, 0.95),
+            "retries_mean": safe_mean(retries),
+        }
+        ops_table = []
+        for b in self.by_key.values():
+            ops_table.append(
+                {
+                    "runner_name": b["runner_name"],
+                    "backbone_model_id": b["backbone_model_id"],
+                    "split": b["split"],
+                    "n": b["n"],
+                    "parse_failed_rate": safe_mean(b["parse_failed"]),
+                    "generate_failed_rate": safe_mean(b["generate_failed"]),
+                    "fallback_used_rate": safe_mean(b["fallback_used"]),
+                    "tokens_in_mean": safe_mean(b["tokens_in"]),
+                    "tokens_out_mean": safe_mean(b["tokens_out"]),
+                    "cost_usd_sum": sum([x for x in b["cost_usd"] if x is not None]) if b["cost_usd"] else None,
+                    "latency_ms_p50": percentile(b["latency_ms"], 0.5),
+                    "latency_ms_p95": percentile(b["latency_ms"], 0.95),
+                    "retries_mean": safe_mean(b["retries"]),
+                }
+            )
+        top_rows = [row for _, row in heapq.nsmallest(self.top_k, self._top, key=lambda item: item[0])]
+        return {
+            "n_total": self.n_total,
+            "by_split": self.by_split,
+            "by_case_type": self.by_case_type,
+            "reliability": reliability,
+            "usage": usage,
+            "ops_table": ops_table,
+            "top_rows": top_rows,
+            "split_overlap": _split_overlap(self.hashes_by_split),
+        }
+
+
+def _smoke_previews(smoke_path: Path, uids: Set[Any], text_preview_chars: int) -> Dict[Any, str]:
+    """First non-empty input text per uid from smoke_outputs, read as a stream and only for `uids`."""
+    previews: Dict[Any, str] = {}
+    if not uids:
+        return previews
+    for s in iter_scorecards(smoke_path):
+        sm_uid = (s.get("meta") or {}).get("text_id") or s.get("uid")
+        if sm_uid in uids and sm_uid not in previews:
+            txt = (s.get("meta") or {}).get("input_text") or s.get("text")
+            if txt:
+                previews[sm_uid] = txt[:text_preview_chars]
+    return previews
+
+
 def build_snapshot(run_dir: Path, out_dir: Path, text_preview_chars: int, raw_preview_chars: int, top_k: int):
     manifest_path = run_dir / "manifest.json"
     score_path = run_dir / "scorecards.jsonl"
@@ -167,9 +364,6 @@ def build_snapshot(run_dir: Path, out_dir: Path, text_preview_chars: int, raw_pr
     smoke_path = run_dir / "smoke_outputs.jsonl"
 
     manifest = load_json(manifest_path) or {}
-    scorecards = load_jsonl(score_path)
-    traces = load_jsonl(trace_path)
-    smokes = load_jsonl(smoke_path)
 
     run_id = manifest.get("run_id") or run_dir.name
     timestamp = manifest.get("timestamp_utc")
@@ -178,9 +372,6 @@ def build_snapshot(run_dir: Path, out_dir: Path, text_preview_chars: int, raw_pr
     prompt_hashes = list((manifest.get("prompt_versions") or {}).values())
     purpose = manifest.get("purpose") or "unknown"
 
-    # Compute split overlap integrity check
-    split_overlap = _compute_split_overlap(scorecards, traces)
-
     # Artifact presence
     def fsize(p: Path):
         return p.stat().st_size if p.exists() else None
@@ -196,186 +387,22 @@ def build_snapshot(run_dir: Path, out_dir: Path, text_preview_chars: int, raw_pr
         "smoke_outputs_bytes": fsize(smoke_path),
     }
 
-    # Aggregates
-    rows = scorecards
-    n_total = len(rows)
-    by_split = {}
-    by_case_type = {}
-
-    def inc(d, key):
-        if key is None:
-            return
-        d[key] = d.get(key, 0) + 1
-
-    for r in rows:
-        meta = r.get("meta") or {}
-        inc(by_split, meta.get("split"))
-        inc(by_case_type, meta.get("case_type"))
-
-    # Reliability
-    def rate(key):
-        flags = [(r.get("flags") or {}).get(key) for r in rows]
-        flags = [bool(x) for x in flags if x is not None]
-        if not flags:
-            return None
-        return sum(flags) / len(flags)
-
-    def agg_numeric(getter):
-        vals = []
-        for r in rows:
-            val = getter(r)
-            if val is not None:
-                vals.append(val)
-        return vals
-
-    # empty_output detection
-    empty_output_flags = []
-    aspects_counts = []
-    for r in rows:
-        parsed = (r.get("runtime") or {}).get("parsed_output") or {}
-        aspects = parsed.get("stage1_aspects") or parsed.get("stage2_aspects") or parsed.get("final_aspects") or []
-        if isinstance(aspects, list):
-            aspects_counts.append(len(aspects))
-            empty_output_flags.append(len(aspects) == 0)
-
-    reliability = {
-        "generate_failed_rate": rate("generate_failed"),
-        "parse_failed_rate": rate("parse_failed"),
-        "fallback_used_rate": rate("fallback_used"),
-        "empty_output_rate": (sum(empty_output_flags) / len(empty_output_flags)) if empty_output_flags else None,
-        "avg_aspect_count": safe_mean(aspects_counts) if aspects_counts else None,
-    }
-
-    tokens_in = agg_numeric(lambda r: (r.get("runtime") or {}).get("tokens_in"))
-    tokens_out = agg_numeric(lambda r: (r.get("runtime") or {}).get("tokens_out"))
-    costs = agg_numeric(lambda r: (r.get("runtime") or {}).get("cost_usd"))
-    latencies = agg_numeric(lambda r: (r.get("meta") or {}).get("latency_ms"))
-    retries = agg_numeric(lambda r: (r.get("runtime") or {}).get("retries"))
-
-    usage = {
-        "tokens_in_total": sum(tokens_in) if tokens_in else None,
-        "tokens_out_total": sum(tokens_out) if tokens_out else None,
-        "cost_usd_total": sum(costs) if costs else None,
-        "latency_ms_mean": safe_mean(latencies),
-        "latency_ms_p50": percentile(latencies, 0.5),
-        "latency_ms_p95": percentile(latencies, 0.95),
-        "retries_mean": safe_mean(retries),
-    }
-
-    # ops_table rows
-    def collect_ops_rows():
-        by_key = {}
-        for r in rows:
-            meta = r.get("meta") or {}
-            key = (meta.get("runner_name") or meta.get("mode") or manifest.get("mode"), meta.get("backbone_model_id"), meta.get("split"))
-            if key not in by_key:
-                by_key[key] = {
-                    "runner_name": key[0],
-                    "backbone_model_id": key[1],
-                    "split": key[2],
-                    "n": 0,
-                    "parse_failed": [],
-                    "generate_failed": [],
-                    "fallback_used": [],
-                    "tokens_in": [],
-                    "tokens_out": [],
-                    "cost_usd": [],
-                    "latency_ms": [],
-                    "retries": [],
-                }
-            bucket = by_key[key]
-            bucket["n"] += 1
-            flags = r.get("flags") or {}
-            bucket["parse_failed"].append(bool(flags.get("parse_failed")))
-            bucket["generate_failed"].append(bool(flags.get("generate_failed")))
-            bucket["fallback_used"].append(bool(flags.get("fallback_used")))
-            rt = r.get("runtime") or {}
-            bucket["tokens_in"].append(rt.get("tokens_in"))
-            bucket["tokens_out"].append(rt.get("tokens_out"))
-            bucket["cost_usd"].append(rt.get("cost_usd"))
-            bucket["latency_ms"].append((r.get("meta") or {}).get("latency_ms"))
-            bucket["retries"].append(rt.get("retries"))
-
-        rows_out = []
-        for _, b in by_key.items():
-            rows_out.append(
-                {
-                    "runner_name": b["runner_name"],
-                    "backbone_model_id": b["backbone_model_id"],
-                    "split": b["split"],
-                    "n": b["n"],
-                    "parse_failed_rate": safe_mean(b["parse_failed"]),
-                    "generate_failed_rate": safe_mean(b["generate_failed"]),
-                    "fallback_used_rate": safe_mean(b["fallback_used"]),
-                    "tokens_in_mean": safe_mean(b["tokens_in"]),
-                    "tokens_out_mean": safe_mean(b["tokens_out"]),
-                    "cost_usd_sum": sum([x for x in b["cost_usd"] if x is not None]) if b["cost_usd"] else None,
-                    "latency_ms_p50": percentile(b["latency_ms"], 0.5),
-                    "latency_ms_p95": percentile(b["latency_ms"], 0.95),
-                    "retries_mean": safe_mean(b["retries"]),
-                }
-            )
-        return rows_out
-
-    ops_table = collect_ops_rows()
-
-    # top issues
-    def severity(row):
-        flags = row.get("flags") or {}
-        sev = (
-            (3 if flags.get("generate_failed") else 0)
-            + (2 if flags.get("parse_failed") else 0)
-            + (1 if flags.get("fallback_used") else 0)
-        )
-        # empty_output bonus
-        parsed = (row.get("runtime") or {}).get("parsed_output") or {}
-        aspects = parsed.get("stage1_aspects") or parsed.get("stage2_aspects") or []
-        empty = isinstance(aspects, list) and len(aspects) == 0
-        if empty:
-            sev += 1
-        return sev
-
-    def preview_text(uid):
-        # try smoke_outputs for shorter input
-        for s in smokes:
-            sm_uid = (s.get("meta") or {}).get("text_id") or s.get("uid")
-            if sm_uid == uid:
-                txt = (s.get("meta") or {}).get("input_text") or s.get("text")
-                if txt:
-                    return txt[:text_preview_chars]
-        return None
-
-    top_rows = []
-    for r in rows:
-        uid = (r.get("meta") or {}).get("text_id") or r.get("uid")
-        flags = r.get("flags") or {}
-        sev = severity(r)
-        rt = r.get("runtime") or {}
-        meta = r.get("meta") or {}
-        raw_out = (rt.get("raw_output") or "")[:raw_preview_chars]
-        top_rows.append(
-            {
-                "uid": uid,
-                "split": meta.get("split"),
-                "case_type": meta.get("case_type"),
-                "runner_name": meta.get("runner_name") or meta.get("mode") or manifest.get("mode"),
-                "backbone_model_id": meta.get("backbone_model_id"),
-                "tokens_in": rt.get("tokens_in"),
-                "tokens_out": rt.get("tokens_out"),
-                "cost_usd": rt.get("cost_usd"),
-                "latency_ms": meta.get("latency_ms"),
-                "retries": rt.get("retries"),
-                "flags": json.dumps(flags, ensure_ascii=False),
-                "text_preview": preview_text(uid),
-                "raw_output_preview": raw_out,
-                "_severity": sev,
-            }
-        )
-
-    top_rows = sorted(top_rows, key=lambda x: (-(x["_severity"] or 0), -(x["latency_ms"] or -1)))
-    top_rows = top_rows[:top_k]
+    # One streaming pass over scorecards (traces/smoke_outputs are streamed separately for their lookups)
+    accumulator = RunSnapshotAccumulator(
+        mode=manifest.get("mode"),
+        trace_hashes=_trace_input_hashes(iter_scorecards(trace_path)),
+        raw_preview_chars=raw_preview_chars,
+        top_k=top_k,
+    )
+    _, results = stream_metrics(score_path, {"snapshot": accumulator})
+    stats = results["snapshot"]
+    n_total, by_split, by_case_type = stats["n_total"], stats["by_split"], stats["by_case_type"]
+    reliability, usage, ops_table = stats["reliability"], stats["usage"], stats["ops_table"]
+    split_overlap = stats["split_overlap"]
+    top_rows = stats["top_rows"]
+    previews = _smoke_previews(smoke_path, {r["uid"] for r in top_rows}, text_preview_chars)
     for r in top_rows:
-        r.pop("_severity", None)
+        r["text_preview"] = previews.get(r["uid"])
 
     # run snapshot dict
     snapshot = {
@@ -461,18 +488,18 @@ def build_snapshot(run_dir: Path, out_dir: Path, text_preview_chars: int, raw_pr
 # ---------- CLI ----------
 
 
-def parse_args():
+def parse_args(argv=None):
     p = argparse.ArgumentParser(description="Build ops-only run snapshot.")
     p.add_argument("--run_dir", required=True, help="Run directory containing artifacts.")
     p.add_argument("--out_dir", help="Output directory (default: <run_dir>/ops_outputs)")
     p.add_argument("--text_preview_chars", type=int, default=80)
     p.add_argument("--raw_preview_chars", type=int, default=200)
     p.add_argument("--top_k", type=int, default=20)
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
     run_dir = Path(args.run_dir)
     out_dir = Path(args.out_dir) if args.out_dir else run_dir / "ops_outputs"
     build_snapshot(run_dir, out_dir, args.text_preview_chars, args.raw_preview_chars, args.top_k)
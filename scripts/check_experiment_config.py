@@ -1,6 +1,7 @@
 """
 실험 설정 사전 검사: paper 정책, fold 금지, seed 반복 시 demo_k=0.
 Fold → Seed 반복 전환 후 fail-fast: fold 경로·seed 반복 시 demo_k>0 금지.
+--near_dup: demo_pool ↔ eval 스플릿 근접 중복(MinHash/LSH) 검사 (데이터 로드 필요).
 """
 
 from __future__ import annotations
@@ -9,6 +10,9 @@ import argparse
 import sys
 from pathlib import Path
 
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_FILE_KEY_TO_SPLIT = {"train_file": "train", "valid_file": "valid", "test_file": "test"}
+
 
 def load_yaml(path: str) -> dict:
     import yaml
@@ -77,7 +81,52 @@ def check_paper_valid_only(cfg: dict) -> tuple[bool, str]:
     return True, "paper valid-only ok"
 
 
-def run_checks(config_path: str, strict: bool) -> tuple[bool, list[str]]:
+def _eval_splits_from_roles(roles: dict) -> set[str]:
+    """Eval splits as run_experiments derives them: report/blind_sources when given, else report_set/blind_set."""
+    report_src = roles.get("report_sources")
+    blind_src = roles.get("blind_sources")
+    if report_src is not None or blind_src is not None:
+        keys = list(report_src or []) + list(blind_src or [])
+        return {_FILE_KEY_TO_SPLIT[k] for k in keys if k in _FILE_KEY_TO_SPLIT}
+    return set(roles.get("report_set", ["valid"])) | set(roles.get("blind_set", []))
+
+
+def check_demo_near_duplicates(cfg: dict, threshold: float = 0.8) -> tuple[bool, str]:
+    """demo_pool 스플릿 텍스트가 eval 스플릿과 근접 중복(추정 Jaccard >= threshold)이면 실패."""
+    if str(_PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(_PROJECT_ROOT))
+    from data.datasets.loader import iter_split_examples, resolve_dataset_paths, split_is_configured
+    from tools.near_duplicate import NearDuplicateIndex, find_near_duplicates
+
+    roles = cfg.get("data_roles") or {}
+    eval_splits = _eval_splits_from_roles(roles)
+    demo_splits = set(roles.get("demo_pool", ["train"])) - eval_splits
+    data_cfg, _, _ = resolve_dataset_paths(cfg.get("data") or {})
+    eval_splits = {s for s in eval_splits if split_is_configured(data_cfg, s)}
+    demo_splits = {s for s in demo_splits if split_is_configured(data_cfg, s)}
+    if not eval_splits or not demo_splits:
+        return True, "no demo_pool/eval split pair configured, skip near-duplicate check"
+
+    index = NearDuplicateIndex(threshold)
+    for split in sorted(eval_splits):
+        for ex in iter_split_examples(data_cfg, split):
+            index.add(f"{split}:{ex.uid}", ex.text)
+    queries = ((f"{split}:{ex.uid}", ex.text) for split in sorted(demo_splits) for ex in iter_split_examples(data_cfg, split))
+    matches = find_near_duplicates(list(queries), index)
+    if matches:
+        top = sorted(matches.values(), key=lambda m: -m.jaccard)[:5]
+        pairs = ", ".join(f"{m.query_key}~{m.key}(J={m.jaccard})" for m in top)
+        return False, f"{len(matches)} demo_pool examples near-duplicate eval (threshold={threshold}): {pairs}"
+    return True, f"no near-duplicates between demo_pool {sorted(demo_splits)} and eval {sorted(eval_splits)} (threshold={threshold})"
+
+
+def run_checks(
+    config_path: str,
+    strict: bool,
+    *,
+    near_dup: bool = False,
+    near_dup_threshold: float = 0.8,
+) -> tuple[bool, list[str]]:
     path = Path(config_path)
     if not path.exists():
         return False, [f"ERROR: config not found: {config_path}"]
@@ -105,6 +154,12 @@ def run_checks(config_path: str, strict: bool) -> tuple[bool, list[str]]:
         messages.append("FAIL: paper requires demo fully inactive (k=0, enabled_for=[], force_for_proposed=false).")
 
     all_ok = ok and ok2 and ok3 and ok4
+    if near_dup:
+        ok5, msg5 = check_demo_near_duplicates(cfg, near_dup_threshold)
+        messages.append(f"[demo_near_duplicates] {msg5}")
+        if not ok5:
+            messages.append("FAIL: demo_pool contains near-duplicates of eval texts (leakage).")
+        all_ok = all_ok and ok5
     return all_ok, messages
 
 
@@ -112,8 +167,10 @@ def main() -> None:
     ap = argparse.ArgumentParser(description="Pre-run checks: no fold paths, seed repeat demo.k=0, paper valid-only")
     ap.add_argument("--config", required=True, help="Experiment config YAML path")
     ap.add_argument("--strict", action="store_true", help="Exit 1 on any failure")
+    ap.add_argument("--near_dup", action="store_true", help="Load splits and check demo_pool/eval near-duplicates (MinHash/LSH)")
+    ap.add_argument("--near_dup_threshold", type=float, default=0.8, help="Estimated Jaccard threshold for --near_dup (default 0.8)")
     args = ap.parse_args()
-    passed, messages = run_checks(args.config, args.strict)
+    passed, messages = run_checks(args.config, args.strict, near_dup=args.near_dup, near_dup_threshold=args.near_dup_threshold)
     for m in messages:
         print(m)
     if not passed and args.strict:
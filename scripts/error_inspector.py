@@ -1,20 +1,13 @@
 import argparse
 import json
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-def categorize(error: str) -> str:
-    err_lower = error.lower()
-    if "429" in err_lower or "rate" in err_lower:
-        return "429_rate_limit"
-    if "timeout" in err_lower or "timed out" in err_lower:
-        return "timeout"
-    if "jsondecodeerror" in err_lower or "parse" in err_lower:
-        return "parse_json"
-    if "validationerror" in err_lower or "validate" in err_lower:
-        return "schema_validation"
-    return "other"
+from metrics.results_index import DEFAULT_INDEX_PATH, connect, error_taxonomy  # noqa: E402
+from metrics.results_index import categorize_error as categorize  # noqa: E402,F401
 
 
 def load_errors(path: Path):
@@ -40,8 +33,28 @@ def main():
     parser = argparse.ArgumentParser(description="Summarize errors.jsonl and suggest repro samples.")
     parser.add_argument("--errors", type=str, default="experiments/results/errors.jsonl", help="Path to errors.jsonl")
     parser.add_argument("--top", type=int, default=3, help="Top N text_ids per category")
+    parser.add_argument(
+        "--index",
+        nargs="?",
+        const=str(DEFAULT_INDEX_PATH),
+        default=None,
+        help="Summarize across runs from the results index instead (scripts/results_index.py ingest)",
+    )
     args = parser.parse_args()
 
+    if args.index:
+        conn = connect(Path(args.index))
+        taxonomy = error_taxonomy(conn)
+        conn.close()
+        if taxonomy.empty:
+            print("No errors found.")
+            return
+        for run_id, group in taxonomy.groupby("run_id", sort=False):
+            print(f"{run_id}: {int(group['n'].sum())} errors")
+            for row in group.itertuples(index=False):
+                print(f"- [{row.level}] {row.error_category}: {row.n} ({row.n_uids} uids)")
+        return
+
     counts, text_ids = load_errors(Path(args.errors))
     total = sum(counts.values())
     if total == 0:
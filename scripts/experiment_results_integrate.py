@@ -6,6 +6,8 @@ E2E 실험 결과 통합: 스냅샷·논문 테이블·HTML 리포트·메트릭
   (1) 단일 런 통합: run_experiments 후 산출물·레포트·메트릭까지 일원화
   (2) N회 반복 런: merged_scorecards.jsonl 기준으로 메트릭만 생성 (self-consistency 등)
 
+단계는 scripts/step_graph.py로 실행: 한 프로세스 안에서 독립 단계는 병렬로, 입력·코드가 그대로인 단계는 건너뜀.
+
 Usage:
   # 단일 런 (스냅샷 + paper 테이블 + HTML + 메트릭)
   python scripts/experiment_results_integrate.py --run_dir results/my_run_proposed --with_metrics
@@ -18,22 +20,13 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
 
-
-def run_cmd(cmd: list[str], step: str) -> bool:
-    print(f"\n[STEP] {step}")
-    print(" ".join(cmd))
-    r = subprocess.run(cmd, cwd=PROJECT_ROOT, check=False)
-    if r.returncode != 0:
-        print(f"[FAIL] {step} exit code {r.returncode}")
-        return False
-    print(f"[OK]   {step}")
-    return True
+from scripts.step_graph import postprocess_steps, run_steps, structural_metrics_step  # noqa: E402
 
 
 def main():
@@ -75,9 +68,10 @@ def main():
     )
     ap.add_argument("--force_paper_tables", action="store_true", help="Pass --force to build_paper_tables")
     ap.add_argument("--report_profile", default="ops", choices=["ops", "paper"], help="HTML report profile when using --run_dir")
+    ap.add_argument("--force", action="store_true", help="Rerun steps even when their stamps say they are up to date")
+    ap.add_argument("--workers", type=int, default=4, help="Max steps run in parallel (default: 4)")
 
     args = ap.parse_args()
-    py = sys.executable
 
     if args.merged_scorecards:
         # N-run: metrics only from merged scorecards
@@ -87,13 +81,8 @@ def main():
             sys.exit(1)
         outdir = Path(args.outdir)
         outdir.mkdir(parents=True, exist_ok=True)
-        cmd = [
-            py, "scripts/structural_error_aggregator.py",
-            "--input", str(merged),
-            "--outdir", str(outdir),
-            "--profile", args.profile,
-        ]
-        if not run_cmd(cmd, "structural_error_aggregator"):
+        status = run_steps([structural_metrics_step(merged, outdir, args.profile)], outdir, force=args.force)
+        if "failed" in status.values():
             sys.exit(1)
         print(f"\nMetrics written to: {outdir}")
         sys.exit(0)
@@ -106,16 +95,8 @@ def main():
 
     reports_dir = PROJECT_ROOT / "reports" / run_dir.name
     derived_dir = run_dir / "derived"
-    derived_dir.mkdir(parents=True, exist_ok=True)
 
-    # 1) Build run snapshot
-    if not run_cmd(
-        [py, "scripts/build_run_snapshot.py", "--run_dir", str(run_dir)],
-        "build_run_snapshot",
-    ):
-        print("[WARN] build_run_snapshot failed, continuing...")
-
-    # 2) Paper tables (if paper_outputs desired; check purpose in manifest)
+    # Paper tables only for paper/dev purpose (smoke/sanity are blocked unless --force_paper_tables)
     try:
         with open(run_dir / "manifest.json", "r", encoding="utf-8") as f:
             manifest = json.load(f)
@@ -123,49 +104,23 @@ def main():
     except Exception:
         purpose = "dev"
 
-    if purpose in ("paper", "dev"):
-        cmd_pt = [py, "scripts/build_paper_tables.py", "--run_dir", str(run_dir)]
-        if args.force_paper_tables:
-            cmd_pt.append("--force")
-        rc = subprocess.run(cmd_pt, cwd=PROJECT_ROOT).returncode
-        if rc == 0:
-            print("[OK]   build_paper_tables")
-        elif rc == 2:
-            print("[SKIP] build_paper_tables (purpose smoke/sanity; use --force_paper_tables to override)")
-        else:
-            print("[WARN] build_paper_tables failed")
-
-    # 3) HTML report
-    report_profile = "paper" if purpose == "paper" else args.report_profile
-    if not run_cmd(
-        [
-            py, "scripts/build_html_report.py",
-            "--run_dir", str(run_dir),
-            "--out_dir", str(reports_dir),
-            "--profile", report_profile,
-        ],
-        "build_html_report",
-    ):
-        print("[WARN] build_html_report failed")
-
-    # 4) Optional: structural_error_aggregator on run scorecards
-    if args.with_metrics:
-        scorecards = run_dir / "scorecards.jsonl"
-        metrics_out = derived_dir / "metrics"
-        metrics_out.mkdir(parents=True, exist_ok=True)
-        if scorecards.exists():
-            if not run_cmd(
-                [
-                    py, "scripts/structural_error_aggregator.py",
-                    "--input", str(scorecards),
-                    "--outdir", str(metrics_out),
-                    "--profile", args.metrics_profile,
-                ],
-                "structural_error_aggregator",
-            ):
-                print("[WARN] structural_error_aggregator failed")
-        else:
-            print(f"[SKIP] structural_error_aggregator: {scorecards} not found")
+    # Snapshot + paper tables + HTML report (+ structural metrics, metric report) as one step graph:
+    # independent steps run in parallel, unchanged steps are skipped (derived/steps/*.json stamps).
+    steps = postprocess_steps(
+        run_dir,
+        reports_dir,
+        report_profile="paper" if purpose == "paper" else args.report_profile,
+        paper_tables=purpose in ("paper", "dev"),
+        force_paper_tables=args.force_paper_tables,
+        metrics_profile=args.metrics_profile if args.with_metrics else None,
+        metric_report=False,
+    )
+    status = run_steps(steps, derived_dir, max_workers=args.workers, force=args.force)
+    if status.get("build_paper_tables") == "blocked":
+        print("[SKIP] build_paper_tables (purpose smoke/sanity; use --force_paper_tables to override)")
+    for name, state in status.items():
+        if state == "failed":
+            print(f"[WARN] {name} failed")
 
     print(f"\nRun dir:   {run_dir}")
     print(f"Reports:   {reports_dir}")
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Export run artifacts (scorecards.jsonl, outputs.jsonl) as columnar Parquet tables.
+
+Writes <run_dir>/derived/tables/{examples,triplets,trace_calls,errors}.parquet (metrics/run_tables.py).
+build_paper_tables reads this cache when it is newer than scorecards.jsonl. Requires pyarrow.
+
+Usage:
+  python scripts/export_run_tables.py --run_dirs results/experiment_mini__seed42_proposed results/experiment_mini__seed123_proposed
+  python scripts/export_run_tables.py --run_dirs results/test_small_proposed --tables examples triplets
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.run_tables import TABLES, export_run_tables  # noqa: E402
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Export run artifacts as Parquet tables under <run_dir>/derived/tables/.")
+    p.add_argument("--run_dirs", nargs="+", required=True, help="Run directories containing scorecards.jsonl (and outputs.jsonl).")
+    p.add_argument("--tables", nargs="+", choices=TABLES, default=list(TABLES), help="Tables to export (default: all).")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    for run_dir in args.run_dirs:
+        run_dir = Path(run_dir)
+        if not (run_dir / "scorecards.jsonl").exists():
+            print(f"[export_run_tables] Warning: scorecards.jsonl not found in {run_dir}; skipping.", file=sys.stderr)
+            continue
+        try:
+            paths = export_run_tables(run_dir, args.tables)
+        except RuntimeError as e:
+            raise SystemExit(f"[export_run_tables] {e}")
+        for name, path in paths.items():
+            print(f"[OK] {name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
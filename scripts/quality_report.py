@@ -18,7 +18,7 @@ Outputs (default outdir=experiments/reports/proposed):
 7) fig_bucket_quality.png, fig_ablation_delta.png (best-effort; skipped if matplotlib unavailable)
 
 Notes:
-- Streaming JSONL reader to stay memory-safe.
+- Scorecards are read in one streaming pass (metrics.streaming); only counters and per-metric values are kept.
 - Deterministic sampling with seed=42.
 - Buckets: "proposed" for smoke/scorecards, "a"/"b"/"c" for conflict sets.
 - Ablation modes expected (if available): proposed, abl_no_stage2, abl_no_moderator, abl_no_validator.
@@ -32,10 +32,16 @@ import json
 import random
 import shutil
 import statistics
+import sys
 from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.streaming import MetricAccumulator, ScorecardView, stream_metrics  # noqa: E402
+
 SEED = 42
 random.seed(SEED)
 CONTRAST_TOKENS = ["지만", "는데", "그러나", "하지만", "반면", "반면에"]
@@ -112,35 +118,38 @@ def get_polarities_for_card(card: Dict[str, Any]) -> List[str]:
     return pols
 
 
-def collect_metrics_from_scorecards(cards_path: Path, bucket_name: str) -> Dict[str, Any]:
-    bucket_records: List[Dict[str, Any]] = []
-    drop_counts = Counter()
-    issue_counts = Counter()
-    fail_counts = Counter()
-    quality_pass_flags: List[bool] = []
-    targeted_n = 0
-    targetless_n = 0
-    pass_targeted = 0
-    pass_targetless = 0
-    metric_store = defaultdict(list)
-    contrast_total = 0
-    contrast_with_two_aspects = 0
-    contrast_with_polarity_split = 0
-
-    for card in read_jsonl_stream(cards_path):
-        bucket_records.append(card)
+class QualityAccumulator(MetricAccumulator):
+    """Quality/contrast/debate-mapping stats for one bucket; keeps counters and per-metric values, not rows."""
+
+    def __init__(self, bucket_name: str):
+        super().__init__()
+        self.bucket_name = bucket_name
+        self.n = 0
+        self.drop_counts: Counter = Counter()
+        self.issue_counts: Counter = Counter()
+        self.fail_counts: Counter = Counter()
+        self.pass_count = 0
+        self.targeted_n = self.targetless_n = 0
+        self.pass_targeted = self.pass_targetless = 0
+        self.metric_store: Dict[str, List[float]] = defaultdict(list)
+        self.contrast_total = self.contrast_with_two_aspects = self.contrast_with_polarity_split = 0
+
+    def add(self, view: ScorecardView) -> None:
+        card = view.record
+        metric_store = self.metric_store
+        self.n += 1
         meta = card.get("meta", {})
         inputs = card.get("inputs", {})
         text = meta.get("input_text", "")
         has_contrast = any(tok in text for tok in CONTRAST_TOKENS)
         if has_contrast:
-            contrast_total += 1
+            self.contrast_total += 1
             aspects = get_aspects_for_card(card)
             if len(aspects) >= 2:
-                contrast_with_two_aspects += 1
+                self.contrast_with_two_aspects += 1
                 pols = set(get_polarities_for_card(card))
                 if len(pols.intersection({"positive", "negative"})) == 2:
-                    contrast_with_polarity_split += 1
+                    self.contrast_with_polarity_split += 1
 
         # Confidence priority:
         # 1) mean of aspect_sentiments confidences if present
@@ -197,61 +206,69 @@ def collect_metrics_from_scorecards(cards_path: Path, bucket_name: str) -> Dict[
         metric_store["targetless_expected"].append(1.0 if policy.get("targetless_expected") else 0.0)
 
         passed = bool(summary.get("quality_pass", False))
-        quality_pass_flags.append(passed)
+        self.pass_count += passed
         if policy.get("targetless_expected"):
-            targetless_n += 1
+            self.targetless_n += 1
             if passed:
-                pass_targetless += 1
+                self.pass_targetless += 1
         else:
-            targeted_n += 1
+            self.targeted_n += 1
             if passed:
-                pass_targeted += 1
+                self.pass_targeted += 1
 
         for fa in inputs.get("filtered_aspects", []):
             dr = fa.get("drop_reason")
             if dr:
-                drop_counts[dr] += 1
+                self.drop_counts[dr] += 1
 
         for j in atsa.get("sentiment_judgements", []):
             for issue in j.get("issues", []):
-                issue_counts[issue] += 1
+                self.issue_counts[issue] += 1
 
         for fr in summary.get("fail_reasons", []):
-            fail_counts[fr] += 1
-
-    stats = {
-        "bucket": bucket_name,
-        "n": len(bucket_records),
-        "mean_confidence": agg_mean_std(metric_store["confidence"]),
-        "valid_target_rate": agg_mean_std(metric_store["valid_target_rate"]),
-        "opinion_grounded_rate": agg_mean_std(metric_store["opinion_grounded_rate"]),
-        "evidence_relevance_score": agg_mean_std(metric_store["evidence_relevance_score"]),
-        "targetless_ratio": sum(metric_store["targetless_expected"]) / len(metric_store["targetless_expected"])
-        if metric_store["targetless_expected"]
-        else 0.0,
-        "pass_rate": sum(quality_pass_flags) / len(quality_pass_flags) if quality_pass_flags else 0.0,
-        "n_targeted": targeted_n,
-        "n_targetless": targetless_n,
-        "pass_targeted_rate": (pass_targeted / targeted_n) if targeted_n else 0.0,
-        "pass_targetless_rate": (pass_targetless / targetless_n) if targetless_n else 0.0,
-        "drop_top": drop_counts.most_common(10),
-        "issue_top": issue_counts.most_common(10),
-        "fail_top": fail_counts.most_common(10),
-        "records": bucket_records,
-        # Contrast metrics
-        "contrast_sentence_rate": (contrast_total / len(bucket_records)) if bucket_records else 0.0,
-        "contrast_aspect_coverage_rate": (contrast_with_two_aspects / contrast_total) if contrast_total else 0.0,
-        "contrast_polarity_split_rate": (contrast_with_polarity_split / contrast_with_two_aspects) if contrast_with_two_aspects else 0.0,
-        "debate_mapping_coverage": agg_mean_std(metric_store["debate_mapping_coverage"]),
-        "debate_mapping_direct_rate": agg_mean_std(metric_store["debate_mapping_direct_rate"]),
-        "debate_mapping_fallback_rate": agg_mean_std(metric_store["debate_mapping_fallback_rate"]),
-        "debate_mapping_none_rate": agg_mean_std(metric_store["debate_mapping_none_rate"]),
-        "debate_fail_no_aspects_rate": agg_mean_std(metric_store["debate_fail_no_aspects_rate"]),
-        "debate_fail_no_match_rate": agg_mean_std(metric_store["debate_fail_no_match_rate"]),
-        "debate_fail_neutral_stance_rate": agg_mean_std(metric_store["debate_fail_neutral_stance_rate"]),
-        "debate_fail_fallback_used_rate": agg_mean_std(metric_store["debate_fail_fallback_used_rate"]),
-    }
-    return stats
+            self.fail_counts[fr] += 1
+
+    def result(self) -> Dict[str, Any]:
+        metric_store, n = self.metric_store, self.n
+        return {
+            "bucket": self.bucket_name,
+            "n": n,
+            "mean_confidence": agg_mean_std(metric_store["confidence"]),
+            "valid_target_rate": agg_mean_std(metric_store["valid_target_rate"]),
+            "opinion_grounded_rate": agg_mean_std(metric_store["opinion_grounded_rate"]),
+            "evidence_relevance_score": agg_mean_std(metric_store["evidence_relevance_score"]),
+            "targetless_ratio": sum(metric_store["targetless_expected"]) / len(metric_store["targetless_expected"])
+            if metric_store["targetless_expected"]
+            else 0.0,
+            "pass_rate": self.pass_count / n if n else 0.0,
+            "n_targeted": self.targeted_n,
+            "n_targetless": self.targetless_n,
+            "pass_targeted_rate": (self.pass_targeted / self.targeted_n) if self.targeted_n else 0.0,
+            "pass_targetless_rate": (self.pass_targetless / self.targetless_n) if self.targetless_n else 0.0,
+            "drop_top": self.drop_counts.most_common(10),
+            "issue_top": self.issue_counts.most_common(10),
+            "fail_top": self.fail_counts.most_common(10),
+            # Contrast metrics
+            "contrast_sentence_rate": (self.contrast_total / n) if n else 0.0,
+            "contrast_aspect_coverage_rate": (self.contrast_with_two_aspects / self.contrast_total) if self.contrast_total else 0.0,
+            "contrast_polarity_split_rate": (self.contrast_with_polarity_split / self.contrast_with_two_aspects)
+            if self.contrast_with_two_aspects
+            else 0.0,
+            "debate_mapping_coverage": agg_mean_std(metric_store["debate_mapping_coverage"]),
+            "debate_mapping_direct_rate": agg_mean_std(metric_store["debate_mapping_direct_rate"]),
+            "debate_mapping_fallback_rate": agg_mean_std(metric_store["debate_mapping_fallback_rate"]),
+            "debate_mapping_none_rate": agg_mean_std(metric_store["debate_mapping_none_rate"]),
+            "debate_fail_no_aspects_rate": agg_mean_std(metric_store["debate_fail_no_aspects_rate"]),
+            "debate_fail_no_match_rate": agg_mean_std(metric_store["debate_fail_no_match_rate"]),
+            "debate_fail_neutral_stance_rate": agg_mean_std(metric_store["debate_fail_neutral_stance_rate"]),
+            "debate_fail_fallback_used_rate": agg_mean_std(metric_store["debate_fail_fallback_used_rate"]),
+        }
+
+
+def collect_metrics_from_scorecards(cards_path: Path, bucket_name: str) -> Dict[str, Any]:
+    """One streaming pass (metrics.streaming) over a bucket's scorecards; rows are not kept."""
+    _, results = stream_metrics(cards_path, {"quality": QualityAccumulator(bucket_name)})
+    return results["quality"]
 
 
 def write_overall_table(stats: Dict[str, Any], out_path: Path, backup: bool):
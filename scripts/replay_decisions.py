@@ -0,0 +1,119 @@
+"""
+Replay Moderator / debate-override / Stage2-patch decisions of a saved run without calling the LLM.
+
+Stage1, debate and Stage2 outputs are rebuilt from outputs.jsonl process_trace; only the deterministic
+post-LLM logic runs again (see evaluation/replay.py). Only proposed-mode runs have these traces.
+
+Usage:
+  # Replay with the run's own settings (sanity: every case should match the saved result)
+  python scripts/replay_decisions.py --run results/my_run_proposed
+  # Replay with other debate-override thresholds
+  python scripts/replay_decisions.py --run results/my_run_proposed --override '{"min_total": 1.2}'
+  # Threshold sweep against gold triplets (scorecards inputs.gold_triplets, or --gold)
+  python scripts/replay_decisions.py --run results/my_run_proposed \
+      --sweep min_total=0.8:2.4:0.2 --sweep min_margin=0.4,0.8,1.2 --sweep min_target_conf=0.6,0.7,0.8
+
+Outputs (default <run>/derived/replay/):
+  replay.jsonl          one row per case (replay mode)
+  override_sweep.csv    one row per grid point (sweep mode)
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from evaluation.replay import (  # noqa: E402
+    OVERRIDE_KEYS,
+    load_gold,
+    load_replay_cases,
+    make_replayer,
+    override_grid,
+    replay,
+    run_pipeline_config,
+    sweep_override_thresholds,
+)
+
+
+def parse_axis(spec: str) -> tuple[str, List[float]]:
+    """'min_total=0.8:2.4:0.2' (inclusive range) or 'min_margin=0.4,0.8' -> (key, values)."""
+    key, _, values = spec.partition("=")
+    key = key.strip()
+    if key not in OVERRIDE_KEYS:
+        raise argparse.ArgumentTypeError(f"unknown threshold '{key}' (expected one of {', '.join(OVERRIDE_KEYS)})")
+    if ":" in values:
+        start, stop, step = (float(v) for v in values.split(":"))
+        return key, [round(float(v), 6) for v in np.arange(start, stop + step / 2, step)]
+    return key, [float(v) for v in values.split(",") if v.strip()]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--run", required=True, help="Run directory (or outputs.jsonl) of a proposed-mode run.")
+    ap.add_argument("--gold", default=None, help="Gold JSONL (uid/text_id + gold_triplets); default: run scorecards.")
+    ap.add_argument("--override", default=None, help="JSON debate_override thresholds to replay with.")
+    ap.add_argument("--sweep", action="append", type=parse_axis, default=[], help="Threshold axis, e.g. min_total=0.8:2.4:0.2.")
+    ap.add_argument("--outdir", default=None, help="Output directory (default: <run>/derived/replay).")
+    args = ap.parse_args()
+
+    run = Path(args.run)
+    run_dir = run if run.is_dir() else run.parent
+    outdir = Path(args.outdir) if args.outdir else run_dir / "derived" / "replay"
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    cases = load_replay_cases(run, gold=load_gold(args.gold) if args.gold else None)
+    if not cases:
+        raise SystemExit(f"[replay] no proposed-mode process_trace rows in {run}")
+    pipeline_cfg = run_pipeline_config(run)
+    override_cfg = json.loads(args.override) if args.override else None
+    n_gold = sum(1 for c in cases if c.gold is not None)
+    print(f"[replay] loaded {len(cases)} cases ({n_gold} with gold) from {run}")
+
+    if not args.sweep:
+        agent = make_replayer(pipeline_cfg, override_cfg=override_cfg)
+        rows = replay(cases, agent)
+        out_path = outdir / "replay.jsonl"
+        with out_path.open("w", encoding="utf-8", newline="\n") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        matched = sum(1 for r in rows if r["matches_saved"])
+        print(f"[replay] {matched}/{len(rows)} cases match the saved result | thresholds={agent.debate_override_cfg}")
+        if n_gold:
+            f1 = [r["ap_f1"] for r in rows if "ap_f1" in r]
+            print(f"[replay] aspect-polarity F1 (mean over {n_gold}) = {sum(f1) / len(f1):.4f}")
+        print(f"[replay] wrote {out_path} in {time.perf_counter() - started:.2f}s")
+        return
+
+    axes: Dict[str, List[float]] = dict(args.sweep)
+    base = {**make_replayer(pipeline_cfg).debate_override_cfg, **(override_cfg or {})}
+    grid = override_grid(axes, base)
+    rows = sweep_override_thresholds(cases, grid, pipeline_cfg=pipeline_cfg)
+    out_path = outdir / "override_sweep.csv"
+    with out_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"[sweep] {len(grid)} grid points x {len(cases)} cases in {time.perf_counter() - started:.2f}s -> {out_path}")
+    if n_gold:
+        best = sorted(rows, key=lambda r: (-(r["ap_f1"] or 0.0), r["override_applied"]))[:5]
+        for r in best:
+            print(
+                f"  ap_f1={r['ap_f1']:.4f} min_total={r['min_total']} min_margin={r['min_margin']} "
+                f"min_target_conf={r['min_target_conf']} overrides={r['override_applied']} label_changed={r['label_changed']}"
+            )
+    else:
+        print("[sweep] no gold triplets: ap_f1 is empty; compare label_changed / override_applied")
+
+
+if __name__ == "__main__":
+    main()
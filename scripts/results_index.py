@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Cross-run results index (SQLite, metrics/results_index.py).
+
+Usage:
+  python scripts/results_index.py ingest results/                      # incremental; unchanged runs are skipped
+  python scripts/results_index.py diff experiment_mini__seed42_proposed experiment_mini__seed123_proposed --split valid
+  python scripts/results_index.py errors                                # error taxonomy across all indexed runs
+  python scripts/results_index.py history --by prompt_hash --metrics pass_rate polarity_conflict_rate
+  python scripts/results_index.py sql "SELECT mode, COUNT(*) FROM runs GROUP BY mode"
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from metrics.results_index import (  # noqa: E402
+    DEFAULT_INDEX_PATH,
+    connect,
+    error_taxonomy,
+    ingest_runs,
+    metric_history,
+    prediction_diff,
+    query,
+)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Build and query the cross-run results index.")
+    p.add_argument("--index", type=str, default=str(DEFAULT_INDEX_PATH), help="SQLite index path (default: results/results_index.sqlite)")
+    p.add_argument("--out", type=str, default=None, help="Write query result as CSV instead of printing")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Ingest run directories (or parents of run directories)")
+    ingest.add_argument("paths", nargs="*", default=[str(PROJECT_ROOT / "results")])
+    ingest.add_argument("--prune", action="store_true", help="Drop indexed runs whose directory no longer exists")
+
+    diff = sub.add_parser("diff", help="Per-uid final prediction differences between two runs")
+    diff.add_argument("run_a")
+    diff.add_argument("run_b")
+    diff.add_argument("--split", type=str, default=None)
+
+    errors = sub.add_parser("errors", help="Error taxonomy across runs")
+    errors.add_argument("runs", nargs="*")
+
+    history = sub.add_parser("history", help="Metric history grouped by config / prompt hash")
+    history.add_argument("--by", choices=("cfg_hash", "prompt_hash", "mode", "backbone_model"), default="cfg_hash")
+    history.add_argument("--metrics", nargs="*", default=[], help="structural_metrics.csv columns to include")
+
+    sql = sub.add_parser("sql", help="Run an arbitrary read query")
+    sql.add_argument("query")
+    return p.parse_args()
+
+
+def _emit(frame: pd.DataFrame, out: str | None) -> None:
+    if out:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        frame.to_csv(out, index=False)
+        print(f"[OK] Wrote {out} ({len(frame)} rows)")
+        return
+    with pd.option_context("display.max_rows", 200, "display.max_columns", 20, "display.width", 200):
+        print(frame.to_string(index=False) if len(frame) else "(no rows)")
+
+
+def main():
+    args = parse_args()
+    conn = connect(Path(args.index))
+    try:
+        if args.command == "ingest":
+            status = ingest_runs(conn, [Path(p) for p in args.paths], prune=args.prune)
+            for run_dir, state in status.items():
+                print(f"[{state}] {run_dir}")
+            counts = {s: list(status.values()).count(s) for s in sorted(set(status.values()))}
+            print(f"[results_index] {args.index}: {counts or 'no runs found'}")
+            return
+        try:
+            if args.command == "diff":
+                frame = prediction_diff(conn, args.run_a, args.run_b, split=args.split)
+            elif args.command == "errors":
+                frame = error_taxonomy(conn, args.runs)
+            elif args.command == "history":
+                frame = metric_history(conn, by=args.by, metrics=args.metrics)
+            else:
+                frame = query(conn, args.query)
+        except KeyError as e:
+            raise SystemExit(f"[results_index] {e.args[0]} (run 'ingest' first)")
+        _emit(frame, args.out)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ Orchestrates existing scripts in sequence:
 - smoke profile: run_experiments -> build_run_snapshot -> build_html_report(ops)
 - paper profile: run_experiments -> build_run_snapshot -> build_paper_tables -> build_html_report(paper)
 
+Steps after run_experiments (snapshot, paper tables, HTML/metric reports) run through scripts/step_graph.py:
+in-process, independent steps in parallel, and skipped when their inputs and code are unchanged.
+
 Usage:
     python scripts/run_pipeline.py --config experiments/configs/smoke_xlang.yaml --run-id my_run --mode proposed --profile smoke
     python scripts/run_pipeline.py --config experiments/configs/paper.yaml --run-id paper_run --mode proposed --profile paper
@@ -24,6 +27,9 @@ import yaml
 
 # Project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from scripts.step_graph import postprocess_steps, run_steps  # noqa: E402
 
 
 def parse_args():
@@ -72,7 +78,7 @@ Examples:
     parser.add_argument(
         "--with_payload",
         action="store_true",
-        help="Run make_pretest_payload.py after snapshot (bundle smoke+scorecards+inputs)",
+        help="Run make_pretest_payload.py after experiments (bundle smoke+scorecards+inputs)",
     )
     parser.add_argument(
         "--force_paper_tables",
@@ -90,6 +96,23 @@ Examples:
         choices=["smoke", "regression", "paper_main"],
         help="Profile for structural_error_aggregator (default: paper_main)",
     )
+    parser.add_argument(
+        "--force_steps",
+        action="store_true",
+        help="Rerun every derived-output step even when its stamp (derived/steps/*.json) says it is up to date",
+    )
+    parser.add_argument(
+        "--step_workers",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Max derived-output steps run in parallel (default: 4)",
+    )
+    parser.add_argument(
+        "--subprocess_steps",
+        action="store_true",
+        help="Run derived-output steps as subprocesses instead of in-process (also implied by --timeout)",
+    )
     parser.add_argument(
         "--seed",
         type=int,
@@ -126,6 +149,12 @@ Examples:
         action="store_true",
         help="After all seeds complete, run aggregate_seed_metrics.py (머징·평균±표준편차·통합 보고서). Seed 반복 시에만 유효.",
     )
+    parser.add_argument(
+        "--sequential_baseline",
+        default=None,
+        metavar="RUN_DIR",
+        help="Sequential early stopping vs this baseline run (passed to run_experiments --sequential-baseline; see config block sequential).",
+    )
 
     return parser.parse_args()
 
@@ -337,6 +366,8 @@ def run_single_pipeline(config_path: Path, run_id: str, mode: str, profile: str,
         "--run-id", run_id,
         "--mode", mode,
     ]
+    if getattr(args, "sequential_baseline", None):
+        cmd += ["--sequential-baseline", args.sequential_baseline]
 
     if not run_command(cmd, "run_experiments", derived_dir, timeout_s=timeout_s):
         steps_failed.append("run_experiments")
@@ -403,21 +434,6 @@ def run_single_pipeline(config_path: Path, run_id: str, mode: str, profile: str,
         else:
             print(f"[SKIP] filter_scorecards: scorecards.jsonl not found at {scorecards_path}")
 
-    # =========================================================================
-    # STEP 4: Build run snapshot
-    # =========================================================================
-    cmd = [
-        sys.executable,
-        "scripts/build_run_snapshot.py",
-        "--run_dir", str(run_dir),
-    ]
-
-    if not run_command(cmd, "build_run_snapshot", derived_dir, timeout_s=timeout_s):
-        steps_failed.append("build_run_snapshot")
-        print("[WARN] build_run_snapshot failed, continuing...")
-    else:
-        steps_run.append("build_run_snapshot")
-
     # =========================================================================
     # STEP 5 (optional): Make pretest payload
     # =========================================================================
@@ -461,92 +477,36 @@ def run_single_pipeline(config_path: Path, run_id: str, mode: str, profile: str,
             print("[SKIP] make_pretest_payload: required files not found")
 
     # =========================================================================
-    # STEP 6 (paper profile only): Build paper tables
+    # STEP 6-9: Derived outputs (step graph: snapshot, paper tables, HTML report, metrics)
+    # In-process, parallel where independent; steps whose inputs/code are unchanged are skipped.
     # =========================================================================
-    if profile == "paper":
-        cmd = [
-            sys.executable,
-            "scripts/build_paper_tables.py",
-            "--run_dir", str(run_dir),
-        ]
-
-        if args.force_paper_tables:
-            cmd.append("--force")
-
-        rc = run_command_rc(cmd, "build_paper_tables", derived_dir, timeout_s=timeout_s)
-        if rc == 0:
-            steps_run.append("build_paper_tables")
-        elif rc == 2:
-            # Intentional block (smoke/sanity policy). Continue pipeline.
-            steps_blocked.append("build_paper_tables (policy: purpose=smoke/sanity)")
-            print("[SKIP] build_paper_tables: blocked for smoke/sanity purpose (exit code 2)")
+    steps = postprocess_steps(
+        run_dir,
+        reports_dir,
+        report_profile="paper" if profile == "paper" else "ops",
+        paper_tables=profile == "paper",
+        force_paper_tables=args.force_paper_tables,
+        metrics_profile=args.metrics_profile if args.with_metrics else None,
+    )
+    step_status = run_steps(
+        steps,
+        derived_dir,
+        max_workers=args.step_workers,
+        force=args.force_steps,
+        in_process=not (args.subprocess_steps or timeout_s),
+        timeout_s=timeout_s,
+    )
+    for name, state in step_status.items():
+        if state == "ok":
+            steps_run.append(name)
+        elif state == "up_to_date":
+            steps_run.append(f"{name} (up to date)")
+        elif state == "blocked":
+            # Intentional block (smoke/sanity policy, exit code 2). Continue pipeline.
+            steps_blocked.append(f"{name} (policy: purpose=smoke/sanity)")
             print("       Use --force_paper_tables to override")
-        else:
-            steps_failed.append("build_paper_tables")
-            print("[WARN] build_paper_tables failed (exit code != 0/2)")
-
-    # =========================================================================
-    # STEP 7: Build HTML report
-    # =========================================================================
-    html_profile = "paper" if profile == "paper" else "ops"
-
-    cmd = [
-        sys.executable,
-        "scripts/build_html_report.py",
-        "--run_dir", str(run_dir),
-        "--out_dir", str(reports_dir),
-        "--profile", html_profile,
-    ]
-
-    if not run_command(cmd, "build_html_report", derived_dir, timeout_s=timeout_s):
-        steps_failed.append("build_html_report")
-        print("[WARN] build_html_report failed")
-    else:
-        steps_run.append("build_html_report")
-
-    # =========================================================================
-    # STEP 8 (optional): Structural + HF metrics
-    # =========================================================================
-    if args.with_metrics:
-        scorecards_path = run_dir / "scorecards.jsonl"
-        metrics_outdir = derived_dir / "metrics"
-        metrics_outdir.mkdir(parents=True, exist_ok=True)
-
-        if scorecards_path.exists():
-            cmd = [
-                sys.executable,
-                "scripts/structural_error_aggregator.py",
-                "--input", str(scorecards_path),
-                "--outdir", str(metrics_outdir),
-                "--profile", args.metrics_profile,
-            ]
-            if not run_command(cmd, "structural_error_aggregator", derived_dir, timeout_s=timeout_s):
-                steps_failed.append("structural_error_aggregator")
-                print("[WARN] structural_error_aggregator failed, continuing...")
-            else:
-                steps_run.append("structural_error_aggregator")
-                for f in ["structural_metrics.csv", "structural_metrics_table.md"]:
-                    if (metrics_outdir / f).exists():
-                        print(f"       Generated: derived/metrics/{f}")
-        else:
-            print(f"[SKIP] structural_error_aggregator: scorecards.jsonl not found at {scorecards_path}")
-
-        # STEP 9 (with_metrics): Metric report HTML
-        if run_dir.exists() and (run_dir / "scorecards.jsonl").exists():
-            cmd = [
-                sys.executable,
-                "scripts/build_metric_report.py",
-                "--run_dir", str(run_dir),
-                "--out_dir", str(reports_dir),
-                "--metrics_profile", args.metrics_profile,
-            ]
-            if not run_command(cmd, "build_metric_report", derived_dir, timeout_s=timeout_s):
-                steps_failed.append("build_metric_report")
-                print("[WARN] build_metric_report failed, continuing...")
-            else:
-                steps_run.append("build_metric_report")
-                if (reports_dir / "metric_report.html").exists():
-                    print("       Generated: reports/.../metric_report.html")
+        elif state == "failed":
+            steps_failed.append(name)
 
     # =========================================================================
     # DONE: Summary
@@ -651,6 +611,40 @@ def _run_aggregate(base_run_id: str, seeds: list, mode: str, args) -> int:
     return 0 if rc == 0 else 1
 
 
+def _warm_dataset_snapshots(config: dict) -> None:
+    """
+    Build the dataset snapshot cache once before fanning out seed runs (data.snapshot_cache: true),
+    so seed workers all open the same memory-mapped snapshot instead of each parsing the splits.
+    Relative paths are anchored at PROJECT_ROOT, matching the cwd of the run_experiments subprocess.
+    """
+    data_cfg = dict(config.get("data") or {})
+    if not data_cfg.get("snapshot_cache"):
+        return
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from data.datasets.cache import DEFAULT_CACHE_ROOT, warm_split_snapshots
+    from data.datasets.loader import resolve_dataset_paths
+
+    def _anchor(value):
+        return str(PROJECT_ROOT / value) if isinstance(value, str) and not Path(value).is_absolute() else value
+
+    data_cfg["snapshot_cache_root"] = _anchor(data_cfg.get("snapshot_cache_root") or DEFAULT_CACHE_ROOT)
+    data_cfg["allowed_roots"] = [_anchor(r) for r in (data_cfg.get("allowed_roots") or ["experiments/data"])]
+    if data_cfg.get("dataset_root"):
+        data_cfg["dataset_root"] = _anchor(data_cfg["dataset_root"])
+    else:
+        for k, v in list(data_cfg.items()):
+            if isinstance(v, str) and any(token in k for token in ["file", "path", "dir"]):
+                data_cfg[k] = _anchor(v)
+    try:
+        resolved_cfg, _, _ = resolve_dataset_paths(data_cfg)
+        keys = warm_split_snapshots(resolved_cfg)
+        print("[SNAPSHOT] dataset cache ready: " + ", ".join(f"{s}={(k or '-')[:12]}" for s, k in keys.items()))
+    except Exception as e:
+        # Seed runs still work (each builds/opens the cache itself); only the up-front warm-up is skipped.
+        print(f"[WARN] dataset snapshot warm-up failed: {e}")
+
+
 def main():
     args = parse_args()
 
@@ -699,6 +693,7 @@ def main():
 
         temp_dir = PROJECT_ROOT / "results" / ".run_pipeline_temp"
         temp_dir.mkdir(parents=True, exist_ok=True)
+        _warm_dataset_snapshots(config)
 
         def _run_one(seed: int) -> tuple[int, int]:
             run_id_cur = f"{base_run_id}__seed{seed}"
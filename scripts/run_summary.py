@@ -5,7 +5,7 @@
 - manifest.json + outputs.jsonl + scorecards.jsonl 기반으로
   purpose, loaded_counts, processing_splits/count, outputs(total_lines, unique_uid, errors), artifacts 출력.
 - --fail_fast 시: processing_splits == ['valid'], processing_count == valid_count, unique_uid == processing_count
-  불일치면 즉시 exit 1 (덮어쓰기·중복·실패 누락 방지).
+  불일치면 즉시 exit 1 (덮어쓰기·중복·실패 누락 방지). sequential 조기 종료 런은 manifest.sequential.processed와 비교.
 
 Usage:
   python scripts/run_summary.py --run_dir results/experiment_mini2__seed42_proposed
@@ -142,6 +142,7 @@ def collect_run_summary(run_dir: Path) -> Dict[str, Any]:
         "errors": errors,
         "valid_unique_uid": valid_unique_uid,
         "artifacts": artifacts,
+        "sequential": (manifest or {}).get("sequential"),
     }
 
 
@@ -170,6 +171,9 @@ def print_run_summary(summary: Dict[str, Any]) -> None:
     if summary.get("valid_unique_uid") is not None:
         print(f"scorecards split=valid unique_uid={summary['valid_unique_uid']}")
     print(f"artifacts: {' '.join(artifacts)}")
+    seq = summary.get("sequential")
+    if seq:
+        print(f"sequential: decision={seq.get('decision')} processed={seq.get('processed')}/{seq.get('planned')} metric={seq.get('metric')}")
 
 
 def fail_fast_checks(summary: Dict[str, Any], run_dir: Path) -> List[str]:
@@ -180,15 +184,18 @@ def fail_fast_checks(summary: Dict[str, Any], run_dir: Path) -> List[str]:
     valid_count = (summary.get("loaded_counts") or {}).get("valid")
     unique_uid = summary.get("unique_uid", 0)
     valid_unique = summary.get("valid_unique_uid")
+    seq = summary.get("sequential") or {}
+    # sequential runs that stopped early process only a prefix of the examples
+    expected = seq.get("processed") if seq.get("stopped_early") else proc_count
 
     if splits is not None and splits != ["valid"]:
         failures.append(f"processing_splits == ['valid'] required; got {splits}")
     if proc_count is not None and valid_count is not None and proc_count != valid_count:
         failures.append(f"processing_count ({proc_count}) != manifest.split_counts.valid ({valid_count})")
-    if proc_count is not None and unique_uid != proc_count:
-        failures.append(f"outputs unique_uid ({unique_uid}) != processing_count ({proc_count})")
-    if valid_unique is not None and proc_count is not None and valid_unique != proc_count:
-        failures.append(f"scorecards split=valid unique_uid ({valid_unique}) != processing_count ({proc_count})")
+    if expected is not None and unique_uid != expected:
+        failures.append(f"outputs unique_uid ({unique_uid}) != processing_count ({expected})")
+    if valid_unique is not None and expected is not None and valid_unique != expected:
+        failures.append(f"scorecards split=valid unique_uid ({valid_unique}) != processing_count ({expected})")
 
     return failures
 
@@ -3,14 +3,24 @@ Derive per-sample scorecards from smoke_outputs.jsonl.
 Outputs: scorecards.jsonl written alongside the smoke file.
 Adds ATE debug info (raw candidates + filtered decisions) for easier diagnosis.
 Extended: run_id, profile, ate, atsa, validator, moderator, stage_delta, latency, flags.
+The full output row is not embedded: runtime.output_ref points at it (byte offset into the smoke/outputs
+file, sidecar <file>.index.jsonl); read it with tools.output_index.OutputStore when needed.
 """
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from metrics.scorecard import stage1_atsa_sentiments  # noqa: E402
+from tools.output_index import index_path_for, iter_jsonl_with_offsets  # noqa: E402
+from tools.trace_format import trace_call_metadata  # noqa: E402
+
 # Risk ID enum for validator normalization (canonical for S1/S2 comparison)
 VALIDATOR_RISK_IDS = (
     "NEGATION_SCOPE", "CONTRAST_SCOPE", "POLARITY_MISMATCH", "EVIDENCE_GAP", "SPAN_MISMATCH", "OTHER",
@@ -26,16 +36,11 @@ def load_jsonl(path: Path) -> List[Dict[str, Any]]:
     return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
 
 def _extract_call_meta(process_trace: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """First entry's call metadata (structured call_metadata or JSON notes; full and compact traces)."""
     for tr in process_trace or []:
-        notes = tr.get("notes")
-        if not notes:
-            continue
-        try:
-            meta = json.loads(notes)
-            if isinstance(meta, dict):
-                return meta
-        except Exception:
-            continue
+        meta = trace_call_metadata(tr)
+        if meta:
+            return meta
     return {}
 
 
@@ -265,7 +270,14 @@ def build_sentence_sentiment(text: str, entry: Dict[str, Any]):
         "reason": "fallback to final_result",
     }
 
-def make_scorecard(entry: Dict[str, Any], extra_allow: Set[str] | None = None) -> Dict[str, Any]:
+def make_scorecard(
+    entry: Dict[str, Any], extra_allow: Set[str] | None = None, output_ref: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    output_ref: where `entry` was written ({"file", "uid", "offset", "length"}, see tools/output_index.py).
+    When given, the scorecard keeps only that pointer plus derived fields (final_aspects, stage1 ATSA trace
+    sentiments) instead of embedding the whole entry as runtime.parsed_output.
+    """
     text = entry.get("meta", {}).get("input_text", "")
     meta_in = entry.get("meta", {}) or {}
     run_id = meta_in.get("run_id", "")
@@ -280,13 +292,13 @@ def make_scorecard(entry: Dict[str, Any], extra_allow: Set[str] | None = None) -
     generate_failed = bool(error_str and error_str.startswith("generate_failed"))
     parse_failed = bool(error_str and ("json_parse" in error_str or "schema_validation" in error_str))
     raw_output_val = None if (generate_failed or parse_failed) else (call_meta.get("raw_response") or None)
+    parsed_ok = not (generate_failed or parse_failed)
     runtime = {
         "uid": text_id,
         "split": split,
         "runner_name": mode,
         "backbone_model_id": meta_in.get("backbone_model_id"),
         "raw_output": raw_output_val,
-        "parsed_output": None if (generate_failed or parse_failed) else entry,
         "flags": {
             "analysis_flags": entry.get("analysis_flags"),
             "error": error_str,
@@ -305,6 +317,12 @@ def make_scorecard(entry: Dict[str, Any], extra_allow: Set[str] | None = None) -
         "demo_k": meta_in.get("demo_k"),
         "demo_seed": meta_in.get("demo_seed"),
     }
+    if output_ref is None:
+        runtime["parsed_output"] = entry if parsed_ok else None
+    else:
+        runtime["output_ref"] = output_ref
+        runtime["final_aspects"] = (entry.get("final_result") or {}).get("final_aspects") if parsed_ok else None
+        runtime["stage1_atsa_sentiments"] = stage1_atsa_sentiments(entry.get("process_trace")) if parsed_ok else None
     debate_ctx = meta_in.get("debate_review_context") or {}
     debate_override_stats = meta_in.get("debate_override_stats") or {}
     mapping_stats = debate_ctx.get("mapping_stats") or {}
@@ -485,12 +503,18 @@ def main():
             except Exception as e:
                 print(f"[warn] failed to load allowlist {allow_path}: {e}")
 
-    data = load_jsonl(smoke_path)
-    with cards_path.open("w", encoding="utf-8", newline="\n") as f:
-        for entry in data:
-            card = make_scorecard(entry, extra_allow=allow_terms)
+    n = 0
+    with cards_path.open("w", encoding="utf-8", newline="\n") as f, index_path_for(smoke_path).open(
+        "w", encoding="utf-8", newline="\n"
+    ) as f_index:
+        for offset, length, entry in iter_jsonl_with_offsets(smoke_path):
+            uid = (entry.get("meta") or {}).get("text_id") or ""
+            ref = {"file": smoke_path.name, "uid": uid, "offset": offset, "length": length}
+            f_index.write(json.dumps({"uid": uid, "offset": offset, "length": length}, ensure_ascii=False) + "\n")
+            card = make_scorecard(entry, extra_allow=allow_terms, output_ref=ref)
             f.write(json.dumps(card, ensure_ascii=False) + "\n")
-    print(f"wrote {cards_path} ({len(data)} records)")
+            n += 1
+    print(f"wrote {cards_path} ({n} records)")
 
 if __name__ == "__main__":
     main()
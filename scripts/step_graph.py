@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Make-like step graph for run post-processing (snapshot, paper tables, HTML/metric reports, aggregators).
+
+Each Step declares the files it reads (inputs) and writes (outputs); its entry point is `main(argv)` of a
+scripts/*.py module, called in-process (one interpreter, imports paid once) or as a subprocess fallback.
+
+- stamp: <work_dir>/steps/<name>.json records sha256 of every input file (files under input directories),
+  of the step's code (the script and the project modules it imports), the argv and the outputs it wrote.
+- skip: a step is up to date when argv, input and output hashes all match its stamp. Files whose size and
+  mtime match the stamp reuse the recorded hash, so an up-to-date check does not read them.
+- order: a step waits for every step that writes one of its inputs (plus `after`); ready steps run in a
+  thread pool. Failed steps do not stop the others (the pipeline has always continued with warnings).
+
+Logs go to <work_dir>/<name>.log as with run_pipeline's subprocess steps.
+
+Usage:
+  python scripts/step_graph.py --run_dir results/my_run_proposed                       # snapshot + HTML (ops)
+  python scripts/step_graph.py --run_dir results/my_run_proposed --profile paper --with_metrics
+  python scripts/step_graph.py --run_dir results/my_run_proposed --dry_run             # show stale steps only
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+STAMP_VERSION = 1
+
+
+@dataclass
+class Step:
+    name: str
+    script: Path  # scripts/<module>.py exposing main(argv)
+    argv: List[str]
+    inputs: List[Path] = field(default_factory=list)  # files or directories; missing paths are hashed as absent
+    outputs: List[Path] = field(default_factory=list)
+    requires: List[Path] = field(default_factory=list)  # must exist, else the step is skipped ("missing")
+    after: List[str] = field(default_factory=list)  # explicit ordering on top of input/output edges
+    blocked_codes: Tuple[int, ...] = ()  # exit codes meaning "intentionally not built" (not a failure)
+
+    def command(self) -> List[str]:
+        return [sys.executable, str(self.script), *self.argv]
+
+
+# ---------- Hashing ----------
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _files(path: Path) -> List[Path]:
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.is_file())
+    return [path] if path.is_file() else []
+
+
+def fingerprint(paths: Iterable[Path], previous: Optional[Dict[str, List[Any]]] = None) -> Dict[str, List[Any]]:
+    """{file: [size, mtime_ns, sha256]} for every file under `paths`; hashes are reused when stat matches `previous`."""
+    previous = previous or {}
+    out: Dict[str, List[Any]] = {}
+    for path in paths:
+        for f in _files(Path(path)):
+            key = str(f.resolve())
+            st = f.stat()
+            old = previous.get(key)
+            if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+                out[key] = old
+            else:
+                out[key] = [st.st_size, st.st_mtime_ns, _sha256(f)]
+    return out
+
+
+def _digests(entries: Dict[str, List[Any]]) -> Dict[str, str]:
+    return {path: entry[2] for path, entry in entries.items()}
+
+
+_CODE_CACHE: Dict[Path, List[Path]] = {}
+
+
+def _module_file(name: str) -> Optional[Path]:
+    base = PROJECT_ROOT.joinpath(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _imported_files(path: Path) -> List[Path]:
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return []
+    package = path.resolve().parent.relative_to(PROJECT_ROOT).parts if path.resolve().is_relative_to(PROJECT_ROOT) else ()
+    names: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = list(package[: len(package) - node.level + 1])
+                base = ".".join(parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            names.append(base)
+            names.extend(f"{base}.{alias.name}" for alias in node.names)
+    found = (_module_file(n) for n in names if n)
+    return [f for f in found if f is not None]
+
+
+def code_files(script: Path) -> List[Path]:
+    """The script plus every project module it imports, transitively (site-packages are not tracked)."""
+    script = Path(script).resolve()
+    if script not in _CODE_CACHE:
+        seen: Set[Path] = set()
+        stack = [script]
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            stack.extend(p.resolve() for p in _imported_files(path))
+        _CODE_CACHE[script] = sorted(seen)
+    return _CODE_CACHE[script]
+
+
+# ---------- Stamps ----------
+
+
+def _stamp_path(step: Step, work_dir: Path) -> Path:
+    return work_dir / "steps" / f"{step.name}.json"
+
+
+def _load_stamp(path: Path) -> Dict[str, Any]:
+    try:
+        stamp = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return stamp if stamp.get("version") == STAMP_VERSION else {}
+
+
+def _input_fingerprint(step: Step, previous: Optional[Dict[str, List[Any]]]) -> Dict[str, List[Any]]:
+    return fingerprint([*step.inputs, *step.requires, *code_files(step.script)], previous)
+
+
+def is_up_to_date(step: Step, work_dir: Path) -> bool:
+    return _matches_stamp(step, _load_stamp(_stamp_path(step, work_dir)))
+
+
+def _matches_stamp(step: Step, stamp: Dict[str, Any]) -> bool:
+    if not stamp or stamp.get("argv") != [str(a) for a in step.argv]:
+        return False
+    if _digests(_input_fingerprint(step, stamp.get("inputs"))) != _digests(stamp.get("inputs", {})):
+        return False
+    return _digests(fingerprint(step.outputs, stamp.get("outputs"))) == _digests(stamp.get("outputs", {}))
+
+
+def _write_stamp(step: Step, work_dir: Path, inputs: Dict[str, List[Any]]) -> None:
+    path = _stamp_path(step, work_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stamp = {
+        "version": STAMP_VERSION,
+        "step": step.name,
+        "argv": [str(a) for a in step.argv],
+        "inputs": inputs,
+        "outputs": fingerprint(step.outputs),
+        "finished": datetime.now().isoformat(),
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(stamp, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ---------- Execution ----------
+
+
+class _ThreadRoutedStream:
+    """sys.stdout/sys.stderr stand-in writing to the calling thread's step log (else the original stream)."""
+
+    def __init__(self, default):
+        self._default = default
+
+    def _target(self):
+        return getattr(_ROUTE_LOCAL, "log", None) or self._default
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._default, name)
+
+
+_ROUTE_LOCK = threading.Lock()
+_ROUTE_LOCAL = threading.local()
+_ROUTE_STATE: Dict[str, Any] = {"users": 0, "saved": None}
+
+
+@contextmanager
+def _routed_output():
+    """Install the routed streams for the duration of a graph run (graphs may run concurrently in threads)."""
+    with _ROUTE_LOCK:
+        if _ROUTE_STATE["users"] == 0:
+            _ROUTE_STATE["saved"] = (sys.stdout, sys.stderr)
+            sys.stdout, sys.stderr = _ThreadRoutedStream(sys.stdout), _ThreadRoutedStream(sys.stderr)
+        _ROUTE_STATE["users"] += 1
+    try:
+        yield
+    finally:
+        with _ROUTE_LOCK:
+            _ROUTE_STATE["users"] -= 1
+            if _ROUTE_STATE["users"] == 0:
+                sys.stdout, sys.stderr = _ROUTE_STATE["saved"]
+
+
+def _call_main(step: Step) -> int:
+    try:
+        module = importlib.import_module(f"scripts.{Path(step.script).stem}")
+        rc = module.main([str(a) for a in step.argv])
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return int(e.code or 0)
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return int(rc or 0)
+
+
+def _execute(step: Step, log_file: Path, in_process: bool, timeout_s: Optional[int] = None) -> int:
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(f"# Step: {step.name}\n")
+        f.write(f"# Command: {' '.join(step.command())}\n")
+        f.write(f"# Started: {datetime.now().isoformat()}\n")
+        f.write("-" * 60 + "\n\n")
+        f.flush()
+        if in_process:
+            _ROUTE_LOCAL.log = f
+            try:
+                rc = _call_main(step)
+            finally:
+                _ROUTE_LOCAL.log = None
+        else:
+            try:
+                rc = subprocess.run(
+                    step.command(), stdout=f, stderr=subprocess.STDOUT, text=True, cwd=PROJECT_ROOT, check=False,
+                    timeout=timeout_s if timeout_s and timeout_s > 0 else None,
+                ).returncode
+            except subprocess.TimeoutExpired:
+                f.write(f"\n# Timeout after {timeout_s}s\n")
+                rc = 1
+        f.write("\n" + "-" * 60 + "\n")
+        f.write(f"# Finished: {datetime.now().isoformat()}\n")
+        f.write(f"# Exit code: {rc}\n")
+    return rc
+
+
+def run_step(step: Step, work_dir: Path, force: bool = False, in_process: bool = True, timeout_s: Optional[int] = None) -> str:
+    """
+    Run one step unless up to date. Returns 'ok', 'up_to_date', 'missing', 'blocked' or 'failed'.
+    timeout_s applies to subprocess steps only (an in-process step cannot be interrupted).
+    """
+    missing = [p for p in step.requires if not Path(p).exists()]
+    if missing:
+        print(f"[SKIP] {step.name}: {missing[0]} not found")
+        return "missing"
+    stamp = {} if force else _load_stamp(_stamp_path(step, work_dir))
+    if _matches_stamp(step, stamp):
+        print(f"[SKIP] {step.name}: up to date")
+        return "up_to_date"
+    inputs = _input_fingerprint(step, stamp.get("inputs"))
+    for out in step.outputs:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+    log_file = work_dir / f"{step.name}.log"
+    rc = _execute(step, log_file, in_process, timeout_s)
+    if rc in step.blocked_codes:
+        print(f"[SKIP] {step.name}: blocked (exit code {rc})")
+        return "blocked"
+    if rc != 0:
+        print(f"[FAIL] {step.name} exited with code {rc}")
+        print(f"       See log: {log_file}")
+        return "failed"
+    _write_stamp(step, work_dir, inputs)
+    print(f"[OK]   {step.name} completed successfully")
+    return "ok"
+
+
+def _contains(parent: Path, child: Path) -> bool:
+    return child == parent or parent in child.parents
+
+
+def dependencies(steps: Sequence[Step]) -> Dict[str, Set[str]]:
+    """Step name -> names of steps writing one of its inputs (or listed in `after`). Raises ValueError on cycles."""
+    names = [s.name for s in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate step names: {names}")
+    outputs = {s.name: [Path(p).resolve() for p in s.outputs] for s in steps}
+    deps: Dict[str, Set[str]] = {}
+    for step in steps:
+        reads = [Path(p).resolve() for p in [*step.inputs, *step.requires]]
+        deps[step.name] = {
+            other for other, writes in outputs.items()
+            if other != step.name and any(_contains(w, r) or _contains(r, w) for w in writes for r in reads)
+        } | (set(step.after) & set(names))
+    done: Set[str] = set()
+    while len(done) < len(deps):
+        ready = [n for n, d in deps.items() if n not in done and d <= done]
+        if not ready:
+            raise ValueError(f"step graph has a cycle among: {sorted(set(deps) - done)}")
+        done.update(ready)
+    return deps
+
+
+def run_steps(
+    steps: Sequence[Step],
+    work_dir: Path,
+    max_workers: int = 4,
+    force: bool = False,
+    in_process: bool = True,
+    timeout_s: Optional[int] = None,
+) -> Dict[str, str]:
+    """Run the graph; returns step name -> status (see run_step), in completion order."""
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    deps = dependencies(steps)
+    pending = {s.name: s for s in steps}
+    status: Dict[str, str] = {}
+    with _routed_output() if in_process else nullcontext(), ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running: Dict[Any, str] = {}
+        while pending or running:
+            for name in [n for n in pending if deps[n] <= status.keys()]:
+                running[pool.submit(run_step, pending.pop(name), work_dir, force, in_process, timeout_s)] = name
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                try:
+                    status[name] = fut.result()
+                except Exception as e:
+                    print(f"[ERROR] {name} failed with exception: {e}")
+                    status[name] = "failed"
+    return status
+
+
+# ---------- Run directory post-processing ----------
+
+
+def postprocess_steps(
+    run_dir: Path,
+    reports_dir: Path,
+    report_profile: str = "ops",
+    paper_tables: bool = False,
+    force_paper_tables: bool = False,
+    metrics_profile: Optional[str] = None,
+    metric_report: bool = True,
+    snapshot: bool = True,
+    shards: bool = True,
+) -> List[Step]:
+    """
+    Steps after run_experiments for one run directory: run snapshot, paper tables (paper_tables=True),
+    HTML report, the reports' example shards (shards=True), and with metrics_profile the structural
+    metrics CSV (+ metric report HTML).
+    """
+    run_dir = Path(run_dir).resolve()
+    reports_dir = Path(reports_dir).resolve()
+    scripts_dir = PROJECT_ROOT / "scripts"
+    metrics_dir = run_dir / "derived" / "metrics"
+    manifest, scorecards = run_dir / "manifest.json", run_dir / "scorecards.jsonl"
+    traces, smoke = run_dir / "traces.jsonl", run_dir / "smoke_outputs.jsonl"
+    steps: List[Step] = []
+    if snapshot:
+        steps.append(Step(
+            "build_run_snapshot", scripts_dir / "build_run_snapshot.py", ["--run_dir", str(run_dir)],
+            inputs=[manifest, scorecards, traces, smoke], outputs=[run_dir / "ops_outputs"],
+        ))
+    if paper_tables:
+        argv = ["--run_dir", str(run_dir)] + (["--force"] if force_paper_tables else [])
+        steps.append(Step(
+            "build_paper_tables", scripts_dir / "build_paper_tables.py", argv,
+            inputs=[manifest, scorecards, smoke], outputs=[run_dir / "paper_outputs"], blocked_codes=(2,),
+        ))
+    rules = scripts_dir / ("paper_rules.yaml" if report_profile == "paper" else "ops_rules.yaml")
+    steps.append(Step(
+        "build_html_report", scripts_dir / "build_html_report.py",
+        ["--run_dir", str(run_dir), "--out_dir", str(reports_dir), "--profile", report_profile, "--rules", str(rules)],
+        inputs=[
+            manifest, scorecards, traces, run_dir / "ops_outputs", run_dir / "paper_outputs", rules,
+            PROJECT_ROOT / "experiments" / "configs" / "latency_gate_config.yaml",
+        ],
+        outputs=[reports_dir / "index.html"],
+    ))
+    if shards:
+        steps.append(report_shards_step(run_dir, reports_dir))
+    if metrics_profile:
+        steps.append(structural_metrics_step(scorecards, metrics_dir, metrics_profile))
+    if metrics_profile and metric_report:
+        steps.append(metric_report_step(run_dir, reports_dir, metrics_profile))
+    return steps
+
+
+def structural_metrics_step(scorecards: Path, outdir: Path, profile: str, name: str = "structural_error_aggregator") -> Step:
+    """structural_error_aggregator on a (merged) scorecards file -> <outdir>/structural_metrics.{csv,_table.md}."""
+    outdir = Path(outdir).resolve()
+    return Step(
+        name, PROJECT_ROOT / "scripts" / "structural_error_aggregator.py",
+        ["--input", str(Path(scorecards).resolve()), "--outdir", str(outdir), "--profile", profile],
+        outputs=[outdir / "structural_metrics.csv", outdir / "structural_metrics_table.md"],
+        requires=[Path(scorecards).resolve()],
+    )
+
+
+def report_shards_step(run_dir: Path, reports_dir: Path) -> Step:
+    """build_report_shards -> <reports_dir>/data/ (example/trace shards read by the reports on demand)."""
+    run_dir, reports_dir = Path(run_dir).resolve(), Path(reports_dir).resolve()
+    return Step(
+        "build_report_shards", PROJECT_ROOT / "scripts" / "build_report_shards.py", ["--run_dir", str(run_dir), "--out_dir", str(reports_dir)],
+        inputs=[run_dir / "outputs.jsonl"], outputs=[reports_dir / "data"], requires=[run_dir / "scorecards.jsonl"],
+    )
+
+
+def metric_report_step(run_dir: Path, reports_dir: Path, profile: str) -> Step:
+    """build_metric_report -> <reports_dir>/metric_report.html (+ transition outputs under derived/metrics)."""
+    run_dir, reports_dir = Path(run_dir).resolve(), Path(reports_dir).resolve()
+    metrics_dir = run_dir / "derived" / "metrics"
+    return Step(
+        "build_metric_report", PROJECT_ROOT / "scripts" / "build_metric_report.py",
+        ["--run_dir", str(run_dir), "--out_dir", str(reports_dir), "--metrics_profile", profile],
+        inputs=[run_dir / "manifest.json", metrics_dir / "structural_metrics.csv", PROJECT_ROOT / "experiments" / "configs" / "debate_thresholds.json"],
+        outputs=[reports_dir / "metric_report.html", metrics_dir / "transition_summary.json", metrics_dir / "transition_table.csv"],
+        requires=[run_dir / "scorecards.jsonl"],
+    )
+
+
+# ---------- CLI ----------
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Rebuild derived outputs of a run directory, skipping up-to-date steps.")
+    p.add_argument("--run_dir", required=True, help="results/<run_id>_<mode>")
+    p.add_argument("--out_dir", default=None, help="Reports directory (default: reports/<run_dir.name>)")
+    p.add_argument("--profile", choices=["ops", "paper"], default="ops", help="paper also builds paper tables")
+    p.add_argument("--force_paper_tables", action="store_true", help="Pass --force to build_paper_tables")
+    p.add_argument("--with_metrics", action="store_true", help="Also build structural metrics and metric_report.html")
+    p.add_argument("--metrics_profile", default="paper_main", choices=["smoke", "regression", "paper_main"])
+    p.add_argument("--force", action="store_true", help="Ignore stamps and rerun every step")
+    p.add_argument("--workers", type=int, default=4, help="Parallel steps (default: 4)")
+    p.add_argument("--subprocess", action="store_true", help="Run each step in its own interpreter")
+    p.add_argument("--dry_run", action="store_true", help="List steps and whether they are up to date")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    run_dir = Path(args.run_dir)
+    if not run_dir.is_dir():
+        raise SystemExit(f"[step_graph] Not a directory: {run_dir}")
+    reports_dir = Path(args.out_dir) if args.out_dir else PROJECT_ROOT / "reports" / run_dir.name
+    steps = postprocess_steps(
+        run_dir, reports_dir, report_profile=args.profile, paper_tables=args.profile == "paper",
+        force_paper_tables=args.force_paper_tables, metrics_profile=args.metrics_profile if args.with_metrics else None,
+    )
+    work_dir = run_dir / "derived"
+    if args.dry_run:
+        deps = dependencies(steps)
+        for step in steps:
+            state = "up to date" if is_up_to_date(step, work_dir) else "stale"
+            print(f"{step.name:28s} {state:10s} after: {', '.join(sorted(deps[step.name])) or '-'}")
+        return
+    status = run_steps(steps, work_dir, max_workers=args.workers, force=args.force, in_process=not args.subprocess)
+    print(f"[step_graph] {run_dir.name}: " + ", ".join(f"{name}={state}" for name, state in status.items()))
+    if "failed" in status.values():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -35,44 +35,19 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from metrics.scorecard import get_sample_correctness  # noqa: E402,F401  (re-exported)
+from metrics.streaming import TransitionAccumulator, iter_scorecards, stream_metrics  # noqa: E402
 
 
 def load_jsonl(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-
-
-def get_sample_correctness(record: Dict[str, Any]) -> Optional[Tuple[bool, bool]]:
-    """
-    Return (C1, C2) for sample: stage1 correct, stage2 correct.
-    Returns None if correctness/triplet_correctness not present.
-    """
-    # 1) Sample-level correctness block
-    correctness = record.get("correctness")
-    if isinstance(correctness, dict):
-        s1 = correctness.get("stage1")
-        s2 = correctness.get("stage2")
-        if isinstance(s1, dict) and isinstance(s2, dict):
-            c1 = s1.get("is_correct")
-            c2 = s2.get("is_correct")
-            if c1 is not None and c2 is not None:
-                return (bool(c1), bool(c2))
-
-    # 2) Derive from triplet_correctness: sample correct iff all triplets correct
-    triplets = record.get("triplet_correctness")
-    if isinstance(triplets, list) and len(triplets) > 0:
-        c1_all = all(
-            bool(t.get("stage1_correct", False)) for t in triplets if isinstance(t, dict)
-        )
-        c2_all = all(
-            bool(t.get("stage2_correct", False)) for t in triplets if isinstance(t, dict)
-        )
-        return (c1_all, c2_all)
-
-    return None
+    return list(iter_scorecards(path))
 
 
 def aggregate_transitions(
@@ -80,71 +55,12 @@ def aggregate_transitions(
     profile_filter: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Compute n_fix, n_keep, n_break, n_still and rates."""
-    if profile_filter:
-        rows = [r for r in rows if (r.get("profile") or (r.get("meta") or {}).get("profile")) == profile_filter]
-
-    n_fix = n_keep = n_break = n_still = 0
-    for r in rows:
-        pair = get_sample_correctness(r)
-        if pair is None:
-            continue
-        c1, c2 = pair
-        if not c1 and c2:
-            n_fix += 1
-        elif c1 and c2:
-            n_keep += 1
-        elif c1 and not c2:
-            n_break += 1
-        else:
-            n_still += 1
-
-    n_total = n_fix + n_keep + n_break + n_still
-    if n_total == 0:
-        return {
-            "n_fix": 0,
-            "n_keep": 0,
-            "n_break": 0,
-            "n_still": 0,
-            "n_total": 0,
-            "n_skipped": len(rows) - n_total,
-            "fix_rate": None,
-            "keep_rate": None,
-            "break_rate": None,
-            "still_wrong_rate": None,
-        }
-
-    def rate(num: int, denom: int) -> float:
-        return (num / denom) if denom else 0.0
-
-    return {
-        "n_fix": n_fix,
-        "n_keep": n_keep,
-        "n_break": n_break,
-        "n_still": n_still,
-        "n_total": n_total,
-        "n_skipped": len(rows) - n_total,
-        "fix_rate": rate(n_fix, n_total),
-        "keep_rate": rate(n_keep, n_total),
-        "break_rate": rate(n_break, n_total),
-        "still_wrong_rate": rate(n_still, n_total),
-    }
-
-
-def main() -> None:
-    ap = argparse.ArgumentParser(description="Aggregate S1→S2 correctness transitions from scorecards")
-    ap.add_argument("--input", required=True, help="Path to scorecards.jsonl (or merged_scorecards.jsonl)")
-    ap.add_argument("--outdir", default="results/metrics", help="Output directory for transition_summary.json and transition_table.csv")
-    ap.add_argument("--profile", choices=["smoke", "regression", "paper_main"], default=None, help="Filter by profile")
-    args = ap.parse_args()
+    return TransitionAccumulator(profile_filter).feed(rows)
 
-    path = Path(args.input)
-    rows = load_jsonl(path)
-    if not rows:
-        print(f"No records in {path}")
-        return
 
-    summary = aggregate_transitions(rows, args.profile)
-    outdir = Path(args.outdir)
+def write_transition_outputs(summary: Dict[str, Any], outdir: Path) -> Path:
+    """Write transition_summary.json and transition_table.csv; return the summary path."""
+    outdir = Path(outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
     # transition_summary.json
@@ -168,6 +84,22 @@ def main() -> None:
             rate_val = row[3] if row[3] is not None else ""
             w.writerow([row[0], row[1], row[2], rate_val])
     print(f"Wrote {table_path}")
+    return summary_path
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Aggregate S1→S2 correctness transitions from scorecards")
+    ap.add_argument("--input", required=True, help="Path to scorecards.jsonl (or merged_scorecards.jsonl)")
+    ap.add_argument("--outdir", default="results/metrics", help="Output directory for transition_summary.json and transition_table.csv")
+    ap.add_argument("--profile", choices=["smoke", "regression", "paper_main"], default=None, help="Filter by profile")
+    args = ap.parse_args(argv)
+
+    path = Path(args.input)
+    n_records, results = stream_metrics(path, {"transitions": TransitionAccumulator(args.profile)})
+    if not n_records:
+        print(f"No records in {path}")
+        return
+    write_transition_outputs(results["transitions"], Path(args.outdir))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,7 @@
+"""
+Long-running inference service over make_runner(...) (see service/http_app.py for the HTTP front end).
+"""
+
+from .absa_service import AbsaRequest, AbsaService, render_event, render_result, resolve_trace_level
+
+__all__ = ["AbsaRequest", "AbsaService", "render_event", "render_result", "resolve_trace_level"]
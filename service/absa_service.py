@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from agents.supervisor_agent import SupervisorAgent, SupervisorStreamEvent
+from evaluation.baselines import make_runner
+from schemas import FinalOutputSchema
+from tools.backbone_client import BackboneClient
+from tools.backbone_pool import BackbonePool, build_backbone
+from tools.data_tools import InternalExample
+from tools.deadline import Deadline
+from tools.llm_runner import single_flight as llm_single_flight
+from tools.trace_format import trace_call_metadata
+
+SUPPORTED_MODES = ("proposed", "bl1", "bl2", "bl3")
+TRACE_LEVELS = ("none", "summary", "full")
+
+
+@dataclass(frozen=True)
+class AbsaRequest:
+    """One inference request. Identical (mode, text, language_code, domain_id) requests share one computation."""
+
+    text: str
+    mode: str = "proposed"
+    uid: Optional[str] = None
+    language_code: str = "unknown"
+    domain_id: str = "unknown"
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], *, default_mode: str) -> "AbsaRequest":
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        text = payload.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("'text' must be a non-empty string")
+        mode = str(payload.get("mode") or default_mode).lower()
+        if mode not in SUPPORTED_MODES:
+            raise ValueError(f"unsupported mode '{mode}' (expected one of {', '.join(SUPPORTED_MODES)})")
+        uid = payload.get("uid")
+        return cls(
+            text=text,
+            mode=mode,
+            uid=str(uid) if uid is not None else None,
+            language_code=str(payload.get("language_code") or "unknown"),
+            domain_id=str(payload.get("domain_id") or "unknown"),
+        )
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        return (self.mode, self.text, self.language_code, self.domain_id)
+
+    @property
+    def internal_uid(self) -> str:
+        """Content-derived uid so coalesced callers receive the same, reproducible result."""
+        digest = hashlib.sha256("\x1f".join(self.key).encode("utf-8")).hexdigest()[:16]
+        return f"svc_{digest}"
+
+
+def resolve_trace_level(value: Optional[str]) -> str:
+    level = (value or "summary").lower()
+    if level not in TRACE_LEVELS:
+        raise ValueError(f"unsupported trace level '{level}' (expected one of {', '.join(TRACE_LEVELS)})")
+    return level
+
+
+def _trace_summary(trace: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for tr in trace:
+        row: Dict[str, Any] = {"stage": tr.get("stage"), "agent": tr.get("agent")}
+        if tr.get("stage_status"):
+            row["stage_status"] = tr["stage_status"]
+        call_meta = trace_call_metadata(tr)
+        if call_meta:
+            row["retries"] = call_meta.get("retries")
+            row["fallback_construct_used"] = call_meta.get("fallback_construct_used")
+            if call_meta.get("error"):
+                row["error"] = call_meta["error"]
+        rows.append(row)
+    return rows
+
+
+def render_result(result: FinalOutputSchema, request: AbsaRequest, trace: str) -> Dict[str, Any]:
+    """
+    Response body for one request.
+    - full: complete FinalOutputSchema dump
+    - summary: process_trace replaced by stage/agent/retry rows, debate rounds dropped (summary kept)
+    - none: process_trace and debate removed
+    """
+    payload = result.model_dump()
+    if trace != "full":
+        process_trace = payload.pop("process_trace", []) or []
+        if trace == "summary":
+            payload["trace_summary"] = _trace_summary(process_trace)
+            if isinstance(payload.get("debate"), dict):
+                payload["debate"] = {"summary": payload["debate"].get("summary")}
+        else:
+            payload.pop("debate", None)
+    return {"uid": request.uid or request.internal_uid, "mode": request.mode, "trace": trace, "result": payload}
+
+
+def render_event(event: SupervisorStreamEvent, request: AbsaRequest, trace: str) -> Dict[str, Any]:
+    """Streaming event body: final events reuse render_result(); provisional/debate payloads pass through."""
+    if event.event == "final":
+        body = render_result(event.payload, request, trace)
+    else:
+        body = {"uid": request.uid or request.internal_uid, "mode": request.mode, "result": event.payload}
+    return {"event": event.event, "stage": event.stage, "elapsed_ms": event.elapsed_ms, **body}
+
+
+class AbsaService:
+    """
+    Long-lived inference front end over make_runner(...).
+
+    - Runners (agents + backbone client) are built once per mode and reused (warm).
+    - Identical in-flight requests are coalesced onto one computation.
+    - Requests are collected in micro-batches (batch_window_ms / max_batch) before dispatch, which lets
+      near-simultaneous duplicates coalesce and keeps dispatch work per loop tick bounded.
+    - At most max_concurrency examples run at once; timeout_s bounds each example and is also passed to
+      SupervisorAgent as its deadline, so proposed-mode requests degrade before they would time out.
+    Call start() on the serving event loop before use and close() on shutdown.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        *,
+        backbone: Optional[BackboneClient] = None,
+        run_id: str = "service",
+        default_mode: str = "proposed",
+        max_concurrency: int = 32,
+        batch_window_ms: float = 2.0,
+        max_batch: int = 32,
+        timeout_s: Optional[float] = None,
+    ):
+        if default_mode not in SUPPORTED_MODES:
+            raise ValueError(f"unsupported default mode '{default_mode}'")
+        if max_concurrency < 1 or max_batch < 1:
+            raise ValueError("max_concurrency and max_batch must be >= 1")
+        self.config = config or {}
+        backbone_cfg = self.config.get("backbone") or {}
+        self.backbone = backbone or build_backbone(backbone_cfg)
+        self.run_id = run_id
+        self.default_mode = default_mode
+        self.max_concurrency = int(max_concurrency)
+        self.batch_window_s = max(0.0, float(batch_window_ms)) / 1000.0
+        self.max_batch = int(max_batch)
+        self.timeout_s = timeout_s
+        self.stats: Dict[str, int] = {"requests": 0, "coalesced": 0, "batches": 0, "completed": 0, "errors": 0}
+        self._runners: Dict[str, Any] = {}
+        self._inflight: Dict[Tuple[str, str, str, str], asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._limiter: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    # ---------------- lifecycle ----------------
+    async def start(self) -> None:
+        if self._batcher is not None:
+            return
+        for mode in SUPPORTED_MODES:
+            self.runner(mode)
+        self._queue = asyncio.Queue()
+        self._limiter = asyncio.Semaphore(self.max_concurrency)
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def close(self) -> None:
+        """
+        Cancel running examples, fail requests that were queued but never dispatched (so no caller hangs)
+        and close the backbone's async SDK client for this loop.
+        """
+        if self._batcher is None:
+            return
+        self._batcher.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(self._batcher, *self._tasks, return_exceptions=True)
+        self._batcher = None
+        self._queue = None  # later infer() calls raise instead of queueing behind a stopped batcher
+        for fut in self._inflight.values():
+            if not fut.done():
+                fut.set_exception(RuntimeError("AbsaService closed before the request was dispatched"))
+        self._inflight.clear()
+        await self.backbone.aclose()
+
+    async def __aenter__(self) -> "AbsaService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def runner(self, mode: str):
+        if mode not in self._runners:
+            self._runners[mode] = make_runner(
+                run_mode=mode,
+                backbone=self.backbone,
+                config=self.config.get("pipeline", {}),
+                run_id=f"{self.run_id}_{mode}",
+            )
+        return self._runners[mode]
+
+    def health(self) -> Dict[str, Any]:
+        health = {
+            "status": "ok" if self._batcher is not None else "stopped",
+            "provider": getattr(self.backbone, "provider", None),
+            "model": getattr(self.backbone, "model", None),
+            "warm_modes": sorted(self._runners),
+            "inflight": len(self._inflight),
+            "max_concurrency": self.max_concurrency,
+            **self.stats,
+        }
+        policy = getattr(self.backbone, "call_policy", None)
+        if policy is not None:
+            health["call_policy"] = policy.snapshot()
+        if isinstance(self.backbone, BackbonePool):
+            health["backbone_pool"] = self.backbone.snapshot()
+        health["single_flight"] = dict(llm_single_flight.stats)
+        return health
+
+    # ---------------- requests ----------------
+    async def infer(self, request: AbsaRequest) -> FinalOutputSchema:
+        if self._queue is None:
+            raise RuntimeError("AbsaService.start() must be awaited before serving requests")
+        self.stats["requests"] += 1
+        fut = self._inflight.get(request.key)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            # a caller may disconnect before the result arrives; never leave the exception unretrieved
+            fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._inflight[request.key] = fut
+            self._queue.put_nowait(request)
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one cancelled caller must not cancel the shared computation
+        return await asyncio.shield(fut)
+
+    async def analyze(self, request: AbsaRequest, *, trace: str = "summary") -> Dict[str, Any]:
+        return render_result(await self.infer(request), request, trace)
+
+    async def analyze_batch(self, requests: Iterable[AbsaRequest], *, trace: str = "summary") -> List[Dict[str, Any]]:
+        """Per-item results in input order; a failed item yields {"uid", "error"} instead of failing the batch."""
+        items = list(requests)
+        results = await asyncio.gather(*(self.infer(r) for r in items), return_exceptions=True)
+        out: List[Dict[str, Any]] = []
+        for req, res in zip(items, results):
+            if isinstance(res, BaseException):
+                out.append({"uid": req.uid or req.internal_uid, "mode": req.mode, "error": f"{type(res).__name__}: {res}"})
+            else:
+                out.append(render_result(res, req, trace))
+        return out
+
+    async def stream(self, request: AbsaRequest, *, trace: str = "summary") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Progressive events for one request: provisional (after Stage1), debate, final. Runners without astream()
+        (baselines) yield only the final event. Streams are never coalesced; a failure or timeout ends the stream
+        with an {"event": "error"} item. The runner executes in its own task (under the concurrency limit and
+        timeout), so a slow consumer or a disconnect never leaves the limiter held.
+        """
+        if self._limiter is None:
+            raise RuntimeError("AbsaService.start() must be awaited before serving requests")
+        self.stats["requests"] += 1
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._produce_events(request, queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    yield {"event": "error", "uid": request.uid or request.internal_uid, "mode": request.mode, "error": f"{type(item).__name__}: {item}"}
+                    break
+                yield render_event(item, request, trace)
+        finally:
+            producer.cancel()
+
+    # ---------------- internals ----------------
+    def _example(self, request: AbsaRequest) -> InternalExample:
+        return InternalExample(
+            uid=request.internal_uid,
+            text=request.text,
+            split="service",
+            language_code=request.language_code,
+            domain_id=request.domain_id,
+        )
+
+    def _deadline_kwargs(self, runner: Any) -> Dict[str, Any]:
+        """SupervisorAgent degrades (debate rounds -> Stage2 -> Validator) before timeout_s cancels the example."""
+        if self.timeout_s and isinstance(runner, SupervisorAgent):
+            return {"deadline": Deadline(self.timeout_s)}
+        return {}
+
+    async def _produce_events(self, request: AbsaRequest, queue: asyncio.Queue) -> None:
+        assert self._limiter is not None
+        runner = self.runner(request.mode)
+        example = self._example(request)
+        try:
+            async with self._limiter:
+                async with asyncio.timeout(self.timeout_s):
+                    if hasattr(runner, "astream"):
+                        async with aclosing(runner.astream(example, **self._deadline_kwargs(runner))) as events:
+                            async for event in events:
+                                queue.put_nowait(event)
+                    else:
+                        started = time.perf_counter()
+                        result = await runner.arun(example)
+                        elapsed_ms = round((time.perf_counter() - started) * 1000.0, 1)
+                        queue.put_nowait(SupervisorStreamEvent("final", "final", elapsed_ms, example.uid, result))
+        except Exception as e:
+            self.stats["errors"] += 1
+            queue.put_nowait(e)
+        else:
+            self.stats["completed"] += 1
+        queue.put_nowait(None)
+
+    async def _batch_loop(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+            self.stats["batches"] += 1
+            for request in batch:
+                task = asyncio.create_task(self._execute(request))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, request: AbsaRequest) -> None:
+        assert self._limiter is not None
+        fut = self._inflight[request.key]
+        example = self._example(request)
+        try:
+            async with self._limiter:
+                async with asyncio.timeout(self.timeout_s):
+                    runner = self.runner(request.mode)
+                    result = await runner.arun(example, **self._deadline_kwargs(runner))
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            if not fut.done():
+                fut.set_exception(e)
+        else:
+            self.stats["completed"] += 1
+            if not fut.done():
+                fut.set_result(result)
+        finally:
+            self._inflight.pop(request.key, None)
+
+
+__all__ = ["AbsaRequest", "AbsaService", "SUPPORTED_MODES", "TRACE_LEVELS", "render_event", "render_result", "resolve_trace_level"]
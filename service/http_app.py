@@ -0,0 +1,160 @@
+"""
+HTTP front end for AbsaService (aiohttp).
+
+    python -m service.http_app --config experiments/configs/default.yaml --port 8080
+
+Endpoints:
+    POST /v1/absa?trace=none|summary|full        {"text": ..., "mode"?, "uid"?, "language_code"?, "domain_id"?}
+    POST /v1/absa:batch?trace=none|summary|full  {"items": [{...}, ...], "mode"?}
+    POST /v1/absa:stream?trace=...&format=sse|ndjson  same body as /v1/absa; provisional -> debate -> final events
+    GET  /healthz
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from aiohttp import web
+except ImportError:  # pragma: no cover
+    web = None
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from evaluation.baselines import resolve_run_mode
+from service.absa_service import AbsaRequest, AbsaService, resolve_trace_level
+
+MAX_BATCH_ITEMS = 256
+STREAM_FORMATS = {"sse": "text/event-stream", "ndjson": "application/x-ndjson"}
+
+
+def _json_error(status: int, message: str):
+    return web.json_response({"error": message}, status=status)
+
+
+def _encode_event(event: Dict[str, Any], fmt: str) -> bytes:
+    data = json.dumps(event, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {event['event']}\ndata: {data}\n\n".encode("utf-8")
+    return (data + "\n").encode("utf-8")
+
+
+async def _read_json(request) -> Dict[str, Any]:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ValueError("request body must be valid JSON")
+    if not isinstance(body, dict):
+        raise ValueError("request body must be a JSON object")
+    return body
+
+
+def create_app(service: AbsaService):
+    """aiohttp application bound to a (not yet started) AbsaService; startup/cleanup manage its lifecycle."""
+    if web is None:
+        raise RuntimeError("aiohttp is required for the HTTP service (pip install aiohttp)")
+
+    async def absa(request):
+        try:
+            trace = resolve_trace_level(request.query.get("trace"))
+            req = AbsaRequest.from_payload(await _read_json(request), default_mode=service.default_mode)
+        except ValueError as e:
+            return _json_error(400, str(e))
+        try:
+            return web.json_response(await service.analyze(req, trace=trace))
+        except TimeoutError:
+            return _json_error(504, "inference timed out")
+        except Exception as e:
+            return _json_error(500, f"{type(e).__name__}: {e}")
+
+    async def absa_batch(request):
+        try:
+            trace = resolve_trace_level(request.query.get("trace"))
+            body = await _read_json(request)
+            items = body.get("items")
+            if not isinstance(items, list) or not items:
+                raise ValueError("'items' must be a non-empty list")
+            if len(items) > MAX_BATCH_ITEMS:
+                raise ValueError(f"at most {MAX_BATCH_ITEMS} items per batch")
+            default_mode = str(body.get("mode") or service.default_mode).lower()
+            reqs = [AbsaRequest.from_payload(item, default_mode=default_mode) for item in items]
+        except ValueError as e:
+            return _json_error(400, str(e))
+        return web.json_response({"trace": trace, "results": await service.analyze_batch(reqs, trace=trace)})
+
+    async def absa_stream(request):
+        try:
+            trace = resolve_trace_level(request.query.get("trace"))
+            fmt = (request.query.get("format") or "sse").lower()
+            if fmt not in STREAM_FORMATS:
+                raise ValueError(f"unsupported stream format '{fmt}' (expected sse or ndjson)")
+            req = AbsaRequest.from_payload(await _read_json(request), default_mode=service.default_mode)
+        except ValueError as e:
+            return _json_error(400, str(e))
+        response = web.StreamResponse(headers={"Content-Type": STREAM_FORMATS[fmt], "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        async for event in service.stream(req, trace=trace):
+            await response.write(_encode_event(event, fmt))
+        await response.write_eof()
+        return response
+
+    async def healthz(request):
+        return web.json_response(service.health())
+
+    async def on_startup(app):
+        await service.start()
+
+    async def on_cleanup(app):
+        await service.close()
+
+    app = web.Application()
+    app.router.add_post("/v1/absa", absa)
+    app.router.add_post("/v1/absa:batch", absa_batch)
+    app.router.add_post("/v1/absa:stream", absa_stream)
+    app.router.add_get("/healthz", healthz)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def read_config(path: Optional[str]) -> Dict[str, Any]:
+    if not path:
+        return {}
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve SupervisorAgent/baselines over HTTP with warm runners.")
+    parser.add_argument("--config", type=str, default="experiments/configs/default.yaml")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--mode", type=str, choices=["proposed", "bl1", "bl2", "bl3"], default=None, help="Default mode when a request omits 'mode'.")
+    parser.add_argument("--run-id", type=str, default="service")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="Max examples in flight.")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0, help="Micro-batch collection window.")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--timeout-s", type=float, default=None, help="Per-example timeout (504 on expiry).")
+    args = parser.parse_args()
+
+    cfg = read_config(args.config)
+    service = AbsaService(
+        cfg,
+        run_id=args.run_id,
+        default_mode=resolve_run_mode(args.mode, os.getenv("RUN_MODE"), cfg.get("run_mode") or cfg.get("mode")),
+        max_concurrency=args.max_concurrency,
+        batch_window_ms=args.batch_window_ms,
+        max_batch=args.max_batch,
+        timeout_s=args.timeout_s,
+    )
+    web.run_app(create_app(service), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import asyncio
+
+from service.absa_service import AbsaRequest, AbsaService, resolve_trace_level
+
+
+def test_service_coalesces_and_renders_trace_levels():
+    async def scenario():
+        async with AbsaService(run_id="svc_test", batch_window_ms=5) as svc:
+            req = AbsaRequest(text="배송은 빨랐지만 포장이 엉망이었다", language_code="ko", uid="c1")
+            full, summary, none = await asyncio.gather(
+                svc.analyze(req, trace="full"),
+                svc.analyze(req, trace="summary"),
+                svc.analyze(req, trace="none"),
+            )
+            stats = dict(svc.stats)
+            bl2 = await svc.analyze(AbsaRequest(text="가격 대비 맛이 좋다", mode="bl2"), trace="none")
+        return full, summary, none, stats, bl2
+
+    full, summary, none, stats, bl2 = asyncio.run(scenario())
+    assert stats["requests"] == 3 and stats["coalesced"] == 2 and stats["completed"] == 1
+    assert full["uid"] == "c1" and full["mode"] == "proposed"
+    assert full["result"]["final_result"] == summary["result"]["final_result"] == none["result"]["final_result"]
+    assert full["result"]["process_trace"]
+    assert "process_trace" not in summary["result"]
+    assert [r["stage"] for r in summary["result"]["trace_summary"]] == [t["stage"] for t in full["result"]["process_trace"]]
+    assert "process_trace" not in none["result"] and "debate" not in none["result"]
+    assert bl2["mode"] == "bl2" and bl2["uid"].startswith("svc_")
+
+
+class _SlowRunner:
+    async def arun(self, example):
+        await asyncio.sleep(1)
+
+
+def test_service_batch_reports_per_item_errors_and_validates_payload():
+    async def scenario():
+        svc = AbsaService(run_id="svc_test", timeout_s=0.05)
+        await svc.start()
+        svc._runners["bl1"] = _SlowRunner()
+        try:
+            return await svc.analyze_batch(
+                [AbsaRequest(text="좋아요", mode="bl3", uid="a"), AbsaRequest(text="느려요", mode="bl1", uid="b")],
+                trace="none",
+            )
+        finally:
+            await svc.close()
+
+    ok, slow = asyncio.run(scenario())
+    assert ok["uid"] == "a" and "result" in ok
+    assert slow["uid"] == "b" and slow["error"].startswith("TimeoutError")
+
+    for bad in ({"text": ""}, {"text": "x", "mode": "bl9"}, ["x"]):
+        try:
+            AbsaRequest.from_payload(bad, default_mode="proposed")
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {bad!r}")
+    assert AbsaRequest.from_payload({"text": "x"}, default_mode="bl2").mode == "bl2"
+    assert resolve_trace_level(None) == "summary"
+
+
+def test_close_fails_queued_requests_instead_of_hanging():
+    async def scenario():
+        svc = AbsaService(run_id="svc_test", batch_window_ms=10_000)
+        await svc.start()
+        callers = [asyncio.ensure_future(svc.infer(AbsaRequest(text=f"문장 {i}", mode="bl1"))) for i in range(3)]
+        await asyncio.sleep(0.05)  # the batcher holds the requests in an undispatched batch
+        await svc.close()
+        results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), 1.0)
+        try:
+            await svc.infer(AbsaRequest(text="closed"))
+        except RuntimeError:
+            late = "rejected"
+        else:  # pragma: no cover
+            late = "accepted"
+        return results, svc.health(), late
+
+    results, health, late = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) and "closed" in str(r) for r in results)
+    assert health["inflight"] == 0 and health["status"] == "stopped" and health["completed"] == 0
+    assert late == "rejected"
+
+
+def test_service_stream_emits_provisional_then_final():
+    async def scenario():
+        async with AbsaService(run_id="svc_stream") as svc:
+            proposed = [e async for e in svc.stream(AbsaRequest(text="배송은 빨랐지만 포장이 엉망이었다", uid="s1"), trace="none")]
+            baseline = [e async for e in svc.stream(AbsaRequest(text="좋아요", mode="bl2"))]
+            svc._runners["bl1"] = _SlowRunner()
+            svc.timeout_s = 0.05
+            failed = [e async for e in svc.stream(AbsaRequest(text="느려요", mode="bl1"))]
+        return proposed, baseline, failed
+
+    proposed, baseline, failed = asyncio.run(scenario())
+    assert [e["event"] for e in proposed] == ["provisional", "debate", "final"]
+    assert all(e["uid"] == "s1" for e in proposed)
+    assert "final_aspects" in proposed[0]["result"]["final_result"]
+    assert "process_trace" not in proposed[-1]["result"]
+    assert [e["event"] for e in baseline] == ["final"] and baseline[0]["mode"] == "bl2"
+    assert [e["event"] for e in failed] == ["error"] and failed[0]["error"].startswith("TimeoutError")
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+from agents import BaselineRunner, SupervisorAgent
+from schemas import ATEOutput
+from tools.async_utils import gather_all, run_examples
+from tools.backbone_client import BackboneClient
+from tools.data_tools import InternalExample
+from tools.llm_runner import arun_structured
+
+_TEXTS = [
+    ("ko", "배송은 빨랐지만 포장이 엉망이었다"),
+    ("ko", "서비스가 별로 안 좋다"),
+    ("en", "The battery life is great but the screen is dim"),
+]
+
+
+def _examples():
+    return [InternalExample(uid=f"as{i}", text=t, language_code=lang) for i, (lang, t) in enumerate(_TEXTS)]
+
+
+def _comparable(result):
+    payload = result.model_dump()
+    return payload["final_result"], payload["meta"], [(t["stage"], t["agent"], t["output"]) for t in payload["process_trace"]]
+
+
+def test_supervisor_arun_matches_run():
+    agent = SupervisorAgent(run_id="async_eq")
+    examples = _examples()
+    expected = [_comparable(agent.run(ex)) for ex in examples]
+    actual = run_examples(agent, examples, concurrency=2)
+    assert [_comparable(r) for r in actual] == expected
+
+
+def test_baseline_arun_matches_run():
+    for mode in ("bl2", "bl3"):
+        runner = BaselineRunner(mode, run_id=f"async_{mode}")
+        examples = _examples()
+        expected = [_comparable(runner.run(ex)) for ex in examples]
+        actual = run_examples(runner, examples)
+        assert [_comparable(r) for r in actual] == expected
+
+
+class _SlowRunner:
+    def __init__(self):
+        self.cancelled = 0
+
+    async def arun(self, example):
+        try:
+            await asyncio.sleep(example)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if example < 0:
+            raise ValueError("boom")
+        return example
+
+
+def test_arun_examples_timeout_and_cancellation():
+    runner = _SlowRunner()
+    out = run_examples(runner, [0, 5, 0], timeout_s=0.05, return_exceptions=True)
+    assert out[0] == 0 and out[2] == 0
+    assert isinstance(out[1], TimeoutError)
+
+    # without return_exceptions the first failure cancels the in-flight siblings and is re-raised
+    runner = _SlowRunner()
+    try:
+        run_examples(runner, [5, -0.01, 5])
+    except ValueError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("expected ValueError")
+    assert runner.cancelled == 2
+
+    assert asyncio.run(gather_all(asyncio.sleep(0, "a"), asyncio.sleep(0, "b"))) == ["a", "b"]
+
+
+class _SeqBackbone(BackboneClient):
+    """Overrides only generate(); agenerate must fall back to it."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.idx = 0
+        self.provider = "mock"
+        self.model = "mock-model"
+
+    def generate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        resp = self.responses[self.idx % len(self.responses)]
+        self.idx += 1
+        return resp, {"tokens_in": None, "tokens_out": None, "cost_usd": None}
+
+
+def test_arun_structured_repairs_like_sync():
+    backbone = _SeqBackbone(["not json", json.dumps({"label": "positive", "confidence": 0.9, "rationale": "ok"})])
+    with tempfile.TemporaryDirectory() as td:
+        result = asyncio.run(
+            arun_structured(
+                backbone=backbone,
+                system_prompt="{}",
+                user_text="좋다",
+                schema=ATEOutput,
+                max_retries=2,
+                run_id="async_repair",
+                text_id="t1",
+                stage="test",
+                errors_path=str(Path(td) / "errors.jsonl"),
+            )
+        )
+    assert result.model.label == "positive"
+    assert result.meta.retries == 1 and result.meta.repair_used
+
+
+def test_supervisor_stream_events_match_run():
+    agent = SupervisorAgent(run_id="stream_eq")
+    ex = _examples()[0]
+    expected = _comparable(agent.run(ex))
+
+    events = list(agent.stream(ex))
+    assert [(e.event, e.stage) for e in events] == [("provisional", "stage1"), ("debate", "debate"), ("final", "moderator")]
+    assert [e.elapsed_ms for e in events] == sorted(e.elapsed_ms for e in events)
+    assert _comparable(events[-1].payload) == expected
+    provisional = events[0].payload["final_result"]
+    assert provisional["label"] and isinstance(provisional["final_aspects"], list)
+    assert events[1].to_dict()["payload"]["summary"] == expected[1]["debate_summary"]
+
+    async def collect():
+        return [e async for e in agent.astream(ex)]
+
+    async_events = asyncio.run(collect())
+    assert [e.event for e in async_events] == [e.event for e in events]
+    assert async_events[0].payload == events[0].payload
+    assert _comparable(async_events[-1].payload) == expected
+
+
+class _FakeAsyncOpenAI:
+    """Stands in for openai.AsyncOpenAI: counts clients and closes."""
+
+    instances = []
+
+    def __init__(self):
+        self.closed = False
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+        _FakeAsyncOpenAI.instances.append(self)
+
+    async def _create(self, **request):
+        message = types.SimpleNamespace(content='{"label": "positive"}')
+        usage = types.SimpleNamespace(prompt_tokens=3, completion_tokens=2)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=usage)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_async_sdk_client_is_reused_per_loop_and_closed():
+    saved_module, saved_key = sys.modules.get("openai"), os.environ.get("OPENAI_API_KEY")
+    sys.modules["openai"] = types.SimpleNamespace(AsyncOpenAI=_FakeAsyncOpenAI)
+    os.environ["OPENAI_API_KEY"] = "test"
+    _FakeAsyncOpenAI.instances = []
+    try:
+        backbone = BackboneClient(provider="openai", model="gpt-4o-mini")
+
+        async def calls():
+            await gather_all(*(backbone.agenerate([{"role": "user", "content": "hi"}]) for _ in range(3)))
+            await backbone.aclose()
+
+        asyncio.run(calls())
+        asyncio.run(calls())  # a new loop gets its own client
+        assert len(_FakeAsyncOpenAI.instances) == 2 and all(c.closed for c in _FakeAsyncOpenAI.instances)
+
+        class _Runner:
+            def __init__(self):
+                self.backbone = backbone
+
+            async def arun(self, example):
+                return (await backbone.agenerate([{"role": "user", "content": example}]))[0]
+
+        assert run_examples(_Runner(), ["a", "b"]) == ['{"label": "positive"}'] * 2
+        assert len(_FakeAsyncOpenAI.instances) == 3 and _FakeAsyncOpenAI.instances[-1].closed
+    finally:
+        if saved_module is None:
+            sys.modules.pop("openai", None)
+        else:
+            sys.modules["openai"] = saved_module
+        if saved_key is None:
+            os.environ.pop("OPENAI_API_KEY", None)
+        else:
+            os.environ["OPENAI_API_KEY"] = saved_key
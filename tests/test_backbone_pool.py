@@ -0,0 +1,105 @@
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from schemas import ATEOutput
+from tools.backbone_client import BackboneClient
+from tools.backbone_pool import BackbonePool, CircuitBreaker, build_backbone
+from tools.deadline import DeadlineExceeded
+from tools.llm_runner import arun_structured, run_structured
+
+_OK = json.dumps({"label": "positive", "confidence": 0.9, "rationale": "ok"})
+
+
+class _Target(BackboneClient):
+    """Fails while `down` is set; counts the calls it receives."""
+
+    def __init__(self, provider, model, down=False, error=RuntimeError):
+        self.provider, self.model, self.call_policy = provider, model, None
+        self.down, self.error, self.calls = down, error, 0
+
+    def generate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        self.calls += 1
+        if self.down:
+            raise self.error(f"{self.provider} unavailable")
+        return _OK, {"tokens_in": 3, "tokens_out": 2, "cost_usd": None}
+
+
+def _structured(backbone, td, runner=run_structured):
+    return runner(
+        backbone=backbone, system_prompt="{}", user_text="좋다", schema=ATEOutput, max_retries=0,
+        run_id="pool", text_id="t1", stage="ate", errors_path=str(Path(td) / "errors.jsonl"),
+    )
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker(window=4, min_calls=2, failure_rate=0.5, cooldown_s=0.05)
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and not breaker.allow()  # one half-open probe at a time
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opened == 2
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.snapshot() == {"state": "closed", "opened": 2, "recent_calls": 1, "recent_failures": 0}
+
+
+def test_pool_fails_over_and_records_serving_model():
+    primary, secondary = _Target("openai", "gpt-a", down=True), _Target("anthropic", "claude-b")
+    pool = BackbonePool([primary, secondary], breaker={"min_calls": 2, "cooldown_s": 60})
+    with tempfile.TemporaryDirectory() as td:
+        results = [_structured(pool, td) for _ in range(4)]
+    assert all(r.model.label == "positive" for r in results)
+    assert {(r.meta.served_provider, r.meta.served_model) for r in results} == {("anthropic", "claude-b")}
+    assert json.loads(results[0].meta.to_notes_str())["served_model"] == "claude-b"
+    # the primary's breaker opens after min_calls failures, so later calls skip it entirely
+    assert primary.calls == 2 and secondary.calls == 4
+    stats = pool.snapshot()
+    assert stats["served"] == {"anthropic:claude-b": 4} and stats["failovers"] == 2
+    assert stats["breakers"]["openai:gpt-a"]["state"] == "open"
+
+    with tempfile.TemporaryDirectory() as td:
+        result = asyncio.run(_structured(pool, td, runner=arun_structured))
+    assert result.meta.served_provider == "anthropic" and primary.calls == 2
+
+
+def test_pool_all_down_and_deadline_passthrough():
+    primary, secondary = _Target("openai", "gpt-a", down=True), _Target("anthropic", "claude-b", down=True)
+    pool = BackbonePool([primary, secondary], breaker={"min_calls": 1, "cooldown_s": 60})
+    for _ in range(2):
+        try:
+            pool.generate([{"role": "user", "content": "x"}])
+        except RuntimeError:
+            pass
+    # both breakers open: the target that re-opens first still gets the call
+    secondary.down = False
+    text, usage = pool.generate([{"role": "user", "content": "x"}])
+    assert text == _OK and usage["model"] in {"gpt-a", "claude-b"}
+
+    deadline_pool = BackbonePool([_Target("openai", "gpt-a", down=True, error=DeadlineExceeded), _Target("anthropic", "claude-b")])
+    try:
+        deadline_pool.generate([{"role": "user", "content": "x"}])
+    except DeadlineExceeded:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("DeadlineExceeded must not fail over")
+    assert deadline_pool.targets[1].calls == 0
+
+
+def test_build_backbone_from_config():
+    assert type(build_backbone({"provider": "mock"})) is BackboneClient
+    pool = build_backbone({
+        "provider": "mock", "model": "m1",
+        "fallbacks": [{"provider": "mock", "model": "m2"}],
+        "circuit_breaker": {"cooldown_s": 5},
+        "timeout_s": 10,
+    })
+    assert isinstance(pool, BackbonePool) and pool.provider == "mock" and pool.model == "m1"
+    assert pool.call_policy is not None and pool.breakers[0].cooldown_s == 5
+    assert pool.snapshot()["targets"] == ["mock:m1", "mock:m2"]
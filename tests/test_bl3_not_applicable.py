@@ -42,20 +42,22 @@ def test_bl3_marks_stage2_not_applicable():
     ]
     mock_backbone = MockBackbone(responses)
 
-    ate = ATEAgent(mock_backbone)
-    atsa = ATSAAgent(mock_backbone)
-    validator = ValidatorAgent(mock_backbone)
-    moderator = Moderator()
+    with tempfile.TemporaryDirectory() as td:
+        errors_path = f"{td}/errors.jsonl"
+        ate = ATEAgent(mock_backbone, errors_path=errors_path)
+        atsa = ATSAAgent(mock_backbone, errors_path=errors_path)
+        validator = ValidatorAgent(mock_backbone, errors_path=errors_path)
+        moderator = Moderator()
 
-    result = run_bl3_stage1_only(
-        text="great service",
-        text_id="bl3case",
-        run_id="bl3test",
-        ate_agent=ate,
-        atsa_agent=atsa,
-        validator=validator,
-        moderator=moderator,
-    )
+        result = run_bl3_stage1_only(
+            text="great service",
+            text_id="bl3case",
+            run_id="bl3test",
+            ate_agent=ate,
+            atsa_agent=atsa,
+            validator=validator,
+            moderator=moderator,
+        )
     validated = FinalOutputSchema.model_validate(result.model_dump())
     assert validated.analysis_flags.stage2_executed is False
     stage2_status = [t for t in validated.process_trace if t.stage == "stage2"]
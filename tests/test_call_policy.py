@@ -0,0 +1,207 @@
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from schemas import ATEOutput
+from tools.backbone_client import BackboneClient
+from tools.call_policy import CallPolicy, CallTimeout, stage_key
+from tools.llm_runner import arun_structured, run_structured
+
+_OK = json.dumps({"label": "positive", "confidence": 0.9, "rationale": "ok"})
+_USAGE = {"tokens_in": 10, "tokens_out": 5, "cost_usd": 0.001}
+
+
+class _ScriptedBackbone(BackboneClient):
+    """Call n sleeps delays[n] seconds (last entry repeats) before answering; async calls sleep cooperatively."""
+
+    def __init__(self, delays, policy):
+        super().__init__(provider="mock", call_policy=policy)
+        self.delays, self.calls, self.cancelled = delays, 0, 0
+        self._lock = threading.Lock()
+
+    def _next_delay(self):
+        with self._lock:
+            delay = self.delays[min(self.calls, len(self.delays) - 1)]
+            self.calls += 1
+        return delay
+
+    def generate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        time.sleep(self._next_delay())
+        return _OK, dict(_USAGE)
+
+    async def agenerate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        try:
+            await asyncio.sleep(self._next_delay())
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return _OK, dict(_USAGE)
+
+
+def _warm(policy, key, seconds, n):
+    for _ in range(n):
+        policy.latency.record(key, seconds)
+
+
+def _structured(backbone, td, runner=run_structured, stage="ate", max_retries=1, **kwargs):
+    return runner(
+        backbone=backbone, system_prompt="{}", user_text="좋다", schema=ATEOutput, max_retries=max_retries,
+        run_id="call_policy", text_id="t1", stage=stage, errors_path=str(Path(td) / "errors.jsonl"), **kwargs,
+    )
+
+
+def test_from_config_and_stage_keys():
+    assert CallPolicy.from_config({"provider": "mock"}) is None
+    policy = CallPolicy.from_config({"timeout_s": 5, "stage_timeouts_s": {"debate_turn": 2}, "hedging": {"enabled": True, "min_samples": 3}})
+    assert policy.hedging and policy.min_samples == 3
+    assert stage_key("debate_round2_analyst") == "debate_turn" and stage_key("ate") == "ate"
+    assert policy.timeout_for("debate_turn") == 2 and policy.timeout_for("ate") == 5
+    assert policy.hedge_delay("ate") is None  # not enough samples yet
+    _warm(policy, "ate", 0.2, 3)
+    assert policy.hedge_delay("ate") == 0.2
+
+
+def test_sync_hedge_wins_when_primary_is_slow():
+    policy = CallPolicy(hedging=True, min_samples=5, min_delay_s=0.01)
+    _warm(policy, "ate", 0.02, 5)
+    backbone = _ScriptedBackbone([0.5, 0.0], policy)
+    with tempfile.TemporaryDirectory() as td:
+        started = time.monotonic()
+        result = _structured(backbone, td, max_concurrency=2)
+        elapsed = time.monotonic() - started
+    assert result.model.label == "positive" and result.meta.retries == 0
+    assert elapsed < 0.3
+    time.sleep(0.6)  # the losing primary still finishes in its thread and is counted as waste
+    stats = policy.stats.snapshot()
+    assert (stats["calls"], stats["hedged"], stats["hedge_wins"], stats["losers_cancelled"]) == (1, 1, 1, 1)
+    assert stats["wasted_tokens_in"] == 10 and stats["wasted_tokens_out"] == 5
+
+
+def test_stage_timeout_is_retried_by_attempt_loop():
+    policy = CallPolicy(stage_timeouts_s={"ate": 0.05})
+    backbone = _ScriptedBackbone([0.3, 0.0], policy)
+    with tempfile.TemporaryDirectory() as td:
+        result = _structured(backbone, td)
+    assert result.model.label == "positive" and result.meta.retries == 1
+    assert policy.stats.snapshot()["timeouts"] == 1
+
+    def slow():
+        time.sleep(0.2)
+        return _OK, dict(_USAGE)
+
+    try:
+        CallPolicy(timeout_s=0.02).call("ate", slow)
+    except CallTimeout:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("expected CallTimeout")
+
+
+def test_async_hedge_cancels_loser():
+    policy = CallPolicy(hedging=True, min_samples=5, min_delay_s=0.01)
+    _warm(policy, "ate", 0.02, 5)
+    backbone = _ScriptedBackbone([5.0, 0.0], policy)
+    with tempfile.TemporaryDirectory() as td:
+        started = time.monotonic()
+        result = asyncio.run(_structured(backbone, td, runner=arun_structured))
+        elapsed = time.monotonic() - started
+    assert result.model.label == "positive"
+    assert elapsed < 1.0 and backbone.cancelled == 1
+    stats = policy.snapshot()
+    assert (stats["hedged"], stats["hedge_wins"], stats["losers_cancelled"]) == (1, 1, 1)
+    assert stats["stage_latency"]["ate"]["n"] == 6
+
+
+class _StubbornBackbone(_ScriptedBackbone):
+    """Calls that finish (and bill) even when cancelled, tracking how many run at once."""
+
+    def __init__(self, delays, policy):
+        super().__init__(delays, policy)
+        self.active = self.max_active = 0
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def generate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        self._enter()
+        try:
+            time.sleep(self._next_delay())
+            return _OK, dict(_USAGE)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    async def agenerate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        self._enter()
+        try:
+            delay, started = self._next_delay(), time.monotonic()
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                await asyncio.sleep(max(0.0, delay - (time.monotonic() - started)))
+            return _OK, dict(_USAGE)
+        finally:
+            self.active -= 1
+
+
+def test_async_hedges_respect_max_concurrency_and_count_waste():
+    def run(backbone, td, max_concurrency):
+        async def scenario():
+            result = await arun_structured(
+                backbone=backbone, system_prompt="{}", user_text="좋다", schema=ATEOutput, max_retries=0,
+                run_id="call_policy", text_id="t1", stage="ate", errors_path=str(Path(td) / "errors.jsonl"),
+                max_concurrency=max_concurrency,
+            )
+            await asyncio.sleep(0.3)  # let a loser that ignores cancellation finish
+            return result
+
+        return asyncio.run(scenario())
+
+    with tempfile.TemporaryDirectory() as td:
+        policy = CallPolicy(hedging=True, min_samples=5, min_delay_s=0.01)
+        _warm(policy, "ate", 0.02, 5)
+        limited = _StubbornBackbone([0.2, 0.0], policy)
+        assert run(limited, td, max_concurrency=1).model.label == "positive"
+        assert limited.max_active == 1 and limited.calls == 1  # the hedge waited for the limiter and was dropped
+        assert policy.stats.snapshot()["hedged"] == 1 and policy.stats.snapshot()["wasted_tokens_in"] == 0
+
+        policy = CallPolicy(hedging=True, min_samples=5, min_delay_s=0.01)
+        _warm(policy, "ate", 0.02, 5)
+        stubborn = _StubbornBackbone([0.2, 0.0], policy)
+        assert run(stubborn, td, max_concurrency=2).model.label == "positive"
+        stats = policy.stats.snapshot()
+        assert stubborn.max_active == 2 and stubborn.cancelled == 1
+        assert (stats["hedge_wins"], stats["losers_cancelled"], stats["wasted_tokens_in"], stats["wasted_tokens_out"]) == (1, 1, 10, 5)
+
+
+def test_sync_attempts_hold_their_max_concurrency_slot():
+    with tempfile.TemporaryDirectory() as td:
+        policy = CallPolicy(hedging=True, min_samples=5, min_delay_s=0.01)
+        _warm(policy, "ate", 0.02, 5)
+        limited = _StubbornBackbone([0.2, 0.0], policy)
+        assert _structured(limited, td, max_retries=0, max_concurrency=1).model.label == "positive"
+        time.sleep(0.1)
+        assert limited.max_active == 1 and limited.calls == 1  # the hedge waited for the slot and was dropped
+        assert policy.stats.snapshot()["hedged"] == 1 and policy.stats.snapshot()["wasted_tokens_in"] == 0
+
+        # a timed-out primary keeps running in its thread, so the retry waits for its slot
+        policy = CallPolicy(stage_timeouts_s={"ate": 0.05})
+        stubborn = _StubbornBackbone([0.2, 0.0], policy)
+        result = _structured(stubborn, td, max_concurrency=1)
+        assert result.model.label == "positive" and result.meta.retries == 1
+        stats = policy.stats.snapshot()
+        assert stubborn.max_active == 1 and stubborn.calls == 2
+        assert (stats["timeouts"], stats["wasted_tokens_in"], stats["wasted_tokens_out"]) == (1, 10, 5)
+
+        policy = CallPolicy(hedging=True, min_samples=5, min_delay_s=0.01)
+        _warm(policy, "ate", 0.02, 5)
+        parallel = _StubbornBackbone([0.2, 0.0], policy)
+        assert _structured(parallel, td, max_concurrency=2).model.label == "positive"
+        time.sleep(0.3)
+        assert parallel.max_active == 2 and policy.stats.snapshot()["wasted_tokens_in"] == 10
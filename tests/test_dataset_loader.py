@@ -0,0 +1,101 @@
+import json
+import tempfile
+from pathlib import Path
+
+from data.datasets.loader import (
+    InternalExample,
+    iter_csv_examples,
+    iter_split_examples,
+    load_csv_examples,
+    load_internal_json_dir,
+    load_split_examples,
+)
+
+
+def test_csv_chunked_stream_matches_full_load():
+    tmpdir = Path(tempfile.mkdtemp())
+    csv_path = tmpdir / "valid.csv"
+    csv_path.write_text(
+        "id,text,case_type,lang\n"
+        "a1,서비스가 좋다,conflict,ko\n"
+        ",배송은 느렸다,,\n"
+        "a3,가격이 괜찮다,hard_negation,\n",
+        encoding="utf-8",
+    )
+    full = load_csv_examples(str(csv_path), label_column=None, split="valid", default_language_code="en")
+    streamed = list(iter_csv_examples(str(csv_path), label_column=None, split="valid", default_language_code="en", chunk_rows=1))
+    assert streamed == full
+    assert [ex.uid for ex in full] == ["a1", "valid:1", "a3"]
+    assert [ex.case_type for ex in full] == ["conflict", "unknown", "hard_negation"]
+    assert [ex.language_code for ex in full] == ["ko", "en", "en"]
+
+    data_cfg = {"input_format": "csv", "valid_file": str(csv_path), "label_column": None, "csv_chunk_rows": 2}
+    assert list(iter_split_examples(data_cfg, "valid")) == load_split_examples(data_cfg, "valid")
+
+    numeric = tmpdir / "numeric.csv"
+    numeric.write_text("id,text,label\n1,좋다,positive\n2,별로다,\n,보통,neutral\n10,싫다,negative\n007,괜찮다,positive\n", encoding="utf-8")
+    chunks = [list(iter_csv_examples(str(numeric), chunk_rows=n)) for n in (1, 2, 5)]
+    assert chunks[0] == chunks[1] == chunks[2] == load_csv_examples(str(numeric))
+    assert [ex.uid for ex in chunks[0]] == ["1", "2", "numeric:2", "10", "007"]
+
+
+def test_json_dir_parallel_parse_matches_serial():
+    tmpdir = Path(tempfile.mkdtemp())
+    for i in range(70):
+        turns = [{"Text": f"문장 {i}-{j}", "VerifyEmotionCategory": "기쁨"} for j in range(2)]
+        turns[1]["TextNo"] = 7
+        payload = {"File": {"FileName": f"F{i}"}, "Conversation": turns}
+        (tmpdir / f"f{i:03d}.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    serial = load_internal_json_dir(str(tmpdir), workers=1)
+    parallel = load_internal_json_dir(str(tmpdir), workers=4)
+    assert parallel == serial
+    assert len(serial) == 140
+    # Turns without TextNo fall back to the running example count.
+    assert serial[0].uid == "F0:0" and serial[1].uid == "F0:7" and serial[2].uid == "F1:2"
+
+
+def test_snapshot_cache_roundtrip_and_invalidation():
+    from data.datasets.cache import open_split_snapshot
+
+    tmpdir = Path(tempfile.mkdtemp())
+    csv_path = tmpdir / "valid.csv"
+    csv_path.write_text("id,text,label,score\na1,서비스가 좋다,positive,0.5\na2,배송은 느렸다,,\n", encoding="utf-8")
+    data_cfg = {
+        "input_format": "csv",
+        "valid_file": str(csv_path),
+        "snapshot_cache": True,
+        "snapshot_cache_root": str(tmpdir / "cache"),
+    }
+    parsed = list(iter_csv_examples(str(csv_path), split="valid"))
+
+    first = open_split_snapshot(data_cfg, "valid")
+    second = open_split_snapshot(data_cfg, "valid")
+    assert (first.hit, second.hit) == (False, True) and first.key == second.key
+    assert list(second) == parsed and second[-1] == parsed[-1]
+    assert load_split_examples(data_cfg, "valid") == parsed
+
+    csv_path.write_text("id,text,label\na1,가격이 괜찮다,neutral\n", encoding="utf-8")
+    changed = open_split_snapshot(data_cfg, "valid")
+    assert changed.key != first.key and not changed.hit
+    assert [ex.text for ex in changed] == ["가격이 괜찮다"]
+
+
+def test_snapshot_is_written_in_chunks():
+    from data.datasets.cache import DatasetSnapshot, _write_snapshot
+
+    rows = [
+        InternalExample(uid=f"u{i}", text="좋다" * i, split="test", label=None if i % 2 else "positive",
+                        target="배송" if i == 3 else None, span=(i, i + 2) if i % 3 == 0 else (0.5, 1.25) if i == 4 else None,
+                        metadata={"i": i} if i else None)
+        for i in range(7)
+    ]
+    tmpdir = Path(tempfile.mkdtemp())
+    for chunk_rows in (1, 3, 100):
+        target = tmpdir / f"snap{chunk_rows}"
+        consumed = []
+        assert _write_snapshot((consumed.append(ex) or ex for ex in rows), target, {"split": "test"}, chunk_rows=chunk_rows)
+        assert list(DatasetSnapshot(target, key="k", hit=False)) == rows == consumed
+    assert _write_snapshot(iter(()), tmpdir / "empty", {}) and len(DatasetSnapshot(tmpdir / "empty", key="k", hit=False)) == 0
+    assert not _write_snapshot(rows[:1] + [InternalExample(uid="x", text="t", metadata={"bad": object()})], tmpdir / "bad", {})
+    assert not (tmpdir / "bad").exists() and sorted(p.name for p in tmpdir.iterdir()) == ["empty", "snap1", "snap100", "snap3"]
@@ -0,0 +1,99 @@
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from agents import SupervisorAgent
+from schemas import ATEOutput
+from tools.backbone_client import BackboneClient, _backoff_wait
+from tools.data_tools import InternalExample
+from tools.deadline import Deadline, DeadlineExceeded, deadline_scope
+from tools.llm_runner import run_structured
+
+_TEXT = "배송은 빨랐지만 포장이 엉망이었다"
+
+
+class _SleepyBackbone(BackboneClient):
+    """Mock responses after a fixed delay per call (slow_stages sleep `slow` seconds instead)."""
+
+    def __init__(self, delay, slow_stages=(), slow=0.0):
+        super().__init__(provider="mock")
+        self.delay, self.slow_stages, self.slow = delay, slow_stages, slow
+
+    def generate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        time.sleep(self.slow if any(s in mode for s in self.slow_stages) else self.delay)
+        return self._mock_generate(messages, mode=mode, response_format=response_format)
+
+
+def _run(budget_s):
+    with tempfile.TemporaryDirectory() as td:
+        config = {"deadline": {"reserve_s": 0.0, "call_estimate_s": 0.05}, "errors_path": str(Path(td) / "errors.jsonl")}
+        agent = SupervisorAgent(backbone=_SleepyBackbone(0.05), config=config, run_id="deadline")
+        return agent.run(InternalExample(uid="d1", text=_TEXT, language_code="ko"), deadline=budget_s)
+
+
+def test_degradation_order_debate_rounds_then_stage2_then_validator():
+    # Stage1 = 3 calls (~0.15s); one debate round = 3 calls; judge + Stage2 = 4 calls.
+    one_round = _run(0.58)
+    assert one_round.meta["deadline"]["degraded_stages"] == ["debate_rounds"]
+    assert len(one_round.debate.rounds) == 1 and one_round.analysis_flags.stage2_executed
+
+    no_stage2 = _run(0.25)
+    assert no_stage2.meta["deadline"]["degraded_stages"] == ["debate", "stage2"]
+    assert no_stage2.debate is None and not no_stage2.analysis_flags.stage2_executed
+    assert {t.stage for t in no_stage2.process_trace} == {"stage1", "moderator"}
+    assert no_stage2.final_result.final_aspects
+
+    minimal = _run(0.12)
+    assert minimal.meta["deadline"]["degraded_stages"] == ["validator", "debate", "stage2"]
+    validator_trace = [t for t in minimal.process_trace if t.agent == "Validator"]
+    assert validator_trace[0].notes == "validator_degraded"
+    assert minimal.meta["deadline"]["elapsed_s"] < 0.2
+
+    with tempfile.TemporaryDirectory() as td:
+        agent = SupervisorAgent(config={"errors_path": str(Path(td) / "errors.jsonl")}, run_id="deadline")
+        unbounded = agent.run(InternalExample(uid="d1", text=_TEXT))
+    assert "deadline" not in unbounded.meta
+
+
+def test_arun_deadline_bounds_slow_stage2_calls():
+    backbone = _SleepyBackbone(0.0, slow_stages=("reanalysis",), slow=0.5)
+
+    async def scenario(errors_path):
+        agent = SupervisorAgent(backbone=backbone, config={"enable_debate": False, "errors_path": errors_path}, run_id="deadline_async")
+        started = time.monotonic()
+        result = await agent.arun(InternalExample(uid="d2", text=_TEXT, language_code="ko"), deadline=0.2)
+        return result, time.monotonic() - started
+
+    with tempfile.TemporaryDirectory() as td:
+        result, elapsed = asyncio.run(scenario(str(Path(td) / "errors.jsonl")))
+    assert elapsed < 0.4
+    assert result.meta["deadline"]["degradations"][0]["stage"] == "stage2"
+    assert result.meta["deadline"]["degradations"][0]["reason"] == "deadline_exceeded"
+    assert [t.stage for t in result.process_trace].count("stage2") == 0
+
+
+def test_run_structured_stops_retrying_at_deadline():
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    with tempfile.TemporaryDirectory() as td:
+        errors_path = Path(td) / "errors.jsonl"
+        try:
+            run_structured(
+                backbone=BackboneClient(provider="mock"), system_prompt="{}", user_text="좋다", schema=ATEOutput,
+                run_id="dl", text_id="t1", stage="ATE", errors_path=str(errors_path), deadline=deadline,
+            )
+        except DeadlineExceeded:
+            pass
+        else:  # pragma: no cover
+            raise AssertionError("expected DeadlineExceeded")
+        assert '"type": "deadline_exceeded"' in errors_path.read_text(encoding="utf-8")
+
+    with deadline_scope(Deadline(1.0)):
+        try:
+            _backoff_wait(1, RuntimeError("429"))
+        except DeadlineExceeded:
+            pass
+        else:  # pragma: no cover
+            raise AssertionError("a 2s backoff must not start with 1s left")
+    assert Deadline.coerce(None) is None and Deadline.coerce(0) is None and Deadline.coerce(1.5).budget_s == 1.5
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules the agent entry point must not import (pandas alone adds ~0.3s to every subprocess); this is the
+# gate, the measured `python -X importtime` total is only reported since wall clock varies across runners.
+HEAVY_MODULES = ("pandas", "numpy", "torch", "transformers", "evaluate", "data.datasets.cache")
+
+
+def _importtime(statement):
+    """{module: cumulative seconds} for a fresh interpreter running `statement`."""
+    code = statement + "; import sys; print('\\n'.join(sys.modules))"
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times, set(proc.stdout.split())
+
+
+def test_supervisor_import_stays_light():
+    times, modules = _importtime("from agents import SupervisorAgent")
+    assert not [m for m in HEAVY_MODULES if m in modules], sorted(m for m in HEAVY_MODULES if m in modules)
+    print(f"import agents: {times['agents']:.3f}s cumulative (python -X importtime)")
+
+
+def test_lazy_package_exports_resolve_on_access():
+    _, modules = _importtime("import tools, tools.data_tools, data.datasets")
+    assert "tools.data_tools.data_loader" not in modules and "data.datasets.cache" not in modules
+    _, modules = _importtime("from tools import InternalExample, validate_labels; from data.datasets import open_split_snapshot")
+    assert {"tools.data_tools.data_loader", "tools.data_tools.label_schema", "data.datasets.cache"} <= modules
+    assert "pandas" not in modules
@@ -319,5 +319,45 @@ def test_intentional_failure_demo_overlap_with_eval():
         assert "overlap" in str(e).lower() or "intersect" in str(e).lower()
 
 
+# ---------- Test near-duplicate (MinHash/LSH) demo filtering ----------
+
+
+def test_near_duplicate_index_catches_decorated_repost():
+    """Reposts differing only by emoji/punctuation/spacing are near-duplicates; unrelated text is not."""
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.near_duplicate import NearDuplicateIndex
+
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("eval1", "배송이 정말 빠르고 포장도 꼼꼼해서 만족스러웠어요 다음에도 구매할게요")
+    index.add("eval2", "화면이 너무 어둡고 배터리가 빨리 닳아요")
+
+    matches = index.query("배송이 정말 빠르고, 포장도 꼼꼼해서 만족스러웠어요!! 다음에도 구매할게요 😍😍", query_key="demo1")
+    assert [m.key for m in matches] == ["eval1"]
+    assert matches[0].jaccard >= 0.8
+    assert index.query("가격 대비 성능이 좋습니다") == []
+
+
+def test_demo_sampler_forbid_near_duplicates():
+    """DemoSampler excludes pool examples that near-duplicate an eval text."""
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.demo_sampler import DemoSampler
+    from tools.near_duplicate import NearDuplicateIndex
+    from data.datasets.loader import InternalExample
+
+    demo_pool = [
+        InternalExample(uid="demo1", text="음식이 맛있고 직원분들이 친절했어요!!!", split="train"),
+        InternalExample(uid="demo2", text="주차 공간이 좁아서 불편했습니다", split="train"),
+    ]
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("valid1", "음식이 맛있고 직원분들이 친절했어요")
+
+    result = DemoSampler(demo_pool).sample_with_stats(k=2, seed=42, forbid_near_duplicates=index)
+    assert result.removed_by_near_duplicate == 1
+    assert result.total_excluded == 1
+    assert [d.uid for d in result.demos] == ["demo2"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from metrics.scorecard import extract_final_triplets, extract_stage1_triplets
+from scripts.scorecard_from_smoke import make_scorecard
+from tools.output_index import (
+    OutputIndexWriter,
+    OutputStore,
+    index_path_for,
+    iter_jsonl_with_offsets,
+    load_output_index,
+)
+
+
+def _entry(uid, polarity="positive"):
+    return {
+        "meta": {"text_id": uid, "input_text": "배송이 빨랐어요", "run_id": "r1", "mode": "proposed"},
+        "stage1_ate": {"aspects": [{"term": "배송"}]},
+        "stage1_atsa": {"aspect_sentiments": [{"aspect_ref": "배송", "polarity": "negative"}]},
+        "final_result": {
+            "label": polarity,
+            "final_aspects": [{"aspect_ref": "배송", "opinion_term": {"term": "빨랐"}, "polarity": polarity}],
+        },
+        "process_trace": [
+            {"stage": "stage1", "agent": "ATSA", "output": {"aspect_sentiments": [{"aspect_ref": "배송", "polarity": "negative"}]}},
+        ],
+    }
+
+
+def _write(path, rows):
+    with path.open("w", encoding="utf-8", newline="\n") as f_out, index_path_for(path).open("w", encoding="utf-8", newline="\n") as f_index:
+        writer = OutputIndexWriter(f_out, f_index, file_name=path.name)
+        return [writer.write(row["meta"]["text_id"], row) for row in rows]
+
+
+def test_writer_offsets_match_file_and_store_seeks_by_ref():
+    rows = [_entry("t:0"), _entry("t:1", "negative"), _entry("t:2")]
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(td) / "outputs.jsonl"
+        refs = _write(path, rows)
+        assert [(r["offset"], r["length"]) for r in refs] == [(o, n) for o, n, _ in iter_jsonl_with_offsets(path)]
+        assert load_output_index(path)["t:1"] == (refs[1]["offset"], refs[1]["length"])
+        with OutputStore(Path(td)) as store:
+            for ref, row in zip(refs, rows):
+                assert store.for_scorecard({"runtime": {"output_ref": ref}}) == row
+            stale = dict(refs[2], offset=refs[0]["offset"], length=refs[0]["length"])
+            assert store.for_scorecard({"runtime": {"output_ref": stale}}) == rows[2]  # uid mismatch -> index
+        manifest = str(Path(td) / "manifest.json")
+        assert OutputStore().for_scorecard({"meta": {"manifest_path": manifest}, "runtime": {"output_ref": refs[1]}}) == rows[1]
+
+
+def test_index_is_rebuilt_when_missing():
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(td) / "smoke_outputs.jsonl"
+        refs = _write(path, [_entry("a"), _entry("b")])
+        index_path_for(path).unlink()
+        assert OutputStore(Path(td)).get(path, "b") == _entry("b")
+        assert index_path_for(path).exists()
+        assert load_output_index(path)["b"] == (refs[1]["offset"], refs[1]["length"])
+
+
+def test_scorecard_with_ref_keeps_triplets_of_embedded_scorecard():
+    entry = _entry("t:0")
+    buf = io.StringIO()
+    ref = OutputIndexWriter(buf).write("t:0", entry)
+    embedded = make_scorecard(entry)
+    referenced = make_scorecard(entry, output_ref=ref)
+    assert embedded["runtime"]["parsed_output"] is entry
+    assert "parsed_output" not in referenced["runtime"] and referenced["runtime"]["output_ref"] == ref
+    assert extract_stage1_triplets(referenced) == extract_stage1_triplets(embedded) == {("배송", "", "negative")}
+    assert extract_final_triplets(referenced) == extract_final_triplets(embedded)
+    assert OutputStore().for_scorecard(embedded) is entry
+    assert len(json.dumps(referenced, ensure_ascii=False)) < len(json.dumps(embedded, ensure_ascii=False))
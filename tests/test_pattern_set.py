@@ -0,0 +1,31 @@
+from agents.specialized_agents.validator_agent import ValidatorAgent
+from tools.pattern_set import AhoCorasick, get_pattern_set
+
+
+def test_aho_corasick_matches_naive_substring_scan():
+    patterns = ["지만", "는데", "하지만", "데", "만"]
+    text = "맛은 좋지만 가격은 비싼데 하지만"
+    ac = AhoCorasick(patterns)
+    assert ac.matched_ids(text) == [i for i, p in enumerate(patterns) if p in text]
+    # list-order priority, leftmost occurrence of that pattern
+    assert ac.first_by_priority(text) == (text.find("지만"), 0)
+    assert not AhoCorasick(["그러나"]).contains_any(text)
+
+
+def test_pattern_set_korean_lookups():
+    ps = get_pattern_set("ko")
+    assert get_pattern_set("ko") is ps
+    assert ps.has_contrast("배송은 빨랐다. 하지만 포장이 별로")
+    assert not ps.has_contrast("배송이 빠르다")
+    assert ps.first_contrast("맛은 좋지만 비싸다") == ("맛은 좋지만 비싸다".find("지만"), "지만")
+    assert ps.strip_topic_suffix("배송은") == "배송"
+    assert ps.strip_topic_suffix("은") == "은"
+    assert ps.synonyms_for("배송비") == ["배송", "배달", "출고"]
+    assert ps.synonyms_for("가") == ["가격", "비용", "가성비", "금액"]
+
+
+def test_negation_trigger_uses_compiled_patterns():
+    assert ValidatorAgent._contains_negation_trigger("서비스가 별로 안 좋다", language_code="ko")
+    assert not ValidatorAgent._contains_negation_trigger("서비스가 매우 좋다", language_code="ko")
+    assert ValidatorAgent._contains_negation_trigger("it is not good", language_code="en")
+    assert ValidatorAgent._contains_negation_trigger("좋지 않다", triggers=["지 않"])
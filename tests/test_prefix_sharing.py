@@ -0,0 +1,97 @@
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from schemas import ATEOutput
+from tools.backbone_client import BackboneClient
+from tools.llm_runner import arun_structured, prefix_scope, run_structured
+
+_OK = json.dumps({"label": "positive", "confidence": 0.9, "rationale": "ok"})
+
+
+class _CountingBackbone(BackboneClient):
+    def __init__(self):
+        super().__init__(provider="mock")
+        self.calls = 0
+
+    def generate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        self.calls += 1
+        return _OK, {"tokens_in": 1, "tokens_out": 1, "cost_usd": None}
+
+
+def _kwargs(backbone, td, stage="ATE", user_text="좋다"):
+    return dict(
+        backbone=backbone, system_prompt="{}", user_text=user_text, schema=ATEOutput, max_retries=0,
+        run_id="prefix", text_id="t1", stage=stage, errors_path=str(Path(td) / "errors.jsonl"),
+    )
+
+
+def test_prefix_scope_reuses_identical_calls_only_inside_the_scope():
+    backbone = _CountingBackbone()
+    with tempfile.TemporaryDirectory() as td:
+        with prefix_scope() as memo:
+            first = run_structured(**_kwargs(backbone, td))
+            again = run_structured(**_kwargs(backbone, td))
+            run_structured(**_kwargs(backbone, td, stage="ATSA"))
+            run_structured(**_kwargs(backbone, td, user_text="별로다"))
+            reused_async = asyncio.run(arun_structured(**_kwargs(backbone, td)))
+        outside = run_structured(**_kwargs(backbone, td))
+
+    assert backbone.calls == 4  # ATE once in scope, ATSA, other text, then outside the scope
+    assert (memo.calls, memo.shared) == (5, 2)
+    assert not first.meta.prefix_shared and again.meta.prefix_shared and reused_async.meta.prefix_shared
+    assert not outside.meta.prefix_shared
+    assert json.loads(again.meta.to_notes_str())["prefix_shared"] is True
+    assert "prefix_shared" not in json.loads(first.meta.to_notes_str())
+    again.model.label = "negative"  # each caller owns its copy
+    assert first.model.label == "positive"
+
+
+def test_plan_mode_runs_modes_and_ablation_variants():
+    sys.path.insert(0, str(Path(__file__).parent.parent / "experiments" / "scripts"))
+    from run_experiments import _plan_mode_runs
+
+    cfg = {"pipeline": {"enable_debate": True, "enable_stage2": True}, "backbone": {"provider": "mock"}}
+    assert [r.name for r in _plan_mode_runs("all", cfg, "base.yaml", "r")] == ["proposed", "bl1", "bl2", "bl3"]
+
+    with tempfile.TemporaryDirectory() as td:
+        variant = Path(td) / "abl_no_debate.yaml"
+        variant.write_text("run_mode: abl_no_debate\npipeline:\n  enable_debate: false\n", encoding="utf-8")
+        runs = _plan_mode_runs("proposed,bl3", cfg, "base.yaml", "r", ablation_configs=[str(variant)])
+
+    assert [(r.name, r.runner_mode, r.run_id) for r in runs] == [
+        ("proposed", "proposed", "r_proposed"),
+        ("bl3", "bl3", "r_bl3"),
+        ("abl_no_debate", "proposed", "r_abl_no_debate"),
+    ]
+    assert runs[2].cfg["pipeline"] == {"enable_debate": False, "enable_stage2": True}
+    assert runs[2].cfg_hash != runs[0].cfg_hash and runs[0].cfg_hash == runs[1].cfg_hash
+    try:
+        _plan_mode_runs("proposed,bl9", cfg, "base.yaml", "r")
+    except ValueError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("unknown modes must be rejected")
+
+
+def test_ablation_variants_share_proposed_demos_and_error_log():
+    sys.path.insert(0, str(Path(__file__).parent.parent / "experiments" / "scripts"))
+    from run_experiments import _mode_demo_k, _plan_mode_runs
+    from metrics.results_index import _errors_log_path
+
+    cfg = {"pipeline": {"enable_debate": True}, "backbone": {"provider": "mock"}, "demo": {"k": 2}}
+    with tempfile.TemporaryDirectory() as td:
+        variant = Path(td) / "abl_no_debate_override.yaml"
+        variant.write_text("pipeline:\n  enable_debate: false\n", encoding="utf-8")
+        runs = _plan_mode_runs("proposed,bl1", cfg, "base.yaml", "r", ablation_configs=[str(variant)])
+
+    for enabled_for, force, expected in (([], False, [0, 2, 0]), ([], True, [2, 2, 2]), (["proposed"], False, [2, 0, 2]), (["bl1"], False, [0, 2, 0])):
+        assert [_mode_demo_k(r.runner_mode, 2, enabled_for, force) for r in runs] == expected
+
+    variant_run = runs[2]
+    assert variant_run.errors_path == "experiments/results/proposed/r_abl_no_debate_override/errors_r_abl_no_debate_override.jsonl"
+    manifest = {"run_id": variant_run.run_id, "mode": variant_run.name, "runner_mode": variant_run.runner_mode}
+    assert _errors_log_path(manifest).as_posix().endswith(variant_run.errors_path)
+    assert _errors_log_path({**manifest, "errors_path": "/tmp/errors.jsonl"}) == Path("/tmp/errors.jsonl")
@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+
+from agents.supervisor_agent import SupervisorAgent
+from evaluation.replay import (
+    case_from_output,
+    make_replayer,
+    override_grid,
+    replay,
+    replay_case,
+    sweep_override_thresholds,
+)
+from tools.data_tools import InternalExample
+
+_TEXTS = ["배송은 빨랐지만 포장이 엉망이었다", "가격 대비 맛이 정말 좋다", "서비스가 별로 안 좋다"]
+
+
+def _saved_rows(config=None):
+    agent = SupervisorAgent(config=config or {}, run_id="replay_test")
+    rows = []
+    for i, text in enumerate(_TEXTS):
+        result = agent.run(InternalExample(uid=f"rp{i}", text=text))
+        rows.append(json.loads(json.dumps(result.model_dump(), ensure_ascii=False)))  # as read back from outputs.jsonl
+    return rows
+
+
+def test_replay_reproduces_saved_decisions():
+    for config in ({}, {"enable_stage2": False}):
+        rows = _saved_rows(config)
+        cases = [case_from_output(row) for row in rows]
+        replayed = replay(cases, make_replayer(config))
+        assert all(r["matches_saved"] for r in replayed)
+        assert [r["override_stats"] for r in replayed] == [row["meta"].get("debate_override_stats") for row in rows]
+
+    baseline_row = {"meta": {"mode": "bl2"}, "process_trace": []}
+    assert case_from_output(baseline_row) is None
+
+
+def test_sweep_matches_replaying_every_grid_point():
+    row = _saved_rows()[0]
+    gold = [{"aspect_ref": a["aspect_ref"], "polarity": "negative"} for a in row["final_result"]["final_aspects"]]
+    case = case_from_output(row, gold)
+    aspect = next(iter(case.debate_review_context["aspect_hints"]))
+    case.debate_review_context["aspect_hints"] = {
+        aspect: [
+            {"speaker": "a", "stance": "con", "weight": 1.0, "polarity_hint": "negative"},
+            {"speaker": "b", "stance": "con", "weight": 1.0, "polarity_hint": "negative"},
+            {"speaker": "c", "stance": "pro", "weight": 0.6, "polarity_hint": "positive"},
+        ]
+    }
+    grid = override_grid({"min_total": [1.0, 2.6, 3.0], "min_margin": [0.5, 1.5], "min_target_conf": [0.7, 0.95]})
+    assert grid.shape == (12, 3)
+
+    swept = sweep_override_thresholds([case], grid)
+    for point, row_out in zip(grid, swept):
+        decision, stats = replay_case(make_replayer(override_cfg=dict(zip(("min_total", "min_margin", "min_target_conf"), point))), case)
+        assert row_out["override_applied"] == stats["applied"]
+        assert row_out["label_changed"] == int(decision.moderator.final_label != case.saved_label)
+    f1 = np.array([r["ap_f1"] for r in swept])
+    # the override (negative hint) only fires when total 2.6 >= min_total and margin 1.4 >= min_margin
+    fired = (grid[:, 0] <= 2.6) & (grid[:, 1] <= 1.4)
+    assert f1[fired].min() > f1[~fired].max()
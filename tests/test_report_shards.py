@@ -0,0 +1,51 @@
+import json
+import tempfile
+from pathlib import Path
+
+from metrics.report_shards import EXAMPLE_COLUMNS, build_example_shards, explorer_html, read_shard
+
+
+def _sent(polarity):
+    return {"aspect_ref": "배송", "opinion_term": {"term": "빠르다"}, "polarity": polarity}
+
+
+def _write_run(run_dir, n):
+    run_dir.mkdir()
+    with (run_dir / "scorecards.jsonl").open("w", encoding="utf-8") as f:
+        for i in range(n):
+            card = {
+                "meta": {"text_id": f"u{i}", "split": "valid" if i < 4 else "test", "case_type": "negation" if i % 2 else "plain", "input_text": f"배송 {i}"},
+                "inputs": {"aspect_sentiments": [_sent("negative" if i == 2 else "positive")]},
+                "validator": [{"stage": "stage1", "structural_risks": [{"risk_id": "NEGATION_SCOPE", "severity": "high"}] if i == 3 else []}],
+                "runtime": {"flags": {"error": "TimeoutError: llm"} if i == 5 else {}},
+            }
+            if i != 6:
+                card["gold_triplets"] = [_sent("positive")]
+            f.write(json.dumps(card, ensure_ascii=False) + "\n")
+
+
+def test_shards_hold_rows_filters_and_traces():
+    with tempfile.TemporaryDirectory() as td:
+        run_dir, data = Path(td) / "run", Path(td) / "reports" / "data"
+        _write_run(run_dir, 7)
+        data.mkdir(parents=True)
+        (data / "examples-0009.js").write_text("stale", encoding="utf-8")
+        assert build_example_shards(run_dir / "scorecards.jsonl", data, run_dir, shard_size=3) == {"n": 7, "n_shards": 3, "dir": str(data)}
+        assert sorted(p.name for p in data.iterdir()) == [
+            "examples-0000.js", "examples-0001.js", "examples-0002.js", "index.js", "traces-0000.js", "traces-0001.js", "traces-0002.js",
+        ]
+        index = read_shard(data / "index.js")
+        assert index["n"] == 7 and index["columns"] == list(EXAMPLE_COLUMNS)
+        assert index["facets"]["split"] == {"values": ["valid", "test"], "counts": [4, 3]}
+        assert index["facets"]["risk"] == {"values": ["NEGATION_SCOPE"], "counts": [1]}
+        assert index["filters"]["mismatch"] == [0, 0, 1, 0, 0, 0, None]
+        assert index["filters"]["error"] == [0, 0, 0, 0, 0, 1, 0]
+        assert index["filters"]["risk"][3] == [0] and index["filters"]["case_type"][:2] == [0, 1]
+
+        row = dict(zip(index["columns"], read_shard(data / "examples-0000.js")["rows"][2]))
+        assert row["uid"] == "u2" and row["mismatch"] is True and row["f1"] == 0.0 and row["input"] == "배송 2"
+        trace = read_shard(data / "traces-0001.js")["rows"][0]
+        assert trace["uid"] == "u3" and trace["risks"] == [{"stage": "stage1", "risk_id": "NEGATION_SCOPE", "severity": "high"}]
+        assert trace["triplets"]["gold"] == [["배송", "빠르다", "positive"]]
+
+    assert 'data-src="data"' in explorer_html()
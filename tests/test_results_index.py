@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from metrics.results_index import connect, error_taxonomy, ingest_runs, metric_history, prediction_diff
+
+
+def _card(uid, polarity, label="positive", error=None):
+    card = {
+        "meta": {"text_id": uid, "split": "valid", "latency_ms": 10},
+        "inputs": {"aspect_sentiments": [{"aspect_ref": "배송", "opinion_term": {"term": "빨랐"}, "polarity": polarity}]},
+        "moderator": {"final_label": label},
+        "summary": {"quality_pass": True},
+    }
+    if error:
+        card["runtime"] = {"flags": {"error": error}}
+    return card
+
+
+def _write_run(root, name, cards, cfg_hash="c1"):
+    run_dir = Path(root) / name
+    run_dir.mkdir(exist_ok=True)
+    manifest = {"run_id": name, "mode": "proposed", "cfg_hash": cfg_hash, "timestamp_utc": f"2026-01-0{len(name) % 9 + 1}T00:00:00Z"}
+    (run_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    (run_dir / "scorecards.jsonl").write_text("".join(json.dumps(c, ensure_ascii=False) + "\n" for c in cards), encoding="utf-8")
+    return run_dir
+
+
+def test_ingest_is_incremental_and_replaces_changed_runs():
+    with tempfile.TemporaryDirectory() as td:
+        _write_run(td, "r1", [_card("a", "positive"), _card("b", "negative")])
+        r2 = _write_run(td, "r2", [_card("a", "positive")])
+        conn = connect(Path(td) / "index.sqlite")
+        assert set(ingest_runs(conn, [td]).values()) == {"added"}
+        assert set(ingest_runs(conn, [td]).values()) == {"unchanged"}
+        os.utime(r2 / "scorecards.jsonl", ns=(1, 1))  # same bytes, new stat -> hash check only
+        assert set(ingest_runs(conn, [td]).values()) == {"unchanged"}
+        _write_run(td, "r2", [_card("a", "positive"), _card("b", "positive")])
+        status = ingest_runs(conn, [td])
+        assert status[str(r2.resolve())] == "updated"
+        assert conn.execute("SELECT COUNT(*) FROM examples WHERE run_dir = ?", (str(r2.resolve()),)).fetchone()[0] == 2
+        conn.close()
+
+
+def test_prediction_diff_error_taxonomy_and_history():
+    with tempfile.TemporaryDirectory() as td:
+        _write_run(td, "r1", [_card("a", "positive"), _card("b", "negative"), _card("c", "neutral", error="TimeoutError: timed out")])
+        _write_run(td, "r22", [_card("a", "positive"), _card("b", "positive", label="negative"), _card("c", "neutral", error="429 Too Many Requests")], cfg_hash="c2")
+        conn = connect(Path(td) / "index.sqlite")
+        ingest_runs(conn, [td])
+        diff = prediction_diff(conn, "r1", "r22")
+        assert diff["uid"].tolist() == ["b"]
+        assert json.loads(diff["triplets_b"][0]) == [["배송", "빨랐", "positive"]]
+        assert prediction_diff(conn, "r1", "r22", split="test").empty
+        taxonomy = error_taxonomy(conn)
+        assert sorted(zip(taxonomy["run_id"], taxonomy["error_category"])) == [("r1", "timeout"), ("r22", "429_rate_limit")]
+        history = metric_history(conn, by="cfg_hash")
+        assert history["cfg_hash"].tolist() == ["c1", "c2"] and history["n_rows"].tolist() == [3, 3]
+        assert history["pass_rate"].tolist() == [1.0, 1.0]
+        conn.close()
@@ -0,0 +1,126 @@
+import json
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from metrics.run_tables import (
+    build_run_tables,
+    final_triplet_keys,
+    load_run_tables,
+    map_runs,
+    mean_std_frame,
+    paper_run_metrics,
+    pyarrow,
+    self_consistency_exact,
+    self_consistency_from_keys,
+    write_run_tables,
+)
+
+
+def _sent(aspect, polarity, opinion="좋다"):
+    return {"aspect_ref": aspect, "opinion_term": {"term": opinion}, "polarity": polarity}
+
+
+def _card(uid, split, final, stage1=None, gold=None, **extra):
+    card = {
+        "meta": {"text_id": uid, "split": split, "latency_ms": extra.pop("latency_ms", 10)},
+        "inputs": {"aspect_sentiments": final},
+        "runtime": {"tokens_in": 100, "tokens_out": 20, "cost_usd": 0.5},
+        "summary": {"quality_pass": True},
+    }
+    if "case_type" in extra:
+        card["meta"]["case_type"] = extra.pop("case_type")
+    if stage1 is not None:
+        card["runtime"]["process_trace"] = [{"stage": "stage1", "agent": "ATSA", "output": {"aspect_sentiments": stage1}}]
+    if gold is not None:
+        card["gold_triplets"] = gold
+    card.update(extra)
+    return card
+
+
+def _write_run(root, name, cards, outputs=()):
+    run_dir = Path(root) / name
+    run_dir.mkdir()
+    (run_dir / "manifest.json").write_text(json.dumps({"run_id": name}), encoding="utf-8")
+    for file_name, rows in (("scorecards.jsonl", cards), ("outputs.jsonl", outputs)):
+        with (run_dir / file_name).open("w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return run_dir
+
+
+def test_paper_run_metrics_on_columnar_tables():
+    cards = [
+        _card("a", "valid", [_sent("배송", "positive")], stage1=[_sent("배송", "negative")], gold=[_sent("배송", "positive")], case_type="contrast"),
+        _card("b", "valid", [_sent("가격", "positive"), _sent("가격", "negative", "별로")], flags={"parse_failed": True}, latency_ms=30),
+        _card("c", "test", [], gold=[_sent("맛", "neutral")]),
+    ]
+    with tempfile.TemporaryDirectory() as td:
+        tables = load_run_tables(_write_run(td, "r1", cards))
+    assert list(tables["triplets"]["source"]).count("gold") == 2
+    metrics, cases = paper_run_metrics(tables, {"valid"})
+    assert metrics["included_row_count"] == 2 and metrics["pass_rate"] == 1.0
+    assert metrics["polarity_conflict_rate"] == 0.5 and metrics["parse_failure_rate"] == 0.5
+    assert metrics["latency_ms_mean"] == 20 and isinstance(metrics["latency_ms_mean"], int)
+    assert metrics["tokens_in_mean"] == 100 and metrics["cost_usd_std"] == 0.0
+    assert (metrics["f1_stage1"], metrics["f1_stage2"], metrics["delta_f1"]) == (0.0, 1.0, 1.0)
+    assert metrics["correction_rate"] == 1.0 and metrics["degradation_rate"] == 0.0
+    assert cases["case_type"].tolist() == ["contrast", None]
+    assert cases["final_triplet_count"].tolist() == [1, 2] and cases["stage1_triplet_count"].tolist() == [1, 2]
+    all_metrics, _ = paper_run_metrics(tables, set())
+    assert all_metrics["included_row_count"] == 3 and all_metrics["valid_aspect_rate"] == 2 / 3
+
+
+def test_self_consistency_and_seed_mean_std():
+    same = [_card("a", "valid", [_sent("배송", "positive")]), _card("b", "valid", [])]
+    changed = [_card("a", "valid", [_sent("배송", "negative")]), _card("b", "valid", []), _card("z", "valid", [])]
+    with tempfile.TemporaryDirectory() as td:
+        runs = [load_run_tables(_write_run(td, name, cards)) for name, cards in (("r1", same), ("r2", same), ("r3", changed))]
+    assert self_consistency_exact(runs[:2], {"valid"}) == 1.0
+    assert self_consistency_exact(runs, {"valid"}) == 0.5
+    assert self_consistency_exact(runs, {"test"}) is None
+    stats = mean_std_frame([{"f1": "0.5", "n": "N/A", "_seed": "s1"}, {"f1": "1.0", "n": "", "_seed": "s2"}])
+    assert list(stats.index) == ["f1"] and stats.at["f1", "mean"] == 0.75 and stats.at["f1", "std"] == 0.25
+
+
+def test_map_runs_in_worker_processes_merges_like_serial():
+    same = [_card("a", "valid", [_sent("배송", "positive")]), _card("b", "valid", [])]
+    changed = [_card("a", "valid", [_sent("배송", "negative")]), _card("b", "valid", [])]
+    with tempfile.TemporaryDirectory() as td:
+        run_dirs = [_write_run(td, name, cards) for name, cards in (("r1", same), ("r2", same), ("r3", changed))]
+        parallel = map_runs(load_run_tables, run_dirs, workers=2)
+        serial = map_runs(load_run_tables, run_dirs, workers=1)
+    for a, b in zip(parallel, serial):
+        pd.testing.assert_frame_equal(a["triplets"], b["triplets"])
+    keys = [final_triplet_keys(tables, {"valid"}) for tables in parallel]
+    assert self_consistency_from_keys(keys) == self_consistency_exact(serial, {"valid"}) == 0.5
+    assert self_consistency_from_keys([]) is None
+
+
+def test_trace_calls_errors_and_parquet_export():
+    cm = {"retries": 2, "tokens_in": 5, "served_model": "m", "error": "timeout: 30s"}
+    outputs = [
+        {"meta": {"uid": "a"}, "process_trace": [{"stage": "stage1", "agent": "ATE", "output": {}, "call_metadata": cm}]},
+        {"meta": {"uid": "b"}, "process_trace": [{"stage": "stage1", "agent": "ATE", "output": {}, "notes": json.dumps(cm)}]},
+    ]
+    cards = [_card("a", "valid", [], runtime={"flags": {"error": "parse_error: bad json"}}), _card("b", "valid", [])]
+    with tempfile.TemporaryDirectory() as td:
+        run_dir = _write_run(td, "r1", cards, outputs)
+        tables = build_run_tables(run_dir)
+        calls, errors = tables["trace_calls"], tables["errors"]
+        assert calls["retries"].tolist() == [2, 2] and calls["served_model"].tolist() == ["m", "m"]
+        assert sorted(errors["level"]) == ["call", "call", "example"]
+        assert set(errors["error_type"]) == {"timeout", "parse_error"}
+        if pyarrow is None:
+            try:
+                write_run_tables(tables, run_dir / "derived" / "tables")
+            except RuntimeError as e:
+                assert "pyarrow" in str(e)
+            else:
+                raise AssertionError("expected RuntimeError")
+            return
+        write_run_tables(tables, run_dir / "derived" / "tables")
+        cached = load_run_tables(run_dir, tables=("examples", "trace_calls"))
+        assert isinstance(cached["trace_calls"]["agent"].dtype, pd.CategoricalDtype)
+        assert cached["examples"]["uid"].tolist() == ["a", "b"]
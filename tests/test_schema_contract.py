@@ -41,7 +41,7 @@ def test_supervisor_always_runs_stage2_with_repair():
         errors_file = Path(td) / "errors.jsonl"
 
         def patched_run_structured(*args, **kwargs):
-            kwargs.setdefault("errors_path", str(errors_file))
+            kwargs["errors_path"] = kwargs.get("errors_path") or str(errors_file)
             return orig_run_structured(*args, **kwargs)
 
         # Manual patching
@@ -54,7 +54,7 @@ def test_supervisor_always_runs_stage2_with_repair():
         atsa_mod.run_structured = patched_run_structured
         val_mod.run_structured = patched_run_structured
 
-        supervisor = SupervisorAgent(backbone=mock_backbone, run_id="test_run")
+        supervisor = SupervisorAgent(backbone=mock_backbone, config={"errors_path": str(errors_file)}, run_id="test_run")
         example = InternalExample(uid="ex1", text="sample text for schema contract")
         result = supervisor.run(example)
 
@@ -109,8 +109,9 @@ def test_bl1_baseline_wraps_final_output():
     )
     from agents.baseline_runner import BaselineRunner
 
-    runner = BaselineRunner(mode="bl1", backbone=backbone, run_id="bltest")
-    result = runner.run(InternalExample(uid="b1", text="this is a good sample"))
+    with tempfile.TemporaryDirectory() as td:
+        runner = BaselineRunner(mode="bl1", backbone=backbone, config={"errors_path": str(Path(td) / "errors.jsonl")}, run_id="bltest")
+        result = runner.run(InternalExample(uid="b1", text="this is a good sample"))
     validated = FinalOutputSchema.model_validate(result.model_dump())
     assert validated.meta.get("mode") == "bl1"
     assert validated.analysis_flags.stage2_executed is False
@@ -0,0 +1,98 @@
+import json
+import random
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from data.datasets.loader import InternalExample
+from evaluation.sequential import (
+    SequentialConfig,
+    SequentialMonitor,
+    baseline_scores,
+    mean_diff_ci,
+    paired_proportion_ci,
+    stratified_order,
+)
+
+
+def _card(uid, passed, split="valid"):
+    return {"meta": {"text_id": uid, "split": split}, "summary": {"quality_pass": passed}}
+
+
+def test_stratified_order_interleaves_buckets_deterministically():
+    examples = [InternalExample(uid=f"p{i}", text="배송이 빠르다", case_type="plain", language_code="ko") for i in range(30)]
+    examples += [InternalExample(uid=f"n{i}", text="배송이 안 빠르다", case_type="plain", language_code="ko") for i in range(10)]
+    examples += [InternalExample(uid=f"c{i}", text="맛은 좋지만 비싸다", case_type="conflict", language_code="ko") for i in range(10)]
+    order = stratified_order(examples, seed=7)
+    assert sorted(ex.uid for ex in order) == sorted(ex.uid for ex in examples)
+    assert [ex.uid for ex in order] == [ex.uid for ex in stratified_order(examples, seed=7)]
+    head = Counter(ex.uid[0] for ex in order[:10])
+    assert head["p"] in (5, 6, 7) and 1 <= head["n"] <= 3 and 1 <= head["c"] <= 3
+
+
+def test_monitor_stops_on_conclusive_ci_and_records_stopping_point():
+    config = SequentialConfig(baseline="base", min_examples=20, check_every=10)
+    baseline = {("valid", f"u{i}"): 1.0 for i in range(400)}
+
+    same = SequentialMonitor(config, baseline, planned=400)
+    decisions = [same.add(_card(f"u{i}", True)) for i in range(400)]
+    assert decisions[19] is None  # no changed pair yet, but 20 pairs cannot rule out a 5% drop
+    stop = decisions.index("no_regression")
+    assert 100 < stop < 400 and same.stopped_at == stop + 1
+    summary = same.finish()
+    assert summary["stopped_early"] and summary["processed"] == 400 and summary["ci_low"] > -0.05 < summary["ci_high"]
+
+    worse = SequentialMonitor(config, baseline, planned=400)
+    for i in range(400):
+        if worse.add(_card(f"u{i}", i % 2 == 0)):
+            break
+    assert worse.decision == "regression" and worse.ci["ci_high"] < -0.05 and worse.stopped_at == 20
+
+    unpaired = SequentialMonitor(config, baseline, planned=24)
+    for i in range(24):
+        unpaired.add(_card(f"u{i}", i != 7, split="test" if i < 12 else "valid"))
+    result = unpaired.finish()
+    assert result["paired"] == 12 and result["looks"] == 1 and result["decision"] == "inconclusive"
+
+
+def test_true_regression_is_not_accepted_from_an_unchanged_prefix():
+    # The first 40 examples are unchanged, after which 10% of the passes fail: a percentile bootstrap
+    # gives a zero-width CI on the unchanged prefix and would accept the run at the first look.
+    rng = random.Random(3)
+    config = SequentialConfig(baseline="base", min_examples=20, check_every=5)
+    decisions = Counter()
+    for _ in range(50):
+        baseline = {("valid", f"u{i}"): 1.0 for i in range(300)}
+        monitor = SequentialMonitor(config, baseline, planned=300)
+        for i in range(300):
+            if monitor.add(_card(f"u{i}", i < 40 or rng.random() >= 0.1)):
+                break
+        decisions[monitor.finish()["decision"]] += 1
+    assert decisions["no_regression"] == 0 and decisions["regression"] > 0
+
+
+def test_paired_intervals_do_not_collapse_without_changed_pairs():
+    ci = paired_proportion_ci([(1.0, 1.0)] * 20, 0.05)
+    assert ci["mean"] == 0.0 and ci["ci_low"] < -0.1 and ci["ci_high"] > 0.1
+    ci = paired_proportion_ci([(1.0, 1.0)] * 60 + [(0.0, 1.0)] * 40, 0.05)
+    assert ci["ci_low"] < -0.4 < ci["ci_high"] < -0.3
+    ci = mean_diff_ci([0.0] * 20, 0.05)
+    assert ci["ci_low"] < -0.05 and ci["ci_high"] > 0.05
+
+
+def test_config_block_and_baseline_file():
+    assert SequentialConfig.from_cfg(None) is None
+    assert SequentialConfig.from_cfg({"enabled": False, "baseline": "x"}) is None
+    config = SequentialConfig.from_cfg({"enabled": False, "metric": "accuracy"}, baseline="results/base")
+    assert config.baseline == "results/base" and config.metric == "accuracy"
+    for block in ({"metric": "quality_pass"}, {"baseline": "x", "metric": "bleu"}, {"baseline": "x", "typo": 1}):
+        try:
+            SequentialConfig.from_cfg(block)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {block}")
+
+    with tempfile.TemporaryDirectory() as td:
+        rows = [_card("u0", True), _card("u0", False, split="test"), _card("u1", True), {"meta": {"text_id": "u2"}}]
+        (Path(td) / "scorecards.jsonl").write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+        assert baseline_scores(Path(td), "quality_pass") == {("valid", "u0"): 1.0, ("test", "u0"): 0.0, ("valid", "u1"): 1.0}
@@ -0,0 +1,75 @@
+import itertools
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from metrics.run_tables import load_run_tables
+from metrics.significance import (
+    bootstrap_ci,
+    bootstrap_means,
+    compare_systems,
+    correctness_matrix,
+    default_comparisons,
+    paired_test,
+    randomization_p_value,
+)
+
+
+def test_bootstrap_matches_loop_and_randomization_matches_exact_enumeration():
+    values = np.random.default_rng(3).random(50)
+    rng = np.random.default_rng(0)
+    loop = [values[rng.integers(0, 50, size=50)].mean() for _ in range(300)]
+    assert np.allclose(bootstrap_means(values, 300, seed=0), loop)
+    ci = bootstrap_ci(np.append(values, np.nan), 2000)
+    assert ci["n"] == 50 and ci["ci_low"] < ci["mean"] < ci["ci_high"]
+
+    diffs = np.array([0.3, -0.1, 0.2, 0.05, 0.4])
+    flips = [np.array(s) for s in itertools.product([1, -1], repeat=len(diffs))]
+    exact = np.mean([abs((s * diffs).sum()) >= abs(diffs.sum()) - 1e-12 for s in flips])
+    assert abs(randomization_p_value(diffs, 100000) - exact) < 0.01
+    assert randomization_p_value(np.zeros(10), 1000) == 1.0
+
+
+def test_paired_test_detects_shift_and_ignores_unpaired_examples():
+    rng = np.random.default_rng(1)
+    reference = (rng.random(2000) < 0.5).astype(float)
+    better = np.where(rng.random(2000) < 0.2, 1.0, reference)
+    result = paired_test(better, reference, n_resamples=5000)
+    assert result["delta"] > 0 and result["ci_low"] > 0 and result["p_value"] < 0.001
+    same = paired_test(reference, reference, n_resamples=1000)
+    assert same["delta"] == 0.0 and same["p_value"] == 1.0
+    assert paired_test(np.array([np.nan, 1.0]), np.array([0.0, np.nan]))["n"] == 0
+
+
+def _sent(aspect, polarity):
+    return {"aspect_ref": aspect, "opinion_term": {"term": "좋다"}, "polarity": polarity}
+
+
+def _tables(root, name, polarities):
+    run_dir = Path(root) / name
+    run_dir.mkdir()
+    with (run_dir / "scorecards.jsonl").open("w", encoding="utf-8") as f:
+        for i, pol in enumerate(polarities):
+            card = {"meta": {"text_id": f"u{i}", "split": "valid"}, "inputs": {"aspect_sentiments": [_sent("배송", pol)]}, "gold_triplets": [_sent("배송", "positive")]}
+            f.write(json.dumps(card, ensure_ascii=False) + "\n")
+    return load_run_tables(run_dir)
+
+
+def test_correctness_matrix_pools_seeds_and_compares_modes():
+    with tempfile.TemporaryDirectory() as td:
+        runs = [
+            ("proposed", "s1", _tables(td, "p1", ["positive", "positive", "negative"])),
+            ("proposed", "s2", _tables(td, "p2", ["positive", "negative", "negative"])),
+            ("bl1", "s1", _tables(td, "b1", ["negative", "negative", "negative"])),
+            ("no_debate", "s1", _tables(td, "a1", ["positive", "positive"])),
+        ]
+        matrix = correctness_matrix(runs, {"valid"})
+    assert matrix.uids == ["u0", "u1", "u2"] and matrix.scores["f1"].shape == (3, 2, 3)
+    assert matrix.per_example("accuracy", "proposed").tolist() == [1.0, 0.5, 0.0]
+    assert np.isnan(matrix.per_example("f1", "no_debate")[2])
+    assert default_comparisons(matrix.systems) == [("proposed", "bl1"), ("no_debate", "proposed")]
+    rows = {(r["system"], r["metric"]): r for r in compare_systems(matrix, n_resamples=2000)}
+    assert rows[("proposed", "accuracy")]["delta"] == 0.5 and rows[("proposed", "accuracy")]["n_runs"] == 2
+    assert rows[("no_debate", "f1")]["n"] == 2 and rows[("no_debate", "f1")]["delta"] == 0.25
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from schemas import ATEOutput
+from tools.backbone_client import BackboneClient
+from tools.deadline import DeadlineExceeded
+from tools.llm_runner import arun_structured, run_structured
+from tools.single_flight import SingleFlight
+
+_OK = json.dumps({"label": "positive", "confidence": 0.9, "rationale": "ok"})
+
+
+class _CountingBackbone(BackboneClient):
+    def __init__(self, delay=0.1):
+        super().__init__(provider="mock")
+        self.delay, self.calls = delay, 0
+        self._lock = threading.Lock()
+
+    def generate(self, messages, *, temperature=None, max_tokens=None, response_format="text", mode="", text_id=""):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return _OK, {"tokens_in": 1, "tokens_out": 1, "cost_usd": None}
+
+
+def _kwargs(backbone, td, text_id, stage="ATE", **extra):
+    return dict(
+        backbone=backbone, system_prompt="{}", user_text="좋다", schema=ATEOutput, max_retries=0,
+        run_id="single_flight", text_id=text_id, stage=stage, errors_path=str(Path(td) / "errors.jsonl"),
+        max_concurrency=8, **extra,
+    )
+
+
+def test_concurrent_identical_sync_calls_share_one_provider_call():
+    backbone = _CountingBackbone()
+    with tempfile.TemporaryDirectory() as td, ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda i: run_structured(**_kwargs(backbone, td, f"t{i}")), range(4)))
+        assert backbone.calls == 1
+        assert sorted(r.meta.coalesced for r in results) == [False, True, True, True]
+        assert len({id(r.model) for r in results}) == 4  # each caller owns its copy
+        assert {r.model.label for r in results} == {"positive"}
+        assert json.loads(results[[r.meta.coalesced for r in results].index(True)].meta.to_notes_str())["coalesced"] is True
+
+        uncoalesced = _CountingBackbone()
+        list(pool.map(lambda i: run_structured(**_kwargs(uncoalesced, td, f"t{i}", coalesce=False)), range(4)))
+        assert uncoalesced.calls == 4
+
+
+def test_concurrent_identical_async_calls_share_one_provider_call():
+    backbone = _CountingBackbone()
+
+    async def scenario(td):
+        same = [arun_structured(**_kwargs(backbone, td, f"t{i}")) for i in range(3)]
+        other_stage = arun_structured(**_kwargs(backbone, td, "t9", stage="ATSA"))
+        return await asyncio.gather(*same, other_stage)
+
+    with tempfile.TemporaryDirectory() as td:
+        results = asyncio.run(scenario(td))
+    assert backbone.calls == 2
+    assert [r.meta.coalesced for r in results].count(True) == 2
+
+
+def test_followers_run_themselves_when_the_leader_fails():
+    flight = SingleFlight()
+    started = threading.Event()
+    calls = []
+
+    def leader():
+        calls.append("leader")
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("leader failed")
+
+    def follower():
+        calls.append("follower")
+        return "own"
+
+    with ThreadPoolExecutor(2) as pool:
+        lead = pool.submit(flight.do, "k", leader)
+        started.wait()
+        follow = pool.submit(flight.do, "k", follower)
+        assert follow.result() == ("own", False)
+        try:
+            lead.result()
+        except RuntimeError:
+            pass
+    assert calls == ["leader", "follower"] and flight.stats == {"leaders": 1, "coalesced": 0}
+
+    async def scenario():
+        async def slow():
+            await asyncio.sleep(0.2)
+            return "late"
+
+        task = asyncio.ensure_future(flight.ado("a", slow))
+        await asyncio.sleep(0)
+        try:
+            await flight.ado("a", slow, timeout=0.01)
+        except TimeoutError:
+            pass
+        else:  # pragma: no cover
+            raise AssertionError("expected TimeoutError")
+        return await task
+
+    assert asyncio.run(scenario()) == ("late", False)
+
+
+def test_sync_follower_reruns_when_the_leader_hits_its_own_deadline():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def leader():
+        started.set()
+        time.sleep(0.05)
+        raise DeadlineExceeded("deadline exceeded before ATE (budget 0.050s)")
+
+    with ThreadPoolExecutor(3) as pool:
+        lead = pool.submit(flight.do, "k", leader)
+        started.wait()
+        follow = pool.submit(flight.do, "k", lambda: "positive")
+        assert follow.result() == ("positive", False)
+        try:
+            lead.result()
+        except DeadlineExceeded:
+            pass
+        else:  # pragma: no cover
+            raise AssertionError("expected DeadlineExceeded")
+
+        slow = pool.submit(flight.do, "s", lambda: time.sleep(0.2) or "late")
+        time.sleep(0.02)
+        try:
+            flight.do("s", lambda: "own", timeout=0.01)
+        except TimeoutError:
+            pass
+        else:  # pragma: no cover
+            raise AssertionError("expected TimeoutError")
+        assert slow.result() == ("late", False)
@@ -0,0 +1,51 @@
+import json
+import tempfile
+from pathlib import Path
+
+from scripts.step_graph import Step, dependencies, postprocess_steps, run_steps, structural_metrics_step
+
+
+def _write_scorecards(path, labels):
+    cards = [
+        {"profile": "paper_main", "meta": {"text_id": f"u{i}"}, "moderator": {"final_label": label}, "summary": {"quality_pass": True}}
+        for i, label in enumerate(labels)
+    ]
+    path.write_text("".join(json.dumps(c) + "\n" for c in cards), encoding="utf-8")
+
+
+def test_step_is_skipped_until_inputs_or_outputs_change():
+    with tempfile.TemporaryDirectory() as td:
+        scorecards = Path(td) / "scorecards.jsonl"
+        _write_scorecards(scorecards, ["positive", "negative"])
+        step = structural_metrics_step(scorecards, Path(td) / "metrics", "paper_main")
+        assert run_steps([step], td) == {"structural_error_aggregator": "ok"}
+        assert run_steps([step], td) == {"structural_error_aggregator": "up_to_date"}
+        assert "# Exit code: 0" in (Path(td) / "structural_error_aggregator.log").read_text(encoding="utf-8")
+
+        _write_scorecards(scorecards, ["positive", "negative", "neutral"])
+        assert run_steps([step], td) == {"structural_error_aggregator": "ok"}
+        (Path(td) / "metrics" / "structural_metrics.csv").unlink()
+        assert run_steps([step], td) == {"structural_error_aggregator": "ok"}
+        assert (Path(td) / "metrics" / "structural_metrics.csv").exists()
+        assert run_steps([step], td, force=True) == {"structural_error_aggregator": "ok"}
+
+        scorecards.unlink()
+        assert run_steps([step], td) == {"structural_error_aggregator": "missing"}
+
+
+def test_dependencies_follow_inputs_and_outputs():
+    run_dir = Path("/tmp/run_proposed")
+    steps = postprocess_steps(run_dir, Path("/tmp/reports"), paper_tables=True, metrics_profile="paper_main")
+    deps = dependencies(steps)
+    assert deps["build_run_snapshot"] == set() and deps["build_paper_tables"] == set() and deps["build_report_shards"] == set()
+    assert deps["build_html_report"] == {"build_run_snapshot", "build_paper_tables"}
+    assert deps["build_metric_report"] == {"structural_error_aggregator"}
+
+    script = Path("scripts/build_run_snapshot.py")
+    cycle = [Step("a", script, [], inputs=[Path("/tmp/x")], outputs=[Path("/tmp/y")]), Step("b", script, [], inputs=[Path("/tmp/y")], outputs=[Path("/tmp/x")])]
+    try:
+        dependencies(cycle)
+    except ValueError as e:
+        assert "cycle" in str(e)
+    else:
+        raise AssertionError("cycle not detected")
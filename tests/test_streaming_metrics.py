@@ -0,0 +1,105 @@
+import json
+import tempfile
+from pathlib import Path
+
+from metrics.streaming import (
+    ConsistencyAccumulator,
+    MetricsPass,
+    StructuralAccumulator,
+    StructuralMetricsAccumulator,
+    SubsetRatesAccumulator,
+    TransitionAccumulator,
+    iter_scorecards,
+)
+
+
+def _card(uid, *, profile="paper_main", label="positive", s1_risks=1, s2_risks=0, changed=True, hf=None, correct=None, gold=True):
+    card = {
+        "profile": profile,
+        "meta": {"text_id": uid, "latency_ms": 100},
+        "final_result": {"label": label},
+        "moderator": {"final_label": label, "selected_stage": "stage2" if changed else "stage1"},
+        "validator": [
+            {"stage": "stage1", "structural_risks": [{"risk_id": "NEGATION_SCOPE", "severity": "high"}] * s1_risks},
+            {"stage": "stage2", "structural_risks": [{"risk_id": "CONTRAST_SCOPE", "severity": "low"}] * s2_risks},
+        ],
+        "stage_delta": {"changed": changed, "change_type": "guided" if changed else "none"},
+        "inputs": {"aspect_sentiments": [{"aspect_ref": "배송", "opinion_term": {"term": "빨랐"}, "polarity": label}]},
+    }
+    if gold:
+        card["inputs"]["gold_triplets"] = [{"aspect_ref": "배송", "opinion_term": {"term": "빨랐"}, "polarity": "positive"}]
+    if hf:
+        card["aux_signals"] = {"hf": {"label": hf}}
+    if correct:
+        card["correctness"] = {"stage1": {"is_correct": correct[0]}, "stage2": {"is_correct": correct[1]}}
+    return card
+
+
+_CARDS = [
+    _card("a", hf="negative", correct=(False, True)),
+    _card("a", label="negative", s2_risks=1, changed=False, hf="negative", correct=(True, False)),
+    _card("b", profile="smoke", s1_risks=0, correct=(True, True)),
+    _card("c", s1_risks=2, s2_risks=1, gold=False),
+]
+
+
+def test_single_pass_matches_per_family_results():
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(td) / "scorecards.jsonl"
+        lines = [json.dumps(c, ensure_ascii=False) for c in _CARDS]
+        path.write_text("﻿" + "\n".join(lines[:2] + ["{not json", ""] + lines[2:]) + "\n", encoding="utf-8")
+        assert list(iter_scorecards(path)) == _CARDS  # BOM and broken lines tolerated
+        mp = MetricsPass()
+        mp.register("structural", StructuralMetricsAccumulator("paper_main"))
+        mp.register("transitions", TransitionAccumulator("paper_main"))
+        mp.register("hf_disagree", SubsetRatesAccumulator(where=lambda v: v.hf_label is not None and v.hf_disagrees))
+        results = mp.run(iter_scorecards(path))
+
+    assert mp.n_records == 4
+    structural = results["structural"]
+    assert structural == {
+        **StructuralAccumulator("paper_main").feed(_CARDS),
+        **ConsistencyAccumulator().feed(_CARDS),
+    }
+    assert structural["n"] == 3 and structural["N_gold"] == 2
+    assert structural["risk_flagged_rate"] == 1.0 and structural["ignored_proposal_rate"] == 1 / 3
+    assert structural["hf_polarity_disagreement_rate"] == 0.5
+    assert structural["self_consistency_exact"] == 2 / 3  # case "a" changed label across its rows
+    assert results["transitions"]["n_fix"] == 1 and results["transitions"]["n_skipped"] == 1
+    assert results["hf_disagree"]["stage2_adoption_rate"] == 1.0
+
+
+def test_profile_without_rows_falls_back_to_all_rows_in_the_same_pass():
+    metrics = StructuralMetricsAccumulator("regression").feed(_CARDS)
+    assert metrics["n"] == 4 and metrics["profile_filter"] == "regression"
+    assert "self_consistency_exact" not in metrics
+    assert StructuralMetricsAccumulator("regression", fallback_to_all=False).feed(_CARDS) == {"n": 0}
+
+
+def test_run_snapshot_streams_scorecards_and_keeps_top_issue_order():
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+    from build_run_snapshot import build_snapshot
+
+    with tempfile.TemporaryDirectory() as td:
+        run_dir, out_dir = Path(td) / "run", Path(td) / "out"
+        run_dir.mkdir()
+        cards = [
+            {"meta": {"text_id": f"u{i}", "split": "test", "latency_ms": 10 * i}, "flags": {"parse_failed": i % 3 == 0},
+             "runtime": {"tokens_in": i, "parsed_output": {"stage1_aspects": [1]}}}
+            for i in range(200)
+        ]
+        (run_dir / "scorecards.jsonl").write_text("\n".join(json.dumps(c) for c in cards) + "\n", encoding="utf-8")
+        (run_dir / "smoke_outputs.jsonl").write_text(
+            json.dumps({"meta": {"text_id": "u198", "input_text": ""}}) + "\n" + json.dumps({"meta": {"text_id": "u198", "input_text": "미리보기"}}) + "\n",
+            encoding="utf-8",
+        )
+        build_snapshot(run_dir, out_dir, text_preview_chars=80, raw_preview_chars=20, top_k=3)
+        snapshot = json.loads((out_dir / "run_snapshot.json").read_text(encoding="utf-8"))
+        top = (out_dir / "top_issues.csv").read_text(encoding="utf-8").splitlines()
+
+    assert snapshot["volume"]["total_rows"] == 200 and snapshot["usage"]["tokens_in_total"] == sum(range(200))
+    assert snapshot["reliability"]["parse_failed_rate"] == 67 / 200
+    assert [line.split(",")[0] for line in top[1:]] == ["u198", "u195", "u192"]  # parse_failed first, then slowest
+    assert "미리보기" in top[1]
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.supervisor_agent import SupervisorAgent, SupervisorRequestContext
+from tools.data_tools import InternalExample
+
+_TEXTS = [
+    ("ko", "배송은 빨랐지만 포장이 엉망이었다"),
+    ("ko", "가격 대비 맛이 정말 좋다"),
+    ("ko", "서비스가 별로 안 좋다"),
+    ("en", "The battery life is great but the screen is dim"),
+    ("ko", "직원이 친절하고 매장이 깨끗하다"),
+]
+
+
+def _examples():
+    return [InternalExample(uid=f"re{i}", text=t, language_code=lang) for i, (lang, t) in enumerate(_TEXTS)]
+
+
+def test_concurrent_runs_on_one_instance_match_sequential():
+    examples = _examples()
+    sequential = SupervisorAgent(run_id="reentrant")
+    expected = [sequential.run(ex) for ex in examples]
+
+    shared = SupervisorAgent(run_id="reentrant")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        actual = list(pool.map(shared.run, examples * 3))
+
+    for exp, got in zip(expected * 3, actual):
+        assert got.meta["text_id"] == exp.meta["text_id"]
+        assert got.final_result.model_dump() == exp.final_result.model_dump()
+        assert got.meta["stage2_aspects"] == exp.meta["stage2_aspects"]
+        assert got.meta.get("debate_override_stats") == exp.meta.get("debate_override_stats")
+        assert {tr.uid for tr in got.process_trace} == {exp.meta["text_id"]}
+
+    # run-level totals are the sum of per-example counters, independent of scheduling
+    once = sequential.override_stats.snapshot()
+    assert shared.override_stats.snapshot() == {k: 3 * v for k, v in once.items()}
+    assert once == {
+        k: sum((r.meta.get("debate_override_stats") or {}).get(k, 0) for r in expected) for k in once
+    }
+
+
+def test_request_context_from_example():
+    ex = InternalExample(uid="c1", text="맛있다", language_code="ko", metadata={"demo_texts": ["d1"]})
+    ctx = SupervisorRequestContext.from_example(ex)
+    assert (ctx.text_id, ctx.language_code, ctx.demos) == ("c1", "ko", ["d1"])
+    assert ctx.override_stats == {"applied": 0, "skipped_low_signal": 0, "skipped_conflict": 0}
+    assert SupervisorRequestContext.from_example(ex).trace is not ctx.trace
@@ -0,0 +1,61 @@
+import io
+import json
+
+from schemas import ProcessTrace
+from scripts.scorecard_from_smoke import _extract_call_meta
+from tools.llm_runner import StructuredResultMeta
+from tools.trace_format import render_output, render_process_trace, resolve_trace_level, trace_call_metadata
+
+
+def _payload():
+    meta = StructuredResultMeta(raw_response='{"aspects": []}', retries=1, prompt_hash="abc", served_model="m", served_provider="p")
+    traces = [
+        ProcessTrace(stage="stage1", agent="ATE", input_text="배송이 빨랐어요", output={"aspects": []}, call_metadata=meta.to_call_metadata()),
+        ProcessTrace(stage="stage1", agent="Validator", input_text="배송이 빨랐어요", output={}, notes="validator_degraded"),
+        ProcessTrace(stage="debate", agent="Judge", input_text="topic", output={"winner": None}),
+        ProcessTrace(stage="stage2", agent="status", input_text="배송이 빨랐어요", output={}, stage_status="not_applicable"),
+    ]
+    for tr in traces:
+        tr.uid, tr.case_type, tr.split, tr.input_hash = "u1", "contrast", "valid", "h"
+    return {"meta": {"input_text": "배송이 빨랐어요", "uid": "u1"}, "process_trace": [tr.model_dump() for tr in traces]}, meta
+
+
+def test_full_level_keeps_notes_json_shape():
+    payload, meta = _payload()
+    written = render_output(payload, "full")
+    assert written is payload and "trace_level" not in written["meta"]
+    ate, validator = written["process_trace"][:2]
+    assert ate["notes"] == meta.to_notes_str() and json.loads(ate["notes"]) == ate["call_metadata"]
+    assert ate["input_text"] == "배송이 빨랐어요" and ate["uid"] == "u1"
+    assert validator["notes"] == "validator_degraded"
+
+
+def test_compact_level_stores_text_once_and_moves_raw_responses():
+    payload, meta = _payload()
+    legacy = [dict(e, call_metadata=None, notes=meta.to_notes_str()) if e["agent"] == "ATE" else e for e in payload["process_trace"]]
+    raw = io.StringIO()
+    written = render_output(payload, "compact", raw_out=raw)
+    assert written["meta"]["trace_level"] == "compact" and payload["meta"].get("trace_level") is None
+    ate, validator, judge, status = written["process_trace"]
+    assert set(ate) == {"stage", "agent", "output", "call_metadata"}
+    assert "raw_response" not in ate["call_metadata"] and ate["call_metadata"]["served_model"] == "m"
+    assert validator["notes"] == "validator_degraded" and judge["input_text"] == "topic"
+    assert status["stage_status"] == "not_applicable"
+    assert json.loads(raw.getvalue()) == {"uid": "u1", "index": 0, "stage": "stage1", "agent": "ATE", "raw_response": '{"aspects": []}'}
+    # notes-only entries of older full traces compact to the same shape
+    assert render_process_trace(legacy, "compact", input_text="배송이 빨랐어요") == written["process_trace"]
+    assert trace_call_metadata(legacy[0]) == meta.to_call_metadata() == payload["process_trace"][0]["call_metadata"]
+    assert _extract_call_meta(written["process_trace"])["retries"] == _extract_call_meta(legacy)["retries"] == 1
+
+
+def test_none_level_and_unknown_level():
+    payload, _ = _payload()
+    written = render_output(payload, "none")
+    assert written["process_trace"] == [] and len(payload["process_trace"]) == 4
+    assert resolve_trace_level(None) == "full" and resolve_trace_level("COMPACT") == "compact"
+    try:
+        resolve_trace_level("summary")
+    except ValueError as e:
+        assert "full, compact, none" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
@@ -1,16 +1,9 @@
-from .data_tools import (
-    InternalExample,
-    build_id2label,
-    build_label2id,
-    examples_to_dataframe,
-    load_csv_dataset,
-    load_csv_examples,
-    load_datasets,
-    load_internal_json_dir,
-    load_nikluge_sa2022,
-    load_split_examples,
-    validate_labels,
-)
+"""
+Lazy re-exports (PEP 562): `from tools.backbone_client import ...` must not pay for the dataset loader,
+so the data_tools names below are only imported when first accessed as `tools.<name>`.
+"""
+
+from importlib import import_module
 
 __all__ = [
     "InternalExample",
@@ -25,3 +18,15 @@ __all__ = [
     "load_split_examples",
     "validate_labels",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(import_module(".data_tools", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
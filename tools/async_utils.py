@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Iterable, List, Optional, Protocol, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class AsyncRunner(Protocol):
+    """Anything with a coroutine `arun(example)` (SupervisorAgent, BaselineRunner)."""
+
+    async def arun(self, example: Any) -> Any:
+        ...
+
+
+async def gather_all(*aws: Awaitable[T]) -> List[T]:
+    """
+    Run awaitables concurrently and return their results in argument order.
+    Unlike asyncio.gather, the first failure cancels the remaining siblings (TaskGroup semantics), and
+    cancelling the caller cancels all of them; the original exception is re-raised, not an ExceptionGroup.
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(aw) for aw in aws]
+    except BaseExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return [t.result() for t in tasks]
+
+
+async def arun_examples(
+    runner: AsyncRunner,
+    examples: Iterable[Any],
+    *,
+    concurrency: int = 32,
+    timeout_s: Optional[float] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Run `runner.arun` over many examples on the current event loop; results keep input order.
+    - concurrency: max examples in flight (each example may itself fan out several LLM calls).
+    - timeout_s: per-example deadline; a timed-out example is cancelled and yields TimeoutError.
+    - return_exceptions: store per-example exceptions in the result list instead of failing the batch.
+      When False, the first failure cancels every other in-flight example and is re-raised.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    items: Sequence[Any] = list(examples)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(example: Any) -> Any:
+        async with sem:
+            try:
+                if timeout_s is None:
+                    return await runner.arun(example)
+                async with asyncio.timeout(timeout_s):
+                    return await runner.arun(example)
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+    return await gather_all(*(_one(ex) for ex in items))
+
+
+def run_examples(runner: AsyncRunner, examples: Iterable[Any], **kwargs: Any) -> List[Any]:
+    """
+    Blocking entry point for arun_examples (starts and closes its own event loop). The runner's backbone
+    async client is closed before the loop ends.
+    """
+
+    async def _run() -> List[Any]:
+        try:
+            return await arun_examples(runner, examples, **kwargs)
+        finally:
+            aclose = getattr(getattr(runner, "backbone", None), "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    return asyncio.run(_run())
+
+
+__all__ = ["AsyncRunner", "arun_examples", "gather_all", "run_examples"]
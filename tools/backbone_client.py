@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import re
 import sys
 import time
-from typing import Any, Callable, Dict, List, Iterable, TypeVar
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Iterable, TypeVar
 
-from tools.pattern_loader import load_patterns
+from tools.call_policy import CallPolicy
+from tools.deadline import DeadlineExceeded, current_deadline
+from tools.pattern_set import AhoCorasick, get_pattern_set
 
 T = TypeVar("T")
 
+# Mock provider lookups (pattern sets themselves are compiled once per language by get_pattern_set)
+_HANGUL_RE = re.compile(r"[가-힣]")
+_MOCK_FALLBACK_TOKEN_RE = re.compile(r"[A-Za-z]{2,}")
+_MOCK_POSITIVE = AhoCorasick(["good", "great"])
+_MOCK_NEGATIVE = AhoCorasick(["bad", "poor"])
+
 # Retry config for rate limit (429) and server errors (503)
 _RETRY_MAX_ATTEMPTS = 5
 _RETRY_BASE_SECONDS = 2.0
@@ -34,6 +44,15 @@ def _is_retryable(exc: BaseException) -> bool:
     return False
 
 
+def _backoff_wait(attempt: int, exc: Exception) -> float:
+    """Backoff before the next attempt; refuses to sleep past the request deadline (if any)."""
+    wait = _RETRY_BASE_SECONDS * (2 ** (attempt - 1))
+    deadline = current_deadline()
+    if deadline is not None and wait >= deadline.remaining():
+        raise DeadlineExceeded(f"no budget left for a {wait:.1f}s backoff after {type(exc).__name__}") from exc
+    return wait
+
+
 def _retry_with_backoff(fn: Callable[[], T], provider: str) -> T:
     """Call fn(); on 429/503 retry with exponential backoff. Raises last exception after max attempts."""
     last_exc = None
@@ -44,7 +63,7 @@ def _retry_with_backoff(fn: Callable[[], T], provider: str) -> T:
             last_exc = e
             if attempt == _RETRY_MAX_ATTEMPTS or not _is_retryable(e):
                 raise
-            wait = _RETRY_BASE_SECONDS * (2 ** (attempt - 1))
+            wait = _backoff_wait(attempt, e)
             _logger.warning(
                 "[%s] %s (attempt %d/%d); retrying in %.1fs",
                 provider, type(e).__name__, attempt, _RETRY_MAX_ATTEMPTS, wait,
@@ -52,6 +71,25 @@ def _retry_with_backoff(fn: Callable[[], T], provider: str) -> T:
             time.sleep(wait)
     raise last_exc  # type: ignore[misc]
 
+
+async def _aretry_with_backoff(fn: Callable[[], Awaitable[T]], provider: str) -> T:
+    """Async counterpart of _retry_with_backoff; waits with asyncio.sleep so the event loop keeps running."""
+    last_exc = None
+    for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            last_exc = e
+            if attempt == _RETRY_MAX_ATTEMPTS or not _is_retryable(e):
+                raise
+            wait = _backoff_wait(attempt, e)
+            _logger.warning(
+                "[%s] %s (attempt %d/%d); retrying in %.1fs",
+                provider, type(e).__name__, attempt, _RETRY_MAX_ATTEMPTS, wait,
+            )
+            await asyncio.sleep(wait)
+    raise last_exc  # type: ignore[misc]
+
 # Configure module-level logger to stderr
 _logger = logging.getLogger("backbone_client")
 if not _logger.handlers:
@@ -102,11 +140,43 @@ def _resolve_provider(explicit: str | None) -> str:
 
 
 class BackboneClient:
-    """Unified backbone client. Default provider is a deterministic mock."""
+    """
+    Unified backbone client. Default provider is a deterministic mock.
+    call_policy (optional) adds per-stage timeouts and hedging around run_structured calls.
+    """
 
-    def __init__(self, provider: str | None = None, model: str | None = None):
+    def __init__(self, provider: str | None = None, model: str | None = None, call_policy: CallPolicy | None = None):
         self.provider = _resolve_provider(provider)
         self.model = model or os.getenv("BACKBONE_MODEL", "gpt-3.5-turbo")
+        self.call_policy = call_policy
+        # Async SDK clients own a connection pool bound to the event loop they were first used on, so one
+        # client is kept per loop and reused (keep-alive) until aclose().
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    def _async_client(self, factory: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = factory()
+        return client
+
+    async def aclose(self) -> None:
+        """Close the async SDK client cached for the running event loop (call before the loop shuts down)."""
+        clients = getattr(self, "_async_clients", None)
+        client = clients.pop(asyncio.get_running_loop(), None) if clients is not None else None
+        if client is not None:
+            await client.close()
+
+    def _log_call(self, msgs: List[Dict[str, str]], *, mode: str, text_id: str) -> None:
+        prompt_len = sum(len(m.get("content", "")) for m in msgs)
+        _logger.info(
+            "generate() called: mode=%s, provider=%s, model_name=%s, text_id=%s, prompt_len=%d",
+            mode or "unknown",
+            self.provider,
+            self.model,
+            text_id or "unknown",
+            prompt_len,
+        )
 
     def generate(
         self,
@@ -123,198 +193,18 @@ class BackboneClient:
         usage_dict contains: tokens_in, tokens_out, cost_usd (or None if unavailable)
         """
         msgs = _format_messages(messages)
-        prompt_len = sum(len(m.get("content", "")) for m in msgs)
-        _logger.info(
-            "generate() called: mode=%s, provider=%s, model_name=%s, text_id=%s, prompt_len=%d",
-            mode or "unknown",
-            self.provider,
-            self.model,
-            text_id or "unknown",
-            prompt_len,
-        )
+        self._log_call(msgs, mode=mode, text_id=text_id)
 
         if self.provider == "mock":
-            user_text = msgs[-1]["content"] if msgs else ""
-            stage = mode or ""
-
-            lang_guess = "ko" if re.search(r"[가-힣]", user_text or "") else "en"
-            patterns, _, _ = load_patterns(lang_guess)
-            contrast_tokens = patterns.get("contrast_markers") or []
-            topic_suffixes = tuple(patterns.get("topic_particles") or [])
-            token_regex = patterns.get("aspect_token_regex") or r"[가-힣A-Za-z]{2,}"
-            try:
-                token_pattern = re.compile(token_regex)
-            except re.error:
-                token_pattern = re.compile(r"[A-Za-z]{2,}")
-            pos_keys = patterns.get("positive_keywords") or ["good", "great"]
-            neg_keys = patterns.get("negative_keywords") or ["bad", "poor"]
-
-            def _detect_contrast(text: str):
-                for tok in contrast_tokens:
-                    m = re.search(tok, text)
-                    if m:
-                        return m
-                return None
-
-            def _strip_topic(term: str):
-                if term.endswith(topic_suffixes) and len(term) > 1:
-                    return term[:-1]
-                return term
-
-            def _first_token_with_span(text: str, offset: int = 0):
-                for m in token_pattern.finditer(text):
-                    term = _strip_topic(m.group(0))
-                    if len(term) == 0:
-                        continue
-                    start = offset + m.start()
-                    end = start + len(term)
-                    return term, start, end
-                return None
-
-            def _clause_aspect(clause: str, offset: int = 0):
-                hit = _first_token_with_span(clause, offset)
-                if hit:
-                    return hit
-                if clause:
-                    return clause[0], offset, offset + 1
-                return "서비스", offset, offset + 3
-
-            def pick_aspects(text: str):
-                text = text or ""
-                m = _detect_contrast(text)
-                if not m:
-                    return [_clause_aspect(text, 0)]
-                left = text[: m.start()]
-                right = text[m.end() :]
-                aspects = []
-                lh = _clause_aspect(left, 0)
-                rh = _clause_aspect(right, m.end())
-                if lh:
-                    aspects.append(lh)
-                if rh and not any(a[1] == rh[1] and a[2] == rh[2] for a in aspects):
-                    aspects.append(rh)
-                return aspects or [_clause_aspect(text, 0)]
-
-            def _opinion_term(text: str, start_after: int):
-                m = token_pattern.search(text, start_after)
-                if m:
-                    return m.group(0), m.start(), m.end()
-                if start_after < len(text):
-                    end = min(len(text), start_after + 4)
-                    return text[start_after:end], start_after, end
-                return text[:1] or "좋다", 0, max(1, len(text))
-
-            def sentiment_for(text: str) -> str:
-                lower = text.lower()
-                if any(k.lower() in lower for k in pos_keys):
-                    return "positive"
-                if any(k.lower() in lower for k in neg_keys):
-                    return "negative"
-                return "neutral"
-
-            aspects_raw = pick_aspects(user_text)
-            contrast = _detect_contrast(user_text) is not None and len(aspects_raw) >= 2
-            pol = sentiment_for(user_text)
-            if pol == "neutral" and len(user_text) >= 5:
-                pol = "positive"
-
-            payload: Dict[str, Any] = {}
-
-            if "ATE" in stage and "reanalysis" not in stage:
-                payload = {
-                    "aspects": [
-                        {
-                            "term": term,
-                            "span": {"start": s, "end": e},
-                            "confidence": 0.78 if i == 0 else 0.5,
-                            "rationale": "mock aspect" if i == 0 else "contrast heuristic second aspect",
-                        }
-                        for i, (term, s, e) in enumerate(aspects_raw)
-                    ]
-                }
-            elif "ATSA" in stage and "reanalysis" not in stage:
-                sentiments = []
-                for i, (term, s, e) in enumerate(aspects_raw):
-                    op_term, op_s, op_e = _opinion_term(user_text, e)
-                    pol_i = "positive"
-                    if contrast:
-                        pol_i = "negative" if i == 1 else "positive"
-                    else:
-                        pol_i = pol
-                    sentiments.append(
-                        {
-                            "aspect_ref": term,
-                            "polarity": pol_i,
-                            "opinion_term": {"term": op_term, "span": {"start": op_s, "end": op_e}},
-                            "evidence": user_text[max(0, s - 2) : min(len(user_text), op_e + 6)],
-                            "confidence": 0.8 if i == 0 else 0.7,
-                            "polarity_distribution": {pol_i: 0.8, "neutral": 0.1},
-                            "is_implicit": False,
-                        }
-                    )
-                payload = {"aspect_sentiments": sentiments}
-            elif "Validator" in stage and "reanalysis" not in stage:
-                payload = {"structural_risks": [], "consistency_score": 1.0, "correction_proposals": []}
-            elif "ATE" in stage and "reanalysis" in stage:
-                payload = {
-                    "aspect_review": [
-                        {"term": term, "action": "keep", "revised_span": {"start": s, "end": e}, "reason": "mock review"}
-                        for term, s, e in aspects_raw
-                    ]
-                }
-            elif "ATSA" in stage and "reanalysis" in stage:
-                neg_words = ["안", "못", "별로", "싫", "최악", "짜증", "불만", "나빠"]
-                if any(w in user_text for w in neg_words) and aspects_raw:
-                    payload = {
-                        "sentiment_review": [
-                            {
-                                "aspect_ref": aspects_raw[0][0],
-                                "action": "flip_polarity",
-                                "revised_polarity": "negative",
-                                "reason": "mock flip on negation keyword",
-                            }
-                        ]
-                    }
-                else:
-                    payload = {"sentiment_review": []}
-            elif "Validator" in stage and "reanalysis" in stage:
-                payload = {"final_validation": {"resolved_risks": [], "remaining_risks": [], "final_consistency_score": 1.0}}
-            else:
-                payload = {}
-
-            response_text = json.dumps(payload, ensure_ascii=False) if response_format == "json" else str(payload)
-            # Mock provider: no real usage tracking
-            usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
-            return response_text, usage
+            return self._mock_generate(msgs, mode=mode, response_format=response_format)
 
         if self.provider == "openai":
             from openai import OpenAI  # type: ignore
 
             _require_env(["OPENAI_API_KEY"], "openai")
             client = OpenAI()  # api_key read from env; ensured above
-            resp = client.chat.completions.create(
-                model=self.model,
-                messages=msgs,
-                temperature=temperature if temperature is not None else 0.0,
-                max_tokens=max_tokens,
-                response_format={"type": "json_object"} if response_format == "json" else None,
-            )
-            response_text = resp.choices[0].message.content or ""
-            # Extract usage from OpenAI response
-            usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
-            if hasattr(resp, "usage"):
-                usage["tokens_in"] = getattr(resp.usage, "prompt_tokens", None)
-                usage["tokens_out"] = getattr(resp.usage, "completion_tokens", None)
-                # Cost calculation (approximate, model-dependent)
-                if usage["tokens_in"] is not None and usage["tokens_out"] is not None:
-                    # Rough pricing: adjust per model
-                    cost = None
-                    if "gpt-4" in self.model.lower():
-                        cost = (usage["tokens_in"] / 1_000_000 * 10.0) + (usage["tokens_out"] / 1_000_000 * 30.0)
-                    elif "gpt-3.5" in self.model.lower():
-                        cost = (usage["tokens_in"] / 1_000_000 * 0.5) + (usage["tokens_out"] / 1_000_000 * 1.5)
-                    usage["cost_usd"] = cost
-            return response_text, usage
+            resp = client.chat.completions.create(**self._openai_request(msgs, temperature, max_tokens, response_format))
+            return resp.choices[0].message.content or "", self._openai_usage(resp)
 
         if self.provider == "anthropic":
             from anthropic import Anthropic  # type: ignore
@@ -323,52 +213,311 @@ class BackboneClient:
             client = Anthropic()  # api_key read from env; ensured above
 
             def _call_anthropic():
-                return client.messages.create(
-                    model=self.model,
-                    messages=msgs,
-                    temperature=temperature if temperature is not None else 0.0,
-                    max_tokens=max_tokens or 1024,
-                )
+                return client.messages.create(**self._anthropic_request(msgs, temperature, max_tokens))
 
             resp = _retry_with_backoff(_call_anthropic, "anthropic")
             response_text = resp.content[0].text if resp.content else ""
-            # Extract usage from Anthropic response
-            usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
-            if hasattr(resp, "usage"):
-                usage["tokens_in"] = getattr(resp.usage, "input_tokens", None)
-                usage["tokens_out"] = getattr(resp.usage, "output_tokens", None)
-                # Cost calculation (approximate)
-                if usage["tokens_in"] is not None and usage["tokens_out"] is not None:
-                    # Rough pricing for Claude models
-                    cost = (usage["tokens_in"] / 1_000_000 * 3.0) + (usage["tokens_out"] / 1_000_000 * 15.0)
-                    usage["cost_usd"] = cost
-            return response_text, usage
+            return response_text, self._anthropic_usage(resp)
 
         if self.provider == "google":
-            from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
-
-            _require_env(["GOOGLE_API_KEY", "GENAI_API_KEY"], "google")
-            llm = ChatGoogleGenerativeAI(
-                model=self.model,
-                temperature=temperature if temperature is not None else 0.0,
-                max_output_tokens=max_tokens,
-            )
+            llm = self._google_llm(temperature, max_tokens)
 
             def _call_google():
                 return llm.invoke(msgs)
 
             result = _retry_with_backoff(_call_google, "google")
-            response_text = getattr(result, "content", str(result))
-            # Google provider: usage extraction may vary by SDK version
-            usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
-            # Try to extract usage if available
-            if hasattr(result, "response_metadata"):
-                meta = result.response_metadata
-                if isinstance(meta, dict):
-                    usage_info = meta.get("usage_metadata") or meta.get("usage")
-                    if usage_info:
-                        usage["tokens_in"] = usage_info.get("prompt_token_count") or usage_info.get("input_tokens")
-                        usage["tokens_out"] = usage_info.get("candidates_token_count") or usage_info.get("output_tokens")
-            return response_text, usage
+            return getattr(result, "content", str(result)), self._google_usage(result)
+
+        raise ValueError(f"Unsupported BACKBONE_PROVIDER '{self.provider}'")
+
+    async def agenerate(
+        self,
+        messages: List[Dict[str, Any]],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        response_format: str = "text",
+        mode: str = "",
+        text_id: str = "",
+    ) -> tuple[str, Dict[str, Any]]:
+        """
+        Coroutine counterpart of generate(): same request/response contract, but provider calls use the
+        async SDK clients so an in-flight request does not hold a thread. Subclasses that only override
+        generate() (test doubles, custom providers) are run in a worker thread so their behaviour is kept.
+        """
+        if type(self).generate is not BackboneClient.generate:
+            return await asyncio.to_thread(
+                self.generate,
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                mode=mode,
+                text_id=text_id,
+            )
+        msgs = _format_messages(messages)
+        self._log_call(msgs, mode=mode, text_id=text_id)
+
+        if self.provider == "mock":
+            return self._mock_generate(msgs, mode=mode, response_format=response_format)
+
+        if self.provider == "openai":
+            from openai import AsyncOpenAI  # type: ignore
+
+            _require_env(["OPENAI_API_KEY"], "openai")
+            client = self._async_client(AsyncOpenAI)  # api_key read from env; ensured above
+            resp = await client.chat.completions.create(**self._openai_request(msgs, temperature, max_tokens, response_format))
+            return resp.choices[0].message.content or "", self._openai_usage(resp)
+
+        if self.provider == "anthropic":
+            from anthropic import AsyncAnthropic  # type: ignore
+
+            _require_env(["ANTHROPIC_API_KEY"], "anthropic")
+            client = self._async_client(AsyncAnthropic)  # api_key read from env; ensured above
+
+            async def _call_anthropic():
+                return await client.messages.create(**self._anthropic_request(msgs, temperature, max_tokens))
+
+            resp = await _aretry_with_backoff(_call_anthropic, "anthropic")
+            response_text = resp.content[0].text if resp.content else ""
+            return response_text, self._anthropic_usage(resp)
+
+        if self.provider == "google":
+            llm = self._google_llm(temperature, max_tokens)
+
+            async def _call_google():
+                return await llm.ainvoke(msgs)
+
+            result = await _aretry_with_backoff(_call_google, "google")
+            return getattr(result, "content", str(result)), self._google_usage(result)
 
         raise ValueError(f"Unsupported BACKBONE_PROVIDER '{self.provider}'")
+
+    # ---------------- provider request/usage helpers (shared by generate/agenerate) ----------------
+    @staticmethod
+    def _with_deadline_timeout(request: Dict[str, Any]) -> Dict[str, Any]:
+        """Bound the provider request by the remaining request budget (SDK `timeout`), if a deadline is active."""
+        deadline = current_deadline()
+        if deadline is not None:
+            request["timeout"] = max(deadline.remaining(), 0.001)
+        return request
+
+    def _openai_request(self, msgs, temperature, max_tokens, response_format) -> Dict[str, Any]:
+        return self._with_deadline_timeout({
+            "model": self.model,
+            "messages": msgs,
+            "temperature": temperature if temperature is not None else 0.0,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"} if response_format == "json" else None,
+        })
+
+    def _openai_usage(self, resp) -> Dict[str, Any]:
+        # Extract usage from OpenAI response
+        usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
+        if hasattr(resp, "usage"):
+            usage["tokens_in"] = getattr(resp.usage, "prompt_tokens", None)
+            usage["tokens_out"] = getattr(resp.usage, "completion_tokens", None)
+            # Cost calculation (approximate, model-dependent)
+            if usage["tokens_in"] is not None and usage["tokens_out"] is not None:
+                # Rough pricing: adjust per model
+                cost = None
+                if "gpt-4" in self.model.lower():
+                    cost = (usage["tokens_in"] / 1_000_000 * 10.0) + (usage["tokens_out"] / 1_000_000 * 30.0)
+                elif "gpt-3.5" in self.model.lower():
+                    cost = (usage["tokens_in"] / 1_000_000 * 0.5) + (usage["tokens_out"] / 1_000_000 * 1.5)
+                usage["cost_usd"] = cost
+        return usage
+
+    def _anthropic_request(self, msgs, temperature, max_tokens) -> Dict[str, Any]:
+        return self._with_deadline_timeout({
+            "model": self.model,
+            "messages": msgs,
+            "temperature": temperature if temperature is not None else 0.0,
+            "max_tokens": max_tokens or 1024,
+        })
+
+    @staticmethod
+    def _anthropic_usage(resp) -> Dict[str, Any]:
+        # Extract usage from Anthropic response
+        usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
+        if hasattr(resp, "usage"):
+            usage["tokens_in"] = getattr(resp.usage, "input_tokens", None)
+            usage["tokens_out"] = getattr(resp.usage, "output_tokens", None)
+            # Cost calculation (approximate)
+            if usage["tokens_in"] is not None and usage["tokens_out"] is not None:
+                # Rough pricing for Claude models
+                cost = (usage["tokens_in"] / 1_000_000 * 3.0) + (usage["tokens_out"] / 1_000_000 * 15.0)
+                usage["cost_usd"] = cost
+        return usage
+
+    def _google_llm(self, temperature, max_tokens):
+        from langchain_google_genai import ChatGoogleGenerativeAI  # type: ignore
+
+        _require_env(["GOOGLE_API_KEY", "GENAI_API_KEY"], "google")
+        options = self._with_deadline_timeout({})
+        return ChatGoogleGenerativeAI(
+            model=self.model,
+            temperature=temperature if temperature is not None else 0.0,
+            max_output_tokens=max_tokens,
+            **options,
+        )
+
+    @staticmethod
+    def _google_usage(result) -> Dict[str, Any]:
+        # Google provider: usage extraction may vary by SDK version
+        usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
+        # Try to extract usage if available
+        if hasattr(result, "response_metadata"):
+            meta = result.response_metadata
+            if isinstance(meta, dict):
+                usage_info = meta.get("usage_metadata") or meta.get("usage")
+                if usage_info:
+                    usage["tokens_in"] = usage_info.get("prompt_token_count") or usage_info.get("input_tokens")
+                    usage["tokens_out"] = usage_info.get("candidates_token_count") or usage_info.get("output_tokens")
+        return usage
+
+    def _mock_generate(self, msgs: List[Dict[str, str]], *, mode: str, response_format: str) -> tuple[str, Dict[str, Any]]:
+        """Deterministic heuristic responses keyed on stage name; no I/O, so it is called inline from agenerate."""
+        user_text = msgs[-1]["content"] if msgs else ""
+        stage = mode or ""
+
+        lang_guess = "ko" if _HANGUL_RE.search(user_text or "") else "en"
+        patterns = get_pattern_set(lang_guess)
+        topic_suffixes = patterns.topic_particles
+        token_pattern = patterns.token_regex or _MOCK_FALLBACK_TOKEN_RE
+        pos_matcher = patterns.positive or _MOCK_POSITIVE
+        neg_matcher = patterns.negative or _MOCK_NEGATIVE
+
+        def _detect_contrast(text: str):
+            return patterns.search_contrast_regex(text)
+
+        def _strip_topic(term: str):
+            if term.endswith(topic_suffixes) and len(term) > 1:
+                return term[:-1]
+            return term
+
+        def _first_token_with_span(text: str, offset: int = 0):
+            for m in token_pattern.finditer(text):
+                term = _strip_topic(m.group(0))
+                if len(term) == 0:
+                    continue
+                start = offset + m.start()
+                end = start + len(term)
+                return term, start, end
+            return None
+
+        def _clause_aspect(clause: str, offset: int = 0):
+            hit = _first_token_with_span(clause, offset)
+            if hit:
+                return hit
+            if clause:
+                return clause[0], offset, offset + 1
+            return "서비스", offset, offset + 3
+
+        def pick_aspects(text: str):
+            text = text or ""
+            m = _detect_contrast(text)
+            if not m:
+                return [_clause_aspect(text, 0)]
+            left = text[: m.start()]
+            right = text[m.end() :]
+            aspects = []
+            lh = _clause_aspect(left, 0)
+            rh = _clause_aspect(right, m.end())
+            if lh:
+                aspects.append(lh)
+            if rh and not any(a[1] == rh[1] and a[2] == rh[2] for a in aspects):
+                aspects.append(rh)
+            return aspects or [_clause_aspect(text, 0)]
+
+        def _opinion_term(text: str, start_after: int):
+            m = token_pattern.search(text, start_after)
+            if m:
+                return m.group(0), m.start(), m.end()
+            if start_after < len(text):
+                end = min(len(text), start_after + 4)
+                return text[start_after:end], start_after, end
+            return text[:1] or "좋다", 0, max(1, len(text))
+
+        def sentiment_for(text: str) -> str:
+            lower = text.lower()
+            if pos_matcher.contains_any(lower):
+                return "positive"
+            if neg_matcher.contains_any(lower):
+                return "negative"
+            return "neutral"
+
+        aspects_raw = pick_aspects(user_text)
+        contrast = _detect_contrast(user_text) is not None and len(aspects_raw) >= 2
+        pol = sentiment_for(user_text)
+        if pol == "neutral" and len(user_text) >= 5:
+            pol = "positive"
+
+        payload: Dict[str, Any] = {}
+
+        if "ATE" in stage and "reanalysis" not in stage:
+            payload = {
+                "aspects": [
+                    {
+                        "term": term,
+                        "span": {"start": s, "end": e},
+                        "confidence": 0.78 if i == 0 else 0.5,
+                        "rationale": "mock aspect" if i == 0 else "contrast heuristic second aspect",
+                    }
+                    for i, (term, s, e) in enumerate(aspects_raw)
+                ]
+            }
+        elif "ATSA" in stage and "reanalysis" not in stage:
+            sentiments = []
+            for i, (term, s, e) in enumerate(aspects_raw):
+                op_term, op_s, op_e = _opinion_term(user_text, e)
+                pol_i = "positive"
+                if contrast:
+                    pol_i = "negative" if i == 1 else "positive"
+                else:
+                    pol_i = pol
+                sentiments.append(
+                    {
+                        "aspect_ref": term,
+                        "polarity": pol_i,
+                        "opinion_term": {"term": op_term, "span": {"start": op_s, "end": op_e}},
+                        "evidence": user_text[max(0, s - 2) : min(len(user_text), op_e + 6)],
+                        "confidence": 0.8 if i == 0 else 0.7,
+                        "polarity_distribution": {pol_i: 0.8, "neutral": 0.1},
+                        "is_implicit": False,
+                    }
+                )
+            payload = {"aspect_sentiments": sentiments}
+        elif "Validator" in stage and "reanalysis" not in stage:
+            payload = {"structural_risks": [], "consistency_score": 1.0, "correction_proposals": []}
+        elif "ATE" in stage and "reanalysis" in stage:
+            payload = {
+                "aspect_review": [
+                    {"term": term, "action": "keep", "revised_span": {"start": s, "end": e}, "reason": "mock review"}
+                    for term, s, e in aspects_raw
+                ]
+            }
+        elif "ATSA" in stage and "reanalysis" in stage:
+            neg_words = ["안", "못", "별로", "싫", "최악", "짜증", "불만", "나빠"]
+            if any(w in user_text for w in neg_words) and aspects_raw:
+                payload = {
+                    "sentiment_review": [
+                        {
+                            "aspect_ref": aspects_raw[0][0],
+                            "action": "flip_polarity",
+                            "revised_polarity": "negative",
+                            "reason": "mock flip on negation keyword",
+                        }
+                    ]
+                }
+            else:
+                payload = {"sentiment_review": []}
+        elif "Validator" in stage and "reanalysis" in stage:
+            payload = {"final_validation": {"resolved_risks": [], "remaining_risks": [], "final_consistency_score": 1.0}}
+        else:
+            payload = {}
+
+        response_text = json.dumps(payload, ensure_ascii=False) if response_format == "json" else str(payload)
+        # Mock provider: no real usage tracking
+        usage = {"tokens_in": None, "tokens_out": None, "cost_usd": None}
+        return response_text, usage
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+from tools.backbone_client import BackboneClient, _logger
+from tools.call_policy import CallPolicy
+from tools.deadline import DeadlineExceeded
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker for one backbone target.
+    closed: calls flow; opens when failure_rate of the last `window` outcomes (at least min_calls) is reached.
+    open: calls are skipped for cooldown_s, then one probe call is let through (half_open).
+    half_open: the probe's success closes the breaker (window cleared); its failure re-opens it.
+    """
+
+    def __init__(self, *, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5, cooldown_s: float = 30.0):
+        self.min_calls = int(min_calls)
+        self.failure_rate = float(failure_rate)
+        self.cooldown_s = float(cooldown_s)
+        self._outcomes: Deque[bool] = deque(maxlen=int(window))
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_s:
+                return HALF_OPEN
+            return self._state
+
+    def reopens_in(self) -> float:
+        with self._lock:
+            return max(0.0, self._opened_at + self.cooldown_s - time.monotonic()) if self._state == OPEN else 0.0
+
+    def allow(self) -> bool:
+        """True if a call may go to this target now (claims the single half-open probe slot)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_s:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot whose call ended without a verdict (deadline, cancellation)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                self._state, self._probe_in_flight = CLOSED, False
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                self._trip()
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._trip()
+
+    def _trip(self) -> None:
+        self._state, self._opened_at, self._probe_in_flight = OPEN, time.monotonic(), False
+        self.opened += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            outcomes = list(self._outcomes)
+        return {
+            "state": state,
+            "opened": self.opened,
+            "recent_calls": len(outcomes),
+            "recent_failures": outcomes.count(False),
+        }
+
+
+class BackbonePool(BackboneClient):
+    """
+    Ordered failover over several backbone targets, each guarded by a CircuitBreaker.
+    Calls go to the first target whose breaker allows it; a failure (after the target's own 429/503 retries)
+    moves on to the next target. When every breaker is open, the target that re-opens first is tried anyway
+    so a run keeps going. provider/model are the primary's (run_structured's real-run checks use them); the
+    usage dict of each response carries the serving target's `provider`/`model`.
+    DeadlineExceeded is a request-budget signal, not a provider fault: it propagates without failover.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[BackboneClient],
+        *,
+        breaker: Optional[Dict[str, Any]] = None,
+        call_policy: Optional[CallPolicy] = None,
+    ):
+        if not targets:
+            raise ValueError("BackbonePool needs at least one target")
+        self.targets: List[BackboneClient] = list(targets)
+        self.breakers = [CircuitBreaker(**(breaker or {})) for _ in self.targets]
+        self.provider = self.targets[0].provider
+        self.model = self.targets[0].model
+        self.call_policy = call_policy
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @staticmethod
+    def target_name(target: BackboneClient) -> str:
+        return f"{target.provider}:{target.model}"
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.served: Counter = Counter()
+            self.failovers = 0
+
+    def _route(self) -> Iterator[int]:
+        # allow() is checked lazily so a half-open probe slot is only claimed by a call that is really made
+        routed = False
+        for idx, breaker in enumerate(self.breakers):
+            if breaker.allow():
+                routed = True
+                yield idx
+        if not routed:
+            yield min(range(len(self.targets)), key=lambda i: self.breakers[i].reopens_in())
+
+    def _served(self, idx: int, usage: Dict[str, Any], failed: int) -> Dict[str, Any]:
+        target = self.targets[idx]
+        self.breakers[idx].record_success()
+        with self._lock:
+            self.served[self.target_name(target)] += 1
+            self.failovers += failed
+        return {**(usage or {}), "provider": target.provider, "model": target.model}
+
+    def _failed(self, idx: int, exc: Exception) -> None:
+        self.breakers[idx].record_failure()
+        _logger.warning(
+            "[pool] %s failed (%s: %s); breaker=%s",
+            self.target_name(self.targets[idx]), type(exc).__name__, exc, self.breakers[idx].state,
+        )
+
+    def generate(self, messages: List[Dict[str, Any]], **kwargs: Any) -> tuple[str, Dict[str, Any]]:
+        last_exc: Optional[Exception] = None
+        for failed, idx in enumerate(self._route()):
+            try:
+                text, usage = self.targets[idx].generate(messages, **kwargs)
+            except DeadlineExceeded:
+                self.breakers[idx].release()
+                raise
+            except Exception as e:
+                self._failed(idx, e)
+                last_exc = e
+                continue
+            except BaseException:  # cancelled (e.g. a losing hedge): no verdict on the target
+                self.breakers[idx].release()
+                raise
+            return text, self._served(idx, usage, failed)
+        raise last_exc  # type: ignore[misc]
+
+    async def agenerate(self, messages: List[Dict[str, Any]], **kwargs: Any) -> tuple[str, Dict[str, Any]]:
+        last_exc: Optional[Exception] = None
+        for failed, idx in enumerate(self._route()):
+            try:
+                text, usage = await self.targets[idx].agenerate(messages, **kwargs)
+            except DeadlineExceeded:
+                self.breakers[idx].release()
+                raise
+            except Exception as e:
+                self._failed(idx, e)
+                last_exc = e
+                continue
+            except BaseException:  # cancelled (e.g. a losing hedge): no verdict on the target
+                self.breakers[idx].release()
+                raise
+            return text, self._served(idx, usage, failed)
+        raise last_exc  # type: ignore[misc]
+
+    async def aclose(self) -> None:
+        for target in self.targets:
+            await target.aclose()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            served, failovers = dict(self.served), self.failovers
+        return {
+            "targets": [self.target_name(t) for t in self.targets],
+            "served": served,
+            "failovers": failovers,
+            "breakers": {self.target_name(t): b.snapshot() for t, b in zip(self.targets, self.breakers)},
+        }
+
+
+def build_backbone(backbone_cfg: Optional[Dict[str, Any]]) -> BackboneClient:
+    """
+    BackboneClient for a config `backbone` block; a BackbonePool when `fallbacks` lists extra
+    {provider, model} targets (tried in order after the primary provider/model).
+    """
+    cfg = backbone_cfg or {}
+    call_policy = CallPolicy.from_config(cfg)
+    fallbacks = cfg.get("fallbacks") or []
+    if not fallbacks:
+        return BackboneClient(provider=cfg.get("provider"), model=cfg.get("model"), call_policy=call_policy)
+    targets = [BackboneClient(provider=t.get("provider"), model=t.get("model")) for t in [cfg, *fallbacks]]
+    return BackbonePool(targets, breaker=cfg.get("circuit_breaker"), call_policy=call_policy)
+
+
+__all__ = ["BackbonePool", "CircuitBreaker", "build_backbone"]
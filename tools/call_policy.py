@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from tools.deadline import Deadline, current_deadline, deadline_scope
+
+_Response = Tuple[str, Dict[str, Any]]
+_DEBATE_TURN_RE = re.compile(r"^debate_round\d+_.+$")
+
+
+class CallTimeout(TimeoutError):
+    """A provider call (and its hedge, if any) did not answer within the stage timeout."""
+
+
+def stage_key(stage: str) -> str:
+    """Latency/timeout bucket for a run_structured stage (all debate speaker turns share one bucket)."""
+    return "debate_turn" if _DEBATE_TURN_RE.match(stage or "") else (stage or "default")
+
+
+class LatencyTracker:
+    """Rolling per-stage window of successful call latencies."""
+
+    def __init__(self, window: int = 200):
+        self.window = int(window)
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def quantile(self, key: str, q: float, *, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self, q: float) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            keys = list(self._samples)
+        out = {}
+        for key in sorted(keys):
+            with self._lock:
+                n = len(self._samples[key])
+            out[key] = {"n": n, f"p{int(q * 100)}_ms": round((self.quantile(key, q) or 0.0) * 1000.0, 1)}
+        return out
+
+
+class CallStats:
+    """Run-level hedging/timeout counters (thread-safe; shared by every call through one CallPolicy)."""
+
+    _FIELDS = ("calls", "hedged", "hedge_wins", "timeouts", "losers_cancelled", "wasted_tokens_in", "wasted_tokens_out")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts: Dict[str, float] = {k: 0 for k in self._FIELDS}
+            self._counts["wasted_cost_usd"] = 0.0
+
+    def add(self, key: str, value: float = 1) -> None:
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + value
+
+    def add_waste(self, usage: Dict[str, Any]) -> None:
+        with self._lock:
+            self._counts["wasted_tokens_in"] += int(usage.get("tokens_in") or 0)
+            self._counts["wasted_tokens_out"] += int(usage.get("tokens_out") or 0)
+            self._counts["wasted_cost_usd"] += float(usage.get("cost_usd") or 0.0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counts)
+
+
+class CallPolicy:
+    """
+    Per-stage timeouts and request hedging for backbone calls (used by run_structured/arun_structured).
+
+    - timeout: stage_timeouts_s[stage_key] or timeout_s; a call (plus its hedge) that does not answer in
+      time raises CallTimeout, which the structured attempt loop treats like any other generate failure.
+      The timeout is also published as the call's deadline, so SDK requests carry it as their `timeout`.
+    - hedging: once a stage has min_samples latencies, a call still running after the rolling `quantile`
+      (p95) latency of its stage gets one duplicate request; the first successful response wins and the
+      other is cancelled. Losers that still complete (sync calls cannot be interrupted) count as waste.
+    - attempts (primary and hedge, sync or async) each take the caller's max_concurrency limiter.
+    Config (backbone block): timeout_s, stage_timeouts_s, hedging: {enabled, quantile, min_samples, window,
+    min_delay_s}.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout_s: Optional[float] = None,
+        stage_timeouts_s: Optional[Dict[str, float]] = None,
+        hedging: bool = False,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay_s: float = 0.05,
+        max_workers: int = 32,
+    ):
+        self.timeout_s = timeout_s
+        self.stage_timeouts_s = dict(stage_timeouts_s or {})
+        self.hedging = bool(hedging)
+        self.quantile = float(quantile)
+        self.min_samples = int(min_samples)
+        self.min_delay_s = float(min_delay_s)
+        self.latency = LatencyTracker(window)
+        self.stats = CallStats()
+        self._max_workers = int(max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, backbone_cfg: Optional[Dict[str, Any]]) -> Optional["CallPolicy"]:
+        """CallPolicy for a config `backbone` block, or None when neither timeouts nor hedging are set."""
+        cfg = backbone_cfg or {}
+        hedge_cfg = cfg.get("hedging") or {}
+        if not (cfg.get("timeout_s") or cfg.get("stage_timeouts_s") or hedge_cfg.get("enabled")):
+            return None
+        return cls(
+            timeout_s=cfg.get("timeout_s"),
+            stage_timeouts_s=cfg.get("stage_timeouts_s"),
+            hedging=bool(hedge_cfg.get("enabled", False)),
+            quantile=float(hedge_cfg.get("quantile", 0.95)),
+            min_samples=int(hedge_cfg.get("min_samples", 20)),
+            window=int(hedge_cfg.get("window", 200)),
+            min_delay_s=float(hedge_cfg.get("min_delay_s", 0.05)),
+        )
+
+    # ---------------- planning ----------------
+    def timeout_for(self, key: str) -> Optional[float]:
+        timeout = self.stage_timeouts_s.get(key, self.timeout_s)
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = deadline.remaining() if timeout is None else min(timeout, deadline.remaining())
+        return timeout
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        if not self.hedging:
+            return None
+        p = self.latency.quantile(key, self.quantile, min_samples=self.min_samples)
+        return None if p is None else max(p, self.min_delay_s)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats.snapshot(), "stage_latency": self.latency.snapshot(self.quantile)}
+
+    # ---------------- sync ----------------
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="llm-call")
+            return self._executor
+
+    def _timed(self, key: str, fn: Callable[[], _Response]) -> Callable[[], _Response]:
+        def run() -> _Response:
+            started = time.monotonic()
+            response = fn()
+            self.latency.record(key, time.monotonic() - started)
+            return response
+
+        return run
+
+    def _discard(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.stats.add_waste(future.result()[1] or {})
+
+    def call(
+        self, stage: str, fn: Callable[[], _Response], *, limiter: Optional[threading.BoundedSemaphore] = None
+    ) -> _Response:
+        """
+        Sync call with timeout/hedging. Each attempt takes `limiter` (run_structured's max_concurrency
+        semaphore) in its worker thread and keeps it until the provider call returns, so a loser that cannot
+        be interrupted still counts against max_concurrency. The timeout and hedge delay start once the
+        primary holds its slot.
+        """
+        key = stage_key(stage)
+        self.stats.add("calls")
+        timeout, hedge_after = self.timeout_for(key), self.hedge_delay(key)
+        if timeout is None and hedge_after is None:
+            if limiter is None:
+                return self._timed(key, fn)()
+            with limiter:
+                return self._timed(key, fn)()
+
+        settled = threading.Event()  # answered, timed out or abandoned: attempts still queued must not call
+
+        def attempt(acquired: threading.Event) -> _Response:
+            with limiter if limiter is not None else contextlib.nullcontext():
+                if settled.is_set():
+                    raise CancelledError
+                acquired.set()
+                attempt_timeout = self.timeout_for(key)
+                with deadline_scope(Deadline(attempt_timeout) if attempt_timeout else current_deadline()):
+                    response = self._timed(key, fn)()
+                settled.set()  # before the slot is released, so a queued hedge sees the answer
+                return response
+
+        context = contextvars.copy_context()
+        primary_slot = threading.Event()
+        primary = self._pool().submit(context.copy().run, attempt, primary_slot)
+        outer = current_deadline()
+        if not primary_slot.wait(None if outer is None else outer.remaining()):
+            settled.set()
+            self.stats.add("timeouts")
+            raise CallTimeout(f"{key} call did not get a max_concurrency slot before the deadline")
+        timeout, started = self.timeout_for(key), time.monotonic()
+        pending, hedge, error = {primary}, None, None
+        try:
+            while pending:
+                now = time.monotonic()
+                wait_s = None if timeout is None else max(0.0, started + timeout - now)
+                if hedge is None and hedge_after is not None:
+                    hedge_wait = max(0.0, started + hedge_after - now)
+                    wait_s = hedge_wait if wait_s is None else min(wait_s, hedge_wait)
+                done, pending = wait(pending, timeout=wait_s, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is hedge:
+                            self.stats.add("hedge_wins")
+                        self.stats.add("losers_cancelled", len(pending))
+                        return future.result()
+                    error = future.exception()
+                if done or not pending:
+                    continue
+                if hedge is None and hedge_after is not None and time.monotonic() >= started + hedge_after:
+                    hedge = self._pool().submit(context.copy().run, attempt, threading.Event())
+                    pending.add(hedge)
+                    self.stats.add("hedged")
+                    continue
+                if timeout is not None and time.monotonic() >= started + timeout:
+                    self.stats.add("timeouts")
+                    raise CallTimeout(f"{key} call exceeded {timeout:.2f}s")
+            raise error  # type: ignore[misc]
+        finally:
+            settled.set()
+            for loser in pending:
+                loser.cancel()
+                loser.add_done_callback(self._discard)  # a running loser keeps its slot and, if it answers, is waste
+
+    # ---------------- async ----------------
+    async def acall(
+        self, stage: str, afn: Callable[[], Awaitable[_Response]], *, limiter: Optional[asyncio.Semaphore] = None
+    ) -> _Response:
+        """
+        Async call with timeout/hedging. `limiter` (arun_structured's max_concurrency semaphore) is taken by
+        each attempt, so a hedge never runs beyond the configured concurrency; latency excludes the wait for it.
+        """
+        key = stage_key(stage)
+        self.stats.add("calls")
+        timeout, hedge_after = self.timeout_for(key), self.hedge_delay(key)
+
+        async def attempt() -> _Response:
+            started_call = time.monotonic()
+            response = await afn()
+            self.latency.record(key, time.monotonic() - started_call)
+            return response
+
+        attempts: List[asyncio.Future] = []
+
+        async def timed() -> _Response:
+            if limiter is None:
+                return await attempt()
+            async with limiter:
+                # a hedge that only got the limiter once another attempt answered must not call again
+                if any(t.done() and not t.cancelled() and t.exception() is None for t in attempts):
+                    raise asyncio.CancelledError
+                return await attempt()
+
+        if timeout is None and hedge_after is None:
+            return await timed()
+
+        started = time.monotonic()
+        with deadline_scope(Deadline(timeout) if timeout else current_deadline()):
+            primary = asyncio.ensure_future(timed())
+        attempts.append(primary)
+        pending, hedge, error = {primary}, None, None
+        try:
+            while pending:
+                now = time.monotonic()
+                wait_s = None if timeout is None else max(0.0, started + timeout - now)
+                if hedge is None and hedge_after is not None:
+                    hedge_wait = max(0.0, started + hedge_after - now)
+                    wait_s = hedge_wait if wait_s is None else min(wait_s, hedge_wait)
+                done, pending = await asyncio.wait(pending, timeout=wait_s, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():  # gave up its slot: another attempt in `done` has the answer
+                        continue
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.add("hedge_wins")
+                        self.stats.add("losers_cancelled", len(pending))
+                        for other in done - {task}:  # both answered in the same tick: the other one is waste
+                            self._discard(other)
+                        return task.result()
+                    error = task.exception()
+                if done or not pending:
+                    continue
+                if hedge is None and hedge_after is not None and time.monotonic() >= started + hedge_after:
+                    with deadline_scope(Deadline(timeout) if timeout else current_deadline()):
+                        hedge = asyncio.ensure_future(timed())
+                    attempts.append(hedge)
+                    pending.add(hedge)
+                    self.stats.add("hedged")
+                    continue
+                if timeout is not None and time.monotonic() >= started + timeout:
+                    self.stats.add("timeouts")
+                    raise CallTimeout(f"{key} call exceeded {timeout:.2f}s")
+            raise error  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(self._discard)  # a loser that still answers (e.g. shielded SDK call) is waste
+
+
+__all__ = ["CallPolicy", "CallStats", "CallTimeout", "LatencyTracker", "stage_key"]
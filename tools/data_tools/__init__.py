@@ -1,26 +1,31 @@
-from .data_loader import (
-    InternalExample,
-    examples_to_dataframe,
-    load_csv_dataset,
-    load_csv_examples,
-    load_datasets,
-    load_internal_json_dir,
-    load_nikluge_sa2022,
-    load_split_examples,
-)
-from .label_schema import build_label2id, build_id2label, validate_labels
+from importlib import import_module
 
-__all__ = [
-    "InternalExample",
-    "examples_to_dataframe",
-    "load_csv_dataset",
-    "load_csv_examples",
-    "load_datasets",
-    "load_internal_json_dir",
-    "load_nikluge_sa2022",
-    "load_split_examples",
-    "build_label2id",
-    "build_id2label",
-    "validate_labels",
-]
+# name -> submodule; resolved on first access (PEP 562) so importing the package stays cheap
+_EXPORTS = {
+    "InternalExample": ".data_loader",
+    "examples_to_dataframe": ".data_loader",
+    "load_csv_dataset": ".data_loader",
+    "load_csv_examples": ".data_loader",
+    "load_datasets": ".data_loader",
+    "load_internal_json_dir": ".data_loader",
+    "load_nikluge_sa2022": ".data_loader",
+    "load_split_examples": ".data_loader",
+    "build_label2id": ".label_schema",
+    "build_id2label": ".label_schema",
+    "validate_labels": ".label_schema",
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+
+class DeadlineExceeded(TimeoutError):
+    """A call was about to start (or keep retrying) after its request deadline."""
+
+
+class Deadline:
+    """
+    Absolute per-request time budget on the monotonic clock.
+    Created once per request and passed down (SupervisorAgent -> agents -> run_structured); the backbone
+    client reads it from current_deadline() so generate() keeps its signature for subclasses.
+    """
+
+    def __init__(self, budget_s: float, *, start: Optional[float] = None):
+        if budget_s <= 0:
+            raise ValueError(f"deadline budget must be > 0, got {budget_s}")
+        self.budget_s = float(budget_s)
+        self.start = time.monotonic() if start is None else start
+        self.at = self.start + self.budget_s
+
+    @classmethod
+    def coerce(cls, value: Union["Deadline", float, int, None]) -> Optional["Deadline"]:
+        """Deadline instance as-is, a number as a budget in seconds starting now, None/0 as no deadline."""
+        if value is None or isinstance(value, Deadline):
+            return value
+        return cls(float(value)) if float(value) > 0 else None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Seconds a blocking call may wait: the remaining budget, optionally capped."""
+        remaining = self.remaining()
+        return remaining if cap is None else min(cap, remaining)
+
+    def check(self, what: str) -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"deadline exceeded before {what} (budget {self.budget_s:.3f}s)")
+
+    def __repr__(self) -> str:
+        return f"Deadline(budget_s={self.budget_s:.3f}, remaining_s={self.remaining():.3f})"
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("current_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the LLM call in progress on this thread/task (None outside deadline_scope)."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[None]:
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+__all__ = ["Deadline", "DeadlineExceeded", "current_deadline", "deadline_scope"]
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import List, Set, Sequence, Optional, Dict
 
 from data.datasets.loader import InternalExample
+from tools.near_duplicate import NearDuplicateIndex, NearDuplicateMatch, find_near_duplicates
 
 
 def _compute_text_hash(text: str) -> str:
@@ -21,6 +22,7 @@ class DemoSampleResult:
     removed_by_uid: int
     removed_by_hash: int
     total_excluded: int
+    removed_by_near_duplicate: int = 0
 
 
 class DemoSampler:
@@ -28,7 +30,8 @@ class DemoSampler:
     Centralized sampler to avoid demo leakage.
     - Samples only from the provided pool (demo_pool)
     - Enforces forbid_uids exclusion (UID-based)
-    - Enforces forbid_hashes exclusion (text hash-based, for near-duplicate detection)
+    - Enforces forbid_hashes exclusion (exact text hash after whitespace normalization)
+    - Enforces forbid_near_duplicates exclusion (MinHash/LSH index over eval texts)
     - Deterministic given seed
     """
 
@@ -38,17 +41,28 @@ class DemoSampler:
         self._pool_hashes: Dict[str, str] = {}
         for ex in self.pool:
             self._pool_hashes[ex.uid] = _compute_text_hash(ex.text)
+        # Pool matches are computed once per near-duplicate index (sampling is called per example).
+        self._near_dup_index: Optional[NearDuplicateIndex] = None
+        self._near_dup_matches: Dict[str, NearDuplicateMatch] = {}
 
     def get_pool_hashes(self) -> Dict[str, str]:
         """Return mapping of uid -> text_hash for the demo pool."""
         return dict(self._pool_hashes)
 
+    def near_duplicate_matches(self, index: NearDuplicateIndex) -> Dict[str, NearDuplicateMatch]:
+        """Return pool uid -> best near-duplicate match in `index` (cached for the last index queried)."""
+        if index is not self._near_dup_index:
+            self._near_dup_matches = find_near_duplicates([(ex.uid, ex.text) for ex in self.pool], index)
+            self._near_dup_index = index
+        return dict(self._near_dup_matches)
+
     def sample(
         self,
         k: int,
         seed: int,
         forbid_uids: Set[str] | None = None,
         forbid_hashes: Set[str] | None = None,
+        forbid_near_duplicates: NearDuplicateIndex | None = None,
     ) -> List[InternalExample]:
         """
         Sample k demos from pool, excluding forbidden UIDs and text hashes.
@@ -58,11 +72,12 @@ class DemoSampler:
             seed: Random seed for deterministic sampling
             forbid_uids: Set of UIDs to exclude (eval set UIDs)
             forbid_hashes: Set of text hashes to exclude (for hash-based overlap detection)
+            forbid_near_duplicates: Index of eval texts; pool examples with a near-duplicate in it are excluded
 
         Returns:
             List of InternalExample demos
         """
-        result = self.sample_with_stats(k, seed, forbid_uids, forbid_hashes)
+        result = self.sample_with_stats(k, seed, forbid_uids, forbid_hashes, forbid_near_duplicates)
         return result.demos
 
     def sample_with_stats(
@@ -71,6 +86,7 @@ class DemoSampler:
         seed: int,
         forbid_uids: Set[str] | None = None,
         forbid_hashes: Set[str] | None = None,
+        forbid_near_duplicates: NearDuplicateIndex | None = None,
     ) -> DemoSampleResult:
         """
         Sample k demos with detailed statistics about exclusions.
@@ -80,9 +96,11 @@ class DemoSampler:
         """
         forbid_uid_set = forbid_uids or set()
         forbid_hash_set = forbid_hashes or set()
+        near_dup = self.near_duplicate_matches(forbid_near_duplicates) if forbid_near_duplicates is not None else {}
 
         removed_by_uid = 0
         removed_by_hash = 0
+        removed_by_near_duplicate = 0
         candidates = []
 
         for ex in self.pool:
@@ -93,6 +111,9 @@ class DemoSampler:
             if ex_hash in forbid_hash_set:
                 removed_by_hash += 1
                 continue
+            if ex.uid in near_dup:
+                removed_by_near_duplicate += 1
+                continue
             candidates.append(ex)
 
         if k <= 0 or not candidates:
@@ -100,7 +121,8 @@ class DemoSampler:
                 demos=[],
                 removed_by_uid=removed_by_uid,
                 removed_by_hash=removed_by_hash,
-                total_excluded=removed_by_uid + removed_by_hash,
+                total_excluded=removed_by_uid + removed_by_hash + removed_by_near_duplicate,
+                removed_by_near_duplicate=removed_by_near_duplicate,
             )
 
         rng = random.Random(seed)
@@ -117,7 +139,8 @@ class DemoSampler:
             demos=chosen,
             removed_by_uid=removed_by_uid,
             removed_by_hash=removed_by_hash,
-            total_excluded=removed_by_uid + removed_by_hash,
+            total_excluded=removed_by_uid + removed_by_hash + removed_by_near_duplicate,
+            removed_by_near_duplicate=removed_by_near_duplicate,
         )
 
 
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import json
 import threading
-from dataclasses import dataclass, field
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Type, Dict, Any, Optional, TypeVar, Generic
+from typing import Type, Dict, Any, Generator, Iterator, List, Optional, Tuple, TypeVar, Generic
 
 from pydantic import BaseModel, ValidationError
 
 from .backbone_client import BackboneClient
+from .deadline import Deadline, DeadlineExceeded, deadline_scope
 from .prompt_spec import PromptSpec, DemoExample, OpenAIAdapter, ClaudeAdapter, GeminiAdapter
+from .single_flight import SingleFlight
 
 _semaphore_cache: Dict[int, threading.BoundedSemaphore] = {}
 _sem_lock = threading.Lock()
+# asyncio primitives are bound to one event loop, so async semaphores are cached per loop.
+_async_semaphore_cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+# Concurrent identical structured calls (same backbone, schema, stage and prompt) share one provider call.
+single_flight = SingleFlight()
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -30,10 +40,19 @@ class StructuredResultMeta:
     tokens_out: Optional[int] = None
     cost_usd: Optional[float] = None
     usage_parse_failed: bool = False
+    served_provider: Optional[str] = None  # set when a BackbonePool reports which target answered
+    served_model: Optional[str] = None
+    coalesced: bool = False  # result shared from a concurrent identical call (single_flight)
+    prefix_shared: bool = False  # result reused from an identical call earlier in the same prefix_scope
 
-    def to_notes_str(self) -> str:
-        """Format metadata for ProcessTrace.notes field."""
-        return json.dumps({
+    def to_call_metadata(self) -> Dict[str, Any]:
+        """Structured metadata for ProcessTrace.call_metadata (raw_response truncated to 500 chars)."""
+        served = {"served_provider": self.served_provider, "served_model": self.served_model} if self.served_model else {}
+        if self.coalesced:
+            served["coalesced"] = True
+        if self.prefix_shared:
+            served["prefix_shared"] = True
+        return {
             "raw_response": self.raw_response[:500],
             "retries": self.retries,
             "repair_used": self.repair_used,
@@ -44,7 +63,12 @@ class StructuredResultMeta:
             "tokens_out": self.tokens_out,
             "cost_usd": self.cost_usd,
             "usage_parse_failed": self.usage_parse_failed,
-        }, ensure_ascii=False)
+            **served,
+        }
+
+    def to_notes_str(self) -> str:
+        """Format metadata for ProcessTrace.notes field (JSON of to_call_metadata())."""
+        return json.dumps(self.to_call_metadata(), ensure_ascii=False)
 
 
 @dataclass
@@ -99,6 +123,14 @@ def _get_semaphore(max_concurrency: int) -> threading.BoundedSemaphore:
         return _semaphore_cache[max_concurrency]
 
 
+def _get_async_semaphore(max_concurrency: int) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    per_loop = _async_semaphore_cache.setdefault(loop, {})
+    if max_concurrency not in per_loop:
+        per_loop[max_concurrency] = asyncio.Semaphore(max_concurrency)
+    return per_loop[max_concurrency]
+
+
 def _raise_if_realrun_fallback(
     backbone: BackboneClient,
     errors_path: str,
@@ -136,32 +168,29 @@ def _raise_if_realrun_fallback(
         )
 
 
-def run_structured(
+_Messages = List[Dict[str, Any]]
+_Response = Tuple[str, Dict[str, Any]]
+
+
+def _structured_attempts(
     backbone: BackboneClient,
     system_prompt: str,
     user_text: str,
     schema: Type[T],
     *,
-    max_retries: int = 2,
+    max_retries: int,
     run_id: str,
     text_id: str,
     stage: str,
-    mode: str = "",
-    errors_path: Optional[str] = None,
-    max_concurrency: int = 1,
-    use_mock: bool = False,
-    prompt_spec: Optional[PromptSpec] = None,
-) -> StructuredResult[T]:
+    errors_path: str,
+    use_mock: bool,
+    prompt_spec: Optional[PromptSpec],
+) -> Generator[_Messages, _Response, StructuredResult[T]]:
     """
-    Run backbone, enforce JSON schema, repair on failures, and log errors without raising.
-    - max_concurrency: simple semaphore guard to avoid provider rate limits (default 1).
-    - errors_path defaults to experiments/results/<mode>/<run_id>/errors.jsonl (or stage if mode missing).
-    - On repeated failures, returns a fallback model_construct() and records error metadata.
-    - Returns StructuredResult containing the model and metadata (raw_response, retries, repair_used).
+    Retry/repair state machine shared by run_structured and arun_structured.
+    Yields the messages to send; the driver sends back backbone's (response_text, usage) or throws the
+    exception raised by the call. Returns the StructuredResult via StopIteration.value.
     """
-    errors_path = errors_path or default_errors_path(run_id, mode or None, stage)
-    mode_for_backbone = f"{mode or ''}:{stage}".strip(":")
-    sem = _get_semaphore(max_concurrency)
     compact = _compact_schema(schema)
     attempt = 0
     last_response = ""
@@ -177,9 +206,7 @@ def run_structured(
             if attempt == 0
             else _build_retry_prompt(system_prompt, user_text, last_error, last_response, compact)
         )
-        acquired = False
         try:
-            acquired = sem.acquire()
             spec_for_send = PromptSpec(
                 system=[prompt],
                 user=user_text,
@@ -193,17 +220,13 @@ def run_structured(
                 messages = ClaudeAdapter.to_messages(spec_for_send)
             else:
                 messages = OpenAIAdapter.to_messages(spec_for_send)
-            response_text, usage_dict = backbone.generate(
-                messages,
-                temperature=0.0,
-                response_format="json",
-                mode=mode_for_backbone,
-                text_id=text_id,
-            )
+            response_text, usage_dict = yield messages
             # Extract usage info
             result_meta.tokens_in = usage_dict.get("tokens_in")
             result_meta.tokens_out = usage_dict.get("tokens_out")
             result_meta.cost_usd = usage_dict.get("cost_usd")
+            result_meta.served_provider = usage_dict.get("provider")
+            result_meta.served_model = usage_dict.get("model")
             # Check if usage parsing failed (all None for non-mock provider)
             if backbone.provider != "mock" and result_meta.tokens_in is None and result_meta.tokens_out is None:
                 result_meta.usage_parse_failed = True
@@ -248,12 +271,6 @@ def run_structured(
                     fallback.meta["llm_runner_error"] = last_error
                 return StructuredResult(model=fallback, meta=result_meta)
             continue
-        finally:
-            if acquired:
-                try:
-                    sem.release()
-                except ValueError:
-                    pass
 
         last_response = response
         result_meta.raw_response = response
@@ -360,3 +377,268 @@ def run_structured(
     if hasattr(fallback, "meta") and isinstance(getattr(fallback, "meta"), dict):
         fallback.meta["llm_runner_error"] = last_error or "unknown_error"
     return StructuredResult(model=fallback, meta=result_meta)
+
+
+def _drive_sync(
+    gen: Generator[_Messages, _Response, StructuredResult[T]],
+    call,
+    deadline: Optional[Deadline] = None,
+    what: str = "llm call",
+) -> StructuredResult[T]:
+    try:
+        messages = next(gen)
+        while True:
+            if deadline is not None:
+                deadline.check(what)
+            try:
+                with deadline_scope(deadline):
+                    response = call(messages)
+            except Exception as e:  # provider timeout/429/etc. -> handled by the attempt loop
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded(f"deadline exceeded during {what}: {type(e).__name__}: {e}") from e
+                messages = gen.throw(e)
+            else:
+                messages = gen.send(response)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        gen.close()
+
+
+async def _drive_async(
+    gen: Generator[_Messages, _Response, StructuredResult[T]],
+    call,
+    deadline: Optional[Deadline] = None,
+    what: str = "llm call",
+) -> StructuredResult[T]:
+    try:
+        messages = next(gen)
+        while True:
+            if deadline is not None:
+                deadline.check(what)
+            try:
+                with deadline_scope(deadline):
+                    # asyncio.timeout(None) never fires, so without a deadline this is a plain await
+                    async with asyncio.timeout(deadline.remaining() if deadline is not None else None):
+                        response = await call(messages)  # call() takes the max_concurrency limiter itself
+            except Exception as e:  # CancelledError is a BaseException and propagates (structured cancellation)
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded(f"deadline exceeded during {what}: {type(e).__name__}: {e}") from e
+                messages = gen.throw(e)
+            else:
+                messages = gen.send(response)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        gen.close()
+
+
+def _flight_key(backbone, system_prompt, user_text, schema, *, stage, max_retries, use_mock, prompt_spec) -> tuple:
+    spec = prompt_spec or PromptSpec(system=[system_prompt], user=user_text)
+    return (id(backbone), schema, stage, max_retries, use_mock, system_prompt, spec.prompt_hash())
+
+
+def _shared_copy(result: StructuredResult[T], **flags: bool) -> StructuredResult[T]:
+    """Per-caller copy of a shared result (agents post-process their model in place)."""
+    return StructuredResult(model=result.model.model_copy(deep=True), meta=replace(result.meta, **flags))
+
+
+class PrefixMemo:
+    """Completed structured results of one prefix_scope, keyed like single_flight; counts calls/reuses."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: Dict[tuple, StructuredResult] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def get(self, key: tuple) -> Optional[StructuredResult]:
+        with self._lock:
+            self.calls += 1
+            hit = self._results.get(key)
+            if hit is not None:
+                self.shared += 1
+        return None if hit is None else _shared_copy(hit, prefix_shared=True)
+
+    def put(self, key: tuple, result: StructuredResult) -> None:
+        with self._lock:
+            self._results.setdefault(key, _shared_copy(result))
+
+
+_prefix_memo: contextvars.ContextVar[Optional[PrefixMemo]] = contextvars.ContextVar("prefix_memo", default=None)
+
+
+@contextmanager
+def prefix_scope(memo: Optional[PrefixMemo] = None) -> Iterator[PrefixMemo]:
+    """
+    Share stage prefixes between runners that process the same example (modes/ablations of one run):
+    inside the scope a structured call identical to one already completed (same backbone, schema, stage,
+    prompt) returns a copy of that result (meta.prefix_shared=True) instead of calling the provider, so
+    configs only pay for the stages where their prompts diverge.
+    """
+    memo = memo or PrefixMemo()
+    token = _prefix_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _prefix_memo.reset(token)
+
+
+def _log_deadline(errors_path: str, *, run_id: str, text_id: str, stage: str, error: DeadlineExceeded) -> None:
+    _log_error(
+        errors_path,
+        {"type": "deadline_exceeded", "run_id": run_id, "text_id": text_id, "stage": stage, "error": str(error)},
+    )
+
+
+def run_structured(
+    backbone: BackboneClient,
+    system_prompt: str,
+    user_text: str,
+    schema: Type[T],
+    *,
+    max_retries: int = 2,
+    run_id: str,
+    text_id: str,
+    stage: str,
+    mode: str = "",
+    errors_path: Optional[str] = None,
+    max_concurrency: int = 1,
+    use_mock: bool = False,
+    prompt_spec: Optional[PromptSpec] = None,
+    deadline: Optional[Deadline] = None,
+    coalesce: bool = True,
+) -> StructuredResult[T]:
+    """
+    Run backbone, enforce JSON schema, repair on failures, and log errors without raising.
+    - max_concurrency: simple semaphore guard to avoid provider rate limits (default 1).
+    - errors_path defaults to experiments/results/<mode>/<run_id>/errors.jsonl (or stage if mode missing).
+    - On repeated failures, returns a fallback model_construct() and records error metadata.
+    - Returns StructuredResult containing the model and metadata (raw_response, retries, repair_used).
+    - deadline: no attempt (or retry) starts after it and provider calls are bounded by the remaining budget;
+      expiry raises DeadlineExceeded (logged as deadline_exceeded) instead of returning a fallback, so the
+      caller decides how to degrade.
+    - backbone.call_policy (if set) applies per-stage timeouts and hedging to each provider call.
+    - coalesce: a call identical to one already in flight (same backbone, schema, stage, prompt) waits for
+      it and gets a copy of its result (meta.coalesced=True; errors are logged by the call that ran).
+    - inside prefix_scope(), a call identical to one already completed in the scope is reused.
+    """
+    errors_path = errors_path or default_errors_path(run_id, mode or None, stage)
+    mode_for_backbone = f"{mode or ''}:{stage}".strip(":")
+    policy = getattr(backbone, "call_policy", None)
+
+    def call(messages: _Messages) -> _Response:
+        def generate() -> _Response:
+            return backbone.generate(messages, temperature=0.0, response_format="json", mode=mode_for_backbone, text_id=text_id)
+
+        if policy is not None:  # the policy takes the semaphore per attempt (hedges included)
+            return policy.call(stage, generate, limiter=sem)
+        with sem:
+            return generate()
+
+    sem = _get_semaphore(max_concurrency)
+
+    def structured() -> StructuredResult[T]:
+        gen = _structured_attempts(
+            backbone, system_prompt, user_text, schema,
+            max_retries=max_retries, run_id=run_id, text_id=text_id, stage=stage,
+            errors_path=errors_path, use_mock=use_mock, prompt_spec=prompt_spec,
+        )
+        return _drive_sync(gen, call, deadline, stage)
+
+    key = _flight_key(backbone, system_prompt, user_text, schema, stage=stage, max_retries=max_retries, use_mock=use_mock, prompt_spec=prompt_spec)
+    memo = _prefix_memo.get()
+    reused = memo.get(key) if memo is not None else None
+    if reused is not None:
+        return reused
+    try:
+        if not coalesce:
+            result = structured()
+        else:
+            try:
+                result, shared = single_flight.do(key, structured, timeout=deadline.remaining() if deadline is not None else None)
+            except TimeoutError as e:  # a follower's own deadline ran out while waiting for the leader
+                if isinstance(e, DeadlineExceeded) or deadline is None or not deadline.expired():
+                    raise
+                raise DeadlineExceeded(f"deadline exceeded waiting for a coalesced {stage} call") from e
+            if shared:
+                result = _shared_copy(result, coalesced=True)
+    except DeadlineExceeded as e:
+        _log_deadline(errors_path, run_id=run_id, text_id=text_id, stage=stage, error=e)
+        raise
+    if memo is not None:
+        memo.put(key, result)
+    return result
+
+
+async def arun_structured(
+    backbone: BackboneClient,
+    system_prompt: str,
+    user_text: str,
+    schema: Type[T],
+    *,
+    max_retries: int = 2,
+    run_id: str,
+    text_id: str,
+    stage: str,
+    mode: str = "",
+    errors_path: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    use_mock: bool = False,
+    prompt_spec: Optional[PromptSpec] = None,
+    deadline: Optional[Deadline] = None,
+    coalesce: bool = True,
+) -> StructuredResult[T]:
+    """
+    Coroutine counterpart of run_structured (same retries, repair, logging and fallback rules) built on
+    backbone.agenerate. max_concurrency gates calls per event loop; None (default) leaves concurrency to the
+    caller (e.g. arun_examples), since a shared limit of 1 would serialize every gathered call.
+    """
+    errors_path = errors_path or default_errors_path(run_id, mode or None, stage)
+    mode_for_backbone = f"{mode or ''}:{stage}".strip(":")
+    policy = getattr(backbone, "call_policy", None)
+
+    async def call(messages: _Messages) -> _Response:
+        def agenerate():
+            return backbone.agenerate(messages, temperature=0.0, response_format="json", mode=mode_for_backbone, text_id=text_id)
+
+        if policy is not None:  # the policy takes the limiter per attempt (hedges included)
+            return await policy.acall(stage, agenerate, limiter=sem)
+        if sem is None:
+            return await agenerate()
+        async with sem:
+            return await agenerate()
+
+    sem = _get_async_semaphore(max_concurrency) if max_concurrency else None
+
+    async def structured() -> StructuredResult[T]:
+        gen = _structured_attempts(
+            backbone, system_prompt, user_text, schema,
+            max_retries=max_retries, run_id=run_id, text_id=text_id, stage=stage,
+            errors_path=errors_path, use_mock=use_mock, prompt_spec=prompt_spec,
+        )
+        return await _drive_async(gen, call, deadline, stage)
+
+    key = _flight_key(backbone, system_prompt, user_text, schema, stage=stage, max_retries=max_retries, use_mock=use_mock, prompt_spec=prompt_spec)
+    memo = _prefix_memo.get()
+    reused = memo.get(key) if memo is not None else None
+    if reused is not None:
+        return reused
+    try:
+        if not coalesce:
+            result = await structured()
+        else:
+            try:
+                result, shared = await single_flight.ado(key, structured, timeout=deadline.remaining() if deadline is not None else None)
+            except TimeoutError as e:  # a follower's own deadline ran out while waiting for the leader
+                if isinstance(e, DeadlineExceeded) or deadline is None or not deadline.expired():
+                    raise
+                raise DeadlineExceeded(f"deadline exceeded waiting for a coalesced {stage} call") from e
+            if shared:
+                result = _shared_copy(result, coalesced=True)
+    except DeadlineExceeded as e:
+        _log_deadline(errors_path, run_id=run_id, text_id=text_id, stage=stage, error=e)
+        raise
+    if memo is not None:
+        memo.put(key, result)
+    return result
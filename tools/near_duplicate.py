@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Keep letters/digits of any script (Hangul syllables and Jamo included); drop whitespace, punctuation,
+# emoji and symbols so reposts that only differ in decoration collapse to the same shingles.
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_for_shingles(text: str) -> str:
+    """NFKC + casefold, then strip everything that is not a letter or digit."""
+    return _NON_WORD_RE.sub("", unicodedata.normalize("NFKC", text or "").casefold())
+
+
+def char_shingles(text: str, k: int = 3) -> Set[str]:
+    """
+    Character k-shingles of the normalized text. Korean has no reliable whitespace tokenization
+    (particles attach to nouns), so character n-grams are used instead of word shingles.
+    Texts shorter than k yield a single shingle (or none when empty).
+    """
+    norm = normalize_for_shingles(text)
+    if len(norm) <= k:
+        return {norm} if norm else set()
+    return {norm[i : i + k] for i in range(len(norm) - k + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) with bands*rows <= num_perm whose S-curve midpoint (1/b)^(1/r) is closest to threshold."""
+    best = (num_perm, 1)
+    best_err = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        err = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+@dataclass(frozen=True)
+class NearDuplicateMatch:
+    """One near-duplicate pair: `query_key` (e.g. demo uid) vs indexed `key` (e.g. eval uid) with estimated Jaccard."""
+
+    query_key: str
+    key: str
+    jaccard: float
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH index over character shingles.
+
+    Each text costs one signature (num_perm uint32) and `bands` bucket entries, so building the index and
+    querying N texts is linear in corpus size; only texts sharing an LSH bucket are compared, and their
+    similarity is the MinHash Jaccard estimate (exact Jaccard is not recomputed).
+    """
+
+    def __init__(self, threshold: float = 0.8, *, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = float(threshold)
+        self.num_perm = int(num_perm)
+        self.shingle_size = int(shingle_size)
+        self.bands, self.rows = _optimal_bands(self.threshold, self.num_perm)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._keys: List[str] = []
+        self._signatures: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature (uint32[num_perm]); None for texts with no letters/digits."""
+        shingles = char_shingles(text, self.shingle_size)
+        if not shingles:
+            return None
+        hv = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # (a*x + b) mod p, truncated to 32 bits; one row per shingle, min over shingles per permutation.
+        phv = ((hv[:, None] * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return phv.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray) -> Iterable[bytes]:
+        for band in range(self.bands):
+            yield sig[band * self.rows : (band + 1) * self.rows].tobytes()
+
+    def add(self, key: str, text: str) -> None:
+        sig = self.signature(text)
+        if sig is None:
+            return
+        pos = len(self._keys)
+        self._keys.append(key)
+        self._signatures.append(sig)
+        for band, band_key in enumerate(self._band_keys(sig)):
+            self._buckets[band].setdefault(band_key, []).append(pos)
+
+    def query(self, text: str, *, query_key: str = "") -> List[NearDuplicateMatch]:
+        """Indexed entries whose estimated Jaccard with `text` is >= threshold, highest first."""
+        sig = self.signature(text)
+        if sig is None:
+            return []
+        candidates: Set[int] = set()
+        for band, band_key in enumerate(self._band_keys(sig)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        matches = []
+        for pos in candidates:
+            est = float(np.count_nonzero(self._signatures[pos] == sig)) / self.num_perm
+            if est >= self.threshold:
+                matches.append(NearDuplicateMatch(query_key=query_key, key=self._keys[pos], jaccard=round(est, 4)))
+        matches.sort(key=lambda m: (-m.jaccard, m.key))
+        return matches
+
+
+def find_near_duplicates(
+    queries: Sequence[Tuple[str, str]],
+    index: NearDuplicateIndex,
+) -> Dict[str, NearDuplicateMatch]:
+    """Best match per query key for (key, text) pairs that have a near-duplicate in `index`."""
+    found: Dict[str, NearDuplicateMatch] = {}
+    for key, text in queries:
+        matches = index.query(text, query_key=key)
+        if matches:
+            found[key] = matches[0]
+    return found
+
+
+def summarize_near_duplicates(
+    matches: Dict[str, NearDuplicateMatch],
+    index: NearDuplicateIndex,
+    *,
+    top_n: int = 20,
+) -> Dict[str, object]:
+    """Manifest-friendly summary: settings, pair count, Jaccard range and the top pairs."""
+    ordered = sorted(matches.values(), key=lambda m: (-m.jaccard, m.query_key))
+    scores = [m.jaccard for m in ordered]
+    return {
+        "threshold": index.threshold,
+        "num_perm": index.num_perm,
+        "shingle_size": index.shingle_size,
+        "indexed": len(index),
+        "pairs": len(ordered),
+        "max_jaccard": max(scores) if scores else None,
+        "min_jaccard": min(scores) if scores else None,
+        "top_pairs": [{"query": m.query_key, "match": m.key, "jaccard": m.jaccard} for m in ordered[:top_n]],
+    }
+
+
+__all__ = [
+    "NearDuplicateIndex",
+    "NearDuplicateMatch",
+    "char_shingles",
+    "find_near_duplicates",
+    "jaccard",
+    "normalize_for_shingles",
+    "summarize_near_duplicates",
+]
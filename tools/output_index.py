@@ -0,0 +1,173 @@
+"""
+Byte-offset index for outputs.jsonl and lazy access to full outputs from scorecards.
+
+Scorecards no longer embed the whole FinalOutputSchema dump (runtime.parsed_output); they carry
+runtime.output_ref = {"file", "uid", "offset", "length"} pointing at the line in the run's
+outputs.jsonl (or smoke_outputs.jsonl), plus the few derived fields the metric scripts read.
+A sidecar <outputs>.index.jsonl ({"uid", "offset", "length"} per line) allows lookup by uid.
+
+  writer = OutputIndexWriter(f_out, f_index, file_name="outputs.jsonl")
+  ref = writer.write(uid, payload)            # -> scorecard["runtime"]["output_ref"]
+
+  store = OutputStore(run_dir)                # or OutputStore() to resolve via meta.manifest_path
+  full = store.for_scorecard(card)            # seek + parse only when called; None if unavailable
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+
+
+def index_path_for(output_path: Path) -> Path:
+    """outputs.jsonl -> outputs.index.jsonl (sidecar next to the output file)."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + ".index.jsonl")
+
+
+def _row_uid(row: Dict[str, Any]) -> str:
+    meta = row.get("meta") or {}
+    return str(meta.get("text_id") or meta.get("uid") or row.get("uid") or row.get("text_id") or "")
+
+
+class OutputIndexWriter:
+    """
+    Writes JSONL rows to an already-open text handle (utf-8, newline="\\n") and records each row's
+    byte offset/length, optionally appending them to the sidecar index handle.
+    """
+
+    def __init__(self, f_out: IO[str], f_index: Optional[IO[str]] = None, *, file_name: str = "outputs.jsonl", offset: int = 0):
+        self.f_out = f_out
+        self.f_index = f_index
+        self.file_name = file_name
+        self.offset = offset
+
+    def write(self, uid: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        length = len(line.encode("utf-8"))
+        self.f_out.write(line)
+        ref = {"file": self.file_name, "uid": uid, "offset": self.offset, "length": length}
+        if self.f_index is not None:
+            self.f_index.write(json.dumps({"uid": uid, "offset": self.offset, "length": length}, ensure_ascii=False) + "\n")
+        self.offset += length
+        return ref
+
+
+def iter_jsonl_with_offsets(path: Path) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """(offset, length, row) for every parseable line; offsets are byte positions in the file."""
+    offset = 0
+    with Path(path).open("rb") as f:
+        for raw in f:
+            length = len(raw)
+            text = raw.decode("utf-8-sig" if offset == 0 else "utf-8", errors="replace").strip()
+            if text:
+                try:
+                    row = json.loads(text)
+                except json.JSONDecodeError:
+                    row = None
+                if isinstance(row, dict):
+                    yield offset, length, row
+            offset += length
+
+
+def build_output_index(output_path: Path, index_path: Optional[Path] = None) -> Path:
+    """(Re)build the sidecar index of an existing outputs.jsonl; returns the index path."""
+    index_path = Path(index_path) if index_path else index_path_for(output_path)
+    with index_path.open("w", encoding="utf-8", newline="\n") as f:
+        for offset, length, row in iter_jsonl_with_offsets(output_path):
+            f.write(json.dumps({"uid": _row_uid(row), "offset": offset, "length": length}, ensure_ascii=False) + "\n")
+    return index_path
+
+
+def load_output_index(output_path: Path) -> Dict[str, Tuple[int, int]]:
+    """uid -> (offset, length) from the sidecar index; built from the output file when missing."""
+    output_path = Path(output_path)
+    index_path = index_path_for(output_path)
+    if not index_path.exists() and output_path.exists():
+        try:
+            build_output_index(output_path, index_path)
+        except OSError:  # read-only run dir: index in memory only
+            return {_row_uid(row): (offset, length) for offset, length, row in iter_jsonl_with_offsets(output_path)}
+    out: Dict[str, Tuple[int, int]] = {}
+    if not index_path.exists():
+        return out
+    with index_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            out.setdefault(str(entry.get("uid") or ""), (int(entry["offset"]), int(entry["length"])))
+    return out
+
+
+class OutputStore:
+    """
+    Lazy reader of full outputs referenced by scorecards. Files are opened on first use and rows are
+    parsed only when requested. run_dir: directory holding the output files; when None, each ref is
+    resolved next to the scorecard's meta.manifest_path (so merged/copied scorecards still resolve).
+    """
+
+    def __init__(self, run_dir: Optional[Path] = None):
+        self.run_dir = Path(run_dir) if run_dir else None
+        self._handles: Dict[Path, IO[bytes]] = {}
+        self._indexes: Dict[Path, Dict[str, Tuple[int, int]]] = {}
+
+    def close(self) -> None:
+        for f in self._handles.values():
+            f.close()
+        self._handles.clear()
+
+    def __enter__(self) -> "OutputStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _resolve(self, card: Dict[str, Any], file_name: str) -> Optional[Path]:
+        if self.run_dir is not None:
+            return self.run_dir / file_name
+        manifest_path = (card.get("meta") or {}).get("manifest_path")
+        return Path(manifest_path).parent / file_name if manifest_path else None
+
+    def _read(self, path: Path, offset: int, length: int) -> Optional[Dict[str, Any]]:
+        f = self._handles.get(path)
+        if f is None:
+            if not path.exists():
+                return None
+            f = self._handles[path] = path.open("rb")
+        f.seek(offset)
+        raw = f.read(length)
+        try:
+            row = json.loads(raw.decode("utf-8-sig" if offset == 0 else "utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        return row if isinstance(row, dict) else None
+
+    def get(self, path: Path, uid: str, offset: Optional[int] = None, length: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Row of `uid` in `path`: direct seek when offset/length are given and still match, else via the index."""
+        path = Path(path)
+        if offset is not None and length is not None:
+            row = self._read(path, int(offset), int(length))
+            if row is not None and (not uid or _row_uid(row) == uid):
+                return row
+        if path not in self._indexes:
+            self._indexes[path] = load_output_index(path) if path.exists() else {}
+        loc = self._indexes[path].get(uid)
+        return self._read(path, *loc) if loc else None
+
+    def for_scorecard(self, card: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Full output of a scorecard: embedded runtime.parsed_output (older scorecards) or the output_ref target."""
+        runtime = card.get("runtime") or {}
+        if isinstance(runtime.get("parsed_output"), dict):
+            return runtime["parsed_output"]
+        ref = runtime.get("output_ref")
+        if not isinstance(ref, dict) or not ref.get("file"):
+            return None
+        path = self._resolve(card, ref["file"])
+        if path is None:
+            return None
+        return self.get(path, str(ref.get("uid") or ""), ref.get("offset"), ref.get("length"))
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .pattern_loader import load_patterns
+
+_DEFAULT_TOKEN_REGEX = r"[가-힣A-Za-z]{2,}"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher (Aho-Corasick automaton).
+
+    Patterns are matched in a single left-to-right pass over the text, so lookup cost depends on the text
+    length and the number of hits, not on how many patterns are registered. Pattern ids are positions in
+    the input sequence; callers use them to keep list-order priority. Empty patterns match every text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = [p for p in patterns]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._has_empty = False
+        for pid, pat in enumerate(self.patterns):
+            if not pat:
+                self._has_empty = True
+                continue
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pid)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start, pattern_id) for every occurrence of every non-empty pattern (overlaps included)."""
+        node = 0
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i - len(patterns[pid]) + 1, pid
+
+    def contains_any(self, text: str) -> bool:
+        if self._has_empty:
+            return True
+        return next(self.iter_matches(text), None) is not None
+
+    def matched_ids(self, text: str) -> List[int]:
+        """Sorted ids of patterns occurring in text (equivalent to `[i for i, p in enumerate(patterns) if p in text]`)."""
+        found = {pid for _, pid in self.iter_matches(text)}
+        if self._has_empty:
+            found.update(i for i, p in enumerate(self.patterns) if not p)
+        return sorted(found)
+
+    def first_by_priority(self, text: str) -> Optional[Tuple[int, int]]:
+        """
+        (start, pattern_id) of the lowest-id pattern that occurs, at its leftmost position; None when nothing matches.
+        Mirrors `for p in patterns: pos = text.find(p); if pos != -1: return pos`.
+        """
+        best: Dict[int, int] = {}
+        for start, pid in self.iter_matches(text):
+            if pid not in best or start < best[pid]:
+                best[pid] = start
+        if self._has_empty:
+            for pid, p in enumerate(self.patterns):
+                if not p:
+                    best[pid] = 0
+        if not best:
+            return None
+        pid = min(best)
+        return best[pid], pid
+
+
+class PatternSet:
+    """
+    Compiled view of one language's `resources/patterns/<lang>.json`, built once and shared.
+
+    - contrast / negation / positive / negative: Aho-Corasick automata over lowercased entries
+    - synonyms: automaton over aspect_synonyms keys plus a substring table for the reverse (term-in-key) test
+    - topic particles: suffix sets grouped by length (longest first)
+    - aspect_token_regex and contrast markers: precompiled regexes
+    """
+
+    def __init__(self, patterns: Dict, *, path: Optional[Path] = None, sha256: Optional[str] = None):
+        self.raw = patterns or {}
+        self.path = path
+        self.sha256 = sha256
+
+        self.contrast_markers: List[str] = [m for m in self.raw.get("contrast_markers", []) if isinstance(m, str)]
+        self.contrast = AhoCorasick(m.lower() for m in self.contrast_markers)
+        # Contrast markers are also used as regexes by the mock backbone (case-sensitive search).
+        self.contrast_regexes: List[re.Pattern] = []
+        for m in self.raw.get("contrast_markers") or []:
+            try:
+                self.contrast_regexes.append(re.compile(m))
+            except (re.error, TypeError):
+                self.contrast_regexes.append(re.compile(re.escape(str(m))))
+
+        self.topic_particles: Tuple[str, ...] = tuple(s for s in self.raw.get("topic_particles", []) if isinstance(s, str))
+        by_len: Dict[int, set] = {}
+        for suf in self.topic_particles:
+            by_len.setdefault(len(suf), set()).add(suf)
+        self._suffixes_by_len: List[Tuple[int, frozenset]] = [(n, frozenset(by_len[n])) for n in sorted(by_len, reverse=True)]
+
+        triggers = self.raw.get("negation_triggers")
+        self.negation: Optional[AhoCorasick] = (
+            AhoCorasick(str(t).lower() for t in triggers if t) if triggers else None
+        )
+        self.positive: Optional[AhoCorasick] = self._keyword_matcher("positive_keywords")
+        self.negative: Optional[AhoCorasick] = self._keyword_matcher("negative_keywords")
+
+        self.token_regex_str: str = self.raw.get("aspect_token_regex") or _DEFAULT_TOKEN_REGEX
+        try:
+            self.token_regex: Optional[re.Pattern] = re.compile(self.token_regex_str)
+        except re.error:
+            self.token_regex = None
+
+        synonyms = self.raw.get("aspect_synonyms") or {}
+        self._synonym_values: List[List[str]] = []
+        keys: List[str] = []
+        for key, values in synonyms.items():
+            if not key or not isinstance(values, list):
+                continue
+            keys.append(key)
+            self._synonym_values.append([str(v) for v in values if v])
+        self.synonym_keys = AhoCorasick(keys)
+        # term-in-key test: every substring of every key maps to the keys containing it
+        self._key_substrings: Dict[str, List[int]] = {}
+        for kid, key in enumerate(keys):
+            subs = {key[i:j] for i in range(len(key)) for j in range(i + 1, len(key) + 1)}
+            for sub in subs:
+                self._key_substrings.setdefault(sub, []).append(kid)
+
+    def _keyword_matcher(self, name: str) -> Optional[AhoCorasick]:
+        values = self.raw.get(name)
+        return AhoCorasick(str(k).lower() for k in values) if values else None
+
+    # ---------------- lookups ----------------
+    def has_contrast(self, text: str) -> bool:
+        return self.contrast.contains_any((text or "").lower())
+
+    def first_contrast(self, text: str) -> Optional[Tuple[int, str]]:
+        """(position, marker) of the first contrast marker in list order found in lowercased text."""
+        hit = self.contrast.first_by_priority((text or "").lower())
+        if hit is None:
+            return None
+        return hit[0], self.contrast_markers[hit[1]]
+
+    def search_contrast_regex(self, text: str) -> Optional[re.Match]:
+        """First contrast marker (list order) whose regex matches text; returns the match object."""
+        for pattern in self.contrast_regexes:
+            m = pattern.search(text)
+            if m:
+                return m
+        return None
+
+    def strip_topic_suffix(self, term: str) -> str:
+        """Strip the longest topic particle suffix, keeping at least one character."""
+        for n, suffixes in self._suffixes_by_len:
+            if len(term) > n and term[-n:] in suffixes:
+                return term[:-n]
+        return term
+
+    def synonyms_for(self, lower: str) -> List[str]:
+        """Synonym values for every aspect_synonyms key that contains or is contained in `lower` (key order)."""
+        kids = set(self.synonym_keys.matched_ids(lower))
+        kids.update(self._key_substrings.get(lower, ()))
+        out: List[str] = []
+        for kid in sorted(kids):
+            out += self._synonym_values[kid]
+        return out
+
+
+@lru_cache(maxsize=None)
+def get_pattern_set(language_code: str | None) -> PatternSet:
+    """Compiled PatternSet for a language (same fallback rules as load_patterns); built once per process."""
+    patterns, path, sha = load_patterns(language_code)
+    return PatternSet(patterns, path=path, sha256=sha)
+
+
+def compile_terms(terms: Sequence[str]) -> AhoCorasick:
+    """Automaton over ad-hoc term lists (e.g. per-example normalized aspect terms)."""
+    return AhoCorasick(terms)
+
+
+__all__ = ["AhoCorasick", "PatternSet", "compile_terms", "get_pattern_set"]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future, wait as wait_futures
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    In-flight deduplication: concurrent calls with the same key wait on the first caller (the leader)
+    and share its result instead of repeating the work. Nothing is kept once the leader finishes, so this
+    only removes simultaneous duplicates (it is not a cache).
+    If the leader fails or is cancelled, each waiting caller runs the work itself, so one caller's deadline
+    or cancellation never becomes another caller's error. Sync callers (threads) and async callers
+    (per event loop, like the llm_runner semaphores) are tracked separately.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sync: Dict[Hashable, Future] = {}
+        self._async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Future]]" = weakref.WeakKeyDictionary()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats: Dict[str, int] = {"leaders": 0, "coalesced": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def do(self, key: Hashable, fn: Callable[[], T], *, timeout: Optional[float] = None) -> Tuple[T, bool]:
+        """
+        (result, shared): shared is True when the result came from another caller's in-flight call.
+        Raises TimeoutError if the leader does not finish within timeout.
+        """
+        with self._lock:
+            future = self._sync.get(key)
+            leader = future is None
+            if leader:
+                future = self._sync[key] = Future()
+        if leader:
+            self._count("leaders")
+            try:
+                value = fn()
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                future.set_result(value)
+                return value, False
+            finally:
+                with self._lock:
+                    self._sync.pop(key, None)
+        # Only the wait itself may time out: a leader's own TimeoutError (e.g. DeadlineExceeded) is a failure
+        # like any other, after which this caller runs fn() itself.
+        wait_futures([future], timeout=timeout)
+        if not future.done():
+            raise TimeoutError("coalesced call did not finish in time")
+        if future.cancelled() or future.exception() is not None:
+            return fn(), False
+        self._count("coalesced")
+        return future.result(), True
+
+    async def ado(self, key: Hashable, afn: Callable[[], Awaitable[T]], *, timeout: Optional[float] = None) -> Tuple[T, bool]:
+        """Coroutine counterpart of do(); raises TimeoutError if the leader does not finish within timeout."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._async.setdefault(loop, {})
+        future = inflight.get(key)
+        if future is None:
+            future = inflight[key] = loop.create_future()
+            self._count("leaders")
+            try:
+                value = await afn()
+            except Exception as e:
+                future.set_exception(e)
+                future.exception()  # mark retrieved: a leader without followers must not log "never retrieved"
+                raise
+            except BaseException:
+                future.cancel()
+                raise
+            else:
+                future.set_result(value)
+                return value, False
+            finally:
+                inflight.pop(key, None)
+        done, _ = await asyncio.wait({future}, timeout=timeout)
+        if not done:
+            raise TimeoutError("coalesced call did not finish in time")
+        if future.cancelled() or future.exception() is not None:
+            return await afn(), False
+        self._count("coalesced")
+        return future.result(), True
+
+
+__all__ = ["SingleFlight"]
@@ -0,0 +1,110 @@
+"""
+Serialization levels for process_trace in outputs.jsonl / traces.jsonl (pipeline.trace_level).
+
+- full: historical shape. Every entry repeats input_text and the case fields (uid, case_type, split,
+  language_code, domain_id, input_hash) and carries call metadata twice (call_metadata + the same JSON in notes).
+- compact: the text and case fields live once per example (meta.input_text / meta.uid ..., traces.jsonl row);
+  entries keep stage, agent, output, call_metadata without raw_response, and stage_status / notes only when set.
+  Raw responses optionally go to a raw_responses.jsonl side file (pipeline.trace_raw_responses).
+- none: process_trace is written empty (scorecards are still built from the in-memory trace).
+
+Readers that need call metadata use trace_call_metadata(entry), which accepts both shapes.
+"""
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Dict, List, Optional
+
+TRACE_LEVELS = ("full", "compact", "none")
+
+
+def resolve_trace_level(value: Optional[str]) -> str:
+    level = (value or "full").lower()
+    if level not in TRACE_LEVELS:
+        raise ValueError(f"unsupported trace level '{level}' (expected one of {', '.join(TRACE_LEVELS)})")
+    return level
+
+
+def _notes_metadata(notes: Any) -> Optional[Dict[str, Any]]:
+    if not notes or not isinstance(notes, str) or not notes.startswith("{"):
+        return None
+    try:
+        meta = json.loads(notes)
+    except ValueError:
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def trace_call_metadata(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Call metadata of a trace entry: structured call_metadata, else the JSON notes of older full traces."""
+    cm = entry.get("call_metadata")
+    if isinstance(cm, dict):
+        return cm
+    return _notes_metadata(entry.get("notes")) or {}
+
+
+def compact_trace_entry(
+    entry: Dict[str, Any],
+    *,
+    input_text: str,
+    uid: str = "",
+    index: int = 0,
+    raw_out: Optional[IO[str]] = None,
+) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"stage": entry.get("stage"), "agent": entry.get("agent")}
+    text = entry.get("input_text")
+    if text and text != input_text:
+        out["input_text"] = text
+    out["output"] = entry.get("output") or {}
+    cm = trace_call_metadata(entry)
+    if cm:
+        raw = cm.get("raw_response")
+        if raw and raw_out is not None:
+            row = {"uid": uid, "index": index, "stage": entry.get("stage"), "agent": entry.get("agent"), "raw_response": raw}
+            raw_out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        out["call_metadata"] = {k: v for k, v in cm.items() if k != "raw_response"}
+    if entry.get("stage_status"):
+        out["stage_status"] = entry["stage_status"]
+    notes = entry.get("notes")
+    if notes and _notes_metadata(notes) is None:
+        out["notes"] = notes
+    return out
+
+
+def render_process_trace(
+    entries: List[Dict[str, Any]],
+    level: str,
+    *,
+    input_text: str = "",
+    uid: str = "",
+    raw_out: Optional[IO[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Dumped ProcessTrace dicts in the shape of `level`. full fills notes from call_metadata in place
+    (agents record structured metadata only); compact/none return new lists and leave `entries` untouched.
+    """
+    if level == "none":
+        return []
+    if level == "compact":
+        return [
+            compact_trace_entry(e, input_text=input_text, uid=uid, index=i, raw_out=raw_out) for i, e in enumerate(entries)
+        ]
+    for e in entries:
+        if e.get("notes") is None and isinstance(e.get("call_metadata"), dict):
+            e["notes"] = json.dumps(e["call_metadata"], ensure_ascii=False)
+    return entries
+
+
+def render_output(payload: Dict[str, Any], level: str, *, raw_out: Optional[IO[str]] = None) -> Dict[str, Any]:
+    """
+    FinalOutputSchema dump as written to outputs.jsonl. full renders in place and returns `payload`;
+    other levels return a shallow copy (meta.trace_level set) so the caller keeps the full trace for scorecards.
+    """
+    meta = payload.get("meta") or {}
+    trace = payload.get("process_trace") or []
+    rendered = render_process_trace(
+        trace, level, input_text=meta.get("input_text") or "", uid=str(meta.get("uid") or meta.get("text_id") or ""), raw_out=raw_out
+    )
+    if level == "full":
+        return payload
+    return {**payload, "meta": {**meta, "trace_level": level}, "process_trace": rendered}